@@ -0,0 +1,81 @@
+"""
+各版本计算器界面模块的导入耗时（冷启动）
+
+用法（在仓库根目录）:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py salary_calculator_v5 --top 10
+
+每个模块在独立的子进程中用 python -X importtime 导入（不创建窗口），
+统计导入总耗时，并列出耗时最多的顶层依赖。pandas、matplotlib、numpy
+只应在导出或生成图表时才导入，出现在列表里说明又被放回了模块顶部。
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = [
+    "salary_calculator_v5",
+    "salary_calculator_v6_final_release",
+    "salary_calculator_v13",
+    "salary_calculator_v26",
+    "salary_calculator_v28",
+]
+
+# 界面启动时不应导入的重量级依赖
+HEAVY = ("pandas", "matplotlib", "numpy")
+
+
+def import_times(module):
+    """在子进程中导入模块，返回 [(模块名, 累计耗时us)]（-X importtime 的输出）"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"导入 {module} 失败:\n{result.stderr[-2000:]}")
+
+    times = []
+    for line in result.stderr.splitlines():
+        # 格式: "import time:  self [us] | cumulative | imported package"，跳过表头
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        # 模块名前每两个空格表示一层嵌套，被测模块本身没有缩进
+        times.append((name[1:].rstrip(), int(cumulative)))
+    return times
+
+
+def summarize(module, top):
+    times = import_times(module)
+    total = next(us for name, us in times if name.strip() == module)
+    top_level = sorted(((name.strip(), us) for name, us in times
+                        if name.startswith("  ") and not name.startswith("   ")),
+                       key=lambda item: item[1], reverse=True)
+    heavy = sorted({name.strip().split(".")[0] for name, _ in times} & set(HEAVY))
+
+    print(f"{module}: {total / 1000:.1f} ms" + (f"  (导入了 {', '.join(heavy)})" if heavy else ""))
+    for name, us in top_level[:top]:
+        print(f"    {name:<40} {us / 1000:>8.1f} ms")
+    return total, heavy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="计算器界面模块冷启动导入耗时")
+    parser.add_argument("modules", nargs="*", default=MODULES, help="要测试的模块（默认全部界面版本）")
+    parser.add_argument("--top", type=int, default=5, help="列出耗时最多的前 N 个依赖")
+    args = parser.parse_args(argv)
+
+    failed = []
+    for module in args.modules:
+        _, heavy = summarize(module, args.top)
+        if heavy:
+            failed.append(module)
+    if failed:
+        print(f"\n启动时导入了重量级依赖: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+门店上下文提取前后的单店计算耗时对比
+
+用法（在仓库根目录）:
+    python benchmarks/bench_store_context.py
+
+per_staff_reference 按 salary_calculator_v28.py 原 calculate() 的写法，在每个员工的循环里
+重新计算门店总奖金、提成分配、转化率折扣和阈值分档；calculate_store 先算一次门店上下文。
+员工数增大时，前者每人都要付出整套门店公式的代价，后者每人只算本人相关的部分。
+“员工名单”一列为同一批员工存为 StaffRoster（按列存储）时的耗时。
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from salary_calculator.commission import (  # noqa: E402
+    NewStaffSalary, OldStaffSalary, StoreParams, calculate_store)
+from salary_calculator.rates import DEFAULT_RATES  # noqa: E402
+from salary_calculator.roster import StaffRoster  # noqa: E402
+
+
+def per_staff_reference(p, staff_list, rates=DEFAULT_RATES):
+    """原界面的写法：门店级的量在每个员工的循环里重复计算，输出与 calculate_store 相同"""
+    old, mid, low = [], [], []
+    for staff in staff_list:
+        conversion_rate = (p.service_packs / p.delivery_volume) * 100 if p.delivery_volume > 0 else 0
+        commission_rate = rates.lookup(p.pack_price, p.has_station_license, conversion_rate)
+        basic_salary = staff["old_base"] + staff["basic_perf"] + staff["post_perf"] + staff["subsidy"]
+        total_commission = p.service_packs * commission_rate
+        nation_amount = total_commission * p.nation_commission_rate
+        if p.has_region:
+            staff_amount = (total_commission - nation_amount) * (1 - p.region_commission_rate)
+        else:
+            staff_amount = total_commission - nation_amount
+        per_capita_commission = staff_amount / p.store_staff if p.store_staff > 0 else 0
+        old.append(OldStaffSalary(basic_salary, per_capita_commission, basic_salary + per_capita_commission))
+
+    for new_base, result in ((p.new_base_mid, mid), (p.new_base_low, low)):
+        for staff in staff_list:
+            conversion_rate = (p.service_packs / p.delivery_volume) * 100 if p.delivery_volume > 0 else 0
+            numerator = (staff["old_base"] + staff["basic_perf"] + staff["post_perf"] + staff["subsidy"] +
+                         p.old_avg_commission - new_base)
+            unit_commission = numerator / p.avg_monthly_packs
+            per_capita_new_packs = p.new_service_packs / p.store_staff if p.store_staff > 0 else 0
+            total_commission = commission_per_person = base_commission = None
+            if p.use_threshold:
+                n = p.new_service_packs
+                if n <= p.threshold1:
+                    total_commission = n * unit_commission
+                elif n <= p.threshold2:
+                    total_commission = p.threshold1 * unit_commission + (n - p.threshold1) * p.commission_tier2
+                else:
+                    total_commission = (p.threshold1 * unit_commission + (p.threshold2 - p.threshold1) *
+                                        p.commission_tier2 + (n - p.threshold2) * p.commission_tier3)
+                commission_per_person = total_commission / p.store_staff if p.store_staff > 0 else 0
+                commission_after_conversion = commission_per_person
+                discount_note = " (应用阈值计算)"
+            else:
+                base_commission = per_capita_new_packs * unit_commission
+                commission_after_conversion = base_commission
+                if conversion_rate < p.low_conversion_rate * 100:
+                    commission_after_conversion = base_commission * p.y_discount
+                    discount_note = f" (应用y折扣: {p.y_discount})"
+                elif conversion_rate > p.high_conversion_rate * 100:
+                    commission_after_conversion = base_commission * p.z_discount
+                    discount_note = f" (应用z折扣: {p.z_discount})"
+                else:
+                    discount_note = ""
+            salary_base = new_base + commission_after_conversion
+            threshold = p.avg_monthly_packs * p.store_staff * p.threshold_percentage
+            if p.new_service_packs < threshold:
+                final_salary = salary_base * p.threshold_discount
+                discount_note += f" (包数不足, 应用折扣: {p.threshold_discount})"
+            else:
+                final_salary = salary_base
+            result.append(NewStaffSalary(unit_commission, total_commission, commission_per_person, base_commission,
+                                         commission_after_conversion, salary_base, final_salary, discount_note))
+    return old, mid, low
+
+
+def make_store(staff_count, use_threshold):
+    params = StoreParams(store_staff=staff_count, service_packs=51 * staff_count,
+                         new_service_packs=51 * staff_count, use_threshold=use_threshold,
+                         threshold1=45 * staff_count, threshold2=50 * staff_count)
+    staff_list = [{"old_base": 2000.0 + i % 5 * 100, "basic_perf": 550.0, "post_perf": 200.0, "subsidy": 1100.0}
+                  for i in range(staff_count)]
+    return params, staff_list
+
+
+def check(params, staff_list):
+    """两种写法的结果必须一致"""
+    old, mid, low = per_staff_reference(params, staff_list)
+    result = calculate_store(params, staff_list)
+    assert (old, mid, low) == (result.old, result.mid, result.low)
+    assert calculate_store(params, StaffRoster(staff_list)) == result
+
+
+def main():
+    print(f"{'员工数':>8} {'阈值':>4} {'逐人重算(ms)':>14} {'门店上下文(ms)':>16} {'员工名单(ms)':>14} {'加速':>6}")
+    for use_threshold in (False, True):
+        for staff_count in (2, 10, 100, 1000, 10000):
+            params, staff_list = make_store(staff_count, use_threshold)
+            check(params, staff_list)
+            number = max(1, 20000 // staff_count)
+            before = min(timeit.repeat(lambda: per_staff_reference(params, staff_list),
+                                       number=number, repeat=3)) / number
+            after = min(timeit.repeat(lambda: calculate_store(params, staff_list),
+                                      number=number, repeat=3)) / number
+            roster = StaffRoster(staff_list)
+            columnar = min(timeit.repeat(lambda: calculate_store(params, roster),
+                                         number=number, repeat=3)) / number
+            print(f"{staff_count:>8} {'是' if use_threshold else '否':>4} {before * 1000:>14.3f} "
+                  f"{after * 1000:>16.3f} {columnar * 1000:>14.3f} {before / after:>6.2f}")
+
+
+if __name__ == "__main__":
+    main()
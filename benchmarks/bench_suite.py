@@ -0,0 +1,379 @@
+"""
+薪资公式基准测试套件
+
+用法（在仓库根目录）:
+    python benchmarks/bench_suite.py                          # 运行并与 baseline.json 对比
+    python benchmarks/bench_suite.py --json result.json       # 结果另存为JSON（- 为标准输出）
+    python benchmarks/bench_suite.py --save-baseline          # 用本次结果更新基线
+    python benchmarks/bench_suite.py --filter v28 --quick     # 只跑名称含 v28 的项目，少重复几次
+
+micro: 单个公式的一次调用（v5/v6 的 engine、sweep，v13/v26/v28 的提成单价、门店提成、阈值建议）。
+macro: 一个模拟的全国月份（salary_calculator.synthetic 按种子生成，默认 20000 个门店、
+       约14万名员工），批量计算门店报告、向量化薪资、v28 员工薪资、阈值建议和员工名单社保。
+
+每项计时 repeat 轮，每轮连续调用到至少 min_time 秒（亚微秒级的公式一轮有几十万次调用），
+取各轮单次耗时的中位数与基线的中位数比较：慢于 基线 × (1 + tolerance) + noise_floor 记为退步，
+noise_floor 是绝对的噪声下限，避免亚微秒级项目因几十纳秒的抖动误报；
+判为退步的项目再复测 retries 次，取最快的一次，偶发的抖动不会让检查失败。
+有退步时退出码为 1，可以放在发版前的检查里。基线与机器有关，换机器后用 --save-baseline 重新保存，
+不要手工修改基线文件。
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import timeit
+from collections import namedtuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from salary_calculator.commission import StoreParams, calculate_store, store_context  # noqa: E402
+from salary_calculator.engine import (  # noqa: E402
+    SalaryParams, calculate_new_salary_mode2, calculate_new_salary_mode3, calculate_old_salary,
+    calculate_social_insurance, salary_matrix, store_report)
+from salary_calculator.rates import DEFAULT_RATES, V13_RATES  # noqa: E402
+from salary_calculator.roster import DEFAULT_STAFF, StaffRoster  # noqa: E402
+from salary_calculator.threshold import suggest_thresholds, suggest_thresholds_batch  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# 结果格式版本，字段变化时修改
+SCHEMA_VERSION = 1
+
+# 默认允许比基线慢 20%
+DEFAULT_TOLERANCE = 0.2
+
+# 默认的绝对噪声下限（秒）：与基线的差距小于该值时不算退步
+DEFAULT_NOISE_FLOOR = 5e-7
+
+# 每轮计时的最短时间（秒），--quick 时为 0.2 秒
+DEFAULT_MIN_TIME = 0.5
+
+# 模拟全国月份的默认门店数
+DEFAULT_STORES = 20000
+
+# name: 项目名；kind: micro / macro；calculators: 使用该公式的计算器；setup: 返回被测的无参函数
+Benchmark = namedtuple("Benchmark", "name kind calculators setup")
+
+BENCHMARKS = []
+
+
+def benchmark(name, kind="micro", calculators=()):
+    """注册一个基准项目，被装饰的函数接收 Options，返回每次计时调用的无参函数"""
+    def register(setup):
+        BENCHMARKS.append(Benchmark(name, kind, tuple(calculators), setup))
+        return setup
+    return register
+
+
+# ---------------------------------------------------------------- micro
+
+@benchmark("engine.calculate_old_salary", calculators=("v6",))
+def _(options):
+    params = SalaryParams()
+    return lambda: calculate_old_salary(params)
+
+
+@benchmark("engine.calculate_new_salary_mode2", calculators=("v6",))
+def _(options):
+    params = SalaryParams(purchase_amount=45)
+    return lambda: calculate_new_salary_mode2(params)
+
+
+@benchmark("engine.calculate_new_salary_mode3", calculators=("v6",))
+def _(options):
+    params = SalaryParams(purchase_amount=45)
+    return lambda: calculate_new_salary_mode3(params)
+
+
+@benchmark("engine.calculate_social_insurance", calculators=("v6",))
+def _(options):
+    params = SalaryParams()
+    return lambda: calculate_social_insurance(params)
+
+
+@benchmark("engine.store_report", calculators=("v6",))
+def _(options):
+    params = SalaryParams()
+    return lambda: store_report(params)
+
+
+@benchmark("engine.salary_matrix", calculators=("v6",))
+def _(options):
+    params = SalaryParams()
+    return lambda: salary_matrix(params)
+
+
+@benchmark("sweep.evaluate", calculators=("v5",))
+def _(options):
+    from salary_calculator.sweep import SweepParams, evaluate
+
+    params = SweepParams()
+    return lambda: evaluate(params, params.delivery_amount, params.purchase_amount)
+
+
+@benchmark("sweep.sweep_surface", calculators=("v5",))
+def _(options):
+    import numpy as np
+
+    from salary_calculator.sweep import SweepParams, sweep_surface
+
+    params = SweepParams()
+    rates, amounts = np.linspace(0, 100, 101), np.linspace(0, 200, 101)
+    return lambda: sweep_surface(params, rates, amounts)
+
+
+@benchmark("rates.lookup", calculators=("v26", "v28"))
+def _(options):
+    return lambda: DEFAULT_RATES.lookup(510, False, 58.3)
+
+
+@benchmark("rates.lookup_v13", calculators=("v13",))
+def _(options):
+    return lambda: V13_RATES.lookup(510, False, 58.3)
+
+
+@benchmark("commission.calculate_old_commission", calculators=("v28",))
+def _(options):
+    # 旧月均提成（门店总奖金 → 全国/区总/员工可分 → 人均）即门店上下文
+    params = StoreParams()
+    return lambda: store_context(params)
+
+
+@benchmark("commission.calculate_store", calculators=("v28",))
+def _(options):
+    params, staff = StoreParams(), [dict(s) for s in DEFAULT_STAFF]
+    return lambda: calculate_store(params, staff)
+
+
+def _random_staff(rng):
+    return {"old_base": rng.choice((2000.0, 2200.0, 2500.0)), "basic_perf": rng.uniform(400, 800),
+            "post_perf": rng.uniform(100, 500), "subsidy": 1100.0}
+
+
+@benchmark("commission.calculate_store_roster500", calculators=("v28",))
+def _(options):
+    rng = random.Random(options.seed)
+    roster = StaffRoster(_random_staff(rng) for _ in range(500))
+    params = StoreParams(store_staff=500, service_packs=500 * 51, new_service_packs=500 * 51)
+    return lambda: calculate_store(params, roster)
+
+
+@benchmark("threshold.calculate_threshold_suggestion", calculators=("v26", "v28"))
+def _(options):
+    return lambda: suggest_thresholds(102, 10.0, 15.0, 20.0, target=102 * 10.0)
+
+
+# ---------------------------------------------------------------- macro
+
+_month_cache = {}
+
+
+def _month(options):
+    """模拟全国月份的 (门店表, 员工表)，见 salary_calculator.synthetic"""
+    from salary_calculator.synthetic import generate
+
+    key = (options.stores, options.seed)
+    if key not in _month_cache:
+        _month_cache[key] = generate(*key)
+    return _month_cache[key]
+
+
+@benchmark("national_month.store_report", kind="macro", calculators=("v6",))
+def _(options):
+    params = SalaryParams()
+    names = list(params.to_config())
+    stores, _ = _month(options)
+    records = stores[[c for c in stores.columns if c in names]].to_dict("records")
+    stores = [params.replace(**r) for r in records]
+    return lambda: [store_report(p) for p in stores]
+
+
+@benchmark("national_month.calculate_batch", kind="macro", calculators=("v6",))
+def _(options):
+    from salary_calculator.vectorized import calculate_batch
+
+    stores, _ = _month(options)
+    return lambda: calculate_batch(stores, detail=True)
+
+
+@benchmark("national_month.calculate_matrix", kind="macro", calculators=("v6",))
+def _(options):
+    from salary_calculator.vectorized import calculate_matrix
+
+    stores, _ = _month(options)
+    return lambda: calculate_matrix(stores)
+
+
+@benchmark("national_month.v28_stores", kind="macro", calculators=("v28",))
+def _(options):
+    from salary_calculator.synthetic import v28_stores
+
+    items = list(v28_stores(*_month(options)))
+    return lambda: [calculate_store(p, roster) for p, roster in items]
+
+
+@benchmark("national_month.threshold_suggestions", kind="macro", calculators=("v26", "v28"))
+def _(options):
+    packs = _month(options)[0]["new_purchase_amount"].tolist()
+    stores = [(n, 10.0, 15.0, 20.0, n * 10.0) for n in packs]
+    return lambda: suggest_thresholds_batch(stores)
+
+
+@benchmark("national_month.roster_social", kind="macro", calculators=("v6",))
+def _(options):
+    from salary_calculator.social import calculate_roster
+
+    _, staff = _month(options)
+    return lambda: calculate_roster(staff)
+
+
+# ---------------------------------------------------------------- 运行与对比
+
+def measure(func, repeat, min_time=DEFAULT_MIN_TIME):
+    """每轮调用 number 次（每轮至少 min_time 秒），返回单次调用的最快/中位耗时"""
+    timer = timeit.Timer(func)
+    number = 1
+    elapsed = timer.timeit(number)
+    while elapsed < min_time:
+        # 按已测的耗时估算需要的次数，每次最多放大10倍
+        scale = min_time / elapsed * 1.2 if elapsed > 0 else 10
+        number = int(number * min(10, max(2, scale)))
+        elapsed = timer.timeit(number)
+    times = [t / number for t in timer.repeat(repeat, number)]
+    return {"best": min(times), "median": statistics.median(times), "number": number, "repeat": repeat}
+
+
+def run(options, names=None):
+    """运行选中的项目；names 给出时只运行这些项目（复测用）"""
+    results = {}
+    for bench in BENCHMARKS:
+        if names is not None and bench.name not in names:
+            continue
+        if options.filter and not any(fnmatch.fnmatch(bench.name, f"*{f}*") for f in options.filter):
+            continue
+        if options.kind and bench.kind != options.kind:
+            continue
+        func = bench.setup(options)
+        result = measure(func, options.repeat, options.min_time)
+        result.update(kind=bench.kind, calculators=list(bench.calculators))
+        results[bench.name] = result
+        print(f"  {bench.name:<48} {result['median'] * 1000:>12.4f} ms", file=sys.stderr)
+    return {
+        "schema": SCHEMA_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "stores": options.stores,
+        "seed": options.seed,
+        "min_time": options.min_time,
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance, noise_floor=DEFAULT_NOISE_FLOOR):
+    """
+    与基线逐项对比（单次耗时的中位数），返回 {项目: {baseline, current, ratio, status}}
+
+    status: ok / regression（慢于容差）/ improved（快于容差）/ new（基线中没有）；
+    与基线相差不到 noise_floor 秒的总是 ok
+    """
+    comparison = {}
+    base_results = baseline.get("results", {})
+    for name, result in current["results"].items():
+        base = base_results.get(name)
+        now = result["median"]
+        if base is None:
+            comparison[name] = {"baseline": None, "current": now, "ratio": None, "status": "new"}
+            continue
+        before = base["median"]
+        ratio = now / before if before else float("inf")
+        if now > before * (1 + tolerance) + noise_floor:
+            status = "regression"
+        elif now * (1 + tolerance) + noise_floor < before:
+            status = "improved"
+        else:
+            status = "ok"
+        comparison[name] = {"baseline": before, "current": now, "ratio": ratio, "status": status}
+    return comparison
+
+
+def print_comparison(comparison, file=None):
+    print(f"{'项目':<48} {'基线(ms)':>12} {'本次(ms)':>12} {'倍数':>7}  状态", file=file)
+    for name, c in comparison.items():
+        base = f"{c['baseline'] * 1000:.4f}" if c["baseline"] is not None else "-"
+        ratio = f"{c['ratio']:.2f}" if c["ratio"] is not None else "-"
+        print(f"{name:<48} {base:>12} {c['current'] * 1000:>12.4f} {ratio:>7}  {c['status']}", file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="薪资公式基准测试")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="基线JSON文件")
+    parser.add_argument("--save-baseline", action="store_true", help="把本次结果写入基线文件")
+    parser.add_argument("--json", help="把结果（含与基线的对比）写入JSON文件，- 为标准输出")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="允许的变慢比例，默认0.2")
+    parser.add_argument("--noise-floor", type=float, default=DEFAULT_NOISE_FLOOR * 1e6,
+                        help="绝对噪声下限（微秒），与基线相差不到该值时不算退步，默认0.5")
+    parser.add_argument("--filter", action="append", help="只运行名称包含该字符串的项目（可多次指定）")
+    parser.add_argument("--kind", choices=("micro", "macro"), help="只运行一类项目")
+    parser.add_argument("--stores", type=int, default=DEFAULT_STORES, help="模拟全国月份的门店数")
+    parser.add_argument("--seed", type=int, default=0, help="模拟数据的随机种子")
+    parser.add_argument("--repeat", type=int, default=5, help="每项重复计时的轮数")
+    parser.add_argument("--retries", type=int, default=2, help="退步项目的复测次数，默认2")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME, help="每轮计时的最短秒数，默认0.5")
+    parser.add_argument("--quick", action="store_true", help="快速模式（重复3轮、每轮0.2秒、2000个门店）")
+    options = parser.parse_args(argv)
+    if options.quick:
+        options.repeat = 3
+        options.min_time = min(options.min_time, 0.2)
+        options.stores = min(options.stores, 2000)
+
+    current = run(options)
+    if options.save_baseline:
+        with open(options.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+        print(f"已保存基线: {options.baseline}", file=sys.stderr)
+
+    regressions = []
+    if os.path.exists(options.baseline) and not options.save_baseline:
+        with open(options.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if (baseline.get("stores"), baseline.get("seed")) != (options.stores, options.seed):
+            print(f"警告: 基线的门店数/种子为 {baseline.get('stores')}/{baseline.get('seed')}，"
+                  f"与本次不同，macro 项目不可比", file=sys.stderr)
+        noise_floor = options.noise_floor / 1e6
+        current["comparison"] = compare(current, baseline, options.tolerance, noise_floor)
+        regressions = [name for name, c in current["comparison"].items() if c["status"] == "regression"]
+        for _ in range(options.retries):
+            if not regressions:
+                break
+            print(f"复测: {', '.join(regressions)}", file=sys.stderr)
+            for name, result in run(options, regressions)["results"].items():
+                if result["median"] < current["results"][name]["median"]:
+                    current["results"][name] = result
+            current["comparison"] = compare(current, baseline, options.tolerance, noise_floor)
+            regressions = [name for name, c in current["comparison"].items() if c["status"] == "regression"]
+        # JSON 写到标准输出时对比表改写到标准错误
+        print_comparison(current["comparison"], sys.stderr if options.json == "-" else None)
+
+    if options.json == "-":
+        json.dump(current, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    elif options.json:
+        with open(options.json, "w", encoding="utf-8") as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+
+    if regressions:
+        print(f"性能退步: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""
+薪资计算核心库
+
+与界面无关的薪资计算公式，供批量计算、命令行和各版本计算器共用。
+"""
+from .engine import (
+    MODES,
+    ROLES,
+    STAFF_COLUMNS,
+    ModeCost,
+    RoleSalary,
+    SalaryMatrix,
+    SalaryParams,
+    SocialInsurance,
+    StoreReport,
+    apply_conversion_rate_penalty_to_bonus,
+    calculate_conversion_rate,
+    calculate_mode_salary,
+    calculate_new_salary_mode1,
+    calculate_new_salary_mode2,
+    calculate_new_salary_mode3,
+    calculate_old_salary,
+    calculate_social_insurance,
+    calculate_tier_bonus,
+    comparison_steps,
+    role_subsidy,
+    salary_matrix,
+    salary_steps,
+    store_report,
+    store_report_steps,
+)
+from .schema import GROUPS, PARAMETERS, Group, Param, load_config, parse_config, save_config
+from .steps import Step, StepLog
@@ -0,0 +1,150 @@
+"""
+薪资分析图表（v5 计算器“数据可视化”页）
+
+图表直接用 matplotlib 的 Figure + Agg 画布绘制，不经过 pyplot，也不依赖 Tk，
+可以在后台线程中渲染。相同参数生成的图片按参数哈希缓存，重复生成时直接复用。
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import astuple
+from datetime import datetime
+
+import matplotlib
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from .sweep import evaluate, sweep_conversion, sweep_purchase
+
+
+# 图表曲线的取点数
+SWEEP_POINTS = 1000
+
+# 默认输出目录（用户主目录）
+DEFAULT_OUTPUT_DIR = os.path.expanduser("~")
+
+# 图表样式变化时修改版本号，使旧缓存失效
+CHART_VERSION = 1
+
+MODES = ['旧薪资体系', '新保底', '新底薪（中）', '新底薪（低）']
+COLORS = ['#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
+
+
+def params_hash(params):
+    """参数快照的稳定哈希（跨进程一致，可用作缓存键）"""
+    text = repr((CHART_VERSION, type(params).__name__, astuple(params)))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def build_figure(params, points=SWEEP_POINTS):
+    """按参数快照绘制 2×2 薪资分析图表，返回 Figure"""
+    _, old_salary, mode1_salary, mode2_salary, mode3_salary = (
+        float(v) for v in evaluate(params, params.delivery_amount, params.purchase_amount))
+
+    # 设置中文字体
+    matplotlib.rcParams['font.sans-serif'] = ['DejaVu Sans']
+    matplotlib.rcParams['axes.unicode_minus'] = False
+
+    fig = Figure(figsize=(15, 12))
+    FigureCanvasAgg(fig)
+    (ax1, ax2), (ax3, ax4) = fig.subplots(2, 2)
+
+    # 1. 薪资对比柱状图
+    salaries = [old_salary, mode1_salary, mode2_salary, mode3_salary]
+    bars = ax1.bar(MODES, salaries, color=COLORS)
+    ax1.set_title('薪资模式对比', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('薪资 (元)')
+    ax1.tick_params(axis='x', rotation=45)
+    for bar, salary in zip(bars, salaries):
+        ax1.text(bar.get_x() + bar.get_width() / 2., bar.get_height() + 50,
+                 f'{salary:.0f}', ha='center', va='bottom')
+
+    # 2. 薪资差异饼图
+    differences = [mode1_salary - old_salary, mode2_salary - old_salary, mode3_salary - old_salary]
+    positive_diffs = [max(0, diff) for diff in differences]
+    if sum(positive_diffs) > 0:
+        ax2.pie(positive_diffs, labels=MODES[1:], autopct='%1.1f%%', startangle=90)
+    else:
+        ax2.text(0.5, 0.5, '所有新模式薪资\n均未超过旧模式',
+                 ha='center', va='center', transform=ax2.transAxes)
+    ax2.set_title('薪资提升比例分布')
+
+    # 3. 转化率影响分析（交付量不变，30%~70%）
+    conversion_sweep = sweep_conversion(params, np.linspace(30, 70, points))
+    ax3.plot(conversion_sweep.x, conversion_sweep.old, '-', label='旧薪资体系')
+    ax3.plot(conversion_sweep.x, conversion_sweep.mode2, '-', label='新底薪（中）')
+    ax3.set_title('转化率对薪资的影响')
+    ax3.set_xlabel('转化率 (%)')
+    ax3.set_ylabel('薪资 (元)')
+    ax3.legend()
+    ax3.grid(True)
+
+    # 4. 购买量对薪资的影响（20~120 包）
+    purchase_sweep = sweep_purchase(params, np.linspace(20, 120, points))
+    ax4.plot(purchase_sweep.x, purchase_sweep.old, '-', label='旧薪资体系')
+    ax4.plot(purchase_sweep.x, purchase_sweep.mode2, '-', label='新底薪（中）')
+    ax4.set_title('购买量对薪资的影响')
+    ax4.set_xlabel('购买服务包数量')
+    ax4.set_ylabel('薪资 (元)')
+    ax4.legend()
+    ax4.grid(True)
+
+    fig.tight_layout()
+    return fig
+
+
+class ChartCache:
+    """按参数哈希缓存已生成的图片文件，最多保留 maxsize 项（线程安全）"""
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._paths = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """返回缓存的图片路径，文件已被删除时视为未命中"""
+        with self._lock:
+            path = self._paths.get(key)
+            if path is None:
+                return None
+            if not os.path.exists(path):
+                del self._paths[key]
+                return None
+            self._paths.move_to_end(key)
+            return path
+
+    def put(self, key, path):
+        with self._lock:
+            self._paths[key] = path
+            self._paths.move_to_end(key)
+            while len(self._paths) > self.maxsize:
+                self._paths.popitem(last=False)
+
+
+_cache = ChartCache()
+
+
+def render_charts(params, output_dir=None, cache=_cache):
+    """
+    生成图表文件，返回 (图片路径, 是否命中缓存)
+
+    同一输出目录下参数相同的图表已生成过时直接返回原文件，不再重新绘制；
+    cache=None 时总是重新绘制。可以在后台线程中调用。
+    """
+    output_dir = output_dir or DEFAULT_OUTPUT_DIR
+    key = (params_hash(params), os.path.abspath(output_dir))
+    if cache is not None:
+        path = cache.get(key)
+        if path is not None:
+            return path, True
+
+    os.makedirs(output_dir, exist_ok=True)
+    filename = f"薪资分析图表_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{key[0][:8]}.png"
+    path = os.path.join(output_dir, filename)
+    build_figure(params).savefig(path)
+
+    if cache is not None:
+        cache.put(key, path)
+    return path, False
@@ -0,0 +1,289 @@
+"""
+命令行入口（不启动界面）
+
+用法:
+    python -m salary_calculator batch --input stores.xlsx --config 薪资计算器配置.json --output result.parquet
+    python -m salary_calculator export --input stores.parquet --config 薪资计算器配置.json --output 全国月报.xlsx
+    python -m salary_calculator dataset --input stores.parquet --config 薪资计算器配置.json --output 薪资结果 --key-columns 门店编号
+    python -m salary_calculator social --input 员工名单.xlsx --limits 社保基数上下限.json --output 社保明细.csv
+    python -m salary_calculator validate 场景配置/*.json
+    python -m salary_calculator synthetic --stores 200000 --output stores.parquet --staff 员工名单.parquet
+
+在子命令前加 --trace trace.json / --profile profile.pstats 记录各计算阶段耗时（见 profiling）:
+    python -m salary_calculator --trace trace.json report --input stores.parquet --output report.csv
+"""
+import argparse
+import sys
+import time
+
+from . import profiling
+from .engine import ROLES, SalaryParams
+from .schema import load_config
+
+
+def load_params(path):
+    """读取并校验界面 save_config 保存的JSON配置"""
+    if not path:
+        return SalaryParams()
+    return load_config(path)
+
+
+def iter_store_records(path, chunksize, params, key_columns=None):
+    """
+    逐块读取门店表，返回 (门店参数覆盖值字典的生成器, 标识列 {列名: 源表 dtype})
+
+    标识列原样写入结果，用于标识门店；key_columns 不指定时为参数以外的全部列（门店编号、区域等）。
+    表中有参数以外的数值列（如旧版计算器的输入）时，应用 key_columns 只指定真正的标识列。
+    参数列的空单元格不放入字典，该门店使用配置中的值（与 batch 相同）
+    """
+    from itertools import chain
+
+    import pandas as pd
+
+    from .tables import COLUMN_ALIASES, iter_table_chunks
+
+    chunks = iter_table_chunks(path, chunksize)
+    first = next(chunks, None)
+    if first is None:
+        return iter(()), {}
+    names = set(params.to_config())
+    if key_columns is None:
+        key_columns = [c for c in first.columns if c not in names]
+    else:
+        key_columns = [COLUMN_ALIASES.get(c, c) for c in key_columns]
+        missing = [c for c in key_columns if c not in first.columns]
+        if missing:
+            raise ValueError(f"门店表中没有标识列: {', '.join(missing)}")
+    keys = {c: first[c].dtype for c in key_columns}
+    records = ({k: v for k, v in record.items() if k not in names or not pd.isna(v)}
+               for chunk in chain([first], chunks) for record in chunk.to_dict("records"))
+    return records, keys
+
+
+def run_batch(args):
+    """批量计算门店薪资"""
+    # pandas 只在真正计算时导入，查看帮助等操作不受影响
+    from .streaming import run_stream
+
+    started = time.perf_counter()
+    params = load_params(args.config)
+    rows = run_stream(args.input, args.output, params, chunksize=args.chunksize,
+                      role=args.role, detail=args.detail)
+
+    elapsed = time.perf_counter() - started
+    print(f"已计算 {rows} 行，用时 {elapsed:.2f} 秒，结果已写入: {args.output}")
+    return 0
+
+
+def run_report(args):
+    """
+    多进程计算每个门店的财务分析报告
+
+    门店要先按区域分组再分发到各进程，所以整张门店表（逐块读入后）都放在内存中。
+    指定 --cache 时已算过的门店参数从场景缓存读取，只计算缓存中没有的门店
+    """
+    from contextlib import nullcontext
+
+    import pandas as pd
+
+    from .parallel import run_store_reports
+    from .tables import read_table, write_table
+
+    if args.cache and args.roster:
+        raise ValueError("--cache 不能与 --roster 一起使用（名单汇总的社保不在场景缓存中）")
+
+    started = time.perf_counter()
+    params = load_params(args.config)
+    records, keys = iter_store_records(args.input, args.chunksize, params, args.key_columns)
+    records = list(records)
+    socials = None
+    if args.roster:
+        from .social import load_city_limits, roster_social_insurance
+
+        socials = roster_social_insurance(read_table(args.roster, normalize=False), params, load_city_limits(args.limits),
+                                          store_column="store")
+    if args.cache:
+        from .scenarios import ScenarioStore
+
+        cache = ScenarioStore(args.cache)
+    else:
+        cache = None
+    with nullcontext() if cache is None else cache:
+        rows = run_store_reports(records, params, workers=args.workers,
+                                 region_column=args.region_column, socials=socials, store_column=args.store_column,
+                                 key_columns=list(keys), cache=cache)
+    write_table(pd.DataFrame(rows), args.output)
+
+    elapsed = time.perf_counter() - started
+    hits = "" if cache is None else f"（缓存命中 {cache.hits} 个）"
+    print(f"已分析 {len(rows)} 个门店{hits}，用时 {elapsed:.2f} 秒，结果已写入: {args.output}")
+    return 0
+
+
+def run_export(args):
+    """导出Excel报表：参数 + 每个门店 / 每类员工的薪资，逐块读入、逐行写出"""
+    from .export import export_report
+
+    started = time.perf_counter()
+    params = load_params(args.config)
+    stores, keys = iter_store_records(args.input, args.chunksize, params, args.key_columns)
+    count = export_report(args.output, params, stores, list(keys))
+
+    elapsed = time.perf_counter() - started
+    print(f"已导出 {count} 个门店，用时 {elapsed:.2f} 秒，报表已写入: {args.output}")
+    return 0
+
+
+def run_dataset(args):
+    """输出按 月份/区域 分区的 Parquet / Arrow 结果数据集"""
+    from .columnar import write_results
+
+    started = time.perf_counter()
+    params = load_params(args.config)
+    stores, keys = iter_store_records(args.input, args.chunksize, params, args.key_columns)
+    count = write_results(args.output, params, stores, keys, region_column=args.region_column,
+                          format=args.format)
+
+    elapsed = time.perf_counter() - started
+    print(f"已写出 {count} 个门店，用时 {elapsed:.2f} 秒，结果数据集: {args.output}")
+    return 0
+
+
+def run_social(args):
+    """按员工名单计算社保和公积金（缴费基数按城市上下限截取）"""
+    import pandas as pd
+
+    from .social import calculate_roster, load_city_limits, roster_social_insurance
+    from .tables import read_table, write_table
+
+    started = time.perf_counter()
+    params = load_params(args.config)
+    limits = load_city_limits(args.limits)
+    roster = read_table(args.input, normalize=False)
+    if args.by_store:
+        socials = roster_social_insurance(roster, params, limits, store_column="store")
+        result = pd.DataFrame([{"门店": store, "人数": s.total_staff, "人均缴费基数": s.base,
+                                "每人社保成本": s.per_employee, "社保总成本": s.total_cost}
+                               for store, s in socials.items()])
+    else:
+        result = pd.concat([roster, calculate_roster(roster, params, limits)], axis=1)
+    write_table(result, args.output)
+
+    elapsed = time.perf_counter() - started
+    print(f"已计算 {len(roster)} 名员工，用时 {elapsed:.2f} 秒，结果已写入: {args.output}")
+    return 0
+
+
+def run_validate(args):
+    """批量校验场景配置文件"""
+    started = time.perf_counter()
+    failed = 0
+    for path in args.configs:
+        try:
+            load_config(path)
+        except (OSError, ValueError) as e:
+            failed += 1
+            print(f"{path}: {e}", file=sys.stderr)
+
+    elapsed = time.perf_counter() - started
+    print(f"已校验 {len(args.configs)} 份配置，{failed} 份有误，用时 {elapsed:.2f} 秒")
+    return 1 if failed else 0
+
+
+def run_synthetic(args):
+    """生成模拟的全国门店表和员工名单"""
+    from .synthetic import write_synthetic
+
+    started = time.perf_counter()
+    stores, employees = write_synthetic(args.output, args.staff, stores=args.stores, seed=args.seed)
+
+    elapsed = time.perf_counter() - started
+    print(f"已生成 {stores} 个门店、{employees} 名员工，用时 {elapsed:.2f} 秒，门店表: {args.output}"
+          + (f"，员工名单: {args.staff}" if args.staff else ""))
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m salary_calculator", description="薪资计算器命令行工具")
+    parser.add_argument("--trace", help="把各计算阶段的耗时写入JSON trace（Chrome trace 格式）")
+    parser.add_argument("--profile", help="用 cProfile 剖析并写入 pstats 文件")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    batch = subparsers.add_parser("batch", help="批量计算门店薪资")
+    batch.add_argument("--input", required=True, help="门店表（.csv / .xlsx / .parquet）")
+    batch.add_argument("--output", required=True, help="结果文件（.csv / .xlsx / .parquet）")
+    batch.add_argument("--config", help="界面保存的参数配置JSON，不指定时使用默认参数")
+    batch.add_argument("--role", choices=ROLES, help="员工类型，默认取配置中的 employee_type")
+    batch.add_argument("--detail", action="store_true", help="输出新底薪模式的底薪/提成/补贴分项")
+    batch.add_argument("--chunksize", type=int, default=50000, help="每次读入的行数，决定峰值内存（默认50000）")
+    batch.set_defaults(func=run_batch)
+
+    report = subparsers.add_parser("report", help="多进程计算门店财务分析报告（整张门店表读入内存后按区域分组）")
+    report.add_argument("--input", required=True, help="门店表（.csv / .xlsx / .parquet），需能整表放入内存")
+    report.add_argument("--output", required=True, help="结果文件（.csv / .xlsx / .parquet）")
+    report.add_argument("--config", help="界面保存的参数配置JSON，不指定时使用默认参数")
+    report.add_argument("--workers", type=int, help="进程数，默认使用全部CPU")
+    report.add_argument("--region-column", default="region", help="区域列名，同区域门店在同一进程中计算")
+    report.add_argument("--roster", help="员工名单，按名单汇总每个门店的社保成本")
+    report.add_argument("--limits", help="城市缴费基数上下限JSON（与 --roster 一起使用）")
+    report.add_argument("--store-column", default="门店编号", help="门店表中与名单“门店”列对应的列（默认门店编号）")
+    report.add_argument("--chunksize", type=int, default=50000, help="每次读入的行数（默认50000）")
+    report.add_argument("--cache", help="场景结果缓存文件（SQLite），已算过的门店参数直接读取；不能与 --roster 一起使用")
+    report.add_argument("--key-columns", nargs="+", metavar="列名",
+                        help="原样写入结果的门店标识列（如 门店编号），默认为参数以外的全部列")
+    report.set_defaults(func=run_report)
+
+    export = subparsers.add_parser("export", help="导出Excel报表（参数 + 门店薪资 + 员工薪资）")
+    export.add_argument("--input", required=True, help="门店表（.csv / .xlsx / .parquet）")
+    export.add_argument("--output", required=True, help="报表文件（.xlsx）")
+    export.add_argument("--config", help="界面保存的参数配置JSON，不指定时使用默认参数")
+    export.add_argument("--chunksize", type=int, default=50000, help="每次读入的行数（默认50000）")
+    export.add_argument("--key-columns", nargs="+", metavar="列名",
+                        help="原样写入结果的门店标识列（如 门店编号），默认为参数以外的全部列")
+    export.set_defaults(func=run_export)
+
+    dataset = subparsers.add_parser("dataset", help="输出按月份/区域分区的 Parquet / Arrow 结果数据集")
+    dataset.add_argument("--input", required=True, help="门店表（.csv / .xlsx / .parquet）")
+    dataset.add_argument("--output", required=True, help="输出目录")
+    dataset.add_argument("--config", help="界面保存的参数配置JSON，不指定时使用默认参数")
+    dataset.add_argument("--format", choices=("parquet", "arrow"), default="parquet", help="文件格式（默认parquet）")
+    dataset.add_argument("--region-column", default="region", help="区域列名（默认region）")
+    dataset.add_argument("--chunksize", type=int, default=50000, help="每次读入的行数（默认50000）")
+    dataset.add_argument("--key-columns", nargs="+", metavar="列名",
+                         help="原样写入结果的门店标识列（如 门店编号），默认为参数以外的全部列")
+    dataset.set_defaults(func=run_dataset)
+
+    social = subparsers.add_parser("social", help="按员工名单计算社保和公积金")
+    social.add_argument("--input", required=True, help="员工名单（列: 社保基数、城市、员工类型、门店）")
+    social.add_argument("--output", required=True, help="结果文件（.csv / .xlsx / .parquet）")
+    social.add_argument("--config", help="界面保存的参数配置JSON（缴费比例），不指定时使用默认参数")
+    social.add_argument("--limits", help="城市缴费基数上下限JSON，默认使用当前目录下的 社保基数上下限.json")
+    social.add_argument("--by-store", action="store_true", help="按门店汇总，不输出每个员工的明细")
+    social.set_defaults(func=run_social)
+
+    validate = subparsers.add_parser("validate", help="批量校验参数配置JSON")
+    validate.add_argument("configs", nargs="+", help="配置文件")
+    validate.set_defaults(func=run_validate)
+
+    synthetic = subparsers.add_parser("synthetic", help="生成模拟的全国门店表和员工名单（压力测试用）")
+    synthetic.add_argument("--stores", type=int, default=10000, help="门店数（默认10000）")
+    synthetic.add_argument("--seed", type=int, default=0, help="随机种子，相同种子生成相同数据（默认0）")
+    synthetic.add_argument("--output", required=True, help="门店表（.csv / .xlsx / .parquet）")
+    synthetic.add_argument("--staff", help="员工名单（.csv / .xlsx / .parquet），不指定时不生成")
+    synthetic.set_defaults(func=run_synthetic)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.trace or args.profile:
+        profiling.enable(trace=args.trace, profile=args.profile)
+    try:
+        with profiling.span(args.command):
+            return args.func(args)
+    except Exception as e:
+        print(f"计算错误: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if args.trace or args.profile:
+            profiling.disable()
@@ -0,0 +1,208 @@
+"""
+列式结果输出（Parquet / Arrow IPC）
+
+把每个门店的 store_report 结果写成两个按 月份、区域 分区的数据集:
+
+    <输出目录>/stores/month=2024-05/region=华东/part-0.parquet   每个门店一行
+    <输出目录>/staff/month=2024-05/region=华东/part-0.parquet    每个门店 × 模式 × 员工类型一行
+
+列都有固定类型（金额 float64、人数 int32、模式/员工类型为字典编码字符串），
+BI 按分区和列读取，只需扫描用到的部分，不必再解析整份 Excel。
+分区目录为 hive 风格，pyarrow.dataset / DuckDB / Spark 可以直接识别。
+数据集先写在输出目录旁的临时目录中，全部写完才改名为输出目录，出错时不留下写了一半的数据集。
+"""
+import math
+import os
+import shutil
+from urllib.parse import quote
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .engine import STAFF_COLUMNS, SalaryParams, store_report
+
+
+FORMATS = ("parquet", "arrow")
+PARTITION_COLUMNS = ("month", "region")
+STORE_DATASET = "stores"
+STAFF_DATASET = "staff"
+
+# 区域为空时的分区目录名（hive 约定，读取时还原为 null）
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+# 缓冲的行数达到该值时写出一批，决定峰值内存
+DEFAULT_BATCH_SIZE = 50000
+
+_LABEL = pa.dictionary(pa.int8(), pa.string())
+_STAFF_TYPES = (_LABEL, _LABEL, pa.int32()) + (pa.float64(),) * 5
+
+
+def _key_type(dtype):
+    """标识列的类型：沿用源表的数值 / 布尔 / 时间类型，其余（文本、全空等）为字符串"""
+    if dtype is None:
+        return pa.string()
+    try:
+        arrow_type = pa.from_numpy_dtype(getattr(dtype, "numpy_dtype", dtype))
+    except (TypeError, NotImplementedError):
+        return pa.string()
+    return pa.string() if pa.types.is_null(arrow_type) else arrow_type
+
+
+def key_fields(key_columns=()):
+    """
+    标识列的字段
+
+    key_columns 为列名序列时都是字符串列；为 {列名: 源表 dtype} 时按源表类型写出，
+    如 Parquet 中的数值门店编号仍为整数
+    """
+    dtypes = key_columns if isinstance(key_columns, dict) else {}
+    return [pa.field(c, _key_type(dtypes.get(c))) for c in key_columns]
+
+
+def store_schema(key_columns=()):
+    """门店数据集的列：标识列（见 key_fields）+ StoreReport.to_row() 的全部数值"""
+    names = list(store_report(SalaryParams()).to_row())
+    return pa.schema(key_fields(key_columns) + [pa.field(name, pa.float64()) for name in names])
+
+
+def staff_schema(key_columns=()):
+    """员工数据集的列：标识列（见 key_fields）+ STAFF_COLUMNS"""
+    return pa.schema(key_fields(key_columns) +
+                     [pa.field(name, t) for name, t in zip(STAFF_COLUMNS, _STAFF_TYPES)])
+
+
+def _is_null(value):
+    """空值：None、空字符串，或读表时 pandas 填入的 NaN"""
+    return value is None or value == "" or (isinstance(value, float) and math.isnan(value))
+
+
+def partition_path(month, region):
+    """hive 风格的分区目录，如 month=2024-05/region=华东"""
+    parts = []
+    for name, value in zip(PARTITION_COLUMNS, (month, region)):
+        value = NULL_PARTITION if _is_null(value) else quote(str(value), safe="")
+        parts.append(f"{name}={value}")
+    return os.path.join(*parts)
+
+
+class PartitionedWriter:
+    """按分区缓冲列数据，攒够一批后写到各分区各自的文件中"""
+
+    def __init__(self, root, schema, format="parquet"):
+        if format not in FORMATS:
+            raise ValueError(f"不支持的格式: {format}")
+        self.root = root
+        self.schema = schema
+        self.format = format
+        self.rows = 0
+        self.buffered = 0
+        self._buffers = {}
+        self._writers = {}
+
+    def append(self, partition, values):
+        """追加一行（values 按 schema 的列顺序）"""
+        buffer = self._buffers.get(partition)
+        if buffer is None:
+            buffer = self._buffers[partition] = [[] for _ in self.schema]
+        for column, value in zip(buffer, values):
+            column.append(value)
+        self.rows += 1
+        self.buffered += 1
+
+    def flush(self):
+        """把缓冲的行写出"""
+        for partition, columns in self._buffers.items():
+            batch = pa.record_batch([pa.array(c, type=f.type) for c, f in zip(columns, self.schema)],
+                                    schema=self.schema)
+            self._writer(partition).write_batch(batch)
+        self._buffers.clear()
+        self.buffered = 0
+
+    def _writer(self, partition):
+        writer = self._writers.get(partition)
+        if writer is None:
+            directory = os.path.join(self.root, partition_path(*partition))
+            os.makedirs(directory, exist_ok=True)
+            if self.format == "parquet":
+                writer = pq.ParquetWriter(os.path.join(directory, "part-0.parquet"), self.schema)
+            else:
+                writer = pa.ipc.new_file(os.path.join(directory, "part-0.arrow"), self.schema)
+            self._writers[partition] = writer
+        return writer
+
+    def close(self):
+        self.flush()
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+    def discard(self):
+        """出错时关闭已打开的文件，不写出缓冲的行（文件由调用方删除）"""
+        self._buffers.clear()
+        self.buffered = 0
+        for writer in self._writers.values():
+            try:
+                writer.close()
+            except Exception:
+                pass
+        self._writers.clear()
+
+
+def write_results(output_dir, params=None, stores=None, key_columns=(), region_column="region",
+                  format="parquet", batch_size=DEFAULT_BATCH_SIZE):
+    """
+    计算门店薪资并写出分区数据集，返回写出的门店数
+
+    stores: 门店参数覆盖值字典的可迭代对象（可以是生成器），键为 SalaryParams 字段名、
+            区域列或 key_columns 中的标识列；不传时只写出 params 本身这一个门店
+    key_columns: 标识列名，或 {列名: 源表 dtype}（按源表类型写出，见 key_fields）
+    月份取每个门店的 current_month，区域取 region_column 列。
+    输出目录已存在且不为空时报错，不会与上一次的结果混在一起
+    """
+    if os.path.isdir(output_dir) and os.listdir(output_dir):
+        raise ValueError(f"输出目录不为空: {output_dir}")
+    params = params or SalaryParams()
+    names = set(params.to_config())
+    if isinstance(key_columns, dict):
+        key_columns = {c: t for c, t in key_columns.items() if c != region_column}
+    else:
+        key_columns = [c for c in key_columns if c != region_column]
+    fields = key_fields(key_columns)
+    text = [pa.types.is_string(f.type) for f in fields]
+    parent, name = os.path.split(os.path.abspath(output_dir))
+    temp = os.path.join(parent, f".{name}.{os.getpid()}.tmp")
+    os.makedirs(temp)
+    store_writer = PartitionedWriter(os.path.join(temp, STORE_DATASET), store_schema(key_columns), format)
+    staff_writer = PartitionedWriter(os.path.join(temp, STAFF_DATASET), staff_schema(key_columns), format)
+
+    count = 0
+    try:
+        for record in ({},) if stores is None else stores:
+            overrides = {k: v for k, v in record.items() if k in names}
+            store = params.replace(**overrides) if overrides else params
+            report = store_report(store)
+
+            values = [record.get(f.name) for f in fields]
+            key = [None if _is_null(v) else str(v) if is_text else v for v, is_text in zip(values, text)]
+            region = record.get(region_column)
+            partition = (store.current_month, None if _is_null(region) else region)
+            store_writer.append(partition, key + list(report.to_row().values()))
+            for staff_row in report.staff_rows():
+                staff_writer.append(partition, key + list(staff_row))
+
+            count += 1
+            # 每个门店有多行员工数据，按员工数据集的缓冲行数决定何时写出
+            if staff_writer.buffered >= batch_size:
+                store_writer.flush()
+                staff_writer.flush()
+        store_writer.close()
+        staff_writer.close()
+        if os.path.isdir(output_dir):
+            os.rmdir(output_dir)
+        os.rename(temp, output_dir)
+    except BaseException:
+        store_writer.discard()
+        staff_writer.discard()
+        shutil.rmtree(temp, ignore_errors=True)
+        raise
+    return count
@@ -0,0 +1,324 @@
+"""
+门店提成薪资引擎（v28 计算器）
+
+salary_calculator_v28.py 的 calculate() 在每个员工的循环里重新计算门店总奖金、全国/区总
+提成、员工可分部分、人均提成，新底薪模式里还要重复判断转化率折扣、阈值分档和包数折扣，
+单店计算量是 O(员工数 × 公式)。这些量只与门店参数有关，这里先一次算出门店上下文
+StoreContext，每个员工只再计算与本人有关的部分（基本薪资、档1单价），
+单店计算量降为 O(公式 + 员工数)，结果与原界面逐项相同。
+"""
+from collections import namedtuple
+from dataclasses import dataclass, asdict, fields, replace
+
+from .profiling import span
+from .rates import DEFAULT_RATES
+from .steps import StepLog
+
+
+@dataclass(frozen=True)
+class StoreParams:
+    """v28 计算器一次计算的门店参数，字段名与界面 self.data 的键一致"""
+    delivery_volume: int = 175
+    service_packs: int = 102
+    store_staff: int = 2
+    pack_price: int = 510
+    has_station_license: bool = False
+
+    # 新薪资体系
+    avg_monthly_packs: int = 58
+    threshold_discount: float = 0.7
+    old_avg_commission: float = 1962.0
+    new_base_mid: float = 3100.0
+    new_base_low: float = 2000.0
+    new_service_packs: int = 102
+    low_conversion_rate: float = 0.5
+    high_conversion_rate: float = 0.7
+    y_discount: float = 0.9
+    z_discount: float = 1.1
+    threshold_percentage: float = 0.9
+
+    # 三档阈值
+    use_threshold: bool = False
+    threshold1: int = 90
+    threshold2: int = 100
+    commission_tier2: float = 15.0
+    commission_tier3: float = 20.0
+
+    # 旧提成分配
+    nation_commission_rate: float = 0.1
+    region_commission_rate: float = 0.4
+    has_region: bool = True
+
+    @classmethod
+    def from_config(cls, config):
+        """从字典创建参数，缺失的键使用默认值，多余的键忽略"""
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in config.items() if k in names})
+
+    def to_config(self):
+        return asdict(self)
+
+    def replace(self, **changes):
+        return replace(self, **changes)
+
+
+@dataclass(frozen=True)
+class StoreContext:
+    """只与门店参数有关的中间结果，每个门店只计算一次"""
+    params: StoreParams
+    conversion_rate: float
+    per_capita_packs: float
+    commission_rate: float
+
+    # 旧薪资体系：门店总奖金及其分配
+    total_commission: float
+    nation_amount: float
+    region_amount: float
+    staff_amount: float
+    per_capita_commission: float
+
+    # 新薪资体系
+    per_capita_new_packs: float
+    conversion_factor: float
+    conversion_note: str
+    pack_threshold: float
+    below_threshold: bool
+    discount_note: str
+    # 阈值模式下的分档：(档1包数, 档2提成[, 档3提成])，档1单价因人而异
+    threshold_split: tuple = None
+
+
+# 员工旧薪资：基本薪资、人均提成、汇总薪资
+OldStaffSalary = namedtuple("OldStaffSalary", "basic_salary per_capita_commission total_salary")
+
+# 员工新底薪模式薪资
+# unit_commission: 档1单价（提成基数）
+# total_commission / commission_per_person: 阈值模式下的总提成和人均提成（否则为 None）
+# base_commission: 非阈值模式下的基础提成（否则为 None）
+NewStaffSalary = namedtuple("NewStaffSalary", [
+    "unit_commission", "total_commission", "commission_per_person", "base_commission",
+    "commission_after_conversion", "salary_base", "final_salary", "discount_note",
+])
+
+StoreResult = namedtuple("StoreResult", "context old mid low")
+
+
+def basic_salary(staff):
+    """旧底薪 + 基本绩效 + 岗位绩效 + 补贴"""
+    return staff["old_base"] + staff["basic_perf"] + staff["post_perf"] + staff["subsidy"]
+
+
+def store_context(params, rates=DEFAULT_RATES):
+    """计算门店上下文（与员工无关的部分）"""
+    p = params
+    conversion_rate = (p.service_packs / p.delivery_volume) * 100 if p.delivery_volume > 0 else 0
+    per_capita_packs = p.service_packs / p.store_staff if p.store_staff > 0 else 0
+    commission_rate = rates.lookup(p.pack_price, p.has_station_license, conversion_rate)
+
+    total_commission = p.service_packs * commission_rate
+    nation_amount = total_commission * p.nation_commission_rate
+    if p.has_region:
+        region_amount = (total_commission - nation_amount) * p.region_commission_rate
+        staff_amount = (total_commission - nation_amount) * (1 - p.region_commission_rate)
+    else:
+        region_amount = 0
+        staff_amount = total_commission - nation_amount
+    per_capita_commission = staff_amount / p.store_staff if p.store_staff > 0 else 0
+
+    if p.use_threshold:
+        conversion_factor, conversion_note = 1, " (应用阈值计算)"
+    elif conversion_rate < p.low_conversion_rate * 100:
+        conversion_factor, conversion_note = p.y_discount, f" (应用y折扣: {p.y_discount})"
+    elif conversion_rate > p.high_conversion_rate * 100:
+        conversion_factor, conversion_note = p.z_discount, f" (应用z折扣: {p.z_discount})"
+    else:
+        conversion_factor, conversion_note = 1, ""
+
+    pack_threshold = p.avg_monthly_packs * p.store_staff * p.threshold_percentage
+    below_threshold = p.new_service_packs < pack_threshold
+    discount_note = conversion_note
+    if below_threshold:
+        discount_note += f" (包数不足, 应用折扣: {p.threshold_discount})"
+
+    threshold_split = None
+    if p.use_threshold:
+        n = p.new_service_packs
+        if n <= p.threshold1:
+            threshold_split = (n,)
+        elif n <= p.threshold2:
+            threshold_split = (p.threshold1, (n - p.threshold1) * p.commission_tier2)
+        else:
+            threshold_split = (p.threshold1, (p.threshold2 - p.threshold1) * p.commission_tier2,
+                               (n - p.threshold2) * p.commission_tier3)
+
+    return StoreContext(
+        params=p,
+        conversion_rate=conversion_rate,
+        per_capita_packs=per_capita_packs,
+        commission_rate=commission_rate,
+        total_commission=total_commission,
+        nation_amount=nation_amount,
+        region_amount=region_amount,
+        staff_amount=staff_amount,
+        per_capita_commission=per_capita_commission,
+        per_capita_new_packs=p.new_service_packs / p.store_staff if p.store_staff > 0 else 0,
+        conversion_factor=conversion_factor,
+        conversion_note=conversion_note,
+        pack_threshold=pack_threshold,
+        below_threshold=below_threshold,
+        discount_note=discount_note,
+        threshold_split=threshold_split,
+    )
+
+
+def old_staff_salary(context, staff):
+    """旧薪资体系：基本薪资 + 门店人均提成"""
+    return _old_salary(context, basic_salary(staff))
+
+
+def _old_salary(context, basic):
+    return OldStaffSalary(basic, context.per_capita_commission, basic + context.per_capita_commission)
+
+
+def new_staff_salary(context, staff, new_base):
+    """新底薪模式（中/低由 new_base 决定）：档1单价由员工本人的旧薪资反推"""
+    return _new_salary(context, basic_salary(staff), new_base)
+
+
+def _new_salary(context, basic, new_base):
+    p = context.params
+    if p.avg_monthly_packs == 0:
+        raise ZeroDivisionError("过去X月平均每人购买服务包数量不能为零")
+    unit_commission = (basic + p.old_avg_commission - new_base) / p.avg_monthly_packs
+
+    total_commission = commission_per_person = base_commission = None
+    if p.use_threshold:
+        # 与原公式相同的加法顺序：档1 + 档2 + 档3
+        tier1_packs = context.threshold_split[0]
+        total_commission = sum(context.threshold_split[1:], tier1_packs * unit_commission)
+        commission_per_person = total_commission / p.store_staff if p.store_staff > 0 else 0
+        commission_after_conversion = commission_per_person
+    else:
+        base_commission = context.per_capita_new_packs * unit_commission
+        commission_after_conversion = base_commission * context.conversion_factor
+    salary_base = new_base + commission_after_conversion
+    final_salary = salary_base * p.threshold_discount if context.below_threshold else salary_base
+
+    return NewStaffSalary(unit_commission, total_commission, commission_per_person, base_commission,
+                          commission_after_conversion, salary_base, final_salary, context.discount_note)
+
+
+def calculate_store(params, staff_list, rates=DEFAULT_RATES):
+    """
+    计算一个门店所有员工的旧薪资和新底薪（中/低）薪资
+
+    staff_list: 员工字典列表或 StaffRoster；一次遍历，每名员工的基本薪资只算一次，
+                同时得到旧薪资和两种新底薪模式的档1单价
+    """
+    # 门店上下文包括旧提成单价查表和阈值档位拆分
+    with span("提成单价与档位拆分"):
+        context = store_context(params, rates)
+    with span("员工循环"):
+        if hasattr(staff_list, "basic_salaries"):
+            basics = staff_list.basic_salaries()
+        else:
+            basics = [basic_salary(staff) for staff in staff_list]
+        old, mid, low = [], [], []
+        for basic in basics:
+            old.append(_old_salary(context, basic))
+            mid.append(_new_salary(context, basic, params.new_base_mid))
+            low.append(_new_salary(context, basic, params.new_base_low))
+    return StoreResult(context, old, mid, low)
+
+
+def store_steps(store, staff_list, rates=DEFAULT_RATES):
+    """
+    v28 界面“薪资计算详细过程”的步骤记录
+
+    只记录模板和数值，界面显示时再调用 render()；批量计算只用 calculate_store 的数值，
+    不需要调用本函数。
+    """
+    ctx = store.context
+    p = ctx.params
+    log = StepLog()
+    log.text("=== 薪资计算详细过程 ===\n\n")
+
+    log.text("=== 1. 基础指标计算 ===\n")
+    log.add("转化率 = 购买服务包数量 / 交付量 × 100% = {service_packs} / {delivery_volume} × 100% = {result:.2f}%\n",
+            name="转化率", result=ctx.conversion_rate,
+            service_packs=p.service_packs, delivery_volume=p.delivery_volume)
+    log.add("人均购买服务包数 = 购买服务包数 / 门店人数 = {service_packs} / {store_staff} = {result:.2f}\n\n",
+            name="人均购买服务包数", result=ctx.per_capita_packs,
+            service_packs=p.service_packs, store_staff=p.store_staff)
+
+    log.text("=== 2. 旧提成单价计算 ===\n")
+    log.add("条件: {condition}\n", condition=rates.describe(p.pack_price, p.has_station_license))
+    log.add("旧提成单价 = {result}元/包\n\n", name="旧提成单价", result=ctx.commission_rate)
+
+    log.text("=== 3. 旧薪资体系计算 ===\n")
+    store_log = StepLog()
+    total, nation = ctx.total_commission, ctx.nation_amount
+    store_log.add("  门店总奖金 = 购买服务包数 × 单包提成金额 = {service_packs} × {rate} = {result:.2f}元\n",
+                  name="门店总奖金", result=total, service_packs=p.service_packs, rate=ctx.commission_rate)
+    store_log.add("  全国总提成 = 门店总奖金 × 全国总提成比例 = {total:.2f} × {ratio:.2f} = {result:.2f}元\n",
+                  name="全国总提成", result=nation, total=total, ratio=p.nation_commission_rate)
+    if p.has_region:
+        store_log.add("  区总提成 = (门店总奖金 - 全国总提成) × 区总提成比例 = ({total:.2f} - {nation:.2f}) × "
+                      "{ratio:.2f} = {result:.2f}元\n",
+                      name="区总提成", result=ctx.region_amount, total=total, nation=nation,
+                      ratio=p.region_commission_rate)
+        store_log.add("  员工可分部分 = (门店总奖金 - 全国总提成) × (1-区总提成比例) = ({total:.2f} - {nation:.2f}) × "
+                      "{ratio:.2f} = {result:.2f}元\n",
+                      name="员工可分部分", result=ctx.staff_amount, total=total, nation=nation,
+                      ratio=1 - p.region_commission_rate)
+    else:
+        store_log.add("  员工可分部分 = 门店总奖金 - 全国总提成 = {total:.2f} - {nation:.2f} = {result:.2f}元\n",
+                      name="员工可分部分", result=ctx.staff_amount, total=total, nation=nation)
+    store_log.add("  人均提成 = 员工可分部分 / 门店人数 = {staff_amount:.2f} / {store_staff} = {result:.2f}元\n",
+                  name="人均提成", result=ctx.per_capita_commission,
+                  staff_amount=ctx.staff_amount, store_staff=p.store_staff)
+
+    for i, (staff, old) in enumerate(zip(staff_list, store.old)):
+        log.add("员工{index}:\n", index=i + 1)
+        log.add("  基本薪资 = 旧底薪 + 基本绩效 + 岗位绩效 + 补贴 = {old_base} + {basic_perf} + {post_perf} + "
+                "{subsidy} = {result:.2f}元\n", name=f"员工{i + 1}基本薪资", result=old.basic_salary, **staff)
+        log.extend(store_log)
+        log.add("  汇总薪资 = 基本薪资 + 人均提成 = {basic:.2f} + {commission:.2f} = {result:.2f}元\n\n",
+                name=f"员工{i + 1}旧薪资", result=old.total_salary,
+                basic=old.basic_salary, commission=old.per_capita_commission)
+
+    log.text("=== 4. 新薪资体系计算 ===\n")
+    log.text("模式一(新保底):\n")
+    for i in range(len(staff_list)):
+        log.add("  员工{index}薪资 = {result}元\n", name=f"员工{i + 1}新保底", result=3850, index=i + 1)
+
+    log.text("\n模式二(新底薪中):\n")
+    _new_mode_steps(log, ctx, staff_list, store.mid, p.new_base_mid, "新底薪中")
+    log.text("\n模式三(新底薪低):\n")
+    _new_mode_steps(log, ctx, staff_list, store.low, p.new_base_low, "新底薪低")
+    return log
+
+
+def _new_mode_steps(log, ctx, staff_list, salaries, new_base, label):
+    p = ctx.params
+    for i, (staff, s) in enumerate(zip(staff_list, salaries)):
+        log.add("  员工{index}:\n", index=i + 1)
+        log.add("    提成基数 = (旧底薪+基本绩效+岗位绩效+补贴+旧月均提成-新底薪) / 过去月均每人包数 = "
+                "({old_base}+{basic_perf}+{post_perf}+{subsidy}+{old_avg_commission}-{new_base}) / "
+                "{avg_monthly_packs} = {result:.2f}\n",
+                name=f"员工{i + 1}{label}提成基数", result=s.unit_commission, old_avg_commission=p.old_avg_commission,
+                new_base=new_base, avg_monthly_packs=p.avg_monthly_packs, **staff)
+        if p.use_threshold:
+            log.add("    总提成 = {result:.2f}元{note}\n",
+                    name=f"员工{i + 1}{label}总提成", result=s.total_commission, note=s.discount_note)
+            log.add("    人均提成 = 总提成 / 门店人数 = {total:.2f} / {store_staff} = {result:.2f}元\n",
+                    name=f"员工{i + 1}{label}人均提成", result=s.commission_per_person,
+                    total=s.total_commission, store_staff=p.store_staff)
+        else:
+            log.add("    基础提成 = 人均新包数 × 提成基数 = {packs:.2f} × {unit:.2f} = {result:.2f}{note}\n",
+                    name=f"员工{i + 1}{label}基础提成", result=s.base_commission,
+                    packs=ctx.per_capita_new_packs, unit=s.unit_commission, note=s.discount_note)
+        log.add("    基础薪资 = {label} + 提成 = {new_base} + {commission:.2f} = {result:.2f}\n",
+                name=f"员工{i + 1}{label}基础薪资", result=s.salary_base,
+                label=label, new_base=new_base, commission=s.commission_after_conversion)
+        log.add("    最终薪资 = {result:.2f}元\n", name=f"员工{i + 1}{label}最终薪资", result=s.final_salary)
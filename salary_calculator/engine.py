@@ -0,0 +1,635 @@
+"""
+薪资计算引擎（不依赖Tk）
+
+把 salary_calculator_v6_final_release.py 中 SalaryCalculator 的计算公式
+（calculate_old_salary、calculate_new_salary_mode1/2/3、
+apply_conversion_rate_penalty_to_bonus、calculate_social_insurance）
+改写为纯函数，参数通过不可变的 SalaryParams 传入，
+可以在没有显示器的服务器上批量计算，结果与界面完全一致。
+"""
+from dataclasses import dataclass, asdict, fields, replace
+from datetime import datetime
+
+from .profiling import span
+from .steps import StepLog
+
+
+# 员工类型（与界面下拉框顺序一致）
+ROLES = ("员工", "主管", "顾问", "区总", "市总")
+
+# 薪资模式（与对比报告顺序一致）
+MODES = ("旧薪资体系", "新保底", "新底薪（中）", "新底薪（低）")
+
+# StoreReport.staff_rows() 每行的列名
+STAFF_COLUMNS = ("薪资模式", "员工类型", "人数", "底薪", "提成", "补贴", "人均薪资", "薪资合计")
+
+
+def _current_month():
+    return datetime.now().strftime("%Y-%m")
+
+
+@dataclass(frozen=True)
+class SalaryParams:
+    """一次计算所需的全部参数，字段名与 save_config 保存的JSON键一致"""
+    # 基础参数
+    delivery_amount: float = 100.0
+    purchase_amount: float = 50.0
+    service_price: float = 1000.0
+    service_cost: float = 300.0
+
+    # 员工类型和数量
+    employee_count: int = 2
+    supervisor_count: int = 1
+    consultant_count: int = 0
+    regional_manager_count: int = 0
+    city_manager_count: int = 0
+
+    # 职位补贴
+    supervisor_bonus: float = 500.0
+    consultant_bonus: float = 800.0
+    regional_manager_bonus: float = 1200.0
+    city_manager_bonus: float = 1500.0
+
+    # 员工类型选择（用于计算单个员工薪资）
+    employee_type: str = "员工"
+
+    # 旧薪资体系参数
+    old_base_salary: float = 3000.0
+    old_basic_bonus: float = 500.0
+    old_position_bonus: float = 300.0
+    old_extra_bonus: float = 200.0
+
+    # 新薪资体系参数
+    new_base_salary_mid: float = 3500.0
+    new_base_salary_low: float = 2800.0
+    old_purchase_baseline: float = 40.0
+
+    # 三档提成配置
+    bonus_tier1_threshold: float = 0.9
+    bonus_tier1_amount: float = 7.5
+    bonus_tier2_threshold: float = 1.0
+    bonus_tier2_amount: float = 50.0
+    bonus_tier3_amount: float = 60.0
+
+    min_conversion_rate: float = 45.0
+    penalty_rate: float = 0.8
+    salary_mode: str = "新保底"
+    new_purchase_amount: float = 0.0
+
+    # 社保参数
+    social_insurance_base: float = 10000.0
+    pension_rate: float = 8.0
+    medical_rate: float = 2.0
+    unemployment_rate: float = 0.2
+    injury_rate: float = 0.0
+    maternity_rate: float = 0.0
+    housing_fund_rate: float = 12.0
+
+    # 展示模块参数
+    current_month: str = ""
+    avg_total_salary: float = 5000.0
+    avg_delivery: float = 80.0
+    avg_purchase: float = 40.0
+    avg_conversion_rate: float = 50.0
+    city_cost: float = 10000.0
+
+    def __post_init__(self):
+        if not self.current_month:
+            object.__setattr__(self, "current_month", _current_month())
+
+    @classmethod
+    def from_config(cls, config):
+        """从 save_config 保存的字典创建参数，缺失的键使用默认值，多余的键忽略"""
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in config.items() if k in names})
+
+    def to_config(self):
+        """转换为与 save_config 相同结构的字典"""
+        return asdict(self)
+
+    def replace(self, **changes):
+        """返回修改了部分参数的新对象"""
+        return replace(self, **changes)
+
+    @property
+    def total_staff(self):
+        """门店总人数"""
+        return (self.employee_count + self.supervisor_count + self.consultant_count +
+                self.regional_manager_count + self.city_manager_count)
+
+    def role_counts(self):
+        """按 ROLES 顺序返回 (员工类型, 人数) 列表"""
+        return [
+            ("员工", self.employee_count),
+            ("主管", self.supervisor_count),
+            ("顾问", self.consultant_count),
+            ("区总", self.regional_manager_count),
+            ("市总", self.city_manager_count),
+        ]
+
+
+def conversion_rate(delivery_amount, purchase_amount):
+    """转化率(%) = 购买服务包数量 ➗ 交付量 × 100"""
+    if delivery_amount == 0:
+        return 0
+    return (purchase_amount / delivery_amount) * 100
+
+
+def calculate_conversion_rate(params):
+    """计算转化率"""
+    return conversion_rate(params.delivery_amount, params.purchase_amount)
+
+
+def role_subsidy(params, role=None):
+    """职位补贴，员工没有补贴"""
+    role = params.employee_type if role is None else role
+    if role == "主管":
+        return params.supervisor_bonus
+    elif role == "顾问":
+        return params.consultant_bonus
+    elif role == "区总":
+        return params.regional_manager_bonus
+    elif role == "市总":
+        return params.city_manager_bonus
+    return 0
+
+
+def old_salary_amount(delivery, rate, total_staff, base_salary, basic_bonus, position_bonus, extra_bonus):
+    """旧薪资体系的薪资（不含职位补贴），rate 为转化率(%)"""
+    # 计算基础薪资部分
+    base_calculation = (delivery * rate / 100 - delivery / 2) * 10 / total_staff
+
+    if rate >= 50:
+        # 转化率高于50%
+        return base_salary + base_calculation + basic_bonus + position_bonus + extra_bonus
+    # 转化率低于50%
+    return base_salary + base_calculation + (basic_bonus + position_bonus) / 2 + extra_bonus
+
+
+def calculate_old_salary(params, role=None):
+    """计算旧薪资体系的薪资"""
+    salary = old_salary_amount(params.delivery_amount, calculate_conversion_rate(params), params.total_staff,
+                               params.old_base_salary, params.old_basic_bonus,
+                               params.old_position_bonus, params.old_extra_bonus)
+
+    # 根据职位添加补贴
+    return salary + role_subsidy(params, role)
+
+
+def tier1_amount(old_base, new_base, old_purchase_baseline):
+    """档1每包提成 = (旧底薪 - 新底薪) ➗ 旧购买服务包数"""
+    return (old_base - new_base) / old_purchase_baseline if old_purchase_baseline else 0
+
+
+def calculate_tier_bonus(purchase_amount, tier1_threshold, tier2_threshold,
+                         tier1_amount, tier2_amount, tier3_amount):
+    """三档提成（阈值为服务包数量）"""
+    if purchase_amount <= tier1_threshold:
+        return purchase_amount * tier1_amount
+    elif purchase_amount <= tier2_threshold:
+        return (tier1_threshold * tier1_amount) + ((purchase_amount - tier1_threshold) * tier2_amount)
+    return ((tier1_threshold * tier1_amount) + ((tier2_threshold - tier1_threshold) * tier2_amount) +
+            ((purchase_amount - tier2_threshold) * tier3_amount))
+
+
+def apply_conversion_rate_penalty_to_bonus(params, bonus):
+    """应用转化率未达标的折扣（仅对提成部分）"""
+    if calculate_conversion_rate(params) < params.min_conversion_rate:
+        return bonus * params.penalty_rate
+    return bonus
+
+
+def calculate_new_salary_mode1(params, return_detail=False, role=None):
+    """
+    新薪资体系模式一：新保底（与旧薪资相同，只有底薪，没有提成和补贴）
+    return_detail=True时返回(底薪, 提成, 补贴)
+    """
+    salary = calculate_old_salary(params, role)
+    if return_detail:
+        return salary, 0, 0
+    return salary
+
+
+def _tiered_bonus(params, new_base, rate):
+    """新底薪模式的提成（已按转化率 rate 打折），与员工类型无关"""
+    purchase_amount = params.new_purchase_amount or params.purchase_amount
+    baseline = params.old_purchase_baseline
+
+    bonus = calculate_tier_bonus(
+        purchase_amount,
+        baseline * params.bonus_tier1_threshold,
+        baseline * params.bonus_tier2_threshold,
+        tier1_amount(params.old_base_salary, new_base, baseline),
+        params.bonus_tier2_amount,
+        params.bonus_tier3_amount,
+    )
+
+    # 转化率未达标，提成部分打折
+    if rate < params.min_conversion_rate:
+        return bonus * params.penalty_rate
+    return bonus
+
+
+def _tiered_salary(params, new_base, return_detail, role):
+    bonus = _tiered_bonus(params, new_base, calculate_conversion_rate(params))
+    subsidy = role_subsidy(params, role)
+
+    if return_detail:
+        return new_base, bonus, subsidy  # 底薪、提成、补贴
+    return new_base + bonus + subsidy
+
+
+def calculate_new_salary_mode2(params, return_detail=False, role=None):
+    """
+    新薪资体系模式二：新底薪（中），三档提成+补贴
+    return_detail=True时返回(底薪, 提成, 补贴)
+    """
+    return _tiered_salary(params, params.new_base_salary_mid, return_detail, role)
+
+
+def calculate_new_salary_mode3(params, return_detail=False, role=None):
+    """
+    新薪资体系模式三：新底薪（低），三档提成+补贴
+    return_detail=True时返回(底薪, 提成, 补贴)
+    """
+    return _tiered_salary(params, params.new_base_salary_low, return_detail, role)
+
+
+def calculate_mode_salary(params, mode, return_detail=False, role=None):
+    """按模式名称计算薪资，mode 取值见 MODES"""
+    if mode == "旧薪资体系":
+        salary = calculate_old_salary(params, role)
+        return (salary, 0, 0) if return_detail else salary
+    elif mode == "新保底":
+        return calculate_new_salary_mode1(params, return_detail, role)
+    elif mode == "新底薪（中）":
+        return calculate_new_salary_mode2(params, return_detail, role)
+    elif mode == "新底薪（低）":
+        return calculate_new_salary_mode3(params, return_detail, role)
+    raise ValueError(f"未知的薪资模式: {mode}")
+
+
+class SalaryMatrix:
+    """
+    MODES × ROLES 的薪资矩阵
+
+    cells[模式序号][员工类型序号] 为 (底薪, 提成, 补贴)，与 calculate_mode_salary(return_detail=True)
+    的结果相同；旧薪资体系和新保底只有底薪（已含职位补贴），提成和补贴为0。
+    """
+
+    __slots__ = ("cells",)
+
+    def __init__(self, cells):
+        self.cells = cells
+
+    def __repr__(self):
+        return f"SalaryMatrix({self.cells!r})"
+
+    def cell(self, mode, role):
+        return self.cells[MODES.index(mode)][ROLES.index(role)]
+
+    def salary(self, mode, role):
+        base, bonus, subsidy = self.cell(mode, role)
+        return base + bonus + subsidy
+
+    def salaries(self):
+        """{模式: {员工类型: 薪资}}"""
+        return {mode: {role: base + bonus + subsidy for role, (base, bonus, subsidy) in zip(ROLES, row)}
+                for mode, row in zip(MODES, self.cells)}
+
+    def to_numpy(self):
+        """(len(MODES), len(ROLES), 3) 的 float64 数组"""
+        import numpy as np
+
+        return np.array(self.cells, dtype=float)
+
+
+# 不计算的格子（与 store_report 中人数为0的员工类型一致，各项为整数0）
+_EMPTY_CELL = (0, 0, 0)
+
+
+def salary_matrix(params, skip_empty=False):
+    """
+    一次算出所有薪资模式 × 所有员工类型的 (底薪, 提成, 补贴)
+
+    转化率、旧薪资、两种新底薪的档位拆分和转化率折扣都只算一次，各员工类型只有职位补贴不同。
+    skip_empty=True 时人数为0的员工类型不计算，各项为整数0
+    """
+    # 不计算的员工类型补贴记为 None
+    subsidies = [None if skip_empty and count == 0 else role_subsidy(params, role)
+                 for role, count in params.role_counts()]
+    if all(subsidy is None for subsidy in subsidies):
+        return SalaryMatrix((tuple([_EMPTY_CELL] * len(ROLES)),) * len(MODES))
+
+    rate = calculate_conversion_rate(params)
+    old_salary = old_salary_amount(params.delivery_amount, rate, params.total_staff,
+                                   params.old_base_salary, params.old_basic_bonus,
+                                   params.old_position_bonus, params.old_extra_bonus)
+
+    # 行顺序同 MODES: 旧薪资体系、新保底（与旧薪资相同）、新底薪（中）、新底薪（低）
+    old_row = tuple([_EMPTY_CELL if subsidy is None else (old_salary + subsidy, 0, 0) for subsidy in subsidies])
+    rows = [old_row, old_row]
+    for new_base in (params.new_base_salary_mid, params.new_base_salary_low):
+        bonus = _tiered_bonus(params, new_base, rate)
+        rows.append(tuple([_EMPTY_CELL if subsidy is None else (new_base, bonus, subsidy) for subsidy in subsidies]))
+    return SalaryMatrix(tuple(rows))
+
+
+@dataclass(frozen=True)
+class SocialInsurance:
+    """社保计算结果（单位：元）"""
+    base: float
+    pension: float
+    medical: float
+    unemployment: float
+    injury: float
+    maternity: float
+    housing_fund: float
+    total_staff: int
+
+    @property
+    def per_employee(self):
+        """每位员工社保成本"""
+        return (self.pension + self.medical + self.unemployment + self.injury +
+                self.maternity + self.housing_fund)
+
+    @property
+    def total_cost(self):
+        """社保总成本"""
+        return self.per_employee * self.total_staff
+
+
+def social_insurance(base, pension_rate, medical_rate, unemployment_rate, injury_rate, maternity_rate,
+                     housing_fund_rate, total_staff):
+    """按社保基数和各项比例(%)计算社保费用"""
+    return SocialInsurance(
+        base=base,
+        pension=base * (pension_rate / 100),
+        medical=base * (medical_rate / 100),
+        unemployment=base * (unemployment_rate / 100),
+        injury=base * (injury_rate / 100),
+        maternity=base * (maternity_rate / 100),
+        housing_fund=base * (housing_fund_rate / 100),
+        total_staff=total_staff,
+    )
+
+
+def calculate_social_insurance(params):
+    """计算社保费用"""
+    return social_insurance(params.social_insurance_base, params.pension_rate, params.medical_rate,
+                            params.unemployment_rate, params.injury_rate, params.maternity_rate,
+                            params.housing_fund_rate, params.total_staff)
+
+
+@dataclass(frozen=True)
+class RoleSalary:
+    """某一薪资模式下某类员工的人均 底薪/提成/补贴"""
+    role: str
+    count: int
+    base: float
+    bonus: float
+    subsidy: float
+
+    @property
+    def salary(self):
+        """人均薪资"""
+        return self.base + self.bonus + self.subsidy
+
+    @property
+    def total(self):
+        """该类员工薪资合计"""
+        return self.salary * self.count
+
+
+@dataclass(frozen=True)
+class ModeCost:
+    """某一薪资模式下的门店成本"""
+    mode: str
+    roles: tuple
+    social_cost: float
+    city_cost: float
+    total_profit: float
+
+    @property
+    def total_salary(self):
+        """总薪资成本"""
+        return sum(r.total for r in self.roles)
+
+    @property
+    def total_cost(self):
+        """总成本 = 薪资 + 社保 + 城市成本"""
+        return self.total_salary + self.social_cost + self.city_cost
+
+    @property
+    def net_profit(self):
+        """净利润"""
+        return self.total_profit - self.total_cost
+
+
+@dataclass(frozen=True)
+class StoreReport:
+    """门店财务分析结果（analyze_store 报告中的全部数值）"""
+    total_revenue: float
+    unit_profit: float
+    total_profit: float
+    social: SocialInsurance
+    modes: tuple
+
+    def mode(self, name):
+        """按模式名称取 ModeCost"""
+        for mode in self.modes:
+            if mode.mode == name:
+                return mode
+        raise KeyError(name)
+
+    def to_row(self):
+        """展开为一行扁平字典，便于写入表格"""
+        row = {
+            "门店总流水": self.total_revenue,
+            "客单利润": self.unit_profit,
+            "门店总利润": self.total_profit,
+            "每人社保成本": self.social.per_employee,
+            "社保总成本": self.social.total_cost,
+        }
+        for mode in self.modes:
+            for r in mode.roles:
+                row[f"{mode.mode}_{r.role}薪资"] = r.salary
+            row[f"{mode.mode}_总薪资成本"] = mode.total_salary
+            row[f"{mode.mode}_总成本"] = mode.total_cost
+            row[f"{mode.mode}_净利润"] = mode.net_profit
+        return row
+
+    def staff_rows(self):
+        """每个模式下每类（人数不为0的）员工一行，列见 STAFF_COLUMNS"""
+        for mode in self.modes:
+            for r in mode.roles:
+                if r.count:
+                    yield mode.mode, r.role, r.count, r.base, r.bonus, r.subsidy, r.salary, r.total
+
+
+def store_report(params, social=None, matrix=None):
+    """
+    门店财务分析：各薪资模式下每类员工的薪资、社保和净利润
+
+    social: 按员工名单算好的 SocialInsurance（见 social.roster_social_insurance），
+            不传时按参数中的统一社保基数和门店人数计算
+    matrix: 已算好的 salary_matrix(params)，不传时按 params 计算（人数为0的员工类型不计算）
+    """
+    with span("社保"):
+        social = social or calculate_social_insurance(params)
+    unit_profit = params.service_price - params.service_cost
+    total_profit = params.purchase_amount * unit_profit
+
+    counts = params.role_counts()
+    social_cost = social.total_cost
+    modes = []
+    with span("薪资矩阵"):
+        matrix = matrix or salary_matrix(params, skip_empty=True)
+        for mode, row in zip(MODES, matrix.cells):
+            roles = tuple([RoleSalary(role, count, *(cell if count != 0 else _EMPTY_CELL))
+                           for (role, count), cell in zip(counts, row)])
+            modes.append(ModeCost(mode, roles, social_cost, params.city_cost, total_profit))
+
+    return StoreReport(
+        total_revenue=params.purchase_amount * params.service_price,
+        unit_profit=unit_profit,
+        total_profit=total_profit,
+        social=social,
+        modes=tuple(modes),
+    )
+
+
+def salary_steps(params, salaries=None):
+    """
+    界面“计算结果”页的计算步骤（calculate_salary），显示时调用 render()
+
+    salaries: 已算好的 {模式: params.employee_type 的薪资}，不传时按 params 计算
+    """
+    log = StepLog()
+    conversion_rate = calculate_conversion_rate(params)
+    log.text("=== 薪资计算详细步骤 ===\n\n")
+    log.add("员工类型: {result}\n", name="员工类型", result=params.employee_type)
+    log.add("交付量: {result}\n", name="交付量", result=params.delivery_amount)
+    log.add("购买服务包数量: {result}\n", name="购买服务包数量", result=params.purchase_amount)
+    log.add("转化率: {result:.2f}%\n", name="转化率", result=conversion_rate)
+    log.add("选择模式: {result}\n\n", name="选择模式", result=params.salary_mode)
+
+    old_salary = log.add("旧薪资体系计算结果: {result:.2f}元\n\n", name="旧薪资体系",
+                         result=salaries["旧薪资体系"] if salaries else calculate_old_salary(params))
+
+    mode = params.salary_mode if params.salary_mode in ("新保底", "新底薪（中）") else "新底薪（低）"
+    new_salary = log.add("{mode}模式薪资: {result:.2f}元\n", name=mode,
+                         result=salaries[mode] if salaries else calculate_mode_salary(params, mode), mode=mode)
+
+    difference = log.add("\n薪资差异: {result:.2f}元\n", name="薪资差异", result=new_salary - old_salary)
+    if difference > 0:
+        log.add("新模式比旧模式多 {difference:.2f}元 ({result:.2f}%)\n", name="差异比例",
+                result=(difference / old_salary) * 100, difference=difference)
+    elif difference < 0:
+        log.add("新模式比旧模式少 {difference:.2f}元 ({result:.2f}%)\n", name="差异比例",
+                result=(abs(difference) / old_salary) * 100, difference=abs(difference))
+    else:
+        log.text("新旧模式薪资相同\n")
+
+    unit_profit = params.service_price - params.service_cost
+    log.text("\n=== 业务数据 ===\n")
+    log.add("服务包单价: {result:.2f}元\n", name="服务包单价", result=params.service_price)
+    log.add("服务包成本: {result:.2f}元\n", name="服务包成本", result=params.service_cost)
+    log.add("客单利润: {result:.2f}元\n", name="客单利润", result=unit_profit)
+    log.add("总利润: {result:.2f}元\n", name="总利润", result=params.purchase_amount * unit_profit)
+    return log
+
+
+def comparison_steps(params, salaries=None):
+    """
+    薪资模式对比报告（generate_comparison）的步骤
+
+    salaries: 已算好的 {模式: params.employee_type 的薪资}，不传时按 params 计算
+    """
+    salaries = salaries or {mode: calculate_mode_salary(params, mode) for mode in MODES}
+    old_salary = salaries["旧薪资体系"]
+    rate = calculate_conversion_rate(params)
+    log = StepLog()
+    log.text("=== 薪资模式对比报告 ===\n\n")
+    log.add("员工类型: {result}\n", name="员工类型", result=params.employee_type)
+    log.add("交付量: {result}\n", name="交付量", result=params.delivery_amount)
+    log.add("购买服务包数量: {result}\n", name="购买服务包数量", result=params.purchase_amount)
+    log.add("转化率: {result:.2f}%\n\n", name="转化率", result=rate)
+
+    # 各模式薪资对比
+    log.text(f"{'模式':<15} {'薪资(元)':<12} {'与旧模式差异(元)':<15} {'差异百分比':<12}\n")
+    log.text(f"{'-' * 60}\n")
+    for mode in MODES:
+        salary = salaries[mode]
+        if mode == "旧薪资体系":
+            diff = 0
+            diff_pct = 0
+        else:
+            diff = salary - old_salary
+            diff_pct = (diff / old_salary) * 100 if old_salary != 0 else 0
+        log.add("{mode:<15} {result:<12.2f} {diff:<15.2f} {diff_pct:<12.2f}%\n",
+                name=mode, result=salary, mode=mode, diff=diff, diff_pct=diff_pct)
+
+    # 推荐最优模式（旧薪资体系不参与推荐）
+    best_salary = max(salaries[mode] for mode in MODES[1:])
+    best_modes = [mode for mode in MODES[1:] if salaries[mode] == best_salary]
+    log.text("\n=== 推荐方案 ===\n")
+    log.add("推荐选择: {modes}\n", modes=", ".join(best_modes))
+    log.add("最高薪资: {result:.2f}元\n", name="最高薪资", result=best_salary)
+    log.add("比旧模式多: {result:.2f}元\n", name="比旧模式多", result=best_salary - old_salary)
+
+    # 转化率影响分析
+    min_rate = params.min_conversion_rate
+    if rate < min_rate:
+        log.add("\n⚠️ 警告: 当前转化率({rate:.2f}%)低于要求({min_rate}%)，提成已应用折扣\n",
+                rate=rate, min_rate=min_rate)
+        log.add("如果转化率达到{min_rate}%，提成将有所提升\n", min_rate=min_rate)
+    return log
+
+
+def store_report_steps(params, report=None):
+    """门店财务分析报告（analyze_store）的步骤，report 未传入时按 params 计算"""
+    report = report or store_report(params)
+    social = report.social
+    log = StepLog()
+    log.text("=== 门店财务分析报告 ===\n\n")
+
+    log.text("=== 基础数据 ===\n")
+    log.add("购买服务包数量: {result}\n", name="购买服务包数量", result=params.purchase_amount)
+    log.add("服务包单价: {result:.2f}元\n", name="服务包单价", result=params.service_price)
+    log.add("服务包成本: {result:.2f}元\n", name="服务包成本", result=params.service_cost)
+    log.add("城市平均成本: {result:.2f}元\n\n", name="城市平均成本", result=params.city_cost)
+
+    log.text("=== 人员配置 ===\n")
+    for role, count in params.role_counts():
+        log.add("{role}数量: {result}\n", name=f"{role}数量", result=count, role=role)
+    log.add("总人数: {result}\n\n", name="总人数", result=params.total_staff)
+
+    log.text("=== 社保成本 ===\n")
+    log.add("社保基数: {result:.2f}元\n", name="社保基数", result=social.base)
+    log.add("每人社保成本: {result:.2f}元\n", name="每人社保成本", result=social.per_employee)
+    log.add("社保总成本: {result:.2f}元\n\n", name="社保总成本", result=social.total_cost)
+
+    log.text("=== 门店财务指标 ===\n")
+    log.add("门店总流水: {result:.2f}元\n", name="门店总流水", result=report.total_revenue)
+    log.add("客单利润: {result:.2f}元\n", name="客单利润", result=report.unit_profit)
+    log.add("门店总利润: {result:.2f}元\n\n", name="门店总利润", result=report.total_profit)
+
+    log.text("=== 不同薪资模式下的成本分析 ===\n\n")
+    for mode in report.modes:
+        log.add("{mode}:\n", mode=mode.mode)
+        for r in mode.roles:
+            if mode.mode == "旧薪资体系":
+                parts = (("薪资", r.base),)
+            else:
+                parts = (("底薪", r.base), ("提成", r.bonus), ("补贴", r.subsidy))
+            for label, value in parts:
+                log.add("  {role}{label}: {value:.2f}元 × {count}人 = {result:.2f}元\n",
+                        name=f"{mode.mode}_{r.role}{label}", result=value * r.count,
+                        role=r.role, label=label, value=value, count=r.count)
+        log.add("  总薪资成本: {result:.2f}元\n", name=f"{mode.mode}_总薪资成本", result=mode.total_salary)
+        log.add("  社保成本: {result:.2f}元\n", result=mode.social_cost)
+        log.add("  总成本: {result:.2f}元 (薪资+社保+城市成本)\n", name=f"{mode.mode}_总成本", result=mode.total_cost)
+        log.add("  净利润: {result:.2f}元\n", name=f"{mode.mode}_净利润", result=mode.net_profit)
+        log.text("  ✓ 盈利状况良好\n\n" if mode.net_profit > 0 else "  ✗ 盈利需优化\n\n")
+    return log
@@ -0,0 +1,152 @@
+"""
+Excel 报表导出
+
+界面 export_excel 原来为每个工作表各建一个 DataFrame 再经 pd.ExcelWriter 写出，而且只有参数、
+没有计算结果。这里用 xlsxwriter 的 constant_memory 模式逐行写出 参数表 + 门店薪资 + 员工薪资，
+每写完一行就落盘，导出全国一个月几万个门店时内存占用也不随门店数增长。
+工作簿先写到临时文件，导出成功才替换报表文件，出错时原有的同名报表不受影响。
+"""
+import os
+
+import xlsxwriter
+
+from .engine import STAFF_COLUMNS, SalaryParams, store_report
+from .schema import export_sheets
+from .tables import temp_path
+
+
+# 参数工作表: [(工作表名, [(显示名称, 参数字段名), ...]), ...]，由参数表生成
+PARAMETER_SHEETS = export_sheets()
+
+STORE_SHEET = "门店薪资"
+STAFF_SHEET = "员工薪资"
+
+# 单个工作表最多行数（含表头），超过后续写到 “员工薪资2” 等新工作表
+MAX_ROWS = 1048576
+
+
+class SheetStream:
+    """按顺序逐行写入的工作表，行数超过 max_rows 时自动续写到新工作表"""
+
+    def __init__(self, workbook, name, max_rows=MAX_ROWS):
+        self.workbook = workbook
+        self.name = name
+        self.max_rows = max_rows
+        self.header = None
+        self.rows = 0
+        self._sheets = 0
+        self._sheet = None
+        self._row = 0
+
+    def _new_sheet(self):
+        self._sheets += 1
+        name = self.name if self._sheets == 1 else f"{self.name}{self._sheets}"
+        self._sheet = self.workbook.add_worksheet(name)
+        self._sheet.write_row(0, 0, self.header)
+        self._sheet.freeze_panes(1, 0)
+        self._row = 1
+
+    def write(self, values):
+        """追加一行（第一次写入前需设置 header）"""
+        if self._sheet is None or self._row >= self.max_rows:
+            self._new_sheet()
+        self._sheet.write_row(self._row, 0, values)
+        self._row += 1
+        self.rows += 1
+
+
+class ReportWorkbook:
+    """
+    薪资报表工作簿
+
+    constant_memory 模式下每个工作表只能按行号递增的顺序写入，
+    所以先写参数表，再逐个门店追加 门店薪资 / 员工薪资 行。
+    """
+
+    def __init__(self, path, params=None, key_columns=()):
+        self.path = path
+        self.params = params or SalaryParams()
+        self.key_columns = list(key_columns)
+        self._temp = temp_path(path)
+        self.workbook = xlsxwriter.Workbook(self._temp, {"constant_memory": True, "nan_inf_to_errors": True})
+        self.write_parameters(self.params)
+        self.stores = SheetStream(self.workbook, STORE_SHEET)
+        self.staff = SheetStream(self.workbook, STAFF_SHEET)
+        self.staff.header = self.key_columns + list(STAFF_COLUMNS)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def write_parameters(self, params):
+        """写出参数工作表，每个工作表两列: 参数 / 值"""
+        for sheet_name, items in PARAMETER_SHEETS:
+            sheet = self.workbook.add_worksheet(sheet_name)
+            sheet.write_row(0, 0, ["参数", "值"])
+            sheet.set_column(0, 0, 18)
+            for row, (label, name) in enumerate(items, start=1):
+                sheet.write_row(row, 0, [label, getattr(params, name)])
+
+    def add_store(self, params=None, key=None, report=None):
+        """
+        追加一个门店的结果
+
+        params: 门店参数，默认使用导出参数
+        key: 标识门店的列值（与 key_columns 对应，如门店编号、区域）
+        report: 已计算好的 store_report，不传时按 params 计算
+        """
+        params = params or self.params
+        report = report or store_report(params)
+        key = list(key or [])
+
+        row = report.to_row()
+        if self.stores.header is None:
+            self.stores.header = self.key_columns + list(row)
+        self.stores.write(key + list(row.values()))
+
+        for staff_row in report.staff_rows():
+            self.staff.write(key + list(staff_row))
+
+    def close(self):
+        """写完：生成工作簿并替换报表文件"""
+        if self.workbook is None:
+            return
+        self.workbook.close()
+        self.workbook = None
+        os.replace(self._temp, self.path)
+
+    def discard(self):
+        """放弃导出：关闭工作簿（释放逐行写出用的临时文件）并删除未完成的报表"""
+        if self.workbook is None:
+            return
+        try:
+            self.workbook.close()
+        finally:
+            self.workbook = None
+            if os.path.exists(self._temp):
+                os.remove(self._temp)
+
+
+def export_report(path, params, stores=None, key_columns=()):
+    """
+    导出Excel报表，返回写出的门店数
+
+    stores: 门店参数覆盖值字典的可迭代对象（可以是生成器，逐个读取），
+            键为 SalaryParams 字段名或 key_columns 中的标识列；
+            不传时只导出 params 本身这一个门店
+    """
+    names = set(params.to_config())
+    with ReportWorkbook(path, params, key_columns) as workbook:
+        if stores is None:
+            workbook.add_store()
+        else:
+            for record in stores:
+                overrides = {k: v for k, v in record.items() if k in names}
+                workbook.add_store(params.replace(**overrides) if overrides else params,
+                                   key=[record.get(c) for c in key_columns])
+    return workbook.stores.rows
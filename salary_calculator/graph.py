@@ -0,0 +1,308 @@
+"""
+增量重算的公式依赖图
+
+界面原来每改一个参数都要点“计算”，把 calculate_salary / generate_comparison /
+analyze_store 整条计算链从头算一遍。这里把 v6 的公式拆成依赖图上的节点:
+
+    转化率 → 是否未达标（折扣） → 提成 → 薪资矩阵 → 各模式各类员工薪资 → 门店成本（ModeCost） → 净利润
+
+每个 Tk 变量对应一个输入。输入变化后只重算它下游的节点；某个节点算出的值与原来相同时，
+它的下游不再重算。报告文字也是节点，只有用到的数值变化时才重新生成，界面只刷新这些页面。
+"""
+from collections import namedtuple
+
+from .engine import (MODES, ROLES, ModeCost, RoleSalary, SalaryMatrix, SalaryParams, StoreReport,
+                     calculate_tier_bonus, comparison_steps, conversion_rate, old_salary_amount,
+                     salary_steps, social_insurance, store_report_steps, tier1_amount)
+
+
+# name: 节点名；inputs: 依赖的输入或节点名；func: 按 inputs 顺序接收数值，返回节点的值
+# keep_errors: 为 True 时上游的 NodeError 原样传给 func（如人数为0的员工类型不需要人均薪资）
+Node = namedtuple("Node", "name inputs func keep_errors", defaults=(False,))
+
+
+class NodeError:
+    """节点计算出错时保存的值，下游节点默认直接沿用，读取时抛出原来的异常"""
+
+    def __init__(self, error):
+        self.error = error
+
+    def __repr__(self):
+        return f"NodeError({self.error!r})"
+
+
+def _same(old, new):
+    """
+    值没有变化时下游不必重算
+
+    比较 repr 而不是 ==：显示出来不同的值（-0.0 与 0.0、嵌套在结果中的 2 与 2.0）要算作变化，
+    NaN 与 NaN 则算作相同
+    """
+    if old is new:
+        return True
+    if type(old) is not type(new) or isinstance(new, NodeError):
+        return False
+    if isinstance(new, str):
+        return old == new
+    return repr(old) == repr(new)
+
+
+class FormulaGraph:
+    """
+    公式依赖图
+
+    inputs: 输入的初始值字典；创建时计算全部节点。之后用 set() 修改输入，
+    再调用 recompute() 只重算受影响的节点。
+    """
+
+    def __init__(self, nodes, inputs):
+        self.nodes = {node.name: node for node in nodes}
+        self.values = dict(inputs)
+        self.evaluations = 0
+        self._changed = set()
+
+        dependents = {name: [] for name in list(self.values) + list(self.nodes)}
+        for node in nodes:
+            if node.name in self.values:
+                raise ValueError(f"节点与输入重名: {node.name}")
+            for name in node.inputs:
+                if name not in dependents:
+                    raise ValueError(f"节点 {node.name} 依赖未定义的 {name}")
+                dependents[name].append(node.name)
+        self._order = self._sort(dependents)
+        self._index = {name: i for i, name in enumerate(self._order)}
+
+        # 每个输入下游的全部节点（按计算顺序）
+        self._downstream = {}
+        for name in self.values:
+            seen, stack = set(), [name]
+            while stack:
+                for dependent in dependents[stack.pop()]:
+                    if dependent not in seen:
+                        seen.add(dependent)
+                        stack.append(dependent)
+            self._downstream[name] = sorted(seen, key=self._index.__getitem__)
+
+        for name in self._order:
+            self.values[name] = self._evaluate(self.nodes[name])
+
+    def _sort(self, dependents):
+        """拓扑排序，有循环依赖时抛出 ValueError"""
+        pending = {name: len(node.inputs) for name, node in self.nodes.items()}
+        ready = [name for name in self.values] + [name for name, n in pending.items() if n == 0]
+        order = []
+        while ready:
+            name = ready.pop()
+            if name in self.nodes:
+                order.append(name)
+            for dependent in dependents[name]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(self.nodes):
+            raise ValueError(f"公式存在循环依赖: {sorted(set(self.nodes) - set(order))}")
+        return order
+
+    def _evaluate(self, node):
+        self.evaluations += 1
+        args = [self.values[name] for name in node.inputs]
+        if not node.keep_errors:
+            for arg in args:
+                if isinstance(arg, NodeError):
+                    return arg
+        try:
+            return node.func(*args)
+        except Exception as e:
+            return NodeError(e)
+
+    def set(self, name, value):
+        """修改一个输入，值没有变化时返回 False"""
+        if name not in self._downstream:
+            raise KeyError(name)
+        if _same(self.values[name], value):
+            return False
+        self.values[name] = value
+        self._changed.add(name)
+        return True
+
+    def update(self, values):
+        """修改多个输入，返回有变化的输入名集合"""
+        return {name for name, value in values.items() if self.set(name, value)}
+
+    def recompute(self):
+        """重算受修改影响的节点，返回值有变化的节点名集合"""
+        changed, self._changed = self._changed, set()
+        if not changed:
+            return set()
+        affected = set()
+        for name in changed:
+            affected.update(self._downstream[name])
+
+        updated = set()
+        for name in sorted(affected, key=self._index.__getitem__):
+            node = self.nodes[name]
+            # 输入都没变（上游重算后值相同）的节点跳过
+            if not any(i in changed for i in node.inputs):
+                continue
+            value = self._evaluate(node)
+            if not _same(self.values[name], value):
+                self.values[name] = value
+                changed.add(name)
+                updated.add(name)
+        return updated
+
+    def __getitem__(self, name):
+        """节点或输入的当前值，节点出错时抛出原来的异常"""
+        value = self.values[name]
+        if isinstance(value, NodeError):
+            raise value.error
+        return value
+
+
+# 各类员工的人数字段和职位补贴字段（员工没有补贴）
+_COUNT_FIELDS = dict(zip(ROLES, ("employee_count", "supervisor_count", "consultant_count",
+                                 "regional_manager_count", "city_manager_count")))
+_SUBSIDY_FIELDS = {"主管": "supervisor_bonus", "顾问": "consultant_bonus",
+                   "区总": "regional_manager_bonus", "市总": "city_manager_bonus"}
+
+# 三档提成的新底薪字段
+_TIERED_BASES = {"新底薪（中）": "new_base_salary_mid", "新底薪（低）": "new_base_salary_low"}
+
+# 报告文字中直接显示的参数（其余参数取默认值不影响生成的文字）
+_SALARY_TEXT_FIELDS = ("employee_type", "delivery_amount", "purchase_amount", "salary_mode",
+                       "service_price", "service_cost")
+_COMPARISON_TEXT_FIELDS = ("employee_type", "delivery_amount", "purchase_amount", "min_conversion_rate")
+_STORE_TEXT_FIELDS = ("purchase_amount", "service_price", "service_cost", "city_cost") + tuple(_COUNT_FIELDS.values())
+
+
+def _role_salary(role):
+    def build(count, detail):
+        # 与 store_report 一致：人数为0的员工类型不计算薪资，各项为整数0
+        if count == 0:
+            return RoleSalary(role, count, 0, 0, 0)
+        if isinstance(detail, NodeError):
+            return detail
+        return RoleSalary(role, count, *detail)
+    return build
+
+
+def _selected(employee_type, *salaries):
+    """当前员工类型在各模式下的薪资 {模式: 薪资}"""
+    index = ROLES.index(employee_type)
+    return {mode: salaries[i * len(ROLES) + index] for i, mode in enumerate(MODES)}
+
+
+def _error(*values):
+    """values 中第一个 NodeError，没有时为 None"""
+    return next((value for value in values if isinstance(value, NodeError)), None)
+
+
+def _salary_matrix(old_salary, mid_base, mid_bonus, low_base, low_bonus, *subsidies):
+    """
+    由已算好的旧薪资、两种新底薪的提成和各员工类型的补贴组成薪资矩阵（同 engine.salary_matrix）
+
+    上游出错时只有用到它的格子为该 NodeError（如门店总人数为0时旧薪资出错，新底薪模式仍可计算）
+    """
+    old_row = tuple(_error(old_salary, subsidy) or (old_salary + subsidy, 0, 0) for subsidy in subsidies)
+    rows = [old_row, old_row]
+    for base, bonus in ((mid_base, mid_bonus), (low_base, low_bonus)):
+        rows.append(tuple(_error(base, bonus, subsidy) or (base, bonus, subsidy) for subsidy in subsidies))
+    return SalaryMatrix(tuple(rows))
+
+
+def _tier_bonus(purchase, baseline, tier1_threshold, tier2_threshold, tier1, tier2, tier3, penalized, penalty_rate):
+    bonus = calculate_tier_bonus(purchase, baseline * tier1_threshold, baseline * tier2_threshold, tier1, tier2, tier3)
+    # 转化率未达标，提成部分打折
+    return bonus * penalty_rate if penalized else bonus
+
+
+def _text(steps, names):
+    """报告文字节点：输入为 names 中的参数和已算好的数值"""
+    def render(*values):
+        params = SalaryParams(**dict(zip(names, values)))
+        return steps(params, values[len(names)]).render()
+    return render
+
+
+def salary_nodes():
+    """v6 全部公式的节点"""
+    nodes = [
+        Node("total_staff", tuple(_COUNT_FIELDS.values()), lambda a, b, c, d, e: a + b + c + d + e),
+        Node("conversion_rate", ("delivery_amount", "purchase_amount"), conversion_rate),
+        # 转化率未达标时提成打折
+        Node("penalized", ("conversion_rate", "min_conversion_rate"), lambda rate, minimum: rate < minimum),
+        Node("old_salary", ("delivery_amount", "conversion_rate", "total_staff", "old_base_salary",
+                            "old_basic_bonus", "old_position_bonus", "old_extra_bonus"), old_salary_amount),
+        Node("bonus_purchase", ("new_purchase_amount", "purchase_amount"), lambda new, purchase: new or purchase),
+    ]
+    for role in ROLES:
+        field = _SUBSIDY_FIELDS.get(role)
+        nodes.append(Node(f"subsidy.{role}", (field,), lambda value: value) if field else
+                     Node(f"subsidy.{role}", (), lambda: 0))
+
+    for mode, base_field in _TIERED_BASES.items():
+        nodes.append(Node(f"tier1_amount.{mode}", ("old_base_salary", base_field, "old_purchase_baseline"),
+                          tier1_amount))
+        nodes.append(Node(
+            f"bonus.{mode}",
+            ("bonus_purchase", "old_purchase_baseline", "bonus_tier1_threshold", "bonus_tier2_threshold",
+             f"tier1_amount.{mode}", "bonus_tier2_amount", "bonus_tier3_amount", "penalized", "penalty_rate"),
+            _tier_bonus,
+        ))
+
+    # 薪资矩阵，各模式各类员工的 (底薪, 提成, 补贴) 和人均薪资都从中读取
+    tiered = tuple(name for mode, field in _TIERED_BASES.items() for name in (field, f"bonus.{mode}"))
+    nodes.append(Node("salary_matrix", ("old_salary",) + tiered + tuple(f"subsidy.{role}" for role in ROLES),
+                      _salary_matrix, keep_errors=True))
+    for i, mode in enumerate(MODES):
+        for j, role in enumerate(ROLES):
+            detail = Node(f"detail.{mode}.{role}", ("salary_matrix",), lambda matrix, i=i, j=j: matrix.cells[i][j])
+            salary = Node(f"salary.{mode}.{role}", (detail.name,), lambda cell: cell[0] + cell[1] + cell[2])
+            nodes += [detail, salary]
+
+    nodes += [
+        Node("uniform_social", ("social_insurance_base", "pension_rate", "medical_rate", "unemployment_rate",
+                                "injury_rate", "maternity_rate", "housing_fund_rate", "total_staff"), social_insurance),
+        # 导入员工名单后按名单汇总的社保代替统一基数的计算
+        Node("social", ("roster_social", "uniform_social"), lambda roster, uniform: roster or uniform),
+        Node("unit_profit", ("service_price", "service_cost"), lambda price, cost: price - cost),
+        Node("total_profit", ("purchase_amount", "unit_profit"), lambda purchase, unit: purchase * unit),
+    ]
+    for mode in MODES:
+        roles = []
+        for role in ROLES:
+            node = Node(f"role.{mode}.{role}", (_COUNT_FIELDS[role], f"detail.{mode}.{role}"),
+                        _role_salary(role), keep_errors=True)
+            nodes.append(node)
+            roles.append(node.name)
+        nodes.append(Node(f"mode_cost.{mode}", tuple(roles) + ("social", "city_cost", "total_profit"),
+                          lambda *args, mode=mode: ModeCost(mode, args[:-3], args[-3].total_cost, *args[-2:])))
+        nodes.append(Node(f"net_profit.{mode}", (f"mode_cost.{mode}",), lambda cost: cost.net_profit))
+
+    nodes.append(Node(
+        "report", ("purchase_amount", "service_price", "unit_profit", "total_profit", "social") +
+        tuple(f"mode_cost.{mode}" for mode in MODES),
+        lambda purchase, price, unit, total, social, *modes: StoreReport(purchase * price, unit, total, social, modes),
+    ))
+
+    # 各页面显示的文字
+    all_salaries = tuple(f"salary.{mode}.{role}" for mode in MODES for role in ROLES)
+    nodes += [
+        Node("salaries", ("employee_type",) + all_salaries, _selected),
+        Node("salary_text", _SALARY_TEXT_FIELDS + ("salaries",), _text(salary_steps, _SALARY_TEXT_FIELDS)),
+        Node("comparison_text", _COMPARISON_TEXT_FIELDS + ("salaries",),
+             _text(comparison_steps, _COMPARISON_TEXT_FIELDS)),
+        Node("store_text", _STORE_TEXT_FIELDS + ("report",), _text(store_report_steps, _STORE_TEXT_FIELDS)),
+    ]
+    return nodes
+
+
+def salary_graph(params=None, roster_social=None):
+    """
+    按一组参数建立 v6 公式的依赖图
+
+    输入为 SalaryParams 的全部字段和 roster_social（按员工名单汇总的 SocialInsurance，没有时为 None）
+    """
+    inputs = (params or SalaryParams()).to_config()
+    inputs["roster_social"] = roster_social
+    return FormulaGraph(salary_nodes(), inputs)
@@ -0,0 +1,159 @@
+"""
+多进程门店分析
+
+把全国门店按区域分组、再切成大小相近的分片，分发到进程池中计算每个门店的
+store_report，最后按门店在输入中的原始顺序合并，输出与单进程计算完全相同。
+使用场景缓存（scenarios.ScenarioStore）时，只把缓存中没有的门店参数分发到进程池。
+启用了 profiling 时，工作进程的计时段和剖析数据随每个分片的结果交回主进程合并。
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from operator import itemgetter
+
+from . import profiling
+from .engine import SalaryParams, store_report
+from .scenarios import compute_scenario
+
+
+# 每个分片最多包含的门店数，区域太大时再切分以便各进程负载均衡
+DEFAULT_PARTITION_SIZE = 2000
+
+
+def partition_stores(records, region_column="region", partition_size=DEFAULT_PARTITION_SIZE):
+    """
+    按区域分组门店，返回 [(区域, [(序号, 门店参数), ...]), ...]
+
+    同一区域的门店放在同一个分片里（超过 partition_size 时拆成多片），
+    分片顺序按区域首次出现的顺序，结果可重复。
+    """
+    regions = {}
+    for index, record in enumerate(records):
+        regions.setdefault(record.get(region_column), []).append((index, record))
+
+    partitions = []
+    for region, items in regions.items():
+        for start in range(0, len(items), partition_size):
+            partitions.append((region, items[start:start + partition_size]))
+    return partitions
+
+
+def _store_key(value):
+    """门店编号按字符串比较（门店表逐块读取时标识列为字符串，名单中可能读成数字）"""
+    return None if value is None else str(value)
+
+
+def _report_row(record, key_columns, region_column, report):
+    """结果行：标识列 + 区域 + 门店报告"""
+    row = {c: record.get(c) for c in key_columns}
+    row.setdefault(region_column, record.get(region_column))
+    row.update(report.to_row())
+    return row
+
+
+def _executor(workers):
+    """进程池，工作进程按主进程的设置记录计时段 / 剖析"""
+    return ProcessPoolExecutor(max_workers=workers, initializer=profiling.worker_init,
+                               initargs=profiling.worker_options())
+
+
+def _in_worker(func, task):
+    """进程池中执行 func(task)，连同本进程记录的计时段一起返回"""
+    return func(task), profiling.collect()
+
+
+def _pool_map(executor, func, tasks):
+    """在进程池中逐个计算 tasks，合并各进程的计时段，按顺序返回结果"""
+    results = []
+    for result, collected in executor.map(partial(_in_worker, func), tasks):
+        profiling.merge(collected)
+        results.append(result)
+    return results
+
+
+def _report_partition(task):
+    """计算一个分片内所有门店的报告，返回 [(序号, 结果行), ...]"""
+    config, region_column, items, store_column, socials, key_columns = task
+    params = SalaryParams.from_config(config)
+    names = set(params.to_config())
+    rows = []
+    for index, record in items:
+        overrides = {k: v for k, v in record.items() if k in names}
+        social = socials.get(_store_key(record.get(store_column))) if socials else None
+        report = store_report(params.replace(**overrides), social)
+        rows.append((index, _report_row(record, key_columns, region_column, report)))
+    return rows
+
+
+def _compute_chunk(params_list):
+    return [compute_scenario(p) for p in params_list]
+
+
+def _compute_scenarios(params_list, workers, partition_size):
+    """多进程计算缓存中没有的场景，返回与输入对应的 ScenarioResult 列表"""
+    if workers == 1 or len(params_list) <= 1:
+        return _compute_chunk(params_list)
+    size = max(1, min(partition_size, len(params_list) // (workers * 4)))
+    chunks = [params_list[start:start + size] for start in range(0, len(params_list), size)]
+    with _executor(workers) as executor:
+        return [result for chunk in _pool_map(executor, _compute_chunk, chunks) for result in chunk]
+
+
+def _cached_reports(records, config, workers, region_column, partition_size, key_columns, cache):
+    """按门店参数从场景缓存读取报告，只计算未缓存的门店"""
+    params = SalaryParams.from_config(config)
+    names = set(config)
+    stores = []
+    for record in records:
+        overrides = {k: v for k, v in record.items() if k in names}
+        stores.append(params.replace(**overrides) if overrides else params)
+    results = cache.results(stores, compute=partial(_compute_scenarios, workers=workers,
+                                                    partition_size=partition_size))
+    return [_report_row(record, key_columns, region_column, result.report)
+            for record, result in zip(records, results)]
+
+
+def run_store_reports(records, params=None, workers=None, region_column="region",
+                      partition_size=DEFAULT_PARTITION_SIZE, socials=None, store_column=None, key_columns=None,
+                      cache=None):
+    """
+    并行计算门店报告
+
+    records: 门店参数字典的列表（键为 SalaryParams 字段名，另可带区域列）
+    workers: 进程数，默认使用全部CPU；为1时在当前进程内计算
+    socials: 按员工名单汇总的 {门店: SocialInsurance}（见 social.roster_social_insurance），
+             门店由 store_column 列对应（按字符串比较）；名单中没有的门店按统一社保基数计算
+    key_columns: 原样写入结果行的标识列（如门店编号），默认为 store_column；区域列总是写入
+    cache: 场景缓存 ScenarioStore，给出时已算过的门店参数直接读取（月份不同的门店分开缓存）；
+           名单汇总的社保不属于场景参数，不能与 socials 一起使用
+    返回按输入顺序排列的结果行列表
+    """
+    config = (params or SalaryParams()).to_config()
+    if key_columns is None:
+        key_columns = [store_column] if store_column else []
+    workers = workers or os.cpu_count() or 1
+    if cache is not None:
+        if socials:
+            raise ValueError("场景缓存不能与员工名单汇总的社保一起使用")
+        return _cached_reports(records, config, workers, region_column, partition_size, list(key_columns), cache)
+
+    socials = {_store_key(store): social for store, social in (socials or {}).items()}
+    tasks = []
+    for _, items in partition_stores(records, region_column, partition_size):
+        # 每个分片只带上自己门店的社保汇总
+        part = {}
+        if socials:
+            for _, record in items:
+                store = _store_key(record.get(store_column))
+                if store in socials:
+                    part[store] = socials[store]
+        tasks.append((config, region_column, items, store_column, part, list(key_columns)))
+
+    if workers == 1 or len(tasks) <= 1:
+        results = map(_report_partition, tasks)
+    else:
+        with _executor(workers) as executor:
+            results = _pool_map(executor, _report_partition, tasks)
+    # 按门店在输入中的序号恢复原始顺序；序号不写入结果行，不会与门店表中同名的列冲突
+    rows = sorted((item for part in results for item in part), key=itemgetter(0))
+    return [row for _, row in rows]
@@ -0,0 +1,162 @@
+"""
+旧提成单价表
+
+各版本计算器的旧提成单价都由三个条件决定：服务包价格是否高于分界价、是否站内上牌、
+转化率落在哪个区间。原来每次计算都要走一遍 4×3 的 if/elif 分支，这里改成数据驱动的
+单价表，区间和单价可以从JSON读取，新增档位不需要改代码。
+
+JSON格式（与 DEFAULT_RATE_TABLE 相同）:
+
+    {
+        "price_cutoff": 450,
+        "groups": {
+            "high_no_license": {"bands": [50, 60], "rates": [10, 15, 20]},
+            "high_license":    {"bands": [50, 60], "rates": [15, 20, 25]},
+            "low_no_license":  {"bands": [50, 60], "rates": [5, 10, 15]},
+            "low_license":     {"bands": [50, 60], "rates": [10, 15, 20]}
+        }
+    }
+
+high/low 表示服务包价格 > / ≤ price_cutoff；bands 为转化率（%）区间分界，
+转化率 < bands[0] 取 rates[0]，bands[i-1] ≤ 转化率 < bands[i] 取 rates[i]，
+其余取最后一档，rates 比 bands 多一个。
+"""
+import json
+import os
+from bisect import bisect_right
+from functools import lru_cache
+
+
+# 计算器启动时若当前目录下有此文件，则用它代替内置单价表（v26 / v28）
+RATE_TABLE_FILE = "提成单价表.json"
+
+# v13 的单价表档位与 v26 / v28 不同，使用单独的文件
+V13_RATE_TABLE_FILE = "提成单价表_v13.json"
+
+# 分组名 -> (价格高于分界价, 站内上牌)
+GROUPS = {
+    "high_no_license": (True, False),
+    "high_license": (True, True),
+    "low_no_license": (False, False),
+    "low_license": (False, True),
+}
+
+# v26 / v28 的旧提成单价
+DEFAULT_RATE_TABLE = {
+    "price_cutoff": 450,
+    "groups": {
+        "high_no_license": {"bands": [50, 60], "rates": [10, 15, 20]},
+        "high_license": {"bands": [50, 60], "rates": [15, 20, 25]},
+        "low_no_license": {"bands": [50, 60], "rates": [5, 10, 15]},
+        "low_license": {"bands": [50, 60], "rates": [10, 15, 20]},
+    },
+}
+
+# v13 的旧提成单价（四档转化率区间，各组分界不同）
+V13_RATE_TABLE = {
+    "price_cutoff": 450,
+    "groups": {
+        "high_no_license": {"bands": [50, 60, 70], "rates": [10, 15, 20, 25]},
+        "high_license": {"bands": [60, 70, 80], "rates": [10, 15, 20, 25]},
+        "low_no_license": {"bands": [50, 60, 75], "rates": [10, 12, 15, 20]},
+        "low_license": {"bands": [60, 70, 80], "rates": [10, 12, 15, 20]},
+    },
+}
+
+
+def group_name(pack_price, has_station_license, price_cutoff):
+    """服务包价格和站内上牌对应的分组名"""
+    price = "high" if pack_price > price_cutoff else "low"
+    license_ = "license" if has_station_license else "no_license"
+    return f"{price}_{license_}"
+
+
+class CommissionRateTable:
+    """预编译的旧提成单价表，查找只需一次二分（档位数很少，可视为 O(1)）"""
+
+    def __init__(self, price_cutoff, groups):
+        self.price_cutoff = price_cutoff
+        self.groups = {}
+        for name in GROUPS:
+            if name not in groups:
+                raise ValueError(f"提成单价表缺少分组: {name}")
+            bands = tuple(float(b) for b in groups[name]["bands"])
+            rates = tuple(groups[name]["rates"])
+            if len(rates) != len(bands) + 1:
+                raise ValueError(f"分组 {name} 的单价数量应比转化率分界多一个")
+            if list(bands) != sorted(bands):
+                raise ValueError(f"分组 {name} 的转化率分界必须从小到大排列")
+            self.groups[name] = (bands, rates)
+        # 同一组参数反复查询时直接命中缓存
+        self.lookup = lru_cache(maxsize=4096)(self._lookup)
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config["price_cutoff"], config["groups"])
+
+    @classmethod
+    def load(cls, path):
+        """从JSON文件读取单价表"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_config(json.load(f))
+
+    def to_config(self):
+        return {
+            "price_cutoff": self.price_cutoff,
+            "groups": {name: {"bands": list(bands), "rates": list(rates)}
+                       for name, (bands, rates) in self.groups.items()},
+        }
+
+    def group(self, pack_price, has_station_license):
+        return group_name(pack_price, has_station_license, self.price_cutoff)
+
+    def _lookup(self, pack_price, has_station_license, conversion_rate):
+        bands, rates = self.groups[self.group(pack_price, has_station_license)]
+        return rates[bisect_right(bands, conversion_rate)]
+
+    def describe(self, pack_price, has_station_license, compact=False):
+        """条件说明，如 "服务包价格 > 450 且 无站内上牌"，compact 时不带空格"""
+        op = ">" if pack_price > self.price_cutoff else "≤"
+        license_ = "有" if has_station_license else "无"
+        text = f"服务包价格 {op} {self.price_cutoff} 且 {license_}站内上牌"
+        return text.replace(" ", "") if compact else text
+
+    def lookup_array(self, pack_price, has_station_license, conversion_rate):
+        """
+        向量化查找：三个参数为等长数组（或可广播的标量），返回每行的单价数组
+
+        批量计算时按分组各做一次 searchsorted，不逐行判断
+        """
+        import numpy as np
+
+        pack_price, has_station_license, conversion_rate = np.broadcast_arrays(
+            np.asarray(pack_price, dtype=float),
+            np.asarray(has_station_license, dtype=bool),
+            np.asarray(conversion_rate, dtype=float))
+        high = pack_price > self.price_cutoff
+
+        result = np.zeros(conversion_rate.shape, dtype=float)
+        for name, (bands, rates) in self.groups.items():
+            is_high, licensed = GROUPS[name]
+            mask = (high == is_high) & (has_station_license == licensed)
+            if mask.any():
+                index = np.searchsorted(np.asarray(bands), conversion_rate[mask], side="right")
+                result[mask] = np.asarray(rates, dtype=float)[index]
+        return result
+
+
+DEFAULT_RATES = CommissionRateTable.from_config(DEFAULT_RATE_TABLE)
+V13_RATES = CommissionRateTable.from_config(V13_RATE_TABLE)
+
+
+def load_rate_table(path=None, default=DEFAULT_RATES, filename=RATE_TABLE_FILE):
+    """
+    读取JSON单价表
+
+    未指定路径时使用当前目录下的 filename（v13 为 V13_RATE_TABLE_FILE），文件不存在则返回 default
+    """
+    if not path:
+        if not os.path.exists(filename):
+            return default
+        path = filename
+    return CommissionRateTable.load(path)
@@ -0,0 +1,98 @@
+"""
+门店员工名单（v28 计算器）
+
+v13/v26/v28 界面把员工写死为两行，每名员工四个 tk.StringVar，计算时再转成字典列表。
+旗舰店和区域人员池动辄几百人，逐人建 Tk 变量和字典既慢又占内存。这里按列存储名单：
+旧底薪、基本绩效、岗位绩效、补贴各一个 float64 数组，每名员工只占 4 个浮点数；
+calculate_store 一次遍历名单同时算出旧薪资和新底薪中/低两种模式的档1单价。
+
+名单文件（CSV / Excel / Parquet）的列名为 旧底薪、基本绩效、岗位绩效、补贴
+（也可以用字段名 old_base 等），空值按 0 计。
+"""
+from array import array
+
+# 每名员工的字段，顺序即基本薪资的加法顺序
+STAFF_FIELDS = ("old_base", "basic_perf", "post_perf", "subsidy")
+
+# 名单中文列名 -> 字段名
+STAFF_ALIASES = {
+    "旧底薪": "old_base",
+    "基本绩效": "basic_perf",
+    "岗位绩效": "post_perf",
+    "补贴": "subsidy",
+}
+
+# 界面默认的两名员工
+DEFAULT_STAFF = (
+    {"old_base": 2000.0, "basic_perf": 550.0, "post_perf": 200.0, "subsidy": 1100.0},
+    {"old_base": 2200.0, "basic_perf": 650.0, "post_perf": 400.0, "subsidy": 1100.0},
+)
+
+
+class StaffRoster:
+    """
+    按列存储的员工名单
+
+    迭代和下标取到的是 {字段名: 值} 字典（与原 staff_list 的元素相同），
+    只在显示计算过程时才逐人生成；批量计算用 basic_salaries()。
+    """
+
+    __slots__ = STAFF_FIELDS
+
+    def __init__(self, staff=()):
+        for name in STAFF_FIELDS:
+            setattr(self, name, array("d"))
+        self.extend(staff)
+
+    @classmethod
+    def from_columns(cls, **columns):
+        """由四列数值创建（各列长度相同）"""
+        roster = cls()
+        lengths = {len(columns[name]) for name in STAFF_FIELDS}
+        if len(lengths) > 1:
+            raise ValueError("员工名单各列长度不一致")
+        for name in STAFF_FIELDS:
+            getattr(roster, name).extend(float(v) for v in columns[name])
+        return roster
+
+    @classmethod
+    def from_table(cls, df):
+        """由 DataFrame 创建，缺少的列报错，空值按 0 计"""
+        import pandas as pd
+
+        df = df.rename(columns=lambda c: STAFF_ALIASES.get(str(c).strip(), str(c).strip()))
+        missing = [label for label, name in STAFF_ALIASES.items() if name not in df]
+        if missing:
+            raise ValueError(f"员工名单缺少列: {', '.join(missing)}")
+        return cls.from_columns(**{name: pd.to_numeric(df[name], errors="raise").fillna(0).to_numpy(dtype=float)
+                                   for name in STAFF_FIELDS})
+
+    @classmethod
+    def read(cls, path):
+        """读取名单文件（CSV / Excel / Parquet）"""
+        from .tables import read_table
+
+        return cls.from_table(read_table(path, normalize=False))
+
+    def append(self, staff):
+        for name in STAFF_FIELDS:
+            getattr(self, name).append(float(staff[name]))
+
+    def extend(self, staff_list):
+        for staff in staff_list:
+            self.append(staff)
+
+    def __len__(self):
+        return len(self.old_base)
+
+    def __getitem__(self, index):
+        return {name: getattr(self, name)[index] for name in STAFF_FIELDS}
+
+    def __iter__(self):
+        return (dict(zip(STAFF_FIELDS, values)) for values in
+                zip(self.old_base, self.basic_perf, self.post_perf, self.subsidy))
+
+    def basic_salaries(self):
+        """每名员工的 旧底薪 + 基本绩效 + 岗位绩效 + 补贴"""
+        return array("d", (a + b + c + d for a, b, c, d in
+                           zip(self.old_base, self.basic_perf, self.post_perf, self.subsidy)))
@@ -0,0 +1,324 @@
+"""
+场景结果缓存
+
+分析人员经常反复加载同一份配置、重复生成同样的对比报告和门店分析。这里把影响计算结果的参数
+按参数表规范化（数值统一为浮点数，100 与 100.0 视为相同）后取哈希，计算结果（四种模式下每类员工的
+薪资、门店报告中的底薪/提成/补贴、社保和净利润）按哈希存入磁盘上的 SQLite 文件，
+超过容量时淘汰最久未使用的场景。已算过的场景再次打开或批量重跑时直接读取，不再计算。
+
+最近用过的场景同时保存在内存中（ScenarioCache），同一进程内重复生成报告时连磁盘也不读。
+界面先查内存缓存，没有时在后台线程中读写磁盘缓存，重新打开程序后已算过的场景也不再计算；
+命令行 report --cache 使用磁盘缓存。结果以 float64 数组存储，读取时不需要解析文本。
+"""
+import hashlib
+import json
+import numbers
+import os
+import sqlite3
+import time
+from array import array
+from collections import OrderedDict, namedtuple
+from dataclasses import astuple, fields
+
+from .engine import (MODES, ROLES, ModeCost, RoleSalary, SalaryParams, SocialInsurance, StoreReport,
+                     salary_matrix, store_report)
+from .schema import PARAMETERS
+
+
+# 默认缓存文件（用户主目录下）
+DEFAULT_STORE_PATH = os.path.join(os.path.expanduser("~"), ".salary_calculator", "scenarios.sqlite3")
+
+# 默认最多保留的场景数
+DEFAULT_MAX_ENTRIES = 100000
+
+# 计算公式或结果结构变化时修改版本号，使旧缓存失效
+RESULT_VERSION = 3
+
+# 内存中保留的最近使用场景数（同一进程内重复打开时不读磁盘）
+DEFAULT_MEMORY_ENTRIES = 256
+
+# SQLite 单条语句的参数个数有上限，批量查询时分批
+_BATCH = 500
+
+# 不影响计算结果、不参与哈希的参数：界面上当前选择的员工类型和模式（场景结果包含全部模式和
+# 员工类型）、只读的档1提成展示值，以及展示模块的平均值。
+# current_month 也不影响结果，但保留在哈希中，不同月份的场景分开缓存
+_DISPLAY_FIELDS = frozenset(("employee_type", "salary_mode", "bonus_tier1_amount", "avg_total_salary",
+                             "avg_delivery", "avg_purchase", "avg_conversion_rate"))
+_KEY_FIELDS = [f.name for f in fields(SalaryParams) if f.name not in _DISPLAY_FIELDS]
+_SOCIAL_FIELDS = [f.name for f in fields(SocialInsurance)]
+
+# report: 门店报告 StoreReport；salaries: {模式: {员工类型: 薪资}}（不论该类员工人数是否为0），
+# 门店总人数为0时人均薪资无定义，salaries 为 None
+ScenarioResult = namedtuple("ScenarioResult", "report salaries")
+
+
+def normalized_config(params):
+    """按参数表规范化的配置字典（数值统一为浮点数，文字为字符串）"""
+    return {p.name: str(getattr(params, p.name)) if p.type is str else float(getattr(params, p.name))
+            for p in PARAMETERS}
+
+
+def _integer_counts(params):
+    """各类员工人数是否为整数（结果中的人数保持参数的类型，整数显示为 “2人”，浮点数为 “2.0人”）"""
+    return [isinstance(count, numbers.Integral) for _, count in params.role_counts()]
+
+
+def scenario_key(params):
+    """
+    影响计算结果的参数（规范化后）的内容哈希，跨进程、跨机器一致
+
+    人数的整数/浮点类型也在哈希中：结果中的人数保持参数的类型，类型不同的场景分开缓存
+    """
+    config = normalized_config(params)
+    values = [RESULT_VERSION] + [config[name] for name in _KEY_FIELDS] + _integer_counts(params)
+    return hashlib.sha1(json.dumps(values, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def compute_scenario(params):
+    """计算一个场景的全部结果（门店报告和各员工类型的薪资共用一个薪资矩阵）"""
+    if not params.total_staff:
+        return ScenarioResult(store_report(params), None)
+    matrix = salary_matrix(params)
+    return ScenarioResult(store_report(params, matrix=matrix), matrix.salaries())
+
+
+def _dump(result):
+    """
+    结果压平为 float64 数组的字节串（模式、员工类型按 MODES / ROLES 的顺序）
+
+    开头是各类员工的人数和是否为整数，读取时按原类型还原，不依赖查询时的参数
+    """
+    report = result.report
+    values = []
+    for r in report.modes[0].roles:
+        values += [r.count, isinstance(r.count, numbers.Integral)]
+    values += [report.total_revenue, report.unit_profit, report.total_profit]
+    values += astuple(report.social)[:-1]
+    for mode in report.modes:
+        values += [mode.social_cost, mode.city_cost, mode.total_profit]
+        for r in mode.roles:
+            values += [r.base, r.bonus, r.subsidy]
+    if result.salaries is not None:
+        for mode in MODES:
+            values += [result.salaries[mode][role] for role in ROLES]
+    return array("d", values).tobytes()
+
+
+def _load(data):
+    values = array("d")
+    values.frombytes(data)
+    i = 2 * len(ROLES)
+    counts = [int(count) if integer else count for count, integer in zip(values[0:i:2], values[1:i:2])]
+    totals = values[i:i + 3]
+    i += 3
+    social = SocialInsurance(*values[i:i + len(_SOCIAL_FIELDS) - 1], sum(counts))
+    i += len(_SOCIAL_FIELDS) - 1
+    modes = []
+    for mode in MODES:
+        social_cost, city_cost, total_profit = values[i:i + 3]
+        i += 3
+        roles = []
+        for role, count in zip(ROLES, counts):
+            # 与 store_report 一致：人数为0的员工类型各项为整数0
+            roles.append(RoleSalary(role, count, *values[i:i + 3]) if count else RoleSalary(role, count, 0, 0, 0))
+            i += 3
+        modes.append(ModeCost(mode, tuple(roles), social_cost, city_cost, total_profit))
+    salaries = None
+    if i < len(values):
+        salaries = {}
+        for mode in MODES:
+            salaries[mode] = dict(zip(ROLES, values[i:i + len(ROLES)]))
+            i += len(ROLES)
+    return ScenarioResult(StoreReport(*totals, social, tuple(modes)), salaries)
+
+
+class ScenarioCache:
+    """进程内的场景结果缓存，按最近使用时间淘汰（LRU），不读写磁盘"""
+
+    def __init__(self, max_entries=DEFAULT_MEMORY_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def lookup(self, key):
+        """按哈希取结果，没有时返回 None"""
+        result = self._entries.get(key)
+        if result is None:
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def remember(self, key, result):
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def result(self, params):
+        """取场景结果，未缓存时计算；返回 (结果, 是否命中缓存)"""
+        key = scenario_key(params)
+        cached = self.lookup(key)
+        if cached is not None:
+            self.hits += 1
+            return cached, True
+        self.misses += 1
+        result = compute_scenario(params)
+        self.remember(key, result)
+        return result, False
+
+    def clear(self):
+        self._entries.clear()
+
+
+class ScenarioStore:
+    """
+    磁盘上的场景结果缓存，按最近使用时间淘汰（LRU）
+
+    同一个文件可以被多个进程同时打开；一个对象只在创建它的线程中使用。
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH, max_entries=DEFAULT_MAX_ENTRIES,
+                 memory_entries=DEFAULT_MEMORY_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._memory = ScenarioCache(memory_entries)
+        self._touched = set()
+        self.hits = 0
+        self.misses = 0
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS scenarios (
+                key TEXT PRIMARY KEY,
+                config TEXT NOT NULL,
+                result BLOB NOT NULL,
+                last_used REAL NOT NULL
+            )""")
+        self._db.execute("CREATE INDEX IF NOT EXISTS scenarios_last_used ON scenarios (last_used)")
+        self._db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM scenarios").fetchone()[0]
+
+    def get(self, params):
+        """取缓存的结果，没有时返回 None"""
+        return self.get_many([params])[0]
+
+    def get_many(self, params_list):
+        """批量取缓存，返回与输入对应的列表（未缓存的为 None）"""
+        keys = [scenario_key(p) for p in params_list]
+        found = {}
+        for key in keys:
+            result = self._memory.lookup(key)
+            if result is not None:
+                found[key] = result
+
+        unique = [k for k in dict.fromkeys(keys) if k not in found]
+        loaded = {}
+        for start in range(0, len(unique), _BATCH):
+            batch = unique[start:start + _BATCH]
+            rows = self._db.execute(
+                f"SELECT key, result FROM scenarios WHERE key IN ({','.join('?' * len(batch))})", batch)
+            loaded.update((key, _load(data)) for key, data in rows)
+        for key, result in loaded.items():
+            self._memory.remember(key, result)
+        found.update(loaded)
+        # 最近使用时间攒到写入或关闭时再批量更新，读缓存不必每次提交事务
+        self._touched.update(found)
+        if len(self._touched) >= _BATCH:
+            self._flush_touched()
+
+        results = [found.get(k) for k in keys]
+        hit = sum(r is not None for r in results)
+        self.hits += hit
+        self.misses += len(results) - hit
+        return results
+
+    def _flush_touched(self):
+        if not self._touched:
+            return
+        now = time.time()
+        self._db.executemany("UPDATE scenarios SET last_used = ? WHERE key = ?", [(now, k) for k in self._touched])
+        self._db.commit()
+        self._touched.clear()
+
+    def put(self, params, result):
+        self.put_many([(params, result)])
+
+    def put_many(self, items):
+        """批量写入 [(参数, ScenarioResult), ...]，然后按容量淘汰"""
+        self._flush_touched()
+        now = time.time()
+        rows = []
+        for params, result in items:
+            key = scenario_key(params)
+            self._memory.remember(key, result)
+            rows.append((key, json.dumps(normalized_config(params), ensure_ascii=False), _dump(result), now))
+        self._db.executemany("INSERT OR REPLACE INTO scenarios VALUES (?, ?, ?, ?)", rows)
+        self._db.commit()
+        self.evict()
+
+    def evict(self):
+        """删除超出容量的最久未使用场景，返回删除的条数"""
+        self._flush_touched()
+        excess = len(self) - self.max_entries
+        if excess <= 0:
+            return 0
+        self._db.execute("DELETE FROM scenarios WHERE key IN "
+                         "(SELECT key FROM scenarios ORDER BY last_used LIMIT ?)", (excess,))
+        self._db.commit()
+        return excess
+
+    def result(self, params):
+        """取场景结果，未缓存时计算并写入缓存；返回 (结果, 是否命中缓存)"""
+        cached = self.get(params)
+        if cached is not None:
+            return cached, True
+        result = compute_scenario(params)
+        self.put(params, result)
+        return result, False
+
+    def results(self, params_list, compute=None):
+        """
+        批量取场景结果，只计算未缓存的场景
+
+        compute: 计算一组参数的函数（返回 ScenarioResult 列表），默认逐个 compute_scenario，
+                 可以传入多进程的实现
+        """
+        results = self.get_many(params_list)
+        # 按哈希去重：SalaryParams 中 2 与 2.0 相等，但人数类型不同的是不同的场景
+        missing = {}
+        for index, (params, result) in enumerate(zip(params_list, results)):
+            if result is None:
+                missing.setdefault(scenario_key(params), (params, []))[1].append(index)
+        if missing:
+            todo = [params for params, _ in missing.values()]
+            computed = compute(todo) if compute else [compute_scenario(p) for p in todo]
+            self.put_many(list(zip(todo, computed)))
+            for (_, indexes), result in zip(missing.values(), computed):
+                for index in indexes:
+                    results[index] = result
+        return results
+
+    def clear(self):
+        self._memory.clear()
+        self._touched.clear()
+        self._db.execute("DELETE FROM scenarios")
+        self._db.commit()
+
+    def close(self):
+        self._flush_touched()
+        self._db.close()
@@ -0,0 +1,111 @@
+"""
+界面后台重算调度
+
+输入框每敲一个字符都会触发 trace_add 回调，如果在回调里直接计算，耗时的求解会卡住
+Tk 主循环。RecomputeScheduler 把一次重算拆成三步：
+
+    prepare()        主线程：读取界面变量（Tk 变量只能在主线程访问）
+    compute(inputs)  工作线程：执行计算
+    apply(result)    主线程：把结果写回界面
+
+连续输入时先防抖，停止输入 delay 毫秒后才开始计算；计算期间有新的输入时，旧任务的
+结果直接丢弃，只显示最新一次输入的结果。工作线程不直接操作 Tk，结果放入队列，
+由主线程通过 root.after 轮询取回。
+"""
+import queue
+import threading
+
+
+# 防抖延迟和结果轮询间隔（毫秒）
+DEFAULT_DELAY = 300
+DEFAULT_POLL_INTERVAL = 50
+
+
+class RecomputeScheduler:
+    """防抖 + 后台线程的重算调度器，所有公开方法都只能在主线程调用"""
+
+    def __init__(self, root, prepare, compute, apply, on_error=None,
+                 delay=DEFAULT_DELAY, poll_interval=DEFAULT_POLL_INTERVAL):
+        self.root = root
+        self.prepare = prepare
+        self.compute = compute
+        self.apply = apply
+        self.on_error = on_error
+        self.delay = delay
+        self.poll_interval = poll_interval
+
+        self._generation = 0
+        self._pending = None
+        self._polling = None
+        self._running = 0
+        self._results = queue.Queue()
+
+    def schedule(self, *args):
+        """输入变化时调用（可直接作为 trace_add / bind 的回调），重新开始防抖计时"""
+        self.cancel()
+        self._pending = self.root.after(self.delay, self._start)
+
+    def cancel(self):
+        """取消尚未开始的计算，并作废正在进行的计算"""
+        self._generation += 1
+        if self._pending is not None:
+            self.root.after_cancel(self._pending)
+            self._pending = None
+
+    def run_now(self):
+        """跳过防抖立即在后台开始计算"""
+        self.cancel()
+        self._start()
+
+    def _start(self):
+        self._pending = None
+        generation = self._generation
+        try:
+            inputs = self.prepare()
+        except Exception as e:
+            self._report_error(e)
+            return
+        if inputs is None:
+            return
+
+        worker = threading.Thread(target=self._work, args=(generation, inputs), daemon=True)
+        self._running += 1
+        worker.start()
+        # 已有轮询在排队时不再另起一个，否则每次开始计算都会多出一条轮询链
+        if self._polling is None:
+            self._poll()
+
+    def _work(self, generation, inputs):
+        """工作线程：只做计算，不访问 Tk"""
+        try:
+            self._results.put((generation, True, self.compute(inputs)))
+        except Exception as e:
+            self._results.put((generation, False, e))
+
+    def _poll(self):
+        """主线程：取回已完成的结果，丢弃过期任务的结果"""
+        self._polling = None
+        while True:
+            try:
+                generation, ok, result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._running -= 1
+            if generation != self._generation:
+                continue
+            if ok:
+                self.apply(result)
+            else:
+                self._report_error(result)
+
+        if self._running > 0:
+            self._polling = self.root.after(self.poll_interval, self._poll)
+
+    def _report_error(self, error):
+        if self.on_error is not None:
+            self.on_error(error)
+
+    @property
+    def busy(self):
+        """是否还有等待或进行中的计算"""
+        return self._pending is not None or self._running > 0
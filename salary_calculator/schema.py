@@ -0,0 +1,187 @@
+"""
+参数表
+
+v6 界面原来在 create_variables、各标签页控件、save_config、load_config（带硬编码默认值）
+和 export_excel 中各写一遍约45个参数的名称和默认值。这里把每个参数的显示名称、单位、分组和
+控件类型集中声明一次，类型和默认值取自 SalaryParams；配置读写、Excel 参数表、门店表中文列名
+和界面控件都由这张表生成。
+
+parse_config 不依赖 Tk，可以一次性批量读取、校验成千上万份场景配置。
+"""
+import json
+from collections import namedtuple
+from dataclasses import fields
+
+from .engine import MODES, ROLES, SalaryParams
+
+
+# name: SalaryParams 字段名；label: 显示名称（界面、Excel、门店表列名）；unit: 单位（无单位为空）
+# group: 所属分组；widget: 控件类型 entry / readonly / combo / radio；choices: 可选值
+Param = namedtuple("Param", "name type default label unit group widget choices")
+
+# title: 界面中分组框的标题；tab: 所在标签页；per_row: 每行几个参数；width: 输入框宽度
+# export: 是否导出到 Excel 参数表（工作表名为分组名）
+Group = namedtuple("Group", "name title tab per_row width export")
+
+GROUPS = (
+    Group("薪资模式", "薪资模式", "参数设置", 3, 15, False),
+    Group("基础参数", "基础参数", "参数设置", 2, 15, True),
+    Group("人员配置", "门店人员配置", "参数设置", 3, 10, True),
+    Group("职位补贴", "职位补贴配置", "参数设置", 4, 10, True),
+    Group("员工类型", "员工类型选择", "参数设置", 1, 12, False),
+    Group("旧薪资体系", "旧薪资体系参数", "参数设置", 2, 15, True),
+    Group("新薪资体系", "新薪资体系参数", "参数设置", 2, 15, True),
+    Group("社保参数", "社保参数设置", "社保计算", 2, 15, True),
+    Group("展示模块", "展示模块参数", "参数设置", 2, 15, True),
+)
+GROUPS_BY_NAME = {g.name: g for g in GROUPS}
+
+# 界面上可选的薪资模式（旧薪资体系只用于对比，不可选）
+SALARY_MODES = MODES[1:]
+
+# (字段名, 显示名称, 单位, 分组[, 控件类型[, 可选值]])，同一分组内按界面顺序排列
+_DECLARATIONS = (
+    ("salary_mode", "薪资模式", "", "薪资模式", "radio", SALARY_MODES),
+
+    ("delivery_amount", "交付量", "", "基础参数"),
+    ("purchase_amount", "购买服务包数量", "包", "基础参数"),
+    ("service_price", "服务包单价", "元", "基础参数"),
+    ("service_cost", "服务包必要支出", "元", "基础参数"),
+
+    ("employee_count", "员工数量", "人", "人员配置"),
+    ("supervisor_count", "主管数量", "人", "人员配置"),
+    ("consultant_count", "顾问数量", "人", "人员配置"),
+    ("regional_manager_count", "区总数量", "人", "人员配置"),
+    ("city_manager_count", "市总数量", "人", "人员配置"),
+
+    ("supervisor_bonus", "主管补贴", "元", "职位补贴"),
+    ("consultant_bonus", "顾问补贴", "元", "职位补贴"),
+    ("regional_manager_bonus", "区总补贴", "元", "职位补贴"),
+    ("city_manager_bonus", "市总补贴", "元", "职位补贴"),
+
+    ("employee_type", "员工类型", "", "员工类型", "combo", ROLES),
+
+    ("old_base_salary", "底薪", "元", "旧薪资体系"),
+    ("old_basic_bonus", "基本绩效", "元", "旧薪资体系"),
+    ("old_position_bonus", "岗位绩效", "元", "旧薪资体系"),
+    ("old_extra_bonus", "奖金", "元", "旧薪资体系"),
+
+    ("new_base_salary_mid", "新底薪（中）", "元", "新薪资体系"),
+    ("new_base_salary_low", "新底薪（低）", "元", "新薪资体系"),
+    ("old_purchase_baseline", "旧购买服务包基准", "包", "新薪资体系"),
+    ("bonus_tier1_threshold", "档1占比阈值", "", "新薪资体系"),
+    ("bonus_tier2_threshold", "档2占比阈值", "", "新薪资体系"),
+    # 档1每包提成由底薪差和基准包数推算，界面只读
+    ("bonus_tier1_amount", "档1每包提成", "元", "新薪资体系", "readonly"),
+    ("bonus_tier2_amount", "档2每包提成", "元", "新薪资体系"),
+    ("bonus_tier3_amount", "档3每包提成", "元", "新薪资体系"),
+    ("new_purchase_amount", "新服务包购买数量", "包", "新薪资体系"),
+    ("min_conversion_rate", "下线转化率", "%", "新薪资体系"),
+    ("penalty_rate", "未达标折扣率", "", "新薪资体系"),
+
+    ("social_insurance_base", "社保基数", "元", "社保参数"),
+    ("pension_rate", "养老保险比例", "%", "社保参数"),
+    ("medical_rate", "医疗保险比例", "%", "社保参数"),
+    ("unemployment_rate", "失业保险比例", "%", "社保参数"),
+    ("injury_rate", "工伤保险比例", "%", "社保参数"),
+    ("maternity_rate", "生育保险比例", "%", "社保参数"),
+    ("housing_fund_rate", "住房公积金比例", "%", "社保参数"),
+
+    ("current_month", "当前月份", "", "展示模块"),
+    ("avg_total_salary", "平均总薪资", "元", "展示模块"),
+    ("avg_delivery", "平均交付量", "", "展示模块"),
+    ("avg_purchase", "平均购买服务包数", "包", "展示模块"),
+    ("avg_conversion_rate", "平均转化率", "%", "展示模块"),
+    ("city_cost", "城市平均成本", "元", "展示模块"),
+)
+
+
+def _build_parameters():
+    declared = {d[0]: d for d in _DECLARATIONS}
+    names = [f.name for f in fields(SalaryParams)]
+    if set(declared) != set(names):
+        raise RuntimeError(f"参数表与 SalaryParams 字段不一致: {sorted(set(declared) ^ set(names))}")
+
+    unknown = {d[3] for d in _DECLARATIONS} - set(GROUPS_BY_NAME)
+    if unknown:
+        raise RuntimeError(f"未定义的参数分组: {sorted(unknown)}")
+
+    by_name = {f.name: f for f in fields(SalaryParams)}
+    parameters = []
+    for name, label, unit, group, *rest in _DECLARATIONS:
+        widget = rest[0] if rest else "entry"
+        choices = tuple(rest[1]) if len(rest) > 1 else ()
+        f = by_name[name]
+        parameters.append(Param(name, f.type, f.default, label, unit, group, widget, choices))
+    return tuple(parameters)
+
+
+PARAMETERS = _build_parameters()
+PARAMETERS_BY_NAME = {p.name: p for p in PARAMETERS}
+
+
+def group_parameters(group):
+    """某个分组内的参数（按界面顺序）"""
+    return [p for p in PARAMETERS if p.group == group]
+
+
+def export_sheets():
+    """Excel 参数表: [(工作表名, [(显示名称, 字段名), ...]), ...]"""
+    return [(g.name, [(p.label, p.name) for p in group_parameters(g.name)]) for g in GROUPS if g.export]
+
+
+def display_label(param):
+    """界面上的标签文字，如 “养老保险比例(%):”"""
+    return f"{param.label}({param.unit}):" if param.unit else f"{param.label}:"
+
+
+def coerce_value(param, value):
+    """把配置中的值转换为参数类型，无法转换时抛出 ValueError"""
+    if isinstance(value, bool):
+        raise ValueError("不能是布尔值")
+    if param.type is str:
+        value = str(value)
+    else:
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            raise ValueError("必须是数字") from None
+        if param.type is int:
+            if not number.is_integer():
+                raise ValueError("必须是整数")
+            number = int(number)
+        value = number
+    if param.choices and value not in param.choices:
+        raise ValueError(f"只能是 {'/'.join(param.choices)}")
+    return value
+
+
+def parse_config(config):
+    """
+    校验并转换 save_config 保存的配置字典，返回 SalaryParams
+
+    缺失的键使用默认值，多余的键忽略；所有出错的参数一起列在 ValueError 中
+    """
+    values, errors = {}, []
+    for param in PARAMETERS:
+        if param.name not in config:
+            continue
+        try:
+            values[param.name] = coerce_value(param, config[param.name])
+        except (TypeError, ValueError) as e:
+            errors.append(f"{param.label}({param.name})={config[param.name]!r} {e}")
+    if errors:
+        raise ValueError("配置参数有误: " + "；".join(errors))
+    return SalaryParams(**values)
+
+
+def load_config(path):
+    """读取并校验一份配置文件"""
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_config(json.load(f))
+
+
+def save_config(params, path):
+    """按 save_config 的格式保存参数"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(params.to_config(), f, ensure_ascii=False, indent=4)
@@ -0,0 +1,210 @@
+"""
+员工名单的社保与公积金计算
+
+calculate_social_insurance 只用一个社保基数乘以门店人数。实际名单中每个员工的缴费基数不同，
+而且各城市有缴费基数的下限和上限（住房公积金另有一套上下限）。这里按员工名单（基数、城市、
+员工类型）一次性向量化计算每人的六项缴费，不逐行循环，几万名员工也只需几十毫秒；
+按门店汇总后可以直接代替 store_report 中的社保成本。
+
+城市上下限JSON格式（与 DEFAULT_CITY_LIMITS 相同，金额单位为元）:
+
+    {
+        "default": {"floor": 0, "cap": null},
+        "cities": {
+            "上海": {"floor": 7310, "cap": 36549, "housing_floor": 2690, "housing_cap": 36549},
+            "杭州": {"floor": 4462, "cap": 24930, "rates": {"housing_fund_rate": 12}}
+        }
+    }
+
+floor / cap 为社保缴费基数的下限 / 上限（null 表示不限）；housing_floor / housing_cap 为公积金
+缴费基数的上下限，不填时与社保相同；rates 可覆盖该城市的缴费比例（字段名同 SalaryParams，
+不填的比例取参数中的值）。名单中的城市不在表中时使用 default。
+"""
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from .engine import SalaryParams, SocialInsurance
+
+
+# 计算器启动时若当前目录下有此文件，则用它作为城市上下限表
+CITY_LIMITS_FILE = "社保基数上下限.json"
+
+# 默认不限制缴费基数（各地标准每年调整，由JSON文件提供）
+DEFAULT_CITY_LIMITS = {"default": {"floor": 0, "cap": None}, "cities": {}}
+
+# 六项缴费：(结果列名, 比例字段, 是否按公积金基数)
+CONTRIBUTIONS = (
+    ("养老保险", "pension_rate", False),
+    ("医疗保险", "medical_rate", False),
+    ("失业保险", "unemployment_rate", False),
+    ("工伤保险", "injury_rate", False),
+    ("生育保险", "maternity_rate", False),
+    ("住房公积金", "housing_fund_rate", True),
+)
+RATE_FIELDS = tuple(field for _, field, _ in CONTRIBUTIONS)
+
+# 名单中文列名 -> 字段名（tables.read_table 已按参数表改名的列也在内）
+ROSTER_ALIASES = {
+    "社保基数": "base",
+    "缴费基数": "base",
+    "social_insurance_base": "base",
+    "城市": "city",
+    "员工类型": "role",
+    "employee_type": "role",
+    "门店": "store",
+    "门店编号": "store",
+}
+
+
+class CityLimit:
+    """一个城市的缴费基数上下限和缴费比例覆盖值"""
+
+    def __init__(self, floor=0, cap=None, housing_floor=None, housing_cap=None, rates=None):
+        self.floor = float(floor or 0)
+        self.cap = math.inf if cap is None else float(cap)
+        self.housing_floor = self.floor if housing_floor is None else float(housing_floor)
+        self.housing_cap = self.cap if housing_cap is None else float(housing_cap)
+        self.rates = dict(rates or {})
+        if self.floor > self.cap or self.housing_floor > self.housing_cap:
+            raise ValueError(f"缴费基数下限不能高于上限: {self.floor} > {self.cap}")
+        unknown = set(self.rates) - set(RATE_FIELDS)
+        if unknown:
+            raise ValueError(f"未知的缴费比例: {sorted(unknown)}")
+
+    def to_config(self):
+        config = {"floor": self.floor, "cap": None if math.isinf(self.cap) else self.cap,
+                  "housing_floor": self.housing_floor,
+                  "housing_cap": None if math.isinf(self.housing_cap) else self.housing_cap}
+        if self.rates:
+            config["rates"] = dict(self.rates)
+        return config
+
+
+class CityLimitTable:
+    """各城市的缴费基数上下限表"""
+
+    def __init__(self, cities, default=None):
+        self.default = default if isinstance(default, CityLimit) else CityLimit(**(default or {}))
+        self.cities = {name: limit if isinstance(limit, CityLimit) else CityLimit(**limit)
+                       for name, limit in cities.items()}
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config.get("cities", {}), config.get("default"))
+
+    @classmethod
+    def load(cls, path):
+        """从JSON文件读取上下限表"""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_config(json.load(f))
+
+    def to_config(self):
+        return {"default": self.default.to_config(),
+                "cities": {name: limit.to_config() for name, limit in self.cities.items()}}
+
+    def limit(self, city):
+        return self.cities.get(city, self.default)
+
+
+DEFAULT_LIMITS = CityLimitTable.from_config(DEFAULT_CITY_LIMITS)
+
+
+def load_city_limits(path=None, default=DEFAULT_LIMITS):
+    """
+    读取JSON上下限表
+
+    未指定路径时使用当前目录下的 CITY_LIMITS_FILE，文件不存在则返回 default
+    """
+    if not path:
+        if not os.path.exists(CITY_LIMITS_FILE):
+            return default
+        path = CITY_LIMITS_FILE
+    return CityLimitTable.load(path)
+
+
+def normalize_roster(roster):
+    """把名单的中文列名转换为 base / city / role / store"""
+    return roster.rename(columns=lambda c: ROSTER_ALIASES.get(str(c).strip(), str(c).strip()))
+
+
+def calculate_roster(roster, params=None, limits=None):
+    """
+    计算名单中每个员工的社保和公积金
+
+    roster: DataFrame，列 base（缴费基数，空值取 params.social_insurance_base）、
+            city（城市，可无）、role（员工类型，原样保留在名单中）
+    返回与 roster 行索引相同的 DataFrame：缴费基数、公积金基数、六项缴费和 社保合计
+    """
+    params = params or SalaryParams()
+    limits = limits or DEFAULT_LIMITS
+    roster = normalize_roster(roster)
+    n = len(roster)
+
+    if "base" in roster:
+        base = pd.to_numeric(roster["base"], errors="coerce").to_numpy(dtype=float)
+        base = np.where(np.isnan(base), float(params.social_insurance_base), base)
+    else:
+        base = np.full(n, float(params.social_insurance_base))
+
+    # 每个城市的上下限和比例只查一次，再按城市编号取到每一行
+    if "city" in roster:
+        codes, cities = pd.factorize(roster["city"])
+    else:
+        codes, cities = np.full(n, -1), []
+    # 最后一项给没有城市（编号为 -1）的行，numpy 的 -1 下标正好取到它
+    city_limits = [limits.limit(city) for city in cities] + [limits.default]
+
+    def per_row(values):
+        return np.asarray(values, dtype=float)[codes]
+
+    social_base = np.clip(base, per_row([c.floor for c in city_limits]), per_row([c.cap for c in city_limits]))
+    housing_base = np.clip(base, per_row([c.housing_floor for c in city_limits]),
+                           per_row([c.housing_cap for c in city_limits]))
+
+    columns = {"缴费基数": social_base, "公积金基数": housing_base}
+    total = np.zeros(n)
+    for name, field, housing in CONTRIBUTIONS:
+        rate = per_row([c.rates.get(field, getattr(params, field)) for c in city_limits])
+        columns[name] = (housing_base if housing else social_base) * (rate / 100)
+        total = total + columns[name]
+    columns["社保合计"] = total
+    return pd.DataFrame(columns, index=roster.index)
+
+
+def _social(means, count):
+    """按人均缴费构造 SocialInsurance（人均 × 人数即为名单的社保总成本）"""
+    return SocialInsurance(
+        base=float(means["缴费基数"]),
+        pension=float(means["养老保险"]),
+        medical=float(means["医疗保险"]),
+        unemployment=float(means["失业保险"]),
+        injury=float(means["工伤保险"]),
+        maternity=float(means["生育保险"]),
+        housing_fund=float(means["住房公积金"]),
+        total_staff=int(count),
+    )
+
+
+def roster_summary(contributions):
+    """calculate_roster 的结果汇总为一个 SocialInsurance"""
+    return _social(contributions.mean(), len(contributions))
+
+
+def roster_social_insurance(roster, params=None, limits=None, store_column=None):
+    """
+    按名单汇总社保，可直接传给 store_report(params, social=...)
+
+    store_column 为空时汇总整份名单，返回一个 SocialInsurance；否则按该列（中文列名
+    “门店”读入后为 store）分组，返回 {门店: SocialInsurance}
+    """
+    contributions = calculate_roster(roster, params, limits)
+    if store_column is None:
+        return roster_summary(contributions)
+    stores = normalize_roster(roster)[store_column].to_numpy()
+    grouped = contributions.groupby(stores, sort=False)
+    means, counts = grouped.mean(), grouped.size()
+    return {store: _social(row, counts[store]) for store, row in zip(means.index, means.to_dict("records"))}
@@ -0,0 +1,60 @@
+"""
+计算过程记录
+
+界面上的“计算过程”文字原来在计算的同时用 result_text += f"..." 逐行拼接，
+只需要数值的批量计算也要付出格式化的代价，员工多时反复拼接长字符串还是平方复杂度。
+这里把每一步记录为 Step（名称、文字模板、代入的数值、结果），
+只有界面真正显示时才调用 StepLog.render() 统一格式化并一次性拼接。
+"""
+from collections import namedtuple
+
+
+class Step(namedtuple("Step", "name template values result")):
+    """
+    一个计算步骤
+
+    name: 步骤名称（可为 None，如标题行）
+    template: str.format 模板，如 "转化率 = {purchase} / {delivery} × 100% = {result:.2f}%\\n"，
+              模板中的 {result} 指本步骤的结果
+    values: 代入模板的数值字典（固定文字为 None）
+    result: 本步骤的结果数值
+    """
+    __slots__ = ()
+
+    def render(self):
+        if self.values is None:
+            return self.template
+        return self.template.format(result=self.result, **self.values)
+
+
+class StepLog:
+    """按顺序记录的计算步骤，显示时才生成文字"""
+
+    def __init__(self):
+        self.steps = []
+
+    def add(self, template, name=None, result=None, **values):
+        """记录一步，模板中的占位符用 values 填充"""
+        self.steps.append(Step(name, template, values, result))
+        return result
+
+    def text(self, text):
+        """记录一段固定文字（标题、空行等）"""
+        self.steps.append(Step(None, text, None, None))
+
+    def extend(self, other):
+        self.steps.extend(other.steps)
+
+    def __iter__(self):
+        return iter(self.steps)
+
+    def __len__(self):
+        return len(self.steps)
+
+    def results(self):
+        """有名称的步骤的结果 {名称: 结果}，同名步骤取最后一次"""
+        return {step.name: step.result for step in self.steps if step.name is not None}
+
+    def render(self):
+        """生成完整的计算过程文字"""
+        return "".join(step.render() for step in self.steps)
@@ -0,0 +1,31 @@
+"""
+流式批量计算
+
+输入表按块读取 -> 每块调用向量化公式 -> 结果逐块写出，
+任何时刻内存中只有一块数据，峰值内存只取决于 chunksize。
+
+输入中与结果同名的列（转化率、四种模式及分项，如对上次的输出重新计算）视为旧结果，
+不作为参数读取，计算后被新结果替换；新底薪参数请使用字段名 new_base_salary_mid / new_base_salary_low。
+"""
+from .tables import DEFAULT_CHUNKSIZE, TableWriter, iter_table_chunks
+from .vectorized import RESULT_COLUMNS, calculate_batch
+
+
+def iter_results(chunks, params=None, role=None, detail=False):
+    """
+    对每块门店数据计算薪资，产出 输入列+结果列 的 DataFrame
+
+    输入中已有的结果列（如对上次的输出重新计算）先删除，再接上新结果
+    """
+    for chunk in chunks:
+        result = calculate_batch(chunk, params, role=role, detail=detail)
+        yield chunk.drop(columns=[c for c in RESULT_COLUMNS if c in chunk]).join(result)
+
+
+def run_stream(input_path, output_path, params=None, chunksize=DEFAULT_CHUNKSIZE, role=None, detail=False):
+    """流式计算整个文件，返回处理的行数"""
+    with TableWriter(output_path) as writer:
+        chunks = iter_table_chunks(input_path, chunksize, keep=RESULT_COLUMNS)
+        for result in iter_results(chunks, params, role=role, detail=detail):
+            writer.write(result)
+    return writer.rows
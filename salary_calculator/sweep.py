@@ -0,0 +1,146 @@
+"""
+薪资敏感性分析（v5 计算器图表）
+
+salary_calculator_v5.py 的 generate_charts 原来通过反复 self.purchase_amount.set(...)
+再调用 calculate_old_salary / calculate_new_salary_mode2 来取曲线上的点，每次设置都会触发
+Tk 的 trace，而且只取了6个点。这里用 numpy 一次算出整条曲线或整张
+转化率 × 购买量 的二维薪资面，公式与 v5 界面逐项一致，不修改任何界面变量。
+"""
+from collections import namedtuple
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class SweepParams:
+    """v5 计算器中影响薪资的参数，字段名与界面变量名一致"""
+    delivery_amount: float = 100.0
+    purchase_amount: float = 50.0
+    store_staff_count: int = 5
+    employee_type: str = "员工"
+
+    old_base_salary: float = 3000.0
+    old_basic_bonus: float = 500.0
+    old_position_bonus: float = 300.0
+    old_extra_bonus: float = 200.0
+
+    new_base_salary_mid: float = 3500.0
+    new_base_salary_low: float = 2800.0
+    old_purchase_baseline: float = 40.0
+    bonus_tier1_threshold: float = 1.0
+    bonus_tier2_threshold: float = 1.5
+    bonus_extra1: float = 10.0
+    bonus_extra2: float = 20.0
+    new_purchase_amount: float = 0.0
+
+    min_conversion_rate: float = 45.0
+    penalty_rate: float = 0.8
+
+    @classmethod
+    def from_config(cls, config):
+        """从字典创建参数，缺失的键使用默认值，多余的键忽略"""
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in config.items() if k in names})
+
+    @classmethod
+    def names(cls):
+        return [f.name for f in fields(cls)]
+
+
+# 一维曲线：x 为横轴取值，其余为对应的薪资数组（新模式已应用转化率惩罚）
+Sweep = namedtuple("Sweep", "x conversion_rate old mode1 mode2 mode3")
+
+# 二维薪资面：行对应 conversion_rates，列对应 purchase_amounts
+Surface = namedtuple("Surface", "conversion_rates purchase_amounts delivery old mode1 mode2 mode3")
+
+
+def conversion_rate(delivery, purchase):
+    """转化率（%），交付量为0时为0"""
+    delivery = np.asarray(delivery, dtype=float)
+    purchase = np.asarray(purchase, dtype=float)
+    safe = np.where(delivery == 0, 1.0, delivery)
+    return np.where(delivery == 0, 0.0, (purchase / safe) * 100)
+
+
+def old_salary(p, delivery, purchase):
+    """旧薪资体系（v5 calculate_old_salary）"""
+    delivery = np.asarray(delivery, dtype=float)
+    rate = conversion_rate(delivery, purchase)
+    base_calculation = (delivery * rate / 100 - delivery / 2) * 10 / p.store_staff_count
+
+    high = p.old_base_salary + base_calculation + p.old_basic_bonus + p.old_position_bonus + p.old_extra_bonus
+    low = p.old_base_salary + base_calculation + (p.old_basic_bonus + p.old_position_bonus) / 2 + p.old_extra_bonus
+    salary = np.where(rate >= 50, high, low)
+
+    if p.employee_type == "主管":
+        salary = salary + 500
+    return salary
+
+
+def tiered_salary(p, purchase, new_base):
+    """新底薪（中/低）三档提成（v5 calculate_new_salary_mode2/3）"""
+    if p.new_purchase_amount:
+        # 界面中新服务包购买数优先于购买服务包数量
+        purchase = np.full(np.shape(purchase), p.new_purchase_amount, dtype=float)
+    purchase = np.asarray(purchase, dtype=float)
+
+    baseline = p.old_purchase_baseline
+    per_package_bonus = (p.old_base_salary - new_base) / baseline if baseline > 0 else 0
+    tier1_limit = baseline * p.bonus_tier1_threshold
+    tier2_limit = baseline * p.bonus_tier2_threshold
+
+    bonus1 = per_package_bonus * purchase
+    bonus2 = per_package_bonus * tier1_limit + (per_package_bonus + p.bonus_extra1) * (purchase - tier1_limit)
+    bonus3 = (per_package_bonus * tier1_limit +
+              (per_package_bonus + p.bonus_extra1) * (tier2_limit - tier1_limit) +
+              (per_package_bonus + p.bonus_extra2) * (purchase - tier2_limit))
+    bonus = np.where(purchase <= tier1_limit, bonus1, np.where(purchase <= tier2_limit, bonus2, bonus3))
+
+    salary = new_base + bonus
+    if p.employee_type == "主管":
+        salary = salary + 500
+    return salary
+
+
+def apply_penalty(p, salary, rate):
+    """转化率未达标时整体打折（v5 apply_conversion_rate_penalty）"""
+    return np.where(rate < p.min_conversion_rate, salary * p.penalty_rate, salary)
+
+
+def evaluate(p, delivery, purchase):
+    """任意形状的 交付量/购买量 数组（可广播）上的四种模式薪资"""
+    delivery, purchase = np.broadcast_arrays(np.asarray(delivery, dtype=float),
+                                             np.asarray(purchase, dtype=float))
+    rate = conversion_rate(delivery, purchase)
+    old = old_salary(p, delivery, purchase)
+    return (rate, old,
+            apply_penalty(p, old, rate),
+            apply_penalty(p, tiered_salary(p, purchase, p.new_base_salary_mid), rate),
+            apply_penalty(p, tiered_salary(p, purchase, p.new_base_salary_low), rate))
+
+
+def sweep_conversion(p, rates):
+    """交付量不变，按转化率（%）扫描：购买量 = 交付量 × 转化率 / 100"""
+    rates = np.asarray(rates, dtype=float)
+    return Sweep(rates, *evaluate(p, p.delivery_amount, p.delivery_amount * rates / 100))
+
+
+def sweep_purchase(p, amounts):
+    """交付量不变，按购买服务包数量扫描"""
+    amounts = np.asarray(amounts, dtype=float)
+    return Sweep(amounts, *evaluate(p, p.delivery_amount, amounts))
+
+
+def sweep_surface(p, rates, amounts):
+    """
+    转化率 × 购买量 二维薪资面
+
+    每个格点的交付量由 购买量 / 转化率 反推，转化率为0的行交付量按0处理
+    """
+    rates = np.asarray(rates, dtype=float)[:, None]
+    amounts = np.asarray(amounts, dtype=float)[None, :]
+    safe = np.where(rates == 0, 1.0, rates)
+    delivery = np.where(rates == 0, 0.0, amounts * 100 / safe)
+    _, old, mode1, mode2, mode3 = evaluate(p, delivery, amounts)
+    return Surface(rates.ravel(), amounts.ravel(), delivery, old, mode1, mode2, mode3)
@@ -0,0 +1,187 @@
+"""
+模拟全国门店/员工数据（压力测试用）
+
+按随机种子生成与真实月报结构相同的两张表:
+
+门店表（每行一个门店）: 门店编号、region（大区）、城市，SalaryParams 字段（交付量、购买量、
+新购买量、服务包单价在分界价 450 上下、各类员工人数），以及 v28 才有的 has_station_license。
+每个数值只写一列；v28 计算器的同义字段（delivery_volume 等，见 V28_FIELDS）由 v28_stores 换名，
+门店人数为各类员工人数之和。
+
+员工表（每行一名员工）: 门店编号、员工编号、员工类型（员工/主管/顾问/区总/市总）、城市、
+社保基数、旧底薪、基本绩效、岗位绩效、补贴。可直接作为 social / report --roster 的员工名单，
+也可以按门店读成 StaffRoster。
+
+数据按固定大小的门店块生成，每块的随机数由 (seed, 块序号) 决定，同一种子在任何机器上、
+无论一次生成还是流式写出，结果都相同；逐块写出到磁盘，几百万名员工也不必全部放在内存中。
+"""
+from contextlib import nullcontext
+
+import numpy as np
+import pandas as pd
+
+from .commission import StoreParams
+from .engine import ROLES
+from .roster import STAFF_ALIASES, StaffRoster
+from .tables import TableWriter
+
+
+# 每块门店数（同时决定随机数的分块方式，修改后同一种子的数据会变化）
+BLOCK_SIZE = 10000
+
+# 大区 -> 城市
+REGIONS = {
+    "华东": ("上海", "杭州", "南京", "苏州", "宁波", "合肥"),
+    "华北": ("北京", "天津", "石家庄", "太原", "济南"),
+    "华南": ("广州", "深圳", "东莞", "佛山", "南宁"),
+    "华中": ("武汉", "长沙", "郑州", "南昌"),
+    "西南": ("成都", "重庆", "昆明", "贵阳"),
+    "西北": ("西安", "兰州", "银川"),
+    "东北": ("沈阳", "大连", "长春", "哈尔滨"),
+}
+_CITY_REGION = [(city, region) for region, cities in REGIONS.items() for city in cities]
+
+# 服务包单价（分界价 450 以上 / 以下）及其比例
+PACK_PRICES = (510, 300)
+PACK_PRICE_WEIGHTS = (0.7, 0.3)
+
+# 站内上牌门店的比例
+LICENSE_RATIO = 0.4
+
+# 员工类型（与 ROLES 顺序相同）的 旧底薪基数、补贴、社保基数中位数
+ROLE_OLD_BASE = (2000, 2500, 2300, 4000, 5000)
+ROLE_SUBSIDY = (1100, 1600, 1300, 2300, 2600)
+ROLE_SOCIAL_BASE = (6000, 8000, 7000, 12000, 15000)
+
+# 员工表的列
+STAFF_COLUMNS = ("门店编号", "员工编号", "员工类型", "城市", "社保基数", "旧底薪", "基本绩效", "岗位绩效", "补贴")
+
+# 各类员工人数列（顺序同 ROLES）
+COUNT_COLUMNS = ("employee_count", "supervisor_count", "consultant_count", "regional_manager_count",
+                 "city_manager_count")
+
+# v28 StoreParams 字段 -> 门店表中的列
+V28_FIELDS = {
+    "delivery_volume": "delivery_amount",
+    "service_packs": "purchase_amount",
+    "new_service_packs": "new_purchase_amount",
+    "pack_price": "service_price",
+}
+
+
+def _role_counts(rng, n):
+    """每个门店各类员工人数，列顺序同 ROLES"""
+    return np.column_stack([
+        rng.integers(1, 9, n),                  # 员工
+        rng.integers(0, 2, n) + 1,              # 主管
+        rng.integers(0, 3, n),                  # 顾问
+        (rng.random(n) < 0.05).astype(int),     # 区总
+        (rng.random(n) < 0.01).astype(int),     # 市总
+    ])
+
+
+def generate_block(block, stores, seed=0, first_employee=0):
+    """
+    生成第 block 块（门店序号从 block × BLOCK_SIZE 开始）的 stores 个门店
+
+    first_employee: 本块第一名员工的全局序号（员工编号连续）
+    返回 (门店表, 员工表)
+    """
+    rng = np.random.default_rng(np.random.SeedSequence([seed, block]))
+    start = block * BLOCK_SIZE
+    store_ids = pd.Series(np.arange(start, start + stores)).map("S{:07d}".format)
+
+    cities = rng.integers(0, len(_CITY_REGION), stores)
+    city = np.array([c for c, _ in _CITY_REGION], dtype=object)[cities]
+    region = np.array([r for _, r in _CITY_REGION], dtype=object)[cities]
+
+    counts = _role_counts(rng, stores)
+    staff = counts.sum(axis=1)
+    delivery = rng.integers(40, 61, stores) * staff
+    purchase = np.round(delivery * rng.beta(5, 5, stores)).astype(int)
+    new_purchase = np.round(purchase * rng.uniform(0.9, 1.1, stores)).astype(int)
+    pack_price = rng.choice(PACK_PRICES, stores, p=PACK_PRICE_WEIGHTS)
+    license_ = rng.random(stores) < LICENSE_RATIO
+
+    store_df = pd.DataFrame({
+        "门店编号": store_ids,
+        "region": region,
+        "城市": city,
+        "delivery_amount": delivery,
+        "purchase_amount": purchase,
+        "new_purchase_amount": new_purchase,
+        "service_price": pack_price,
+        **{name: counts[:, i] for i, name in enumerate(COUNT_COLUMNS)},
+        "has_station_license": license_,
+    })
+
+    # 员工按门店、再按员工类型排列
+    roles = np.repeat(np.tile(np.arange(len(ROLES)), stores), counts.ravel())
+    owner = np.repeat(np.arange(stores), staff)
+    n = len(roles)
+    social_base = np.round(np.asarray(ROLE_SOCIAL_BASE)[roles] * rng.lognormal(0, 0.25, n))
+    staff_df = pd.DataFrame({
+        "门店编号": store_ids.to_numpy()[owner],
+        "员工编号": pd.Series(np.arange(first_employee, first_employee + n)).map("E{:08d}".format),
+        "员工类型": np.asarray(ROLES, dtype=object)[roles],
+        "城市": city[owner],
+        "社保基数": social_base,
+        "旧底薪": np.asarray(ROLE_OLD_BASE, dtype=float)[roles] + rng.integers(0, 6, n) * 100,
+        "基本绩效": rng.integers(40, 81, n) * 10.0,
+        "岗位绩效": rng.integers(10, 51, n) * 10.0,
+        "补贴": np.asarray(ROLE_SUBSIDY, dtype=float)[roles],
+    }, columns=list(STAFF_COLUMNS))
+    return store_df, staff_df
+
+
+def iter_blocks(stores, seed=0):
+    """逐块产出 (门店表, 员工表)，共 stores 个门店"""
+    first_employee = 0
+    for block, start in enumerate(range(0, stores, BLOCK_SIZE)):
+        store_df, staff_df = generate_block(block, min(BLOCK_SIZE, stores - start), seed, first_employee)
+        first_employee += len(staff_df)
+        yield store_df, staff_df
+
+
+def generate(stores, seed=0):
+    """一次生成整张门店表和员工表（数据量大时用 write_synthetic 流式写出）"""
+    blocks = list(iter_blocks(stores, seed))
+    if not blocks:
+        store_df, staff_df = generate_block(0, 0, seed)
+        return store_df, staff_df
+    return (pd.concat([b[0] for b in blocks], ignore_index=True),
+            pd.concat([b[1] for b in blocks], ignore_index=True))
+
+
+def v28_stores(stores, staff):
+    """
+    按门店产出 v28 计算器的 (StoreParams, StaffRoster)
+
+    stores / staff: generate 生成的门店表和员工表（员工表按门店顺序排列）
+    """
+    store_staff = stores[list(COUNT_COLUMNS)].sum(axis=1).to_numpy()
+    ends = store_staff.cumsum()
+    values = {field: stores[column].to_numpy() for field, column in V28_FIELDS.items()}
+    licenses = stores["has_station_license"].to_numpy()
+    columns = {name: staff[label].to_numpy() for label, name in STAFF_ALIASES.items()}
+    for i, (count, end) in enumerate(zip(store_staff, ends)):
+        params = StoreParams(store_staff=int(count), has_station_license=bool(licenses[i]),
+                             **{field: int(column[i]) for field, column in values.items()})
+        yield params, StaffRoster.from_columns(**{name: col[end - count:end] for name, col in columns.items()})
+
+
+def write_synthetic(store_path, staff_path=None, stores=1000, seed=0):
+    """
+    生成并逐块写出门店表（和员工表），格式按扩展名（.csv / .xlsx / .parquet）
+
+    返回 (门店数, 员工数)
+    """
+    employees = 0
+    with TableWriter(store_path) as store_writer, \
+            (TableWriter(staff_path) if staff_path else nullcontext()) as staff_writer:
+        for store_df, staff_df in iter_blocks(stores, seed):
+            store_writer.write(store_df)
+            employees += len(staff_df)
+            if staff_writer is not None:
+                staff_writer.write(staff_df)
+    return store_writer.rows, employees
@@ -0,0 +1,280 @@
+"""
+门店表读写
+
+支持 CSV / Excel / Parquet，列名可以使用界面上的中文名称（如“交付量”），
+读取后统一转换为 SalaryParams 的字段名。
+大文件使用 iter_table_chunks / TableWriter 按块读写，内存占用与文件大小无关。
+
+CSV / Excel 没有列类型，逐块读取时每块各自推断会不一致（如门店编号前几块全是数字、
+后面出现字母），所以按参数表固定类型: 参数列取 SalaryParams 的类型（人数为可空整数），
+其余列（门店编号、区域等）一律读为字符串。
+"""
+import os
+
+import pandas as pd
+
+from .schema import PARAMETERS, PARAMETERS_BY_NAME
+
+
+# 中文列名 -> 参数字段名（与界面标签、export_excel 中的名称一致，由参数表生成）
+COLUMN_ALIASES = {p.label: p.name for p in PARAMETERS}
+
+
+def file_format(path):
+    """根据扩展名判断文件格式: csv / excel / parquet"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".csv", ".txt"):
+        return "csv"
+    elif ext in (".xlsx", ".xlsm", ".xls"):
+        return "excel"
+    elif ext in (".parquet", ".pq"):
+        return "parquet"
+    raise ValueError(f"不支持的文件格式: {path}")
+
+
+def _column_name(column, keep=()):
+    name = str(column).strip()
+    return name if name in keep else COLUMN_ALIASES.get(name, name)
+
+
+def normalize_columns(df, keep=()):
+    """把中文列名转换为参数字段名，keep 中的列名原样保留"""
+    return df.rename(columns=lambda c: _column_name(c, keep))
+
+
+def column_dtype(name):
+    """按块读取时的列类型（name 为转换后的列名）"""
+    param = PARAMETERS_BY_NAME.get(name)
+    if param is None or param.type is str:
+        return str
+    return "Int64" if param.type is int else "float64"
+
+
+def _csv_dtypes(path, keep=()):
+    """CSV 各列（原列名）的类型"""
+    header = pd.read_csv(path, nrows=0).columns
+    return {c: column_dtype(_column_name(c, keep)) for c in header}
+
+
+# read_csv(dtype=str) 得到的文本列类型（pandas 3 为 str，之前为 object），其他格式的块与之一致
+_TEXT_DTYPE = pd.Series([], dtype=str).dtype
+
+
+def _typed(df):
+    """把已转换列名的块按 column_dtype 转换类型，空值保持为空"""
+    for name in df.columns:
+        dtype = column_dtype(name)
+        column = df[name]
+        if dtype is str:
+            # 整列为空的块也要是文本类型，否则与其他块不一致
+            df[name] = column.where(column.isna(), column.astype(str)).astype(_TEXT_DTYPE)
+        else:
+            df[name] = pd.to_numeric(column).astype(dtype)
+    return df
+
+
+def read_table(path, normalize=True):
+    """读取整张门店表，normalize 为 False 时保留原列名"""
+    fmt = file_format(path)
+    if fmt == "csv":
+        df = pd.read_csv(path)
+    elif fmt == "excel":
+        df = pd.read_excel(path)
+    else:
+        df = pd.read_parquet(path)
+    return normalize_columns(df) if normalize else df
+
+
+def write_table(df, path):
+    """按扩展名写出结果表"""
+    fmt = file_format(path)
+    if fmt == "csv":
+        # 带BOM，方便直接用Excel打开中文列名
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+    elif fmt == "excel":
+        df.to_excel(path, index=False)
+    else:
+        df.to_parquet(path, index=False)
+
+
+# 默认每块行数
+DEFAULT_CHUNKSIZE = 50000
+
+
+def _iter_excel_chunks(path, chunksize):
+    """用 openpyxl 只读模式逐行读取Excel，每 chunksize 行组成一块"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        buffer = []
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) >= chunksize:
+                yield pd.DataFrame(buffer, columns=header)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=header)
+    finally:
+        workbook.close()
+
+
+def iter_table_chunks(path, chunksize=DEFAULT_CHUNKSIZE, keep=()):
+    """
+    逐块读取门店表，每次产出一个最多 chunksize 行的 DataFrame
+
+    CSV / Excel 的列类型见 column_dtype，各块相同；Parquet 保留文件中的类型。
+    keep: 不按中文名称转换为参数字段名的列（如与参数同名的结果列）
+    """
+    fmt = file_format(path)
+    if fmt == "csv":
+        chunks = pd.read_csv(path, chunksize=chunksize, dtype=_csv_dtypes(path, keep))
+    elif fmt == "excel" and not path.lower().endswith(".xls"):
+        chunks = _iter_excel_chunks(path, chunksize)
+    elif fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        batches = pq.ParquetFile(path).iter_batches(batch_size=chunksize)
+        chunks = (batch.to_pandas() for batch in batches)
+    else:
+        # 旧版 .xls 无法流式读取，只能整表读入后再分块
+        df = pd.read_excel(path)
+        chunks = (df.iloc[i:i + chunksize] for i in range(0, len(df), chunksize))
+
+    start = 0
+    for chunk in chunks:
+        # 行号在整个文件内连续
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        chunk = normalize_columns(chunk, keep)
+        yield chunk if fmt in ("csv", "parquet") else _typed(chunk)
+
+
+def _same_kind(a, b):
+    """同为数值或同为字符串（string / large_string）的类型，可以无损转换"""
+    import pyarrow as pa
+
+    numeric = (pa.types.is_integer, pa.types.is_floating)
+    text = (pa.types.is_string, pa.types.is_large_string)
+    return any(any(f(a) for f in kind) and any(f(b) for f in kind) for kind in (numeric, text))
+
+
+def _conform(table, schema):
+    """
+    把后续块转换为第一块确定的列类型
+
+    只做无损的转换: 全空的列、整数/浮点之间（有损时 pyarrow 报错）、字符串之间；
+    其他类型不一致直接报错，不强行转换
+    """
+    import pyarrow as pa
+
+    if table.schema.names != schema.names:
+        raise ValueError(f"结果列与第一块不一致: {table.schema.names} != {schema.names}")
+    columns = []
+    for field, column in zip(schema, table.columns):
+        if column.type != field.type:
+            if not (pa.types.is_null(column.type) or _same_kind(column.type, field.type)):
+                raise ValueError(f"列 {field.name} 的类型 {column.type} 与之前写出的 {field.type} 不一致")
+            column = column.cast(field.type)
+        columns.append(column)
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def temp_path(path):
+    """
+    写出 path 时先写入的临时文件名（与目标同目录，替换时不跨文件系统）
+
+    文件由各写出器正常创建，权限与直接写出目标时相同
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, f".{name}.{os.getpid()}.tmp")
+
+
+class TableWriter:
+    """
+    逐块写出结果表，写完的块不再保留在内存中
+
+    先写到目标旁边的临时文件，close() 时才替换目标；出错（或 discard()）时只删除临时文件，
+    原有的同名结果不受影响
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.format = file_format(path)
+        self.rows = 0
+        self._writer = None
+        self._sheet = None
+        self._temp = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def _target(self):
+        """实际写入的临时文件（见 temp_path）"""
+        if self._temp is None:
+            self._temp = temp_path(self.path)
+        return self._temp
+
+    def write(self, df):
+        """追加一块数据"""
+        if self.format == "csv":
+            first = self.rows == 0
+            df.to_csv(self._target(), mode="w" if first else "a", header=first, index=False,
+                      encoding="utf-8-sig" if first else "utf-8")
+        elif self.format == "excel":
+            if self._writer is None:
+                from openpyxl import Workbook
+
+                self._writer = Workbook(write_only=True)
+                self._sheet = self._writer.create_sheet()
+                self._sheet.append([str(c) for c in df.columns])
+            # 空值（NaN / pd.NA）写为空单元格
+            for row in df.astype(object).where(df.notna(), None).itertuples(index=False, name=None):
+                self._sheet.append(row)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                # 第一块中全空的列类型未知，按字符串写出
+                schema = pa.schema([pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f
+                                    for f in table.schema], metadata=table.schema.metadata)
+                self._writer = pq.ParquetWriter(self._target(), schema)
+            if not table.schema.equals(self._writer.schema):
+                table = _conform(table, self._writer.schema)
+            self._writer.write_table(table)
+        self.rows += len(df)
+
+    def close(self):
+        """写完：把临时文件替换为目标文件（没有写入任何数据时不产生文件）"""
+        if self._writer is not None:
+            if self.format == "excel":
+                self._writer.save(self._target())
+            else:
+                self._writer.close()
+            self._writer = None
+        if self._temp is not None:
+            os.replace(self._temp, self.path)
+            self._temp = None
+
+    def discard(self):
+        """放弃已写入的数据，删除临时文件"""
+        if self._writer is not None:
+            # 只写模式的工作表和 ParquetWriter 都要关闭，释放打开的文件
+            (self._sheet if self.format == "excel" else self._writer).close()
+            self._writer = None
+        if self._temp is not None:
+            if os.path.exists(self._temp):
+                os.remove(self._temp)
+            self._temp = None
@@ -0,0 +1,124 @@
+"""
+三档阈值打平建议
+
+salary_calculator_v26.py / v28 的 calculate_threshold_suggestion 原来对
+(阈值1, 阈值2) 做双重循环穷举，复杂度 O(n²)。这里利用提成函数分段线性的性质直接求解：
+
+    阈值2 ≥ 服务包数:  总提成 - 目标 = t1·(c1-c2) + N·c2 - 目标            （只与 t1 有关）
+    阈值2 < 服务包数:  总提成 - 目标 = t1·(c1-c2) + t2·(c2-c3) + N·c3 - 目标
+
+两种情况都是网格上的线性函数：
+- 差异不变号时最优点一定在可行域的顶点上，O(1) 得到；
+- 差异在可行域内穿过 0 时，对每个阈值2 直接解出最优阈值1，单层循环 O(n/step)。
+结果与原穷举法的最小差异完全一致，差异相同时同样取阈值较小的组合。
+"""
+import math
+from collections import namedtuple
+
+
+# 原界面穷举的起点和步长
+DEFAULT_START = 10
+DEFAULT_STEP = 5
+
+# 浮点误差范围内的差异视为相同
+_EPS = 1e-9
+
+
+class ThresholdSuggestion(namedtuple("ThresholdSuggestion", "threshold1 threshold2 diff")):
+    """阈值建议：阈值1、阈值2（服务包数）和与目标提成的差异（元）"""
+    __slots__ = ()
+
+    @property
+    def text(self):
+        """界面上显示的建议文字"""
+        return f"建议阈值1: {self.threshold1}包, 阈值2: {self.threshold2}包 (差异: {self.diff:.2f}元)"
+
+
+def tier_commission(packs, threshold1, threshold2, tier1, tier2, tier3):
+    """按阈值（服务包数）计算三档总提成"""
+    if packs <= threshold1:
+        return packs * tier1
+    elif packs <= threshold2:
+        return threshold1 * tier1 + (packs - threshold1) * tier2
+    return threshold1 * tier1 + (threshold2 - threshold1) * tier2 + (packs - threshold2) * tier3
+
+
+def _best_index(offset, slope, low, high):
+    """在整数区间 [low, high] 上求 |offset + slope·x| 最小的 x（并列取较小的 x）"""
+    if slope == 0:
+        return low
+    root = -offset / slope
+    best = None
+    for x in (low, high, math.floor(root), math.ceil(root)):
+        x = min(max(x, low), high)
+        value = abs(offset + slope * x)
+        if best is None or value < best[0] - _EPS or (abs(value - best[0]) <= _EPS and x < best[1]):
+            best = (value, x)
+    return best[1]
+
+
+def suggest_thresholds(packs, tier1, tier2, tier3, target=None, step=DEFAULT_STEP, start=DEFAULT_START):
+    """
+    求使三档总提成最接近目标值的 (阈值1, 阈值2)
+
+    packs: 新购买服务包数（整数）
+    tier1/tier2/tier3: 档1/档2/档3每包提成
+    target: 目标总提成，默认 packs × tier1（与按档1全部计提打平）
+    step/start: 阈值网格的步长和起点，step 可以为1
+    搜索范围与原界面相同：start ≤ 阈值1 < packs，阈值1 < 阈值2 < packs + step。
+    没有可选阈值时返回 None。
+    """
+    packs = int(packs)
+    step = int(step)
+    if step <= 0:
+        raise ValueError("步长必须为正整数")
+    if target is None:
+        target = packs * tier1
+    if start >= packs:
+        return None
+
+    # 阈值1可取 start + step·i，i ∈ [0, count-1]
+    count = (packs - start + step - 1) // step
+    candidates = []
+
+    # 情况一：阈值2 ≥ 服务包数，取网格上第一个不小于服务包数的阈值2
+    i = _best_index(start * (tier1 - tier2) + packs * tier2 - target, step * (tier1 - tier2), 0, count - 1)
+    t1 = start + step * i
+    candidates.append((t1, t1 + step * ((packs - t1 + step - 1) // step)))
+
+    # 情况二：阈值2 < 服务包数，阈值2 = start + step·k，0 ≤ i < k ≤ count-1
+    last = count - 1
+    if last >= 1:
+        offset = start * (tier1 - tier3) + packs * tier3 - target
+        slope_i = step * (tier1 - tier2)
+        slope_k = step * (tier2 - tier3)
+        h = lambda i, k: offset + slope_i * i + slope_k * k
+        vertices = [(0, 1), (0, last), (last - 1, last)]
+        values = [h(i, k) for i, k in vertices]
+        if slope_i == 0:
+            # 差异与阈值1无关：阈值1取最小，阈值2直接求解
+            pairs = [(0, _best_index(offset, slope_k, 1, last))]
+        elif min(values) >= 0 or max(values) <= 0:
+            # 差异不变号：|差异| 是线性函数，最优点在顶点上
+            pairs = vertices
+        else:
+            # 差异在可行域内穿过0：每个阈值2对应的最优阈值1可直接求出
+            pairs = [(_best_index(offset + slope_k * k, slope_i, 0, k - 1), k) for k in range(1, last + 1)]
+        candidates.extend((start + step * i, start + step * k) for i, k in pairs)
+
+    best = None
+    for t1, t2 in candidates:
+        diff = abs(tier_commission(packs, t1, t2, tier1, tier2, tier3) - target)
+        if best is None or diff < best.diff - _EPS or (abs(diff - best.diff) <= _EPS and (t1, t2) < best[:2]):
+            best = ThresholdSuggestion(t1, t2, diff)
+    return best
+
+
+def suggest_thresholds_batch(stores, step=DEFAULT_STEP, start=DEFAULT_START):
+    """
+    批量求多个门店的阈值建议
+
+    stores: 可迭代的 (服务包数, 档1, 档2, 档3) 或 (服务包数, 档1, 档2, 档3, 目标提成)
+    返回与输入顺序一致的 ThresholdSuggestion 列表（无可选阈值时为 None）
+    """
+    return [suggest_thresholds(*store, step=step, start=start) for store in stores]
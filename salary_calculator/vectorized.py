@@ -0,0 +1,219 @@
+"""
+向量化批量计算
+
+一次性计算整张门店表的四种薪资模式，三档提成用 numpy 分段求值代替逐行 if/elif，
+结果与 engine 中的逐个计算完全一致。calculate_matrix 同时算出所有员工类型
+（与 engine.salary_matrix 相同的 模式 × 员工类型 矩阵），calculate_batch 从中取出所需的员工类型。
+"""
+import numpy as np
+import pandas as pd
+
+from .engine import MODES, ROLES, SalaryParams
+from .profiling import span
+
+
+# 门店表中可以按行覆盖的数值参数（其余参数取自 SalaryParams）
+STORE_COLUMNS = (
+    "delivery_amount",
+    "purchase_amount",
+    "new_purchase_amount",
+    "employee_count",
+    "supervisor_count",
+    "consultant_count",
+    "regional_manager_count",
+    "city_manager_count",
+    "old_purchase_baseline",
+    "old_base_salary",
+    "old_basic_bonus",
+    "old_position_bonus",
+    "old_extra_bonus",
+    "new_base_salary_mid",
+    "new_base_salary_low",
+    "bonus_tier1_threshold",
+    "bonus_tier2_threshold",
+    "bonus_tier2_amount",
+    "bonus_tier3_amount",
+    "min_conversion_rate",
+    "penalty_rate",
+    "supervisor_bonus",
+    "consultant_bonus",
+    "regional_manager_bonus",
+    "city_manager_bonus",
+)
+
+_SUBSIDY_FIELDS = {
+    "主管": "supervisor_bonus",
+    "顾问": "consultant_bonus",
+    "区总": "regional_manager_bonus",
+    "市总": "city_manager_bonus",
+}
+
+
+def _value(stores, params, name):
+    """取门店表中的列，没有该列时使用参数中的标量（由 numpy 自动广播）；空单元格同样取参数中的值"""
+    default = float(getattr(params, name))
+    if name not in stores:
+        return default
+    column = stores[name]
+    values = column.to_numpy(dtype=float, na_value=np.nan)
+    return np.where(np.isnan(values), default, values) if column.hasnans else values
+
+
+def conversion_rate(delivery, purchase):
+    """转化率（%），交付量为0时为0"""
+    delivery, purchase = np.broadcast_arrays(np.asarray(delivery, dtype=float),
+                                             np.asarray(purchase, dtype=float))
+    out = np.zeros(delivery.shape)
+    np.divide(purchase, delivery, out=out, where=delivery != 0)
+    return out * 100
+
+
+def tier_bonus(purchase, tier1_threshold, tier2_threshold, tier1_amount, tier2_amount, tier3_amount):
+    """三档提成的分段求值，分支判断与 engine.calculate_tier_bonus 相同"""
+    tier1_full = tier1_threshold * tier1_amount
+    return np.where(
+        purchase <= tier1_threshold,
+        purchase * tier1_amount,
+        np.where(
+            purchase <= tier2_threshold,
+            tier1_full + (purchase - tier1_threshold) * tier2_amount,
+            tier1_full + (tier2_threshold - tier1_threshold) * tier2_amount +
+            (purchase - tier2_threshold) * tier3_amount,
+        ),
+    )
+
+
+# 矩阵最后一维: 底薪、提成、补贴
+CELL_COLUMNS = ("底薪", "提成", "补贴")
+
+# calculate_batch 可能输出的全部结果列（“新底薪（中）”等与参数的中文名称相同）
+RESULT_COLUMNS = ("转化率",) + MODES + tuple(f"{mode}_{name}" for mode in MODES[2:] for name in CELL_COLUMNS)
+
+
+def _subsidy(stores, params, role):
+    """职位补贴（员工没有补贴）"""
+    field = _SUBSIDY_FIELDS.get(role)
+    return _value(stores, params, field) if field else 0.0
+
+
+def _components(stores, params):
+    """
+    各员工类型共用的部分: (转化率, 旧薪资（不含补贴）, 新底薪（中）/（低）的 (底薪, 提成))
+
+    各员工类型的薪资只在此基础上加不同的职位补贴
+    """
+    v = lambda name: _value(stores, params, name)
+
+    delivery = v("delivery_amount")
+    purchase = v("purchase_amount")
+    rate = conversion_rate(delivery, purchase)
+
+    with np.errstate(divide="ignore", invalid="ignore"), span("旧薪资"):
+        # 旧薪资体系（门店人数为0时结果为 inf/nan）
+        staff_count = (v("employee_count") + v("supervisor_count") + v("consultant_count") +
+                       v("regional_manager_count") + v("city_manager_count"))
+        base_calculation = (delivery * rate / 100 - delivery / 2) * 10 / staff_count
+        old_base, basic_bonus, position_bonus, extra_bonus = (
+            v("old_base_salary"), v("old_basic_bonus"), v("old_position_bonus"), v("old_extra_bonus"))
+        old_salary = np.where(
+            rate >= 50,
+            old_base + base_calculation + basic_bonus + position_bonus + extra_bonus,
+            old_base + base_calculation + (basic_bonus + position_bonus) / 2 + extra_bonus,
+        )
+
+    with np.errstate(divide="ignore", invalid="ignore"), span("档位拆分"):
+        # 新底薪（中）/（低）共用的三档阈值与折扣
+        new_purchase = v("new_purchase_amount")
+        tier_purchase = np.where(new_purchase != 0, new_purchase, purchase)
+        baseline = v("old_purchase_baseline")
+        tier1_threshold = baseline * v("bonus_tier1_threshold")
+        tier2_threshold = baseline * v("bonus_tier2_threshold")
+        below_min_rate = rate < v("min_conversion_rate")
+
+        tiered = []
+        for new_base in (v("new_base_salary_mid"), v("new_base_salary_low")):
+            tier1_amount = np.where(baseline != 0, (old_base - new_base) / baseline, 0.0)
+            bonus = tier_bonus(tier_purchase, tier1_threshold, tier2_threshold,
+                               tier1_amount, v("bonus_tier2_amount"), v("bonus_tier3_amount"))
+            # 转化率未达标，提成部分打折
+            bonus = np.where(below_min_rate, bonus * v("penalty_rate"), bonus)
+            tiered.append((new_base, bonus))
+    return rate, old_salary, tiered
+
+
+def _matrix(stores, params):
+    """返回 (转化率, 薪资矩阵)，见 calculate_matrix"""
+    n = len(stores)
+    rate, old_salary, tiered = _components(stores, params)
+    # 每行一个员工类型
+    subsidies = np.array([np.broadcast_to(_subsidy(stores, params, role), (n,)) for role in ROLES])
+
+    # 按 (分项, 模式, 员工类型, 门店) 存储，同一格的全部门店连续，写入和按列取出都不跨步；
+    # 返回时转置为 (门店, 模式, 员工类型, 分项)
+    cells = np.empty((len(CELL_COLUMNS), len(MODES), len(ROLES), n))
+    # 旧薪资体系、新保底: 底薪 = 旧薪资 + 职位补贴，没有提成和补贴
+    cells[0, 0] = old_salary + subsidies
+    cells[0, 1] = cells[0, 0]
+    cells[1:, :2] = 0
+    for i, (new_base, bonus) in enumerate(tiered, start=2):
+        cells[0, i] = new_base
+        cells[1, i] = bonus
+        cells[2, i] = subsidies
+    return rate, cells.transpose(3, 1, 2, 0)
+
+
+def calculate_matrix(stores, params=None):
+    """
+    整张门店表的 模式 × 员工类型 薪资矩阵
+
+    返回 (门店数, len(MODES), len(ROLES), 3) 的 float64 数组，最后一维为 底薪/提成/补贴，
+    每个门店的一格与 engine.salary_matrix(params).cells 相同；
+    转化率、旧薪资和档位拆分每个门店只算一次，各员工类型只广播不同的职位补贴
+    """
+    return _matrix(stores, params or SalaryParams())[1]
+
+
+def _role_index(stores, params, role):
+    """取矩阵中员工类型的下标；门店表有 employee_type 列时按行取，未知类型按员工（无补贴）计"""
+    if "employee_type" in stores:
+        codes, names = pd.factorize(stores["employee_type"])
+        # 最后一项给空值（编号为 -1）的行
+        return np.array([ROLES.index(name) if name in ROLES else 0 for name in names] + [0])[codes]
+    role = params.employee_type if role is None else role
+    return ROLES.index(role) if role in ROLES else 0
+
+
+def calculate_batch(stores, params=None, role=None, detail=False):
+    """
+    批量计算门店表的薪资
+
+    stores: DataFrame，列名见 STORE_COLUMNS，缺少的列使用 params 中的值
+    role: 员工类型，默认取 params.employee_type；门店表中有 employee_type 列时按行计算
+    detail: 为True时额外输出新底薪模式的 底薪/提成/补贴 分项
+    返回与 stores 行索引相同的 DataFrame，列为转化率和 MODES 中的四种模式薪资
+    """
+    params = params or SalaryParams()
+    n = len(stores)
+    index = _role_index(stores, params, role)
+    # 每种模式所选员工类型的 (底薪, 提成, 补贴)
+    if np.ndim(index) == 0:
+        # 所有门店同一员工类型时只加这一类员工的补贴，不必算出整个矩阵
+        rate, old_salary, tiered = _components(stores, params)
+        subsidy = _subsidy(stores, params, ROLES[index])
+        old_salary = old_salary + subsidy
+        cells = [(old_salary, 0, 0)] * 2 + [(new_base, bonus, subsidy) for new_base, bonus in tiered]
+    else:
+        rate, matrix = _matrix(stores, params)
+        selected = matrix[np.arange(n), :, index, :]
+        cells = [tuple(selected[:, i, j] for j in range(len(CELL_COLUMNS))) for i in range(len(MODES))]
+
+    columns = {"转化率": rate}
+    for i, mode in enumerate(MODES):
+        base, bonus, subsidy = cells[i]
+        columns[mode] = base + bonus + subsidy if i >= 2 else base
+    if detail:
+        for i, mode in enumerate(MODES[2:], start=2):
+            for j, name in enumerate(CELL_COLUMNS):
+                columns[f"{mode}_{name}"] = cells[i][j]
+    return pd.DataFrame({name: np.broadcast_to(values, (n,)).copy() for name, values in columns.items()},
+                        index=stores.index)
@@ -1,12 +1,22 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 
+from salary_calculator.rates import V13_RATE_TABLE_FILE, V13_RATES, load_rate_table
+from salary_calculator.roster import DEFAULT_STAFF, STAFF_FIELDS, StaffRoster
+from salary_calculator.steps import StepLog
+
+# v13 界面第一行员工默认是 2200 那一档，与 v26/v28 的顺序相反
+STAFF_DEFAULTS = DEFAULT_STAFF[::-1]
+
 class SalaryCalculatorApp:
     def __init__(self, root):
         self.root = root
         self.root.title("薪资计算系统")
         self.root.geometry("1200x800")
 
+        # 旧提成单价表，当前目录有“提成单价表_v13.json”时优先使用
+        self.commission_rates = load_rate_table(default=V13_RATES, filename=V13_RATE_TABLE_FILE)
+
         # 数据存储
         self.data = {
             "delivery_volume": tk.StringVar(value="175"),
@@ -36,13 +46,8 @@ class SalaryCalculatorApp:
         }
 
         # 创建员工数据占位
-        for i in range(2):
-            self.data["staff_data"].append({
-                "old_base": tk.StringVar(value="2000" if i else "2200"),
-                "basic_perf": tk.StringVar(value="550" if i else "650"),
-                "post_perf": tk.StringVar(value="200" if i else "400"),
-                "subsidy": tk.StringVar(value="1100")
-            })
+        for staff in STAFF_DEFAULTS:
+            self.data["staff_data"].append({name: tk.StringVar(value=f"{staff[name]:g}") for name in STAFF_FIELDS})
 
         self.create_widgets()
 
@@ -262,18 +267,17 @@ class SalaryCalculatorApp:
         self.data["commission_tier3"].set("20")
         self.data["threshold_percentage"].set("0.9")
 
-        for i, staff in enumerate(self.data["staff_data"]):
-            staff["old_base"].set("2000" if i else "2200")
-            staff["basic_perf"].set("550" if i else "650")
-            staff["post_perf"].set("200" if i else "400")
-            staff["subsidy"].set("1100")
+        for staff, default in zip(self.data["staff_data"], STAFF_DEFAULTS):
+            for name in STAFF_FIELDS:
+                staff[name].set(f"{default[name]:g}")
 
         self.results_text.delete(1.0, tk.END)
 
     def calculate(self):
         try:
             # 准备计算结果文本
-            result_text = "=== 薪资计算详细过程 ===\n\n"
+            log = StepLog()
+            log.text("=== 薪资计算详细过程 ===\n\n")
 
             # 提取基础参数
             delivery_volume = float(self.data["delivery_volume"].get())
@@ -305,83 +309,28 @@ class SalaryCalculatorApp:
             commission_tier3 = float(self.data["commission_tier3"].get())
 
             # 提取员工数据
-            staff_list = []
-            for staff_data in self.data["staff_data"]:
-                staff = {
-                    "old_base": float(staff_data["old_base"].get()),
-                    "basic_perf": float(staff_data["basic_perf"].get()),
-                    "post_perf": float(staff_data["post_perf"].get()),
-                    "subsidy": float(staff_data["subsidy"].get())
-                }
-                staff_list.append(staff)
+            staff_list = StaffRoster({name: float(var.get()) for name, var in staff_data.items()}
+                                     for staff_data in self.data["staff_data"])
 
             # === 计算基础指标 ===
-            result_text += "=== 1. 基础指标计算 ===\n"
+            log.text("=== 1. 基础指标计算 ===\n")
             conversion_rate = (service_packs / delivery_volume) * 100
             per_capita_packs = service_packs / store_staff
-            result_text += f"转化率 = 购买服务包数量 / 交付量 × 100% = {service_packs} / {delivery_volume} × 100% = {conversion_rate:.2f}%\n"
-            result_text += f"人均购买服务包数 = 购买服务包数 / 门店人数 = {service_packs} / {store_staff} = {per_capita_packs:.2f}\n\n"
+            log.add("转化率 = 购买服务包数量 / 交付量 × 100% = {service_packs} / {delivery_volume} × 100% = {result:.2f}%\n", name="转化率", result=conversion_rate, service_packs=service_packs, delivery_volume=delivery_volume)
+            log.add("人均购买服务包数 = 购买服务包数 / 门店人数 = {service_packs} / {store_staff} = {result:.2f}\n\n", name="人均购买服务包数", result=per_capita_packs, service_packs=service_packs, store_staff=store_staff)
 
             # === 计算旧提成单价 ===
-            result_text += "=== 2. 旧提成单价计算 ===\n"
-            conditions = [
-                (pack_price > 450 and not has_station_license),
-                (pack_price > 450 and has_station_license),
-                (pack_price <= 450 and not has_station_license),
-                (pack_price <= 450 and has_station_license)
-            ]
-
-            commission_rate = 0
-            if conditions[0]:  # >450 & 无站内
-                if conversion_rate < 50:
-                    commission_rate = 10
-                elif 50 <= conversion_rate < 60:
-                    commission_rate = 15
-                elif 60 <= conversion_rate < 70:
-                    commission_rate = 20
-                else:
-                    commission_rate = 25
-                result_text += f"条件: 服务包价格>450且无站内上牌, 转化率={conversion_rate:.2f}% → 每包提成={commission_rate}元\n"
-
-            elif conditions[1]:  # >450 & 有站内
-                if conversion_rate < 60:
-                    commission_rate = 10
-                elif 60 <= conversion_rate < 70:
-                    commission_rate = 15
-                elif 70 <= conversion_rate < 80:
-                    commission_rate = 20
-                else:
-                    commission_rate = 25
-                result_text += f"条件: 服务包价格>450且有站内上牌, 转化率={conversion_rate:.2f}% → 每包提成={commission_rate}元\n"
-
-            elif conditions[2]:  # <=450 & 无站内
-                if conversion_rate < 50:
-                    commission_rate = 10
-                elif 50 <= conversion_rate < 60:
-                    commission_rate = 12
-                elif 60 <= conversion_rate < 75:
-                    commission_rate = 15
-                else:
-                    commission_rate = 20
-                result_text += f"条件: 服务包价格≤450且无站内上牌, 转化率={conversion_rate:.2f}% → 每包提成={commission_rate}元\n"
-
-            elif conditions[3]:  # <=450 & 有站内
-                if conversion_rate < 60:
-                    commission_rate = 10
-                elif 60 <= conversion_rate < 70:
-                    commission_rate = 12
-                elif 70 <= conversion_rate < 80:
-                    commission_rate = 15
-                else:
-                    commission_rate = 20
-                result_text += f"条件: 服务包价格≤450且有站内上牌, 转化率={conversion_rate:.2f}% → 每包提成={commission_rate}元\n"
+            log.text("=== 2. 旧提成单价计算 ===\n")
+            commission_rate = self.commission_rates.lookup(pack_price, has_station_license, conversion_rate)
+            condition = self.commission_rates.describe(pack_price, has_station_license, compact=True)
+            log.add("条件: {condition}, 转化率={conversion_rate:.2f}% → 每包提成={commission_rate}元\n", condition=condition, conversion_rate=conversion_rate, commission_rate=commission_rate)
 
             # === 旧薪资计算 ===
-            result_text += "\n=== 3. 旧薪资计算 ===\n"
+            log.text("\n=== 3. 旧薪资计算 ===\n")
             total_commission = new_service_packs * commission_rate
             commission_per_person = total_commission / store_staff
-            result_text += f"总提成 = 新购买服务包数 × 每包提成 = {new_service_packs} × {commission_rate} = {total_commission}\n"
-            result_text += f"人均提成 = 总提成 / 门店人数 = {total_commission} / {store_staff} = {commission_per_person:.2f}\n"
+            log.add("总提成 = 新购买服务包数 × 每包提成 = {new_service_packs} × {commission_rate} = {result}\n", name="总提成", result=total_commission, new_service_packs=new_service_packs, commission_rate=commission_rate)
+            log.add("人均提成 = 总提成 / 门店人数 = {total_commission} / {store_staff} = {result:.2f}\n", name="人均提成", result=commission_per_person, total_commission=total_commission, store_staff=store_staff)
 
             old_salaries = []
             for i, staff in enumerate(staff_list):
@@ -389,24 +338,24 @@ class SalaryCalculatorApp:
                 total_salary = basic_salary + commission_per_person
                 old_salaries.append(total_salary)
 
-                result_text += f"\n员工{i + 1}旧薪资计算:\n"
-                result_text += f"基本薪资 = 旧底薪 + 基本绩效 + 岗位绩效 + 补贴 = "
-                result_text += f"{staff['old_base']} + {staff['basic_perf']} + {staff['post_perf']} + {staff['subsidy']} = {basic_salary}\n"
-                result_text += f"汇总薪资 = 基本薪资 + 人均提成 = {basic_salary} + {commission_per_person} = {total_salary:.2f}\n"
+                log.add("\n员工{index}旧薪资计算:\n", index=i + 1)
+                log.text("基本薪资 = 旧底薪 + 基本绩效 + 岗位绩效 + 补贴 = ")
+                log.add("{old_base} + {basic_perf} + {post_perf} + {subsidy} = {basic_salary}\n", old_base=staff['old_base'], basic_perf=staff['basic_perf'], post_perf=staff['post_perf'], subsidy=staff['subsidy'], basic_salary=basic_salary)
+                log.add("汇总薪资 = 基本薪资 + 人均提成 = {basic_salary} + {commission_per_person} = {result:.2f}\n", name="汇总薪资", result=total_salary, basic_salary=basic_salary, commission_per_person=commission_per_person)
 
             # === 新薪资计算 ===
-            result_text += "\n=== 4. 新薪资计算 ===\n"
+            log.text("\n=== 4. 新薪资计算 ===\n")
             new_salaries = []  # 存储每个员工的三种薪资模式结果
 
             for i, staff in enumerate(staff_list):
-                result_text += f"\n--- 员工{i + 1}新薪资计算 ---\n"
+                log.add("\n--- 员工{index}新薪资计算 ---\n", index=i + 1)
 
                 # 模式一：新保底
                 salary_high = 3850
-                result_text += f"模式一(新保底): 固定薪资 = 3850元\n"
+                log.text("模式一(新保底): 固定薪资 = 3850元\n")
 
                 # 模式二：新底薪(中)
-                result_text += f"\n模式二(新底薪中):\n"
+                log.text("\n模式二(新底薪中):\n")
                 salary_mid, mid_detail = self.calculate_new_salary_detail(
                     staff, conversion_rate, new_service_packs,
                     avg_monthly_packs, store_staff,
@@ -418,7 +367,7 @@ class SalaryCalculatorApp:
                     threshold_percentage, threshold_discount,
                     "中"
                 )
-                result_text += mid_detail
+                log.extend(mid_detail)
                 new_salaries.append({
                     "high": salary_high,
                     "mid": salary_mid,
@@ -426,7 +375,7 @@ class SalaryCalculatorApp:
                 })
 
                 # 模式三：新底薪(低)
-                result_text += f"\n模式三(新底薪低):\n"
+                log.text("\n模式三(新底薪低):\n")
                 salary_low, low_detail = self.calculate_new_salary_detail(
                     staff, conversion_rate, new_service_packs,
                     avg_monthly_packs, store_staff,
@@ -438,34 +387,34 @@ class SalaryCalculatorApp:
                     threshold_percentage, threshold_discount,
                     "低"
                 )
-                result_text += low_detail
+                log.extend(low_detail)
                 new_salaries[i]["low"] = salary_low
 
                 # 添加分隔线
-                result_text += "-" * 80 + "\n"
+                log.text("-" * 80 + "\n")
 
             # === 新旧薪资对比 ===
-            result_text += "\n=== 5. 新旧薪资对比 ===\n"
+            log.text("\n=== 5. 新旧薪资对比 ===\n")
             for i in range(len(staff_list)):
-                result_text += f"\n员工{i + 1}薪资对比:\n"
-                result_text += f"  旧薪资体系: {old_salaries[i]:.2f}元\n"
-                result_text += f"  新薪资体系模式一(新保底): {new_salaries[i]['high']:.2f}元\n"
-                result_text += f"  新薪资体系模式二(新底薪中): {new_salaries[i]['mid']:.2f}元\n"
-                result_text += f"  新薪资体系模式三(新底薪低): {new_salaries[i]['low']:.2f}元\n"
+                log.add("\n员工{index}薪资对比:\n", index=i + 1)
+                log.add("  旧薪资体系: {old_salary:.2f}元\n", old_salary=old_salaries[i])
+                log.add("  新薪资体系模式一(新保底): {high:.2f}元\n", high=new_salaries[i]['high'])
+                log.add("  新薪资体系模式二(新底薪中): {mid:.2f}元\n", mid=new_salaries[i]['mid'])
+                log.add("  新薪资体系模式三(新底薪低): {low:.2f}元\n", low=new_salaries[i]['low'])
 
                 # 计算差异
                 diff_high = new_salaries[i]['high'] - old_salaries[i]
                 diff_mid = new_salaries[i]['mid'] - old_salaries[i]
                 diff_low = new_salaries[i]['low'] - old_salaries[i]
 
-                result_text += f"\n  对比结果:\n"
-                result_text += f"  模式一比旧薪资 {'增加' if diff_high >= 0 else '减少'} {abs(diff_high):.2f}元\n"
-                result_text += f"  模式二比旧薪资 {'增加' if diff_mid >= 0 else '减少'} {abs(diff_mid):.2f}元\n"
-                result_text += f"  模式三比旧薪资 {'增加' if diff_low >= 0 else '减少'} {abs(diff_low):.2f}元\n"
+                log.text("\n  对比结果:\n")
+                log.add("  模式一比旧薪资 {change_high} {abs_high:.2f}元\n", change_high='增加' if diff_high >= 0 else '减少', abs_high=abs(diff_high))
+                log.add("  模式二比旧薪资 {change_mid} {abs_mid:.2f}元\n", change_mid='增加' if diff_mid >= 0 else '减少', abs_mid=abs(diff_mid))
+                log.add("  模式三比旧薪资 {change_low} {abs_low:.2f}元\n", change_low='增加' if diff_low >= 0 else '减少', abs_low=abs(diff_low))
 
             # 更新结果文本框
             self.results_text.delete(1.0, tk.END)
-            self.results_text.insert(tk.END, result_text)
+            self.results_text.insert(tk.END, log.render())
             self.results_text.see(tk.END)  # 滚动到最后
 
         except Exception as e:
@@ -481,130 +430,130 @@ class SalaryCalculatorApp:
                                     threshold_percentage, threshold_discount,
                                     salary_level):
         """
-        计算新薪资并返回详细的计算过程文本
-        返回值: (最终薪资, 详细计算过程文本)
+        计算新薪资并记录详细的计算过程
+        返回值: (最终薪资, 计算过程 StepLog)
         """
-        detail = ""
-        detail += f"模式: {salary_level}, 新底薪: {new_base}元\n"
-        detail += f"员工数据: 旧底薪={old_base}, 基本绩效={basic_perf}, 岗位绩效={post_perf}, 补贴={subsidy}\n\n"
+        log = StepLog()
+        log.add("模式: {salary_level}, 新底薪: {new_base}元\n", salary_level=salary_level, new_base=new_base)
+        log.add("员工数据: 旧底薪={old_base}, 基本绩效={basic_perf}, 岗位绩效={post_perf}, 补贴={subsidy}\n\n", old_base=old_base, basic_perf=basic_perf, post_perf=post_perf, subsidy=subsidy)
 
         # === 1. 计算提成基数 ===
-        detail += f"1. 计算提成基数:\n"
+        log.text("1. 计算提成基数:\n")
         numerator = old_base + basic_perf + post_perf + subsidy + old_avg_commission - new_base
         denominator = avg_monthly_packs
 
-        detail += f"   分子 = (旧底薪 + 基本绩效 + 岗位绩效 + 补贴 + 旧月均提成) - 新底薪\n"
-        detail += f"         = ({old_base} + {basic_perf} + {post_perf} + {subsidy} + {old_avg_commission}) - {new_base}\n"
-        detail += f"         = {numerator}\n\n"
+        log.text("   分子 = (旧底薪 + 基本绩效 + 岗位绩效 + 补贴 + 旧月均提成) - 新底薪\n")
+        log.add("         = ({old_base} + {basic_perf} + {post_perf} + {subsidy} + {old_avg_commission}) - {new_base}\n", old_base=old_base, basic_perf=basic_perf, post_perf=post_perf, subsidy=subsidy, old_avg_commission=old_avg_commission, new_base=new_base)
+        log.add("         = {result}\n\n", name=f"新底薪{salary_level}分子", result=numerator)
 
-        detail += f"   分母 = 过去X月平均每人购买服务包数量 = {denominator}\n\n"
+        log.add("   分母 = 过去X月平均每人购买服务包数量 = {result}\n\n", name=f"新底薪{salary_level}分母", result=denominator)
 
         unit_commission = numerator / denominator
-        detail += f"   单位提成 = 分子 / 分母 = {numerator} / {denominator} = {unit_commission:.4f}\n\n"
+        log.add("   单位提成 = 分子 / 分母 = {numerator} / {denominator} = {result:.4f}\n\n", name=f"新底薪{salary_level}单位提成", result=unit_commission, numerator=numerator, denominator=denominator)
 
         per_capita_packs = new_service_packs / store_staff
-        detail += f"   人均服务包数 = 新购买服务包数 / 门店人数 = {new_service_packs} / {store_staff} = {per_capita_packs:.2f}\n\n"
+        log.add("   人均服务包数 = 新购买服务包数 / 门店人数 = {new_service_packs} / {store_staff} = {result:.2f}\n\n", name=f"新底薪{salary_level}人均服务包数", result=per_capita_packs, new_service_packs=new_service_packs, store_staff=store_staff)
 
         base_commission = per_capita_packs * unit_commission
-        detail += f"   基础提成 = 人均服务包数 × 单位提成 = {per_capita_packs:.2f} × {unit_commission:.4f} = {base_commission:.4f}\n\n"
+        log.add("   基础提成 = 人均服务包数 × 单位提成 = {per_capita_packs:.2f} × {unit_commission:.4f} = {result:.4f}\n\n", name=f"新底薪{salary_level}基础提成", result=base_commission, per_capita_packs=per_capita_packs, unit_commission=unit_commission)
 
         # === 2. 应用转化率折扣 ===
-        detail += f"2. 应用转化率折扣规则:\n"
-        detail += f"   当前转化率: {conversion_rate:.2f}%\n"
-        detail += f"   下限要求: {low_conversion_rate * 100}%\n"
-        detail += f"   上限要求: {high_conversion_rate * 100}%\n"
+        log.text("2. 应用转化率折扣规则:\n")
+        log.add("   当前转化率: {conversion_rate:.2f}%\n", conversion_rate=conversion_rate)
+        log.add("   下限要求: {low_rate}%\n", low_rate=low_conversion_rate * 100)
+        log.add("   上限要求: {high_rate}%\n", high_rate=high_conversion_rate * 100)
 
         commission_after_conversion = base_commission
         if conversion_rate < low_conversion_rate * 100:
-            detail += f"   转化率 < 下限要求 → 提成部分打y折扣 ({y_discount})\n"
+            log.add("   转化率 < 下限要求 → 提成部分打y折扣 ({y_discount})\n", y_discount=y_discount)
             commission_after_conversion = base_commission * y_discount
-            detail += f"   折扣后提成 = {base_commission:.4f} × {y_discount} = {commission_after_conversion:.4f}\n"
+            log.add("   折扣后提成 = {base_commission:.4f} × {y_discount} = {result:.4f}\n", name=f"新底薪{salary_level}折扣后提成", result=commission_after_conversion, base_commission=base_commission, y_discount=y_discount)
         elif conversion_rate > high_conversion_rate * 100:
-            detail += f"   转化率 > 上限要求 → 提成部分打z折扣 ({z_discount})\n"
+            log.add("   转化率 > 上限要求 → 提成部分打z折扣 ({z_discount})\n", z_discount=z_discount)
             commission_after_conversion = base_commission * z_discount
-            detail += f"   折扣后提成 = {base_commission:.4f} × {z_discount} = {commission_after_conversion:.4f}\n"
+            log.add("   折扣后提成 = {base_commission:.4f} × {z_discount} = {result:.4f}\n", name=f"新底薪{salary_level}折扣后提成", result=commission_after_conversion, base_commission=base_commission, z_discount=z_discount)
         else:
-            detail += f"   转化率在正常范围内 → 提成不变\n"
-            detail += f"   最终提成 = {commission_after_conversion:.4f}\n"
+            log.text("   转化率在正常范围内 → 提成不变\n")
+            log.add("   最终提成 = {result:.4f}\n", name=f"新底薪{salary_level}最终提成", result=commission_after_conversion)
 
-        detail += "\n"
+        log.text("\n")
 
         # === 3. 应用阈值逻辑（如果启用）===
         if use_threshold:
-            detail += f"3. 应用三档提成逻辑(新底薪{salary_level}):\n"
+            log.add("3. 应用三档提成逻辑(新底薪{salary_level}):\n", salary_level=salary_level)
 
             # 计算阈值数量
             threshold1_value = avg_monthly_packs * store_staff * (threshold1 / 100.0)
             threshold2_value = avg_monthly_packs * store_staff * (threshold2 / 100.0)
 
-            detail += f"   阈值1数量 = 平均每人购买量 × 门店人数 × 阈值1百分比\n"
-            detail += f"            = {avg_monthly_packs} × {store_staff} × {threshold1 / 100} = {threshold1_value:.2f}\n"
-            detail += f"   阈值2数量 = 平均每人购买量 × 门店人数 × 阈值2百分比\n"
-            detail += f"            = {avg_monthly_packs} × {store_staff} × {threshold2 / 100} = {threshold2_value:.2f}\n"
+            log.text("   阈值1数量 = 平均每人购买量 × 门店人数 × 阈值1百分比\n")
+            log.add("            = {avg_monthly_packs} × {store_staff} × {threshold1_ratio} = {result:.2f}\n", name=f"新底薪{salary_level}阈值1数量", result=threshold1_value, avg_monthly_packs=avg_monthly_packs, store_staff=store_staff, threshold1_ratio=threshold1 / 100)
+            log.text("   阈值2数量 = 平均每人购买量 × 门店人数 × 阈值2百分比\n")
+            log.add("            = {avg_monthly_packs} × {store_staff} × {threshold2_ratio} = {result:.2f}\n", name=f"新底薪{salary_level}阈值2数量", result=threshold2_value, avg_monthly_packs=avg_monthly_packs, store_staff=store_staff, threshold2_ratio=threshold2 / 100)
 
             # 应用三档提成规则
             if new_service_packs <= threshold1_value:
-                detail += f"   服务包数量({new_service_packs}) ≤ 阈值1({threshold1_value:.2f}) → 使用档1\n"
+                log.add("   服务包数量({new_service_packs}) ≤ 阈值1({threshold1_value:.2f}) → 使用档1\n", new_service_packs=new_service_packs, threshold1_value=threshold1_value)
                 total_commission = new_service_packs * commission_tier1
-                detail += f"   总提成 = 服务包数量 × 档1每包提成 = {new_service_packs} × {commission_tier1} = {total_commission}\n"
+                log.add("   总提成 = 服务包数量 × 档1每包提成 = {new_service_packs} × {commission_tier1} = {result}\n", name=f"新底薪{salary_level}总提成", result=total_commission, new_service_packs=new_service_packs, commission_tier1=commission_tier1)
             elif threshold1_value < new_service_packs <= threshold2_value:
-                detail += f"   阈值1({threshold1_value:.2f}) < 服务包数量({new_service_packs}) ≤ 阈值2({threshold2_value:.2f}) → 使用档2\n"
+                log.add("   阈值1({threshold1_value:.2f}) < 服务包数量({new_service_packs}) ≤ 阈值2({threshold2_value:.2f}) → 使用档2\n", threshold1_value=threshold1_value, new_service_packs=new_service_packs, threshold2_value=threshold2_value)
                 base_commission = threshold1_value * commission_tier1
                 extra_commission = (new_service_packs - threshold1_value) * commission_tier2
                 total_commission = base_commission + extra_commission
-                detail += f"   总提成 = (阈值1数量 × 档1每包提成) + (超过部分 × 档2每包提成)\n"
-                detail += f"           = ({threshold1_value:.2f} × {commission_tier1}) + ({(new_service_packs - threshold1_value):.2f} × {commission_tier2})\n"
-                detail += f"           = {base_commission} + {extra_commission} = {total_commission}\n"
+                log.text("   总提成 = (阈值1数量 × 档1每包提成) + (超过部分 × 档2每包提成)\n")
+                log.add("           = ({threshold1_value:.2f} × {commission_tier1}) + ({extra_packs:.2f} × {commission_tier2})\n", threshold1_value=threshold1_value, commission_tier1=commission_tier1, extra_packs=(new_service_packs - threshold1_value), commission_tier2=commission_tier2)
+                log.add("           = {base_commission} + {extra_commission} = {result}\n", name=f"新底薪{salary_level}总提成", result=total_commission, base_commission=base_commission, extra_commission=extra_commission)
             else:
-                detail += f"   服务包数量({new_service_packs}) > 阈值2({threshold2_value:.2f}) → 使用档3\n"
+                log.add("   服务包数量({new_service_packs}) > 阈值2({threshold2_value:.2f}) → 使用档3\n", new_service_packs=new_service_packs, threshold2_value=threshold2_value)
                 base_commission1 = threshold1_value * commission_tier1
                 base_commission2 = (threshold2_value - threshold1_value) * commission_tier2
                 extra_commission = (new_service_packs - threshold2_value) * commission_tier3
                 total_commission = base_commission1 + base_commission2 + extra_commission
-                detail += f"   总提成 = (阈值1数量 × 档1每包提成) + (阈值1-2之间数量 × 档2每包提成) + (超过阈值2部分 × 档3每包提成)\n"
-                detail += f"           = ({threshold1_value:.2f} × {commission_tier1}) + ({(threshold2_value - threshold1_value):.2f} × {commission_tier2}) + ({(new_service_packs - threshold2_value):.2f} × {commission_tier3})\n"
-                detail += f"           = {base_commission1} + {base_commission2} + {extra_commission} = {total_commission}\n"
+                log.text("   总提成 = (阈值1数量 × 档1每包提成) + (阈值1-2之间数量 × 档2每包提成) + (超过阈值2部分 × 档3每包提成)\n")
+                log.add("           = ({threshold1_value:.2f} × {commission_tier1}) + ({tier2_packs:.2f} × {commission_tier2}) + ({extra_packs:.2f} × {commission_tier3})\n", threshold1_value=threshold1_value, commission_tier1=commission_tier1, tier2_packs=(threshold2_value - threshold1_value), commission_tier2=commission_tier2, extra_packs=(new_service_packs - threshold2_value), commission_tier3=commission_tier3)
+                log.add("           = {base_commission1} + {base_commission2} + {extra_commission} = {result}\n", name=f"新底薪{salary_level}总提成", result=total_commission, base_commission1=base_commission1, base_commission2=base_commission2, extra_commission=extra_commission)
 
             # 计算人均提成
             commission_per_person = total_commission / store_staff
-            detail += f"\n   人均提成 = 总提成 / 门店人数 = {total_commission} / {store_staff} = {commission_per_person:.4f}\n"
+            log.add("\n   人均提成 = 总提成 / 门店人数 = {total_commission} / {store_staff} = {result:.4f}\n", name=f"新底薪{salary_level}人均提成", result=commission_per_person, total_commission=total_commission, store_staff=store_staff)
 
             # 更新commission变量为人均提成
             commission_after_conversion = commission_per_person
         else:
-            detail += f"3. 未启用阈值计算 → 使用基础提成\n"
-            detail += f"   最终提成 = {commission_after_conversion:.4f}\n"
+            log.text("3. 未启用阈值计算 → 使用基础提成\n")
+            log.add("   最终提成 = {result:.4f}\n", name=f"新底薪{salary_level}最终提成", result=commission_after_conversion)
 
-        detail += "\n"
+        log.text("\n")
 
         # === 4. 计算基础薪资 ===
-        detail += f"4. 计算基础薪资:\n"
+        log.text("4. 计算基础薪资:\n")
         salary_base = new_base + commission_after_conversion
-        detail += f"   汇总薪资基数 = 新底薪 + 提成 = {new_base} + {commission_after_conversion:.4f} = {salary_base:.4f}\n\n"
+        log.add("   汇总薪资基数 = 新底薪 + 提成 = {new_base} + {commission_after_conversion:.4f} = {result:.4f}\n\n", name=f"新底薪{salary_level}汇总薪资基数", result=salary_base, new_base=new_base, commission_after_conversion=commission_after_conversion)
 
         # === 5. 应用门店逻辑（包数不足折扣）===
-        detail += f"5. 应用门店逻辑(包数不足折扣):\n"
+        log.text("5. 应用门店逻辑(包数不足折扣):\n")
 
         # 计算阈值：过去X月平均每人购买量 × 门店人数 × 门店逻辑阈值百分比
         threshold = avg_monthly_packs * store_staff * threshold_percentage
-        detail += f"   阈值 = 过去X月平均每人购买量 × 门店人数 × 门店逻辑阈值百分比\n"
-        detail += f"        = {avg_monthly_packs} × {store_staff} × {threshold_percentage}\n"
-        detail += f"        = {threshold:.2f}\n"
+        log.text("   阈值 = 过去X月平均每人购买量 × 门店人数 × 门店逻辑阈值百分比\n")
+        log.add("        = {avg_monthly_packs} × {store_staff} × {threshold_percentage}\n", avg_monthly_packs=avg_monthly_packs, store_staff=store_staff, threshold_percentage=threshold_percentage)
+        log.add("        = {threshold:.2f}\n", threshold=threshold)
 
-        detail += f"   当前服务包数量 = {new_service_packs}\n"
+        log.add("   当前服务包数量 = {result}\n", name=f"新底薪{salary_level}当前服务包数量", result=new_service_packs)
 
         if new_service_packs < threshold:
-            detail += f"   服务包数量 < 阈值 → 汇总薪资打{threshold_discount}折\n"
+            log.add("   服务包数量 < 阈值 → 汇总薪资打{threshold_discount}折\n", threshold_discount=threshold_discount)
             final_salary = salary_base * threshold_discount
-            detail += f"   最终薪资 = {salary_base:.4f} × {threshold_discount} = {final_salary:.4f}\n"
+            log.add("   最终薪资 = {salary_base:.4f} × {threshold_discount} = {result:.4f}\n", name=f"新底薪{salary_level}最终薪资", result=final_salary, salary_base=salary_base, threshold_discount=threshold_discount)
         else:
             final_salary = salary_base
-            detail += f"   服务包数量 ≥ 阈值 → 汇总薪资不变\n"
-            detail += f"   最终薪资 = {final_salary:.4f}\n"
+            log.text("   服务包数量 ≥ 阈值 → 汇总薪资不变\n")
+            log.add("   最终薪资 = {result:.4f}\n", name=f"新底薪{salary_level}最终薪资", result=final_salary)
 
-        detail += f"最终{salary_level}模式薪资: {final_salary:.2f}元\n"
+        log.add("最终{salary_level}模式薪资: {final_salary:.2f}元\n", salary_level=salary_level, final_salary=final_salary)
 
-        return final_salary, detail
+        return final_salary, log
 
 
 if __name__ == "__main__":
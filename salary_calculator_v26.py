@@ -1,6 +1,19 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 
+from salary_calculator.rates import load_rate_table
+from salary_calculator.roster import DEFAULT_STAFF, STAFF_FIELDS, StaffRoster
+from salary_calculator.scheduler import RecomputeScheduler
+from salary_calculator.steps import StepLog
+from salary_calculator.threshold import suggest_thresholds
+
+
+def compute_threshold_suggestion(inputs):
+    """工作线程中计算阈值建议（提成是分段线性函数，直接求解最优阈值）"""
+    new_service_packs, commission_tier1, commission_tier2, commission_tier3, old_commission_total = inputs
+    return suggest_thresholds(new_service_packs, commission_tier1, commission_tier2,
+                              commission_tier3, target=old_commission_total)
+
 
 class SalaryCalculatorApp:
     def __init__(self, root):
@@ -8,6 +21,9 @@ class SalaryCalculatorApp:
         self.root.title("薪资计算系统")
         self.root.geometry("1200x800")
 
+        # 旧提成单价表，当前目录有“提成单价表.json”时优先使用
+        self.commission_rates = load_rate_table()
+
         # 创建数据存储
         self.data = {
             "delivery_volume": tk.StringVar(value="175"),
@@ -39,13 +55,13 @@ class SalaryCalculatorApp:
         }
 
         # 添加员工数据
-        for i in range(2):
-            self.data["staff_data"].append({
-                "old_base": tk.StringVar(value="2000" if i == 0 else "2200"),
-                "basic_perf": tk.StringVar(value="550" if i == 0 else "650"),
-                "post_perf": tk.StringVar(value="200" if i == 0 else "400"),
-                "subsidy": tk.StringVar(value="1100")
-            })
+        for staff in DEFAULT_STAFF:
+            self.data["staff_data"].append({name: tk.StringVar(value=f"{staff[name]:g}") for name in STAFF_FIELDS})
+
+        # 阈值建议在后台线程计算，连续输入时只算最后一次
+        self.threshold_scheduler = RecomputeScheduler(
+            self.root, self.read_threshold_inputs, compute_threshold_suggestion,
+            self.show_threshold_suggestion, on_error=self.show_threshold_error)
 
         self.create_widgets()
 
@@ -56,38 +72,29 @@ class SalaryCalculatorApp:
     def calculate_threshold_suggestion(self, *args):
         if not self.data["use_threshold"].get():
             return
+        self.threshold_scheduler.schedule()
 
-        try:
-            new_service_packs = int(self.data["new_service_packs"].get())
-            commission_tier1 = float(self.data["commission_tier1"].get())
-            commission_tier2 = float(self.data["commission_tier2"].get())
-            commission_tier3 = float(self.data["commission_tier3"].get())
-            old_avg_commission = float(self.data["old_avg_commission"].get() or 0)
+    def read_threshold_inputs(self):
+        """主线程读取阈值建议所需的参数"""
+        if not self.data["use_threshold"].get():
+            return None
 
-            # 用档1提成自动推荐打平
-            old_commission_total = new_service_packs * commission_tier1
+        new_service_packs = int(self.data["new_service_packs"].get())
+        commission_tier1 = float(self.data["commission_tier1"].get())
+        commission_tier2 = float(self.data["commission_tier2"].get())
+        commission_tier3 = float(self.data["commission_tier3"].get())
+        old_avg_commission = float(self.data["old_avg_commission"].get() or 0)
 
-            best_suggestion = ""
-            min_diff = float('inf')
-            step = 5
-            for t1 in range(10, new_service_packs, step):
-                for t2 in range(t1 + step, new_service_packs + step, step):
-                    if new_service_packs <= t1:
-                        total_commission = new_service_packs * commission_tier1
-                    elif new_service_packs <= t2:
-                        total_commission = t1 * commission_tier1 + (new_service_packs - t1) * commission_tier2
-                    else:
-                        total_commission = t1 * commission_tier1 + (t2 - t1) * commission_tier2 + (
-                                new_service_packs - t2) * commission_tier3
-                    diff = abs(total_commission - old_commission_total)
-                    if diff < min_diff:
-                        min_diff = diff
-                        best_suggestion = f"建议阈值1: {t1}包, 阈值2: {t2}包 (差异: {diff:.2f}元)"
+        # 用档1提成自动推荐打平
+        old_commission_total = new_service_packs * commission_tier1
 
-            self.data["threshold_suggestion"].set(best_suggestion)
+        return new_service_packs, commission_tier1, commission_tier2, commission_tier3, old_commission_total
 
-        except Exception as e:
-            self.data["threshold_suggestion"].set(f"计算错误: {str(e)}")
+    def show_threshold_suggestion(self, suggestion):
+        self.data["threshold_suggestion"].set(suggestion.text if suggestion else "")
+
+    def show_threshold_error(self, e):
+        self.data["threshold_suggestion"].set(f"计算错误: {str(e)}")
 
     def toggle_threshold_fields(self, *args):
         # 档1提成始终禁用、只显示
@@ -312,17 +319,17 @@ class SalaryCalculatorApp:
         self.data["threshold_percentage"].set("0.9")
         self.data["calculated_commission_rate"].set("")
         self.data["threshold_suggestion"].set("")
-        for i, staff in enumerate(self.data["staff_data"]):
-            staff["old_base"].set("2000" if i == 0 else "2200")
-            staff["basic_perf"].set("550" if i == 0 else "650")
-            staff["post_perf"].set("200" if i == 0 else "400")
-            staff["subsidy"].set("1100")
+        for staff, default in zip(self.data["staff_data"], DEFAULT_STAFF):
+            for name in STAFF_FIELDS:
+                staff[name].set(f"{default[name]:g}")
         self.results_text.delete(1.0, tk.END)
         self.toggle_threshold_fields()
 
     def calculate(self):
         try:
-            result_text = "=== 薪资计算详细过程 ===\n\n"
+            # 计算过程只记录模板和数值，最后一次性生成文字
+            log = StepLog()
+            log.text("=== 薪资计算详细过程 ===\n\n")
 
             delivery_volume = int(self.data["delivery_volume"].get())
             service_packs = int(self.data["service_packs"].get())
@@ -349,88 +356,50 @@ class SalaryCalculatorApp:
             commission_tier2 = float(self.data["commission_tier2"].get())
             commission_tier3 = float(self.data["commission_tier3"].get())
 
-            staff_list = []
-            for staff_data in self.data["staff_data"]:
-                staff = {
-                    "old_base": float(staff_data["old_base"].get()),
-                    "basic_perf": float(staff_data["basic_perf"].get()),
-                    "post_perf": float(staff_data["post_perf"].get()),
-                    "subsidy": float(staff_data["subsidy"].get())
-                }
-                staff_list.append(staff)
-
-            result_text += "=== 1. 基础指标计算 ===\n"
+            staff_list = StaffRoster({name: float(var.get()) for name, var in staff_data.items()}
+                                     for staff_data in self.data["staff_data"])
+
+            log.text("=== 1. 基础指标计算 ===\n")
             conversion_rate = (service_packs / delivery_volume) * 100 if delivery_volume > 0 else 0
             per_capita_packs = service_packs / store_staff if store_staff > 0 else 0
-            result_text += f"转化率 = 购买服务包数量 / 交付量 × 100% = {service_packs} / {delivery_volume} × 100% = {conversion_rate:.2f}%\n"
-            result_text += f"人均购买服务包数 = 购买服务包数 / 门店人数 = {service_packs} / {store_staff} = {per_capita_packs:.2f}\n\n"
-
-            result_text += "=== 2. 旧提成单价计算 ===\n"
-            conditions = [
-                (pack_price > 450 and not has_station_license),
-                (pack_price > 450 and has_station_license),
-                (pack_price <= 450 and not has_station_license),
-                (pack_price <= 450 and has_station_license)
-            ]
-
-            commission_rate = 0
-            if conditions[0]:
-                if conversion_rate < 50:
-                    commission_rate = 10
-                elif 50 <= conversion_rate < 60:
-                    commission_rate = 15
-                else:
-                    commission_rate = 20
-                result_text += f"条件: 服务包价格 > 450 且 无站内上牌\n"
-            elif conditions[1]:
-                if conversion_rate < 50:
-                    commission_rate = 15
-                elif 50 <= conversion_rate < 60:
-                    commission_rate = 20
-                else:
-                    commission_rate = 25
-                result_text += f"条件: 服务包价格 > 450 且 有站内上牌\n"
-            elif conditions[2]:
-                if conversion_rate < 50:
-                    commission_rate = 5
-                elif 50 <= conversion_rate < 60:
-                    commission_rate = 10
-                else:
-                    commission_rate = 15
-                result_text += f"条件: 服务包价格 ≤ 450 且 无站内上牌\n"
-            elif conditions[3]:
-                if conversion_rate < 50:
-                    commission_rate = 10
-                elif 50 <= conversion_rate < 60:
-                    commission_rate = 15
-                else:
-                    commission_rate = 20
-                result_text += f"条件: 服务包价格 ≤ 450 且 有站内上牌\n"
+            log.add("转化率 = 购买服务包数量 / 交付量 × 100% = {service_packs} / {delivery_volume} × 100% = {result:.2f}%\n",
+                    name="转化率", result=conversion_rate, service_packs=service_packs, delivery_volume=delivery_volume)
+            log.add("人均购买服务包数 = 购买服务包数 / 门店人数 = {service_packs} / {store_staff} = {result:.2f}\n\n",
+                    name="人均购买服务包数", result=per_capita_packs, service_packs=service_packs, store_staff=store_staff)
+
+            log.text("=== 2. 旧提成单价计算 ===\n")
+            commission_rate = self.commission_rates.lookup(pack_price, has_station_license, conversion_rate)
+            log.add("条件: {condition}\n", condition=self.commission_rates.describe(pack_price, has_station_license))
 
             self.data["calculated_commission_rate"].set(str(commission_rate))
-            result_text += f"旧提成单价 = {commission_rate}元/包\n\n"
+            log.add("旧提成单价 = {result}元/包\n\n", name="旧提成单价", result=commission_rate)
 
             # === 3. 旧薪资体系 ===
-            result_text += "=== 3. 旧薪资体系计算 ===\n"
+            log.text("=== 3. 旧薪资体系计算 ===\n")
             for i, staff in enumerate(staff_list):
                 basic_salary = staff["old_base"] + staff["basic_perf"] + staff["post_perf"] + staff["subsidy"]
                 total_commission = service_packs * commission_rate
                 per_capita_commission = total_commission / store_staff if store_staff > 0 else 0
                 total_salary = basic_salary + per_capita_commission
-                result_text += f"员工{i + 1}:\n"
-                result_text += f"  基本薪资 = 旧底薪 + 基本绩效 + 岗位绩效 + 补贴 = {staff['old_base']} + {staff['basic_perf']} + {staff['post_perf']} + {staff['subsidy']} = {basic_salary:.2f}元\n"
-                result_text += f"  总提成 = 服务包数 × 提成单价 = {service_packs} × {commission_rate} = {total_commission:.2f}元\n"
-                result_text += f"  人均提成 = 总提成 / 门店人数 = {total_commission:.2f} / {store_staff} = {per_capita_commission:.2f}元\n"
-                result_text += f"  汇总薪资 = 基本薪资 + 人均提成 = {basic_salary:.2f} + {per_capita_commission:.2f} = {total_salary:.2f}元\n\n"
-
-            result_text += "=== 4. 新薪资体系计算 ===\n"
-            result_text += "模式一(新保底):\n"
+                log.add("员工{index}:\n", index=i + 1)
+                log.add("  基本薪资 = 旧底薪 + 基本绩效 + 岗位绩效 + 补贴 = {old_base} + {basic_perf} + {post_perf} + "
+                        "{subsidy} = {result:.2f}元\n", name=f"员工{i + 1}基本薪资", result=basic_salary, **staff)
+                log.add("  总提成 = 服务包数 × 提成单价 = {service_packs} × {rate} = {result:.2f}元\n",
+                        name="总提成", result=total_commission, service_packs=service_packs, rate=commission_rate)
+                log.add("  人均提成 = 总提成 / 门店人数 = {total:.2f} / {store_staff} = {result:.2f}元\n",
+                        name="人均提成", result=per_capita_commission, total=total_commission, store_staff=store_staff)
+                log.add("  汇总薪资 = 基本薪资 + 人均提成 = {basic:.2f} + {commission:.2f} = {result:.2f}元\n\n",
+                        name=f"员工{i + 1}旧薪资", result=total_salary,
+                        basic=basic_salary, commission=per_capita_commission)
+
+            log.text("=== 4. 新薪资体系计算 ===\n")
+            log.text("模式一(新保底):\n")
             for i, staff in enumerate(staff_list):
                 salary_mode1 = 3850
-                result_text += f"  员工{i + 1}薪资 = {salary_mode1}元\n"
+                log.add("  员工{index}薪资 = {result}元\n", name=f"员工{i + 1}新保底", result=salary_mode1, index=i + 1)
 
             # ================== 新底薪中 =========================
-            result_text += "\n模式二(新底薪中):\n"
+            log.text("\n模式二(新底薪中):\n")
             for i, staff in enumerate(staff_list):
                 numerator = staff["old_base"] + staff["basic_perf"] + staff["post_perf"] + staff["subsidy"] + old_avg_commission - new_base_mid
                 denominator = avg_monthly_packs
@@ -478,18 +447,29 @@ class SalaryCalculatorApp:
                 else:
                     final_salary = salary_base
 
-                result_text += f"  员工{i + 1}:\n"
-                result_text += f"    提成基数 = (旧底薪+基本绩效+岗位绩效+补贴+旧月均提成-新底薪) / 过去月均每人包数 = ({staff['old_base']}+{staff['basic_perf']}+{staff['post_perf']}+{staff['subsidy']}+{old_avg_commission}-{new_base_mid}) / {avg_monthly_packs} = {unit_commission:.2f}\n"
+                log.add("  员工{index}:\n", index=i + 1)
+                log.add("    提成基数 = (旧底薪+基本绩效+岗位绩效+补贴+旧月均提成-新底薪) / 过去月均每人包数 = "
+                        "({old_base}+{basic_perf}+{post_perf}+{subsidy}+{old_avg_commission}-{new_base}) / "
+                        "{avg_monthly_packs} = {result:.2f}\n",
+                        name=f"员工{i + 1}新底薪中提成基数", result=unit_commission, old_avg_commission=old_avg_commission,
+                        new_base=new_base_mid, avg_monthly_packs=avg_monthly_packs, **staff)
                 if use_threshold:
-                    result_text += f"    总提成 = {total_commission:.2f}元{discount_note}\n"
-                    result_text += f"    人均提成 = 总提成 / 门店人数 = {total_commission:.2f} / {store_staff} = {commission_per_person:.2f}元\n"
+                    log.add("    总提成 = {result:.2f}元{note}\n",
+                            name=f"员工{i + 1}新底薪中总提成", result=total_commission, note=discount_note)
+                    log.add("    人均提成 = 总提成 / 门店人数 = {total:.2f} / {store_staff} = {result:.2f}元\n",
+                            name=f"员工{i + 1}新底薪中人均提成", result=commission_per_person,
+                            total=total_commission, store_staff=store_staff)
                 else:
-                    result_text += f"    基础提成 = 人均新包数 × 提成基数 = {per_capita_new_packs:.2f} × {unit_commission:.2f} = {base_commission:.2f}{discount_note}\n"
-                result_text += f"    基础薪资 = 新底薪中 + 提成 = {new_base_mid} + {commission_after_conversion:.2f} = {salary_base:.2f}\n"
-                result_text += f"    最终薪资 = {final_salary:.2f}元\n"
+                    log.add("    基础提成 = 人均新包数 × 提成基数 = {packs:.2f} × {unit:.2f} = {result:.2f}{note}\n",
+                            name=f"员工{i + 1}新底薪中基础提成", result=base_commission,
+                            packs=per_capita_new_packs, unit=unit_commission, note=discount_note)
+                log.add("    基础薪资 = 新底薪中 + 提成 = {new_base} + {commission:.2f} = {result:.2f}\n",
+                        name=f"员工{i + 1}新底薪中基础薪资", result=salary_base,
+                        new_base=new_base_mid, commission=commission_after_conversion)
+                log.add("    最终薪资 = {result:.2f}元\n", name=f"员工{i + 1}新底薪中最终薪资", result=final_salary)
 
             # ================== 新底薪低 =========================
-            result_text += "\n模式三(新底薪低):\n"
+            log.text("\n模式三(新底薪低):\n")
             for i, staff in enumerate(staff_list):
                 numerator = staff["old_base"] + staff["basic_perf"] + staff["post_perf"] + staff["subsidy"] + old_avg_commission - new_base_low
                 denominator = avg_monthly_packs
@@ -534,19 +514,30 @@ class SalaryCalculatorApp:
                 else:
                     final_salary = salary_base
 
-                result_text += f"  员工{i + 1}:\n"
-                result_text += f"    提成基数 = (旧底薪+基本绩效+岗位绩效+补贴+旧月均提成-新底薪) / 过去月均每人包数 = ({staff['old_base']}+{staff['basic_perf']}+{staff['post_perf']}+{staff['subsidy']}+{old_avg_commission}-{new_base_low}) / {avg_monthly_packs} = {unit_commission:.2f}\n"
+                log.add("  员工{index}:\n", index=i + 1)
+                log.add("    提成基数 = (旧底薪+基本绩效+岗位绩效+补贴+旧月均提成-新底薪) / 过去月均每人包数 = "
+                        "({old_base}+{basic_perf}+{post_perf}+{subsidy}+{old_avg_commission}-{new_base}) / "
+                        "{avg_monthly_packs} = {result:.2f}\n",
+                        name=f"员工{i + 1}新底薪低提成基数", result=unit_commission, old_avg_commission=old_avg_commission,
+                        new_base=new_base_low, avg_monthly_packs=avg_monthly_packs, **staff)
                 if use_threshold:
-                    result_text += f"    总提成 = {total_commission:.2f}元{discount_note}\n"
-                    result_text += f"    人均提成 = 总提成 / 门店人数 = {total_commission:.2f} / {store_staff} = {commission_per_person:.2f}元\n"
+                    log.add("    总提成 = {result:.2f}元{note}\n",
+                            name=f"员工{i + 1}新底薪低总提成", result=total_commission, note=discount_note)
+                    log.add("    人均提成 = 总提成 / 门店人数 = {total:.2f} / {store_staff} = {result:.2f}元\n",
+                            name=f"员工{i + 1}新底薪低人均提成", result=commission_per_person,
+                            total=total_commission, store_staff=store_staff)
                 else:
-                    result_text += f"    基础提成 = 人均新包数 × 提成基数 = {per_capita_new_packs:.2f} × {unit_commission:.2f} = {base_commission:.2f}{discount_note}\n"
-                result_text += f"    基础薪资 = 新底薪低 + 提成 = {new_base_low} + {commission_after_conversion:.2f} = {salary_base:.2f}\n"
-                result_text += f"    最终薪资 = {final_salary:.2f}元\n"
+                    log.add("    基础提成 = 人均新包数 × 提成基数 = {packs:.2f} × {unit:.2f} = {result:.2f}{note}\n",
+                            name=f"员工{i + 1}新底薪低基础提成", result=base_commission,
+                            packs=per_capita_new_packs, unit=unit_commission, note=discount_note)
+                log.add("    基础薪资 = 新底薪低 + 提成 = {new_base} + {commission:.2f} = {result:.2f}\n",
+                        name=f"员工{i + 1}新底薪低基础薪资", result=salary_base,
+                        new_base=new_base_low, commission=commission_after_conversion)
+                log.add("    最终薪资 = {result:.2f}元\n", name=f"员工{i + 1}新底薪低最终薪资", result=final_salary)
 
             self.results_text.config(state=tk.NORMAL)
             self.results_text.delete(1.0, tk.END)
-            self.results_text.insert(tk.END, result_text)
+            self.results_text.insert(tk.END, log.render())
             self.results_text.config(state=tk.DISABLED)
 
         except Exception as e:
@@ -1,5 +1,21 @@
+import os
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+
+from salary_calculator.commission import StoreParams, calculate_store, store_steps
+from salary_calculator.profiling import span, traced
+from salary_calculator.rates import load_rate_table
+from salary_calculator.roster import DEFAULT_STAFF, STAFF_FIELDS, StaffRoster
+from salary_calculator.scheduler import RecomputeScheduler
+from salary_calculator.threshold import suggest_thresholds
+
+
+def compute_threshold_suggestion(inputs):
+    """工作线程中计算阈值建议（提成是分段线性函数，直接求解最优阈值）"""
+    new_service_packs, commission_tier1, commission_tier2, commission_tier3, old_commission_total = inputs
+    return suggest_thresholds(new_service_packs, commission_tier1, commission_tier2,
+                              commission_tier3, target=old_commission_total)
+
 
 class SalaryCalculatorApp:
     def __init__(self, root):
@@ -7,6 +23,9 @@ class SalaryCalculatorApp:
         self.root.title("薪资计算系统")
         self.root.geometry("1200x850")
 
+        # 旧提成单价表，当前目录有“提成单价表.json”时优先使用
+        self.commission_rates = load_rate_table()
+
         # 创建数据存储
         self.data = {
             "delivery_volume": tk.StringVar(value="175"),
@@ -40,14 +59,16 @@ class SalaryCalculatorApp:
             "staff_data": []
         }
 
-        # 添加员工数据
-        for i in range(2):
-            self.data["staff_data"].append({
-                "old_base": tk.StringVar(value="2000" if i == 0 else "2200"),
-                "basic_perf": tk.StringVar(value="550" if i == 0 else "650"),
-                "post_perf": tk.StringVar(value="200" if i == 0 else "400"),
-                "subsidy": tk.StringVar(value="1100")
-            })
+        # 界面上只有默认的几名员工可以逐个编辑；大门店导入员工名单，不再逐人创建Tk变量
+        for staff in DEFAULT_STAFF:
+            self.data["staff_data"].append({name: tk.StringVar(value=f"{staff[name]:g}") for name in STAFF_FIELDS})
+        # 导入的员工名单（StaffRoster），为 None 时按界面上的员工计算
+        self.staff_roster = None
+
+        # 阈值建议在后台线程计算，连续输入时只算最后一次
+        self.threshold_scheduler = RecomputeScheduler(
+            self.root, self.read_threshold_inputs, compute_threshold_suggestion,
+            self.show_threshold_suggestion, on_error=self.show_threshold_error)
 
         self.create_widgets()
 
@@ -58,36 +79,28 @@ class SalaryCalculatorApp:
     def calculate_threshold_suggestion(self, *args):
         if not self.data["use_threshold"].get():
             return
-        try:
-            new_service_packs = int(self.data["new_service_packs"].get())
-            commission_tier1 = float(self.data["commission_tier1"].get())
-            commission_tier2 = float(self.data["commission_tier2"].get())
-            commission_tier3 = float(self.data["commission_tier3"].get())
-            old_avg_commission = float(self.data["old_avg_commission"].get() or 0)
-
-            # 用档1提成自动推荐打平
-            old_commission_total = new_service_packs * commission_tier1
-
-            best_suggestion = ""
-            min_diff = float('inf')
-            step = 5
-            for t1 in range(10, new_service_packs, step):
-                for t2 in range(t1 + step, new_service_packs + step, step):
-                    if new_service_packs <= t1:
-                        total_commission = new_service_packs * commission_tier1
-                    elif new_service_packs <= t2:
-                        total_commission = t1 * commission_tier1 + (new_service_packs - t1) * commission_tier2
-                    else:
-                        total_commission = t1 * commission_tier1 + (t2 - t1) * commission_tier2 + (
-                                new_service_packs - t2) * commission_tier3
-                    diff = abs(total_commission - old_commission_total)
-                    if diff < min_diff:
-                        min_diff = diff
-                        best_suggestion = f"建议阈值1: {t1}包, 阈值2: {t2}包 (差异: {diff:.2f}元)"
-
-            self.data["threshold_suggestion"].set(best_suggestion)
-        except Exception as e:
-            self.data["threshold_suggestion"].set(f"计算错误: {str(e)}")
+        self.threshold_scheduler.schedule()
+
+    def read_threshold_inputs(self):
+        """主线程读取阈值建议所需的参数"""
+        if not self.data["use_threshold"].get():
+            return None
+        new_service_packs = int(self.data["new_service_packs"].get())
+        commission_tier1 = float(self.data["commission_tier1"].get())
+        commission_tier2 = float(self.data["commission_tier2"].get())
+        commission_tier3 = float(self.data["commission_tier3"].get())
+        old_avg_commission = float(self.data["old_avg_commission"].get() or 0)
+
+        # 用档1提成自动推荐打平
+        old_commission_total = new_service_packs * commission_tier1
+
+        return new_service_packs, commission_tier1, commission_tier2, commission_tier3, old_commission_total
+
+    def show_threshold_suggestion(self, suggestion):
+        self.data["threshold_suggestion"].set(suggestion.text if suggestion else "")
+
+    def show_threshold_error(self, e):
+        self.data["threshold_suggestion"].set(f"计算错误: {str(e)}")
 
     def toggle_threshold_fields(self, *args):
         self.commission_tier1_entry.config(state=tk.DISABLED)
@@ -179,36 +192,7 @@ class SalaryCalculatorApp:
 
             conversion_rate = (service_packs / delivery_volume) * 100 if delivery_volume > 0 else 0
 
-            if pack_price > 450 and not has_station_license:
-                if conversion_rate < 50:
-                    commission_rate = 10
-                elif 50 <= conversion_rate < 60:
-                    commission_rate = 15
-                else:
-                    commission_rate = 20
-            elif pack_price > 450 and has_station_license:
-                if conversion_rate < 50:
-                    commission_rate = 15
-                elif 50 <= conversion_rate < 60:
-                    commission_rate = 20
-                else:
-                    commission_rate = 25
-            elif pack_price <= 450 and not has_station_license:
-                if conversion_rate < 50:
-                    commission_rate = 5
-                elif 50 <= conversion_rate < 60:
-                    commission_rate = 10
-                else:
-                    commission_rate = 15
-            elif pack_price <= 450 and has_station_license:
-                if conversion_rate < 50:
-                    commission_rate = 10
-                elif 50 <= conversion_rate < 60:
-                    commission_rate = 15
-                else:
-                    commission_rate = 20
-            else:
-                commission_rate = 0
+            commission_rate = self.commission_rates.lookup(pack_price, has_station_license, conversion_rate)
 
             total_bonus = service_packs * commission_rate
             nation_amount = total_bonus * nation_commission_rate
@@ -352,6 +336,14 @@ class SalaryCalculatorApp:
             ttk.Entry(staff_frame, textvariable=staff["post_perf"], width=8).grid(row=i + 1, column=3, padx=5, pady=2)
             ttk.Entry(staff_frame, textvariable=staff["subsidy"], width=8).grid(row=i + 1, column=4, padx=5, pady=2)
 
+        roster_row = len(self.data["staff_data"]) + 1
+        roster_frame = ttk.Frame(staff_frame)
+        roster_frame.grid(row=roster_row, column=0, columnspan=5, sticky=tk.W, padx=5, pady=10)
+        ttk.Button(roster_frame, text="导入员工名单", command=self.import_roster).pack(side=tk.LEFT, padx=5)
+        ttk.Button(roster_frame, text="清除名单", command=self.clear_roster).pack(side=tk.LEFT, padx=5)
+        self.roster_label = ttk.Label(roster_frame, text="未导入名单，按上面的员工计算")
+        self.roster_label.pack(side=tk.LEFT, padx=5)
+
         self.toggle_threshold_fields()
 
         # 在基础参数tab最后一行加“有区总”勾选框
@@ -446,273 +438,119 @@ class SalaryCalculatorApp:
         self.data["threshold_percentage"].set("0.9")
         self.data["calculated_commission_rate"].set("")
         self.data["threshold_suggestion"].set("")
-        for i, staff in enumerate(self.data["staff_data"]):
-            staff["old_base"].set("2000" if i == 0 else "2200")
-            staff["basic_perf"].set("550" if i == 0 else "650")
-            staff["post_perf"].set("200" if i == 0 else "400")
-            staff["subsidy"].set("1100")
+        for staff, default in zip(self.data["staff_data"], DEFAULT_STAFF):
+            for name in STAFF_FIELDS:
+                staff[name].set(f"{default[name]:g}")
+        self.clear_roster()
         self.results_text.delete(1.0, tk.END)
         self.toggle_threshold_fields()
 
+    def import_roster(self):
+        """导入员工名单（列: 旧底薪、基本绩效、岗位绩效、补贴），门店人数改为名单人数"""
+        path = filedialog.askopenfilename(
+            title="导入员工名单",
+            filetypes=[("表格文件", "*.xlsx *.xls *.csv *.parquet"), ("所有文件", "*.*")],
+        )
+        if not path:
+            return
+        try:
+            roster = StaffRoster.read(path)
+        except Exception as e:
+            messagebox.showerror("名单错误", f"读取员工名单时出现错误: {str(e)}")
+            return
+        if not len(roster):
+            messagebox.showerror("名单错误", "员工名单为空")
+            return
+        self.staff_roster = roster
+        self.data["store_staff"].set(str(len(roster)))
+        self.roster_label.config(text=f"已导入 {len(roster)} 名员工: {os.path.basename(path)}")
+
+    def clear_roster(self):
+        """恢复按界面上的员工计算"""
+        self.staff_roster = None
+        self.roster_label.config(text="未导入名单，按上面的员工计算")
+
+    @traced("v28.calculate")
     def calculate(self):
         try:
-            result_text = "=== 薪资计算详细过程 ===\n\n"
-
-            delivery_volume = int(self.data["delivery_volume"].get())
-            service_packs = int(self.data["service_packs"].get())
-            store_staff = int(self.data["store_staff"].get())
-            pack_price = int(self.data["pack_price"].get())
-            pack_cost = int(self.data["pack_cost"].get())
-            has_station_license = self.data["has_station_license"].get() == "有"
-            avg_monthly_packs = int(self.data["avg_monthly_packs"].get())
-            threshold_discount = float(self.data["threshold_discount"].get())
-            old_avg_commission = float(self.data["old_avg_commission"].get())
-            new_base_mid = float(self.data["new_base_mid"].get())
-            new_base_low = float(self.data["new_base_low"].get())
-            new_service_packs = int(self.data["new_service_packs"].get())
-            use_threshold = self.data["use_threshold"].get()
-
-            low_conversion_rate = float(self.data["low_conversion_rate"].get())
-            high_conversion_rate = float(self.data["high_conversion_rate"].get())
-            y_discount = float(self.data["y_discount"].get())
-            z_discount = float(self.data["z_discount"].get())
-            threshold_percentage = float(self.data["threshold_percentage"].get())
-
-            threshold1 = int(self.data["threshold1"].get())
-            threshold2 = int(self.data["threshold2"].get())
-            commission_tier2 = float(self.data["commission_tier2"].get())
-            commission_tier3 = float(self.data["commission_tier3"].get())
-
-            staff_list = []
-            for staff_data in self.data["staff_data"]:
-                staff = {
-                    "old_base": float(staff_data["old_base"].get()),
-                    "basic_perf": float(staff_data["basic_perf"].get()),
-                    "post_perf": float(staff_data["post_perf"].get()),
-                    "subsidy": float(staff_data["subsidy"].get())
-                }
-                staff_list.append(staff)
-
-            result_text += "=== 1. 基础指标计算 ===\n"
-            conversion_rate = (service_packs / delivery_volume) * 100 if delivery_volume > 0 else 0
-            per_capita_packs = service_packs / store_staff if store_staff > 0 else 0
-            result_text += f"转化率 = 购买服务包数量 / 交付量 × 100% = {service_packs} / {delivery_volume} × 100% = {conversion_rate:.2f}%\n"
-            result_text += f"人均购买服务包数 = 购买服务包数 / 门店人数 = {service_packs} / {store_staff} = {per_capita_packs:.2f}\n\n"
-
-            result_text += "=== 2. 旧提成单价计算 ===\n"
-            conditions = [
-                (pack_price > 450 and not has_station_license),
-                (pack_price > 450 and has_station_license),
-                (pack_price <= 450 and not has_station_license),
-                (pack_price <= 450 and has_station_license)
-            ]
-
-            commission_rate = 0
-            if conditions[0]:
-                if conversion_rate < 50:
-                    commission_rate = 10
-                elif 50 <= conversion_rate < 60:
-                    commission_rate = 15
-                else:
-                    commission_rate = 20
-                result_text += f"条件: 服务包价格 > 450 且 无站内上牌\n"
-            elif conditions[1]:
-                if conversion_rate < 50:
-                    commission_rate = 15
-                elif 50 <= conversion_rate < 60:
-                    commission_rate = 20
-                else:
-                    commission_rate = 25
-                result_text += f"条件: 服务包价格 > 450 且 有站内上牌\n"
-            elif conditions[2]:
-                if conversion_rate < 50:
-                    commission_rate = 5
-                elif 50 <= conversion_rate < 60:
-                    commission_rate = 10
-                else:
-                    commission_rate = 15
-                result_text += f"条件: 服务包价格 ≤ 450 且 无站内上牌\n"
-            elif conditions[3]:
-                if conversion_rate < 50:
-                    commission_rate = 10
-                elif 50 <= conversion_rate < 60:
-                    commission_rate = 15
-                else:
-                    commission_rate = 20
-                result_text += f"条件: 服务包价格 ≤ 450 且 有站内上牌\n"
-
-            self.data["calculated_commission_rate"].set(str(commission_rate))
-            result_text += f"旧提成单价 = {commission_rate}元/包\n\n"
-
-            result_text += "=== 3. 旧薪资体系计算 ===\n"
-
-            # 重新读取参数，保证联动
-            nation_commission_rate = float(self.data["nation_commission_rate"].get())
-            region_commission_rate = float(self.data["region_commission_rate"].get())
-            has_region = self.data["has_region"].get()
-            if isinstance(has_region, str):
-                has_region = has_region.lower() in ("1", "true", "yes", "on")
-            elif isinstance(has_region, int):
-                has_region = bool(has_region)
-            # 调试可留
-            # print("调试：has_region（类型保险）为：", has_region)
-
-            for i, staff in enumerate(staff_list):
-                basic_salary = staff["old_base"] + staff["basic_perf"] + staff["post_perf"] + staff["subsidy"]
-                total_commission = service_packs * commission_rate
-                nation_amount = total_commission * nation_commission_rate
-                if has_region:
-                    region_amount = (total_commission - nation_amount) * region_commission_rate
-                    staff_amount = (total_commission - nation_amount) * (1 - region_commission_rate)
-                else:
-                    region_amount = 0
-                    staff_amount = total_commission - nation_amount
-                per_capita_commission = staff_amount / store_staff if store_staff > 0 else 0
-                total_salary = basic_salary + per_capita_commission
-
-                result_text += f"员工{i + 1}:\n"
-                result_text += f"  基本薪资 = 旧底薪 + 基本绩效 + 岗位绩效 + 补贴 = {staff['old_base']} + {staff['basic_perf']} + {staff['post_perf']} + {staff['subsidy']} = {basic_salary:.2f}元\n"
-                result_text += f"  门店总奖金 = 购买服务包数 × 单包提成金额 = {service_packs} × {commission_rate} = {total_commission:.2f}元\n"
-                result_text += f"  全国总提成 = 门店总奖金 × 全国总提成比例 = {total_commission:.2f} × {nation_commission_rate:.2f} = {nation_amount:.2f}元\n"
-                if has_region:
-                    result_text += f"  区总提成 = (门店总奖金 - 全国总提成) × 区总提成比例 = ({total_commission:.2f} - {nation_amount:.2f}) × {region_commission_rate:.2f} = {region_amount:.2f}元\n"
-                    result_text += f"  员工可分部分 = (门店总奖金 - 全国总提成) × (1-区总提成比例) = ({total_commission:.2f} - {nation_amount:.2f}) × {1 - region_commission_rate:.2f} = {staff_amount:.2f}元\n"
-                else:
-                    result_text += f"  员工可分部分 = 门店总奖金 - 全国总提成 = {total_commission:.2f} - {nation_amount:.2f} = {staff_amount:.2f}元\n"
-                result_text += f"  人均提成 = 员工可分部分 / 门店人数 = {staff_amount:.2f} / {store_staff} = {per_capita_commission:.2f}元\n"
-                result_text += f"  汇总薪资 = 基本薪资 + 人均提成 = {basic_salary:.2f} + {per_capita_commission:.2f} = {total_salary:.2f}元\n\n"
-
-            result_text += "=== 4. 新薪资体系计算 ===\n"
-            result_text += "模式一(新保底):\n"
-            for i, staff in enumerate(staff_list):
-                salary_mode1 = 3850
-                result_text += f"  员工{i + 1}薪资 = {salary_mode1}元\n"
-
-            # ================== 新底薪中 =========================
-            result_text += "\n模式二(新底薪中):\n"
-            for i, staff in enumerate(staff_list):
-                numerator = staff["old_base"] + staff["basic_perf"] + staff["post_perf"] + staff[
-                    "subsidy"] + old_avg_commission - new_base_mid
-                denominator = avg_monthly_packs
-                if denominator == 0:
+            with span("读取参数"):
+                delivery_volume = int(self.data["delivery_volume"].get())
+                service_packs = int(self.data["service_packs"].get())
+                store_staff = int(self.data["store_staff"].get())
+                pack_price = int(self.data["pack_price"].get())
+                pack_cost = int(self.data["pack_cost"].get())
+                has_station_license = self.data["has_station_license"].get() == "有"
+                avg_monthly_packs = int(self.data["avg_monthly_packs"].get())
+                threshold_discount = float(self.data["threshold_discount"].get())
+                old_avg_commission = float(self.data["old_avg_commission"].get())
+                new_base_mid = float(self.data["new_base_mid"].get())
+                new_base_low = float(self.data["new_base_low"].get())
+                new_service_packs = int(self.data["new_service_packs"].get())
+                use_threshold = self.data["use_threshold"].get()
+
+                low_conversion_rate = float(self.data["low_conversion_rate"].get())
+                high_conversion_rate = float(self.data["high_conversion_rate"].get())
+                y_discount = float(self.data["y_discount"].get())
+                z_discount = float(self.data["z_discount"].get())
+                threshold_percentage = float(self.data["threshold_percentage"].get())
+
+                threshold1 = int(self.data["threshold1"].get())
+                threshold2 = int(self.data["threshold2"].get())
+                commission_tier2 = float(self.data["commission_tier2"].get())
+                commission_tier3 = float(self.data["commission_tier3"].get())
+
+                staff_list = self.staff_roster
+                if staff_list is None:
+                    staff_list = StaffRoster({name: float(var.get()) for name, var in staff_data.items()}
+                                             for staff_data in self.data["staff_data"])
+
+                # 重新读取参数，保证联动
+                nation_commission_rate = float(self.data["nation_commission_rate"].get())
+                region_commission_rate = float(self.data["region_commission_rate"].get())
+                has_region = self.data["has_region"].get()
+                if isinstance(has_region, str):
+                    has_region = has_region.lower() in ("1", "true", "yes", "on")
+                elif isinstance(has_region, int):
+                    has_region = bool(has_region)
+                # 调试可留
+                # print("调试：has_region（类型保险）为：", has_region)
+
+                if len(staff_list) and avg_monthly_packs == 0:
                     messagebox.showerror("错误", "过去X月平均每人购买服务包数量不能为零")
                     return
-                unit_commission = numerator / denominator  # 档1自动算
 
-                # UI只读显示
+                params = StoreParams(
+                    delivery_volume=delivery_volume, service_packs=service_packs, store_staff=store_staff,
+                    pack_price=pack_price, has_station_license=has_station_license,
+                    avg_monthly_packs=avg_monthly_packs, threshold_discount=threshold_discount,
+                    old_avg_commission=old_avg_commission, new_base_mid=new_base_mid, new_base_low=new_base_low,
+                    new_service_packs=new_service_packs, low_conversion_rate=low_conversion_rate,
+                    high_conversion_rate=high_conversion_rate, y_discount=y_discount, z_discount=z_discount,
+                    threshold_percentage=threshold_percentage, use_threshold=use_threshold,
+                    threshold1=threshold1, threshold2=threshold2,
+                    commission_tier2=commission_tier2, commission_tier3=commission_tier3,
+                    nation_commission_rate=nation_commission_rate, region_commission_rate=region_commission_rate,
+                    has_region=has_region)
+            # 门店级的量只算一次，每个员工只算与本人有关的部分
+            with span("门店计算"):
+                store = calculate_store(params, staff_list, self.commission_rates)
+            ctx = store.context
+
+            self.data["calculated_commission_rate"].set(str(ctx.commission_rate))
+            if store.mid:
+                # UI只读显示（档1单价随员工不同，显示最后一名员工的）
+                unit_commission = store.mid[-1].unit_commission
                 self.data["commission_tier1"].set(f"{unit_commission:.2f}")
                 self.tier1_note_label.config(text=f"(档1单价为：{unit_commission:.2f}元/包，仅做自动显示)")
 
-                per_capita_new_packs = new_service_packs / store_staff if store_staff > 0 else 0
-
-                if use_threshold:
-                    commission_tier1 = unit_commission  # 只用自动算出来的
-                    if new_service_packs <= threshold1:
-                        total_commission = new_service_packs * commission_tier1
-                    elif new_service_packs <= threshold2:
-                        total_commission = threshold1 * commission_tier1 + (
-                                    new_service_packs - threshold1) * commission_tier2
-                    else:
-                        total_commission = threshold1 * commission_tier1 + (
-                                    threshold2 - threshold1) * commission_tier2 + (
-                                                   new_service_packs - threshold2) * commission_tier3
-                    commission_per_person = total_commission / store_staff if store_staff > 0 else 0
-                    commission_after_conversion = commission_per_person
-                    discount_note = " (应用阈值计算)"
-                    salary_base = new_base_mid + commission_after_conversion
-                else:
-                    base_commission = per_capita_new_packs * unit_commission
-                    commission_after_conversion = base_commission
-                    if conversion_rate < low_conversion_rate * 100:
-                        commission_after_conversion = base_commission * y_discount
-                        discount_note = f" (应用y折扣: {y_discount})"
-                    elif conversion_rate > high_conversion_rate * 100:
-                        commission_after_conversion = base_commission * z_discount
-                        discount_note = f" (应用z折扣: {z_discount})"
-                    else:
-                        discount_note = ""
-                    salary_base = new_base_mid + commission_after_conversion
-
-                threshold = avg_monthly_packs * store_staff * threshold_percentage
-                if new_service_packs < threshold:
-                    final_salary = salary_base * threshold_discount
-                    discount_note += f" (包数不足, 应用折扣: {threshold_discount})"
-                else:
-                    final_salary = salary_base
-
-                result_text += f"  员工{i + 1}:\n"
-                result_text += f"    提成基数 = (旧底薪+基本绩效+岗位绩效+补贴+旧月均提成-新底薪) / 过去月均每人包数 = ({staff['old_base']}+{staff['basic_perf']}+{staff['post_perf']}+{staff['subsidy']}+{old_avg_commission}-{new_base_mid}) / {avg_monthly_packs} = {unit_commission:.2f}\n"
-                if use_threshold:
-                    result_text += f"    总提成 = {total_commission:.2f}元{discount_note}\n"
-                    result_text += f"    人均提成 = 总提成 / 门店人数 = {total_commission:.2f} / {store_staff} = {commission_per_person:.2f}元\n"
-                else:
-                    result_text += f"    基础提成 = 人均新包数 × 提成基数 = {per_capita_new_packs:.2f} × {unit_commission:.2f} = {base_commission:.2f}{discount_note}\n"
-                result_text += f"    基础薪资 = 新底薪中 + 提成 = {new_base_mid} + {commission_after_conversion:.2f} = {salary_base:.2f}\n"
-                result_text += f"    最终薪资 = {final_salary:.2f}元\n"
-
-            # ================== 新底薪低 =========================
-            result_text += "\n模式三(新底薪低):\n"
-            for i, staff in enumerate(staff_list):
-                numerator = staff["old_base"] + staff["basic_perf"] + staff["post_perf"] + staff[
-                    "subsidy"] + old_avg_commission - new_base_low
-                denominator = avg_monthly_packs
-                if denominator == 0:
-                    messagebox.showerror("错误", "过去X月平均每人购买服务包数量不能为零")
-                    return
-                unit_commission = numerator / denominator  # 档1自动算
-                # 可扩展：也可给档1低模式加一个只读显示
-
-                per_capita_new_packs = new_service_packs / store_staff if store_staff > 0 else 0
-
-                if use_threshold:
-                    commission_tier1 = unit_commission  # 只用自动算出来的
-                    if new_service_packs <= threshold1:
-                        total_commission = new_service_packs * commission_tier1
-                    elif new_service_packs <= threshold2:
-                        total_commission = threshold1 * commission_tier1 + (
-                                    new_service_packs - threshold1) * commission_tier2
-                    else:
-                        total_commission = threshold1 * commission_tier1 + (
-                                    threshold2 - threshold1) * commission_tier2 + (
-                                                   new_service_packs - threshold2) * commission_tier3
-                    commission_per_person = total_commission / store_staff if store_staff > 0 else 0
-                    commission_after_conversion = commission_per_person
-                    discount_note = " (应用阈值计算)"
-                    salary_base = new_base_low + commission_after_conversion
-                else:
-                    base_commission = per_capita_new_packs * unit_commission
-                    commission_after_conversion = base_commission
-                    if conversion_rate < low_conversion_rate * 100:
-                        commission_after_conversion = base_commission * y_discount
-                        discount_note = f" (应用y折扣: {y_discount})"
-                    elif conversion_rate > high_conversion_rate * 100:
-                        commission_after_conversion = base_commission * z_discount
-                        discount_note = f" (应用z折扣: {z_discount})"
-                    else:
-                        discount_note = ""
-                    salary_base = new_base_low + commission_after_conversion
-
-                threshold = avg_monthly_packs * store_staff * threshold_percentage
-                if new_service_packs < threshold:
-                    final_salary = salary_base * threshold_discount
-                    discount_note += f" (包数不足, 应用折扣: {threshold_discount})"
-                else:
-                    final_salary = salary_base
-
-                result_text += f"  员工{i + 1}:\n"
-                result_text += f"    提成基数 = (旧底薪+基本绩效+岗位绩效+补贴+旧月均提成-新底薪) / 过去月均每人包数 = ({staff['old_base']}+{staff['basic_perf']}+{staff['post_perf']}+{staff['subsidy']}+{old_avg_commission}-{new_base_low}) / {avg_monthly_packs} = {unit_commission:.2f}\n"
-                if use_threshold:
-                    result_text += f"    总提成 = {total_commission:.2f}元{discount_note}\n"
-                    result_text += f"    人均提成 = 总提成 / 门店人数 = {total_commission:.2f} / {store_staff} = {commission_per_person:.2f}元\n"
-                else:
-                    result_text += f"    基础提成 = 人均新包数 × 提成基数 = {per_capita_new_packs:.2f} × {unit_commission:.2f} = {base_commission:.2f}{discount_note}\n"
-                result_text += f"    基础薪资 = 新底薪低 + 提成 = {new_base_low} + {commission_after_conversion:.2f} = {salary_base:.2f}\n"
-                result_text += f"    最终薪资 = {final_salary:.2f}元\n"
-
-            self.results_text.config(state=tk.NORMAL)
-            self.results_text.delete(1.0, tk.END)
-            self.results_text.insert(tk.END, result_text)
-            self.results_text.config(state=tk.DISABLED)
+            # 计算过程文字只在显示时生成
+            with span("生成文字"):
+                result_text = store_steps(store, staff_list, self.commission_rates).render()
+
+                self.results_text.config(state=tk.NORMAL)
+                self.results_text.delete(1.0, tk.END)
+                self.results_text.insert(tk.END, result_text)
+                self.results_text.config(state=tk.DISABLED)
 
         except Exception as e:
             messagebox.showerror("计算错误", f"计算过程中发生错误: {str(e)}")
@@ -1,10 +1,20 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import pandas as pd
-import matplotlib.pyplot as plt
 import json
+import os
 from datetime import datetime
 
+from salary_calculator import profiling
+from salary_calculator.scheduler import RecomputeScheduler
+
+
+def render_chart_file(inputs):
+    """后台线程：按参数快照生成图表文件"""
+    from salary_calculator.charts import render_charts
+    params, output_dir = inputs
+    chart_path, cached = render_charts(params, output_dir)
+    return params, chart_path, cached
+
 
 class SalaryCalculator:
     def __init__(self, root):
@@ -15,6 +25,11 @@ class SalaryCalculator:
         # 创建变量
         self.create_variables()
 
+        # 图表在后台线程渲染，界面不卡顿
+        self.chart_scheduler = RecomputeScheduler(
+            self.root, self.read_chart_inputs, render_chart_file, self.show_chart_result,
+            on_error=lambda e: messagebox.showerror("图表生成错误", f"生成图表时出现错误: {str(e)}"))
+
         # 创建主框架
         self.create_main_frame()
 
@@ -61,6 +76,9 @@ class SalaryCalculator:
         self.avg_conversion_rate = tk.DoubleVar(value=50.0)
         self.city_cost = tk.DoubleVar(value=10000.0)
 
+        # 图表保存目录
+        self.chart_output_dir = tk.StringVar(value=os.path.expanduser("~"))
+
     def create_main_frame(self):
         """创建主框架"""
         # 创建笔记本控件（标签页）
@@ -309,6 +327,13 @@ class SalaryCalculator:
         viz_button = ttk.Button(self.viz_frame, text="生成图表", command=self.generate_charts)
         viz_button.pack(pady=10)
 
+        # 图表保存目录
+        dir_frame = ttk.Frame(self.viz_frame)
+        dir_frame.pack(fill="x", padx=10)
+        ttk.Label(dir_frame, text="图表保存目录:").pack(side="left")
+        ttk.Entry(dir_frame, textvariable=self.chart_output_dir, width=60).pack(side="left", padx=5)
+        ttk.Button(dir_frame, text="浏览...", command=self.choose_chart_output_dir).pack(side="left")
+
         # 图表显示区域
         self.viz_text = tk.Text(self.viz_frame, height=25, width=100)
         viz_scrollbar = ttk.Scrollbar(self.viz_frame, orient="vertical", command=self.viz_text.yview)
@@ -541,7 +566,8 @@ class SalaryCalculator:
         if self.employee_type.get() == "主管":
             salary += 500
 
-        print(f"[DEBUG] 使用底薪（低）: {new_base}, bonus: {bonus}, total: {salary}")
+        # 原来每次调用都打印调试行，改为只在启用计时时记入 trace
+        profiling.note("新底薪（低）", new_base=new_base, bonus=bonus, total=salary)
 
         return salary
 
@@ -782,6 +808,8 @@ class SalaryCalculator:
     def export_excel(self):
         """导出Excel报告"""
         try:
+            # pandas 只在导出时才用到，延迟导入以加快窗口启动
+            import pandas as pd
             from datetime import datetime
 
             # 计算所有模式的薪资
@@ -934,141 +962,55 @@ class SalaryCalculator:
         except Exception as e:
             messagebox.showerror("加载错误", f"加载配置时出现错误: {str(e)}")
 
-    def generate_charts(self):
-        """生成数据可视化图表"""
-        try:
-            # 计算所有模式的薪资
-            old_salary = self.calculate_old_salary()
-            mode1_salary = self.apply_conversion_rate_penalty(self.calculate_new_salary_mode1())
-            mode2_salary = self.apply_conversion_rate_penalty(self.calculate_new_salary_mode2())
-            mode3_salary = self.apply_conversion_rate_penalty(self.calculate_new_salary_mode3())
+    def sweep_params(self):
+        """当前界面参数的快照（图表扫描用）"""
+        from salary_calculator.sweep import SweepParams
+        return SweepParams.from_config({name: getattr(self, name).get() for name in SweepParams.names()})
 
-            # 设置中文字体
-            plt.rcParams['font.sans-serif'] = ['DejaVu Sans']
-            plt.rcParams['axes.unicode_minus'] = False
-
-            # 创建图表
-            fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
-
-            # 1. 薪资对比柱状图
-            modes = ['旧薪资体系', '新保底', '新底薪（中）', '新底薪（低）']
-            salaries = [old_salary, mode1_salary, mode2_salary, mode3_salary]
-            colors = ['#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
-
-            bars = ax1.bar(modes, salaries, color=colors)
-            ax1.set_title('薪资模式对比', fontsize=14, fontweight='bold')
-            ax1.set_ylabel('薪资 (元)')
-            ax1.tick_params(axis='x', rotation=45)
-
-            # 在柱状图上添加数值标签
-            for bar, salary in zip(bars, salaries):
-                height = bar.get_height()
-                ax1.text(bar.get_x() + bar.get_width() / 2., height + 50,
-                         f'{salary:.0f}', ha='center', va='bottom')
-
-            # 2. 薪资差异饼图
-            differences = [mode1_salary - old_salary, mode2_salary - old_salary, mode3_salary - old_salary]
-            positive_diffs = [max(0, diff) for diff in differences]
-
-            if sum(positive_diffs) > 0:
-                labels = ['新保底', '新底薪（中）', '新底薪（低）']
-                ax2.pie(positive_diffs, labels=labels, autopct='%1.1f%%', startangle=90)
-                ax2.set_title('薪资提升比例分布')
-            else:
-                ax2.text(0.5, 0.5, '所有新模式薪资\n均未超过旧模式',
-                         ha='center', va='center', transform=ax2.transAxes)
-                ax2.set_title('薪资提升比例分布')
-
-            # 3. 转化率影响分析
-            conversion_rates = [30, 40, 45, 50, 60, 70]
-            old_salaries = []
-            new_salaries = []
-
-            original_conversion = self.calculate_conversion_rate()
-            original_purchase = self.purchase_amount.get()
-            original_delivery = self.delivery_amount.get()
-            # 临时保存原始值
-            original_conversion = self.calculate_conversion_rate()
-            original_purchase = self.purchase_amount.get()
-            original_delivery = self.delivery_amount.get()
-
-            # 计算不同转化率下的薪资
-            for rate in conversion_rates:
-                # 设置新的转化率
-                self.purchase_amount.set(original_delivery * rate / 100)
-                # 计算薪资
-                old_salaries.append(self.calculate_old_salary())
-                new_salaries.append(self.apply_conversion_rate_penalty(self.calculate_new_salary_mode2()))
-
-            # 恢复原始值
-            self.purchase_amount.set(original_purchase)
-            self.delivery_amount.set(original_delivery)
-
-            ax3.plot(conversion_rates, old_salaries, 'o-', label='旧薪资体系')
-            ax3.plot(conversion_rates, new_salaries, 's-', label='新底薪（中）')
-            ax3.set_title('转化率对薪资的影响')
-            ax3.set_xlabel('转化率 (%)')
-            ax3.set_ylabel('薪资 (元)')
-            ax3.legend()
-            ax3.grid(True)
-
-            # 4. 购买量对薪资的影响
-            purchase_amounts = [20, 40, 60, 80, 100, 120]
-            old_salaries = []
-            new_salaries = []
-
-            # 计算不同购买量下的薪资
-            for amount in purchase_amounts:
-                self.purchase_amount.set(amount)
-                # 计算薪资
-                old_salaries.append(self.calculate_old_salary())
-                new_salaries.append(self.apply_conversion_rate_penalty(self.calculate_new_salary_mode2()))
-
-            # 恢复原始值
-            self.purchase_amount.set(original_purchase)
-
-            ax4.plot(purchase_amounts, old_salaries, 'o-', label='旧薪资体系')
-            ax4.plot(purchase_amounts, new_salaries, 's-', label='新底薪（中）')
-            ax4.set_title('购买量对薪资的影响')
-            ax4.set_xlabel('购买服务包数量')
-            ax4.set_ylabel('薪资 (元)')
-            ax4.legend()
-            ax4.grid(True)
-
-            # 调整布局
-            plt.tight_layout()
-
-            # 保存图表
-            filename = f"薪资分析图表_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-            chart_path = f"/home/ubuntu/{filename}"
-            plt.savefig(chart_path)
-            plt.close()
-
-            # 在文本框中显示图表信息
-            self.viz_text.delete(1.0, tk.END)
-            chart_info = f"图表已生成并保存到: {chart_path}\n\n"
-            chart_info += "图表说明:\n"
-            chart_info += "1. 薪资模式对比: 直观展示不同薪资模式下的薪资水平\n"
-            chart_info += "2. 薪资提升比例分布: 展示新模式相比旧模式的薪资提升比例\n"
-            chart_info += "3. 转化率对薪资的影响: 分析转化率变化对薪资的影响趋势\n"
-            chart_info += "4. 购买量对薪资的影响: 分析购买服务包数量变化对薪资的影响趋势\n\n"
-
-            chart_info += f"当前参数:\n"
-            chart_info += f"员工类型: {self.employee_type.get()}\n"
-            chart_info += f"选择模式: {self.salary_mode.get()}\n"
-            chart_info += f"转化率: {self.calculate_conversion_rate():.2f}%\n"
-            chart_info += f"交付量: {self.delivery_amount.get()}\n"
-            chart_info += f"购买服务包数量: {self.purchase_amount.get()}\n"
-
-            chart_info += "\n建议:\n"
-            chart_info += "根据图表分析结果，选择最适合的薪资模式和业务策略。"
-
-            self.viz_text.insert(tk.END, chart_info)
-
-            messagebox.showinfo("图表生成成功", f"数据可视化图表已保存到: {chart_path}")
+    def read_chart_inputs(self):
+        """主线程：读取参数快照和图表保存目录"""
+        return self.sweep_params(), self.chart_output_dir.get()
 
-        except Exception as e:
-            messagebox.showerror("图表生成错误", f"生成图表时出现错误: {str(e)}")
+    def choose_chart_output_dir(self):
+        """选择图表保存目录"""
+        directory = filedialog.askdirectory(initialdir=self.chart_output_dir.get())
+        if directory:
+            self.chart_output_dir.set(directory)
+
+    def generate_charts(self):
+        """生成数据可视化图表（在后台线程中渲染）"""
+        self.viz_text.delete(1.0, tk.END)
+        self.viz_text.insert(tk.END, "正在生成图表...\n")
+        self.chart_scheduler.run_now()
+
+    def show_chart_result(self, result):
+        """主线程：显示图表生成结果"""
+        params, chart_path, cached = result
+
+        # 在文本框中显示图表信息
+        self.viz_text.delete(1.0, tk.END)
+        chart_info = f"图表已生成并保存到: {chart_path}\n"
+        if cached:
+            chart_info += "（参数未变化，直接使用已生成的图表）\n"
+        chart_info += "\n图表说明:\n"
+        chart_info += "1. 薪资模式对比: 直观展示不同薪资模式下的薪资水平\n"
+        chart_info += "2. 薪资提升比例分布: 展示新模式相比旧模式的薪资提升比例\n"
+        chart_info += "3. 转化率对薪资的影响: 分析转化率变化对薪资的影响趋势\n"
+        chart_info += "4. 购买量对薪资的影响: 分析购买服务包数量变化对薪资的影响趋势\n\n"
+
+        chart_info += f"当前参数:\n"
+        chart_info += f"员工类型: {params.employee_type}\n"
+        chart_info += f"选择模式: {self.salary_mode.get()}\n"
+        chart_info += f"转化率: {params.purchase_amount / params.delivery_amount * 100 if params.delivery_amount else 0:.2f}%\n"
+        chart_info += f"交付量: {params.delivery_amount}\n"
+        chart_info += f"购买服务包数量: {params.purchase_amount}\n"
+
+        chart_info += "\n建议:\n"
+        chart_info += "根据图表分析结果，选择最适合的薪资模式和业务策略。"
+
+        self.viz_text.insert(tk.END, chart_info)
+
+        messagebox.showinfo("图表生成成功", f"数据可视化图表已保存到: {chart_path}")
 
 def main():
     root = tk.Tk()
@@ -1,9 +1,34 @@
+import os
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import pandas as pd
-import json
+from dataclasses import fields
 from datetime import datetime
 
+from salary_calculator import SalaryParams, comparison_steps, salary_steps, store_report, store_report_steps
+from salary_calculator import engine, schema
+from salary_calculator.graph import NodeError, salary_graph
+from salary_calculator.profiling import span, traced
+from salary_calculator.scheduler import RecomputeScheduler
+from salary_calculator.schema import GROUPS, GROUPS_BY_NAME, PARAMETERS, display_label, group_parameters
+
+
+def load_scenario(params):
+    """
+    工作线程：从磁盘上的场景缓存取结果，没有时计算并写入，返回 (参数, ScenarioResult)
+
+    每次在当前线程中打开缓存文件（SQLite 连接不能跨线程使用）；缓存文件不可用时直接计算
+    """
+    import sqlite3
+
+    from salary_calculator.scenarios import ScenarioStore, compute_scenario
+
+    try:
+        store = ScenarioStore()
+    except (OSError, sqlite3.Error):
+        return params, compute_scenario(params)
+    with store:
+        return params, store.result(params)[0]
+
 
 class SalaryCalculator:
     def __init__(self, root):
@@ -20,70 +45,59 @@ class SalaryCalculator:
         # 创建界面
         self.create_interface()
 
+        # 参数变化时只重算受影响的公式，自动刷新结果
+        self.bind_live_updates()
+
+        # 最近用过的场景结果（内存缓存，第一次生成报告时才创建）；内存中没有时在后台线程读写磁盘缓存
+        self.scenario_cache = None
+        self.comparison_scheduler = RecomputeScheduler(
+            self.root, self.read_comparison_params, load_scenario, self.show_comparison,
+            on_error=lambda e: messagebox.showerror("对比错误", f"生成对比报告时出现错误: {str(e)}"))
+        self.store_scheduler = RecomputeScheduler(
+            self.root, self.read_store_params, load_scenario, self.show_store_report,
+            on_error=self.show_store_error)
+
     def create_variables(self):
-        """创建所有需要的变量"""
-        # 基础参数
-        self.delivery_amount = tk.DoubleVar(value=100.0)
-        self.purchase_amount = tk.DoubleVar(value=50.0)
-        self.service_price = tk.DoubleVar(value=1000.0)
-        self.service_cost = tk.DoubleVar(value=300.0)
-
-        # 员工类型和数量
-        self.employee_count = tk.IntVar(value=2)
-        self.supervisor_count = tk.IntVar(value=1)
-        self.consultant_count = tk.IntVar(value=0)
-        self.regional_manager_count = tk.IntVar(value=0)
-
-        self.city_manager_count = tk.IntVar(value=0)
-
-        # 职位补贴
-        self.supervisor_bonus = tk.DoubleVar(value=500.0)
-        self.consultant_bonus = tk.DoubleVar(value=800.0)
-        self.regional_manager_bonus = tk.DoubleVar(value=1200.0)
-        self.city_manager_bonus = tk.DoubleVar(value=1500.0)
-
-        # 员工类型选择（用于计算单个员工薪资）
-        self.employee_type = tk.StringVar(value="员工")
-
-        # 旧薪资体系参数
-        self.old_base_salary = tk.DoubleVar(value=3000.0)
-        self.old_basic_bonus = tk.DoubleVar(value=500.0)
-        self.old_position_bonus = tk.DoubleVar(value=300.0)
-        self.old_extra_bonus = tk.DoubleVar(value=200.0)
-
-        # 新薪资体系参数
-        self.new_base_salary_mid = tk.DoubleVar(value=3500.0)
-        self.new_base_salary_low = tk.DoubleVar(value=2800.0)
-        self.old_purchase_baseline = tk.DoubleVar(value=40.0)
-
-        # 三档提成配置
-        self.bonus_tier1_threshold = tk.DoubleVar(value=0.9)  # 90%
-        self.bonus_tier1_amount = tk.DoubleVar(value=7.5)  # 档1每包提成
-        self.bonus_tier2_threshold = tk.DoubleVar(value=1.0)  # 100%
-        self.bonus_tier2_amount = tk.DoubleVar(value=50.0)  # 档2每包提成
-        self.bonus_tier3_amount = tk.DoubleVar(value=60.0)  # 档3每包提成
-
-        self.min_conversion_rate = tk.DoubleVar(value=45.0)
-        self.penalty_rate = tk.DoubleVar(value=0.8)
-        self.salary_mode = tk.StringVar(value="新保底")
-        self.new_purchase_amount = tk.DoubleVar(value=0.0)
-
-        # 社保参数
-        self.social_insurance_base = tk.DoubleVar(value=10000.0)  # 社保基数
-        self.pension_rate = tk.DoubleVar(value=8.0)  # 养老保险比例
-        self.medical_rate = tk.DoubleVar(value=2.0)  # 医疗保险比例
-        self.unemployment_rate = tk.DoubleVar(value=0.2)  # 失业保险比例
-        self.injury_rate = tk.DoubleVar(value=0.0)  # 工伤保险比例
-        self.maternity_rate = tk.DoubleVar(value=0.0)  # 生育保险比例
-        self.housing_fund_rate = tk.DoubleVar(value=12.0)  # 住房公积金比例
-
-        # 展示模块参数
-        self.current_month = tk.StringVar(value=datetime.now().strftime("%Y-%m"))
-        self.avg_total_salary = tk.DoubleVar(value=5000.0)
-        self.avg_delivery = tk.DoubleVar(value=80.0)
-        self.avg_purchase = tk.DoubleVar(value=40.0)
-        self.avg_conversion_rate = tk.DoubleVar(value=50.0)
-        self.city_cost = tk.DoubleVar(value=10000.0)
+        """按参数表创建所有需要的变量，初始值为 SalaryParams 的默认值"""
+        defaults = SalaryParams()
+        for param in PARAMETERS:
+            var_type = {int: tk.IntVar, float: tk.DoubleVar}.get(param.type, tk.StringVar)
+            setattr(self, param.name, var_type(value=getattr(defaults, param.name)))
+
+        # 公式依赖图和是否实时刷新结果
+        self.formula_graph = salary_graph(defaults)
+        self.live_update = tk.BooleanVar(value=True)
+        self._live_pending = None
+
+        # 导入员工名单后按名单汇总的社保（SocialInsurance），没有名单时为 None
+        self.roster_social = None
+
+    def create_param_group(self, parent, group_name):
+        """按参数表生成一个参数分组框，返回 (分组框, 已占用的行数)"""
+        group = GROUPS_BY_NAME[group_name]
+        frame = ttk.LabelFrame(parent, text=group.title, padding=10)
+        frame.pack(fill=tk.X, padx=5, pady=5)
+
+        params = group_parameters(group.name)
+        for index, param in enumerate(params):
+            var = getattr(self, param.name)
+            if param.widget == "radio":
+                for column, value in enumerate(param.choices):
+                    ttk.Radiobutton(frame, text=value, variable=var, value=value).grid(
+                        row=index, column=column, padx=10, pady=2)
+                continue
+
+            row, column = divmod(index, group.per_row)
+            ttk.Label(frame, text=display_label(param)).grid(row=row, column=column * 2, sticky=tk.W, padx=5, pady=2)
+            if param.widget == "combo":
+                widget = ttk.Combobox(frame, textvariable=var, values=list(param.choices), width=group.width)
+                widget.state(['readonly'])
+            else:
+                state = "readonly" if param.widget == "readonly" else "normal"
+                widget = ttk.Entry(frame, textvariable=var, width=group.width, state=state)
+            widget.grid(row=row, column=column * 2 + 1, padx=5, pady=2)
+
+        return frame, (len(params) + group.per_row - 1) // group.per_row
 
     def update_tier1_bonus(self):
         old_base = self.old_base_salary.get()
@@ -137,35 +151,20 @@ class SalaryCalculator:
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
 
-        # 社保参数组
-        insurance_group = ttk.LabelFrame(scrollable_frame, text="社保参数设置", padding=10)
-        insurance_group.pack(fill=tk.X, padx=5, pady=5)
-
-        ttk.Label(insurance_group, text="社保基数:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(insurance_group, textvariable=self.social_insurance_base, width=15).grid(row=0, column=1, padx=5,
-                                                                                           pady=2)
-
-        ttk.Label(insurance_group, text="养老保险比例(%):").grid(row=0, column=2, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(insurance_group, textvariable=self.pension_rate, width=15).grid(row=0, column=3, padx=5, pady=2)
-
-        ttk.Label(insurance_group, text="医疗保险比例(%):").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(insurance_group, textvariable=self.medical_rate, width=15).grid(row=1, column=1, padx=5, pady=2)
-
-        ttk.Label(insurance_group, text="失业保险比例(%):").grid(row=1, column=2, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(insurance_group, textvariable=self.unemployment_rate, width=15).grid(row=1, column=3, padx=5, pady=2)
-
-        ttk.Label(insurance_group, text="工伤保险比例(%):").grid(row=2, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(insurance_group, textvariable=self.injury_rate, width=15).grid(row=2, column=1, padx=5, pady=2)
-
-        ttk.Label(insurance_group, text="生育保险比例(%):").grid(row=2, column=2, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(insurance_group, textvariable=self.maternity_rate, width=15).grid(row=2, column=3, padx=5, pady=2)
-
-        ttk.Label(insurance_group, text="住房公积金比例(%):").grid(row=3, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(insurance_group, textvariable=self.housing_fund_rate, width=15).grid(row=3, column=1, padx=5, pady=2)
+        # 社保参数组（由参数表生成）
+        insurance_group, rows = self.create_param_group(scrollable_frame, "社保参数")
 
         # 计算按钮
         calc_button = ttk.Button(insurance_group, text="计算社保", command=self.calculate_social_insurance)
-        calc_button.grid(row=3, column=2, columnspan=2, pady=10)
+        calc_button.grid(row=rows, column=0, columnspan=4, pady=10)
+
+        # 按员工名单计算（每人基数不同，按城市上下限截取）
+        roster_frame = ttk.LabelFrame(scrollable_frame, text="员工名单", padding=10)
+        roster_frame.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Button(roster_frame, text="导入员工名单...", command=self.import_roster).pack(side=tk.LEFT, padx=10)
+        ttk.Button(roster_frame, text="清除员工名单", command=self.clear_roster).pack(side=tk.LEFT, padx=10)
+        self.roster_label = ttk.Label(roster_frame, text="未导入名单，按统一社保基数计算")
+        self.roster_label.pack(side=tk.LEFT, padx=10)
 
         # 结果显示区域
         result_frame = ttk.LabelFrame(scrollable_frame, text="社保计算结果", padding=10)
@@ -199,165 +198,10 @@ class SalaryCalculator:
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
 
-        # 1. 薪资模式选择（直接加在最上面！）
-        salary_mode_group = ttk.LabelFrame(scrollable_frame, text="薪资模式")
-        salary_mode_group.pack(fill=tk.X, padx=5, pady=5)
-
-        self.salary_mode = tk.StringVar()
-        self.salary_mode.set("新保底")  # 默认值
-
-        mode_list = [("新保底", "新保底"), ("新底薪（中）", "新底薪（中）"), ("新底薪（低）", "新底薪（低）")]
-        for idx, (text, value) in enumerate(mode_list):
-            ttk.Radiobutton(
-                salary_mode_group, text=text, variable=self.salary_mode, value=value
-            ).grid(row=0, column=idx, padx=10, pady=2)
-
-        # 基础参数组
-        basic_group = ttk.LabelFrame(scrollable_frame, text="基础参数", padding=10)
-        basic_group.pack(fill=tk.X, padx=5, pady=5)
-
-        ttk.Label(basic_group, text="交付量:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(basic_group, textvariable=self.delivery_amount, width=15).grid(row=0, column=1, padx=5, pady=2)
-
-        ttk.Label(basic_group, text="购买服务包数量:").grid(row=0, column=2, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(basic_group, textvariable=self.purchase_amount, width=15).grid(row=0, column=3, padx=5, pady=2)
-
-        ttk.Label(basic_group, text="服务包单价:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(basic_group, textvariable=self.service_price, width=15).grid(row=1, column=1, padx=5, pady=2)
-
-        ttk.Label(basic_group, text="服务包必要支出:").grid(row=1, column=2, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(basic_group, textvariable=self.service_cost, width=15).grid(row=1, column=3, padx=5, pady=2)
-
-        # 员工数量配置
-        staff_group = ttk.LabelFrame(scrollable_frame, text="门店人员配置", padding=10)
-        staff_group.pack(fill=tk.X, padx=5, pady=5)
-
-        ttk.Label(staff_group, text="员工数量:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(staff_group, textvariable=self.employee_count, width=10).grid(row=0, column=1, padx=5, pady=2)
-
-        ttk.Label(staff_group, text="主管数量:").grid(row=0, column=2, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(staff_group, textvariable=self.supervisor_count, width=10).grid(row=0, column=3, padx=5, pady=2)
-
-        ttk.Label(staff_group, text="顾问数量:").grid(row=0, column=4, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(staff_group, textvariable=self.consultant_count, width=10).grid(row=0, column=5, padx=5, pady=2)
-
-        ttk.Label(staff_group, text="区总数量:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(staff_group, textvariable=self.regional_manager_count, width=10).grid(row=1, column=1, padx=5, pady=2)
-
-        ttk.Label(staff_group, text="市总数量:").grid(row=1, column=2, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(staff_group, textvariable=self.city_manager_count, width=10).grid(row=1, column=3, padx=5, pady=2)
-
-        # 职位补贴配置
-        bonus_group = ttk.LabelFrame(scrollable_frame, text="职位补贴配置", padding=10)
-        bonus_group.pack(fill=tk.X, padx=5, pady=5)
-
-        ttk.Label(bonus_group, text="主管补贴:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(bonus_group, textvariable=self.supervisor_bonus, width=10).grid(row=0, column=1, padx=5, pady=2)
-
-        ttk.Label(bonus_group, text="顾问补贴:").grid(row=0, column=2, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(bonus_group, textvariable=self.consultant_bonus, width=10).grid(row=0, column=3, padx=5, pady=2)
-
-        ttk.Label(bonus_group, text="区总补贴:").grid(row=0, column=4, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(bonus_group, textvariable=self.regional_manager_bonus, width=10).grid(row=0, column=5, padx=5, pady=2)
-
-        ttk.Label(bonus_group, text="市总补贴:").grid(row=0, column=6, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(bonus_group, textvariable=self.city_manager_bonus, width=10).grid(row=0, column=7, padx=5, pady=2)
-
-        # 员工类型选择（用于计算单个员工薪资）
-        employee_type_group = ttk.LabelFrame(scrollable_frame, text="员工类型选择", padding=10)
-        employee_type_group.pack(fill=tk.X, padx=5, pady=5)
-
-        ttk.Label(employee_type_group, text="计算类型:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
-        employee_combo = ttk.Combobox(employee_type_group, textvariable=self.employee_type,
-                                      values=["员工", "主管", "顾问", "区总", "市总"], width=12)
-        employee_combo.grid(row=0, column=1, padx=5, pady=2)
-        employee_combo.state(['readonly'])
-
-        # 旧薪资体系参数组
-        old_salary_group = ttk.LabelFrame(scrollable_frame, text="旧薪资体系参数", padding=10)
-        old_salary_group.pack(fill=tk.X, padx=5, pady=5)
-
-        ttk.Label(old_salary_group, text="底薪:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(old_salary_group, textvariable=self.old_base_salary, width=15).grid(row=0, column=1, padx=5, pady=2)
-
-        ttk.Label(old_salary_group, text="基本绩效:").grid(row=0, column=2, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(old_salary_group, textvariable=self.old_basic_bonus, width=15).grid(row=0, column=3, padx=5, pady=2)
-
-        ttk.Label(old_salary_group, text="岗位绩效:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(old_salary_group, textvariable=self.old_position_bonus, width=15).grid(row=1, column=1, padx=5,
-                                                                                         pady=2)
-
-        ttk.Label(old_salary_group, text="奖金:").grid(row=1, column=2, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(old_salary_group, textvariable=self.old_extra_bonus, width=15).grid(row=1, column=3, padx=5, pady=2)
-
-        # 新薪资体系参数组
-        new_salary_group = ttk.LabelFrame(scrollable_frame, text="新薪资体系参数", padding=10)
-        new_salary_group.pack(fill=tk.X, padx=5, pady=5)
-
-        ttk.Label(new_salary_group, text="新底薪（中）:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(new_salary_group, textvariable=self.new_base_salary_mid, width=15).grid(row=0, column=1, padx=5,
-                                                                                          pady=2)
-
-        ttk.Label(new_salary_group, text="新底薪（低）:").grid(row=0, column=2, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(new_salary_group, textvariable=self.new_base_salary_low, width=15).grid(row=0, column=3, padx=5,
-                                                                                          pady=2)
-
-        ttk.Label(new_salary_group, text="旧购买服务包基准:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(new_salary_group, textvariable=self.old_purchase_baseline, width=15).grid(row=1, column=1, padx=5,
-                                                                                            pady=2)
-
-        ttk.Label(new_salary_group, text="档1占比阈值(%):").grid(row=2, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(new_salary_group, textvariable=self.bonus_tier1_threshold, width=15).grid(row=2, column=1, padx=5,
-                                                                                            pady=2)
-
-        ttk.Label(new_salary_group, text="档2占比阈值(%):").grid(row=2, column=2, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(new_salary_group, textvariable=self.bonus_tier2_threshold, width=15).grid(row=2, column=3, padx=5,
-                                                                                            pady=2)
-
-        ttk.Label(new_salary_group, text="档1每包提成:").grid(row=3, column=0, sticky=tk.W, padx=5, pady=2)
-        tier1_entry = ttk.Entry(new_salary_group, textvariable=self.bonus_tier1_amount, width=15, state="readonly")
-        tier1_entry.grid(row=3, column=1, padx=5, pady=2)
-
-        ttk.Label(new_salary_group, text="档2每包提成:").grid(row=3, column=2, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(new_salary_group, textvariable=self.bonus_tier2_amount, width=15).grid(row=3, column=3, padx=5,
-                                                                                         pady=2)
-
-        ttk.Label(new_salary_group, text="档3每包提成:").grid(row=4, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(new_salary_group, textvariable=self.bonus_tier3_amount, width=15).grid(row=4, column=1, padx=5,
-                                                                                         pady=2)
-
-        ttk.Label(new_salary_group, text="新服务包购买数量:").grid(row=4, column=2, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(new_salary_group, textvariable=self.new_purchase_amount, width=15).grid(row=4, column=3, padx=5,
-                                                                                          pady=2)
-
-        ttk.Label(new_salary_group, text="下线转化率(%):").grid(row=5, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(new_salary_group, textvariable=self.min_conversion_rate, width=15).grid(row=5, column=1, padx=5,
-                                                                                          pady=2)
-
-        ttk.Label(new_salary_group, text="未达标折扣率:").grid(row=5, column=2, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(new_salary_group, textvariable=self.penalty_rate, width=15).grid(row=5, column=3, padx=5, pady=2)
-
-        # 展示模块参数组
-        display_group = ttk.LabelFrame(scrollable_frame, text="展示模块参数", padding=10)
-        display_group.pack(fill=tk.X, padx=5, pady=5)
-
-        ttk.Label(display_group, text="当前月份:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(display_group, textvariable=self.current_month, width=15).grid(row=0, column=5, padx=5, pady=2)
-
-        ttk.Label(display_group, text="平均总薪资:").grid(row=0, column=2, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(display_group, textvariable=self.avg_total_salary, width=15).grid(row=0, column=3, padx=5, pady=2)
-
-        ttk.Label(display_group, text="平均交付量:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(display_group, textvariable=self.avg_delivery, width=15).grid(row=1, column=1, padx=5, pady=2)
-
-        ttk.Label(display_group, text="平均购买服务包数:").grid(row=1, column=2, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(display_group, textvariable=self.avg_purchase, width=15).grid(row=1, column=3, padx=5, pady=2)
-
-        ttk.Label(display_group, text="平均转化率(%):").grid(row=2, column=0, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(display_group, textvariable=self.avg_conversion_rate, width=15).grid(row=2, column=1, padx=5, pady=2)
-
-        ttk.Label(display_group, text="城市平均成本:").grid(row=2, column=2, sticky=tk.W, padx=5, pady=2)
-        ttk.Entry(display_group, textvariable=self.city_cost, width=15).grid(row=2, column=3, padx=5, pady=2)
+        # 各参数分组（由参数表生成，薪资模式在最上面）
+        for group in GROUPS:
+            if group.tab == "参数设置":
+                self.create_param_group(scrollable_frame, group.name)
 
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
@@ -367,19 +211,8 @@ class SalaryCalculator:
         self.calc_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.calc_frame, text="薪资计算")
 
-        # 薪资模式选择（属于当前薪资计算tab页，不是参数设置tab）
-        salary_mode_group = ttk.LabelFrame(self.calc_frame, text="薪资模式")
-        salary_mode_group.pack(fill=tk.X, padx=10, pady=10)
-
-        # 注意：如果self.salary_mode已在别处定义，下面两行可以不要
-        self.salary_mode = tk.StringVar()
-        self.salary_mode.set("新保底")  # 默认值
-
-        mode_list = [("新保底", "新保底"), ("新底薪（中）", "新底薪（中）"), ("新底薪（低）", "新底薪（低）")]
-        for idx, (text, value) in enumerate(mode_list):
-            ttk.Radiobutton(
-                salary_mode_group, text=text, variable=self.salary_mode, value=value
-            ).grid(row=0, column=idx, padx=10, pady=2)
+        # 薪资模式选择（与参数设置页共用同一个变量）
+        self.create_param_group(self.calc_frame, "薪资模式")
 
         # 当前底薪值显示
         salary_display_frame = ttk.LabelFrame(self.calc_frame, text="当前底薪值", padding=10)
@@ -409,6 +242,9 @@ class SalaryCalculator:
         calc_button = ttk.Button(button_frame, text="计算薪资", command=self.calculate_salary)
         calc_button.pack(side=tk.LEFT, padx=20)
 
+        ttk.Checkbutton(button_frame, text="实时更新结果", variable=self.live_update,
+                        command=self.show_live_results).pack(side=tk.LEFT, padx=20)
+
         # 结果显示区域
         result_frame = ttk.LabelFrame(self.calc_frame, text="计算结果", padding=10)
         result_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
@@ -553,299 +389,128 @@ class SalaryCalculator:
         except Exception:
             self.low_base_display.config(text="0.00")
 
-    def calculate_conversion_rate(self):
+    # 以下公式方法都按一次读取的参数快照计算（params 不传时读取界面一次），
+    # 计算其他员工类型时通过 role 传入，不再 self.employee_type.set(role) 改动界面
+    def calculate_conversion_rate(self, params=None):
         """计算转化率"""
-        delivery = self.delivery_amount.get()
-        purchase = self.purchase_amount.get()
-        if delivery == 0:
-            return 0
-        return (purchase / delivery) * 100
+        return engine.calculate_conversion_rate(params or self.current_params())
 
-    def calculate_old_salary(self):
+    def calculate_old_salary(self, params=None, role=None):
         """计算旧薪资体系的薪资"""
-        delivery = self.delivery_amount.get()
-        purchase = self.purchase_amount.get()
-        conversion_rate = self.calculate_conversion_rate()
-        staff_count = self.employee_count.get() + self.supervisor_count.get() + self.consultant_count.get() + self.regional_manager_count.get() + self.city_manager_count.get()
-
-        base_salary = self.old_base_salary.get()
-        basic_bonus = self.old_basic_bonus.get()
-        position_bonus = self.old_position_bonus.get()
-        extra_bonus = self.old_extra_bonus.get()
-
-        # 计算基础薪资部分
-        base_calculation = (delivery * conversion_rate / 100 - delivery / 2) * 10 / staff_count
-
-        if conversion_rate >= 50:
-            # 转化率高于50%
-            salary = base_salary + base_calculation + basic_bonus + position_bonus + extra_bonus
-        else:
-            # 转化率低于50%
-            salary = base_salary + base_calculation + (basic_bonus + position_bonus) / 2 + extra_bonus
-
-        # 根据职位添加补贴
-        if self.employee_type.get() == "主管":
-            salary += self.supervisor_bonus.get()
-        elif self.employee_type.get() == "顾问":
-            salary += self.consultant_bonus.get()
-        elif self.employee_type.get() == "区总":
-            salary += self.regional_manager_bonus.get()
-        elif self.employee_type.get() == "市总":
-            salary += self.city_manager_bonus.get()
-
-        return salary
-
-    def calculate_new_salary_mode1(self, return_detail=False, role=None):
+        return engine.calculate_old_salary(params or self.current_params(), role=role)
+
+    def calculate_new_salary_mode1(self, return_detail=False, role=None, params=None):
         """
         新薪资体系模式一：新保底（与旧薪资相同，只有底薪，没有提成和补贴）
         return_detail=True时返回(底薪, 提成, 补贴)
         """
-        if role is not None:
-            self.employee_type.set(role)
-        salary = self.calculate_old_salary()
-        if return_detail:
-            return salary, 0, 0  # 只算底薪，没有提成和补贴
-        else:
-            return salary
+        return engine.calculate_new_salary_mode1(params or self.current_params(), return_detail, role=role)
 
-    def calculate_new_salary_mode2(self, return_detail=False, role=None):
+    def calculate_new_salary_mode2(self, return_detail=False, role=None, params=None):
         """
         新薪资体系模式二：新底薪（中），三档提成+补贴
         return_detail=True时返回(底薪, 提成, 补贴)
         """
-        if role is not None:
-            self.employee_type.set(role)
-        purchase_amount = self.new_purchase_amount.get() or self.purchase_amount.get()
-        old_purchase_baseline = self.old_purchase_baseline.get()
-        new_base = self.new_base_salary_mid.get()  # 新底薪（中）
-        old_base = self.old_base_salary.get()  # 旧底薪
-
-        tier1_threshold = old_purchase_baseline * self.bonus_tier1_threshold.get()
-        tier2_threshold = old_purchase_baseline * self.bonus_tier2_threshold.get()
-
-        # 档1每包提成 = (旧底薪 - 新底薪) ➗ 旧购买服务包数
-        tier1_amount = (old_base - new_base) / old_purchase_baseline if old_purchase_baseline else 0
-        tier2_amount = self.bonus_tier2_amount.get()
-        tier3_amount = self.bonus_tier3_amount.get()
-
-        # 计算三档提成
-        if purchase_amount <= tier1_threshold:
-            bonus = purchase_amount * tier1_amount
-        elif purchase_amount <= tier2_threshold:
-            bonus = (tier1_threshold * tier1_amount) + ((purchase_amount - tier1_threshold) * tier2_amount)
-        else:
-            bonus = (tier1_threshold * tier1_amount) + ((tier2_threshold - tier1_threshold) * tier2_amount) + (
-                    (purchase_amount - tier2_threshold) * tier3_amount)
-
-        # 转化率未达标，提成部分打折
-        bonus = self.apply_conversion_rate_penalty_to_bonus(bonus)
-
-        # 补贴（不同角色不同）
-        subsidy = 0
-        emp_type = self.employee_type.get()
-        if emp_type == "主管":
-            subsidy = self.supervisor_bonus.get()
-        elif emp_type == "顾问":
-            subsidy = self.consultant_bonus.get()
-        elif emp_type == "区总":
-            subsidy = self.regional_manager_bonus.get()
-        elif emp_type == "市总":
-            subsidy = self.city_manager_bonus.get()
-
-        if return_detail:
-            return new_base, bonus, subsidy  # 底薪、提成、补贴
-        else:
-            return new_base + bonus + subsidy
+        return engine.calculate_new_salary_mode2(params or self.current_params(), return_detail, role=role)
 
-    def calculate_new_salary_mode3(self, return_detail=False, role=None):
+    def calculate_new_salary_mode3(self, return_detail=False, role=None, params=None):
         """
         新薪资体系模式三：新底薪（低），三档提成+补贴
         return_detail=True时返回(底薪, 提成, 补贴)
         """
-        if role is not None:
-            self.employee_type.set(role)
-        purchase_amount = self.new_purchase_amount.get() or self.purchase_amount.get()
-        old_purchase_baseline = self.old_purchase_baseline.get()
-        new_base = self.new_base_salary_low.get()  # 新底薪（低）
-        old_base = self.old_base_salary.get()  # 旧底薪
-
-        tier1_threshold = old_purchase_baseline * self.bonus_tier1_threshold.get()
-        tier2_threshold = old_purchase_baseline * self.bonus_tier2_threshold.get()
-
-        # 档1每包提成 = (旧底薪 - 新底薪) ➗ 旧购买服务包数
-        tier1_amount = (old_base - new_base) / old_purchase_baseline if old_purchase_baseline else 0
-        tier2_amount = self.bonus_tier2_amount.get()
-        tier3_amount = self.bonus_tier3_amount.get()
-
-        # 计算三档提成
-        if purchase_amount <= tier1_threshold:
-            bonus = purchase_amount * tier1_amount
-        elif purchase_amount <= tier2_threshold:
-            bonus = (tier1_threshold * tier1_amount) + ((purchase_amount - tier1_threshold) * tier2_amount)
-        else:
-            bonus = (tier1_threshold * tier1_amount) + ((tier2_threshold - tier1_threshold) * tier2_amount) + (
-                    (purchase_amount - tier2_threshold) * tier3_amount)
-
-        # 转化率未达标，提成部分打折
-        bonus = self.apply_conversion_rate_penalty_to_bonus(bonus)
-
-        # 补贴（不同角色不同）
-        subsidy = 0
-        emp_type = self.employee_type.get()
-        if emp_type == "主管":
-            subsidy = self.supervisor_bonus.get()
-        elif emp_type == "顾问":
-            subsidy = self.consultant_bonus.get()
-        elif emp_type == "区总":
-            subsidy = self.regional_manager_bonus.get()
-        elif emp_type == "市总":
-            subsidy = self.city_manager_bonus.get()
-
-        if return_detail:
-            return new_base, bonus, subsidy  # 底薪、提成、补贴
-        else:
-            return new_base + bonus + subsidy
+        return engine.calculate_new_salary_mode3(params or self.current_params(), return_detail, role=role)
 
     def format_formula(self, formula: str, values: dict, result: float, unit: str = "元"):
         formula = formula.replace("/", "➗")
         value_str = "，".join([f"{k}={v}" for k, v in values.items()])
         return f"公式：{formula}\n代入：{value_str}\n结果：{result:.2f}{unit}\n"
 
-    def apply_conversion_rate_penalty_to_bonus(self, bonus):
+    def apply_conversion_rate_penalty_to_bonus(self, bonus, params=None):
         """应用转化率未达标的折扣（仅对提成部分）"""
-        conversion_rate = self.calculate_conversion_rate()
-        min_rate = self.min_conversion_rate.get()
-        penalty_rate = self.penalty_rate.get()
+        return engine.apply_conversion_rate_penalty_to_bonus(params or self.current_params(), bonus)
 
-        if conversion_rate < min_rate:
-            return bonus * penalty_rate
-        return bonus
+    def current_params(self, getter=None):
+        """把界面上的参数读成不可变的 SalaryParams（getter 默认直接调用 .get()）"""
+        getter = getter or (lambda var: var.get())
+        return SalaryParams.from_config({f.name: getter(getattr(self, f.name)) for f in fields(SalaryParams)})
 
+    def bind_live_updates(self):
+        """每个参数变量写入时更新依赖图中对应的输入"""
+        for param in PARAMETERS:
+            getattr(self, param.name).trace_add("write", lambda *args, name=param.name: self.on_param_changed(name))
+        self.show_live_results()
+
+    def on_param_changed(self, name):
+        try:
+            value = getattr(self, name).get()
+        except (tk.TclError, ValueError):
+            # 输入到一半（空、“-”、“1.”）时保留上一次的有效值
+            return
+        if self.formula_graph.set(name, value) and self._live_pending is None:
+            # 同一次操作改动多个变量（如加载配置）时只刷新一次
+            self._live_pending = self.root.after_idle(self.refresh_live_results)
+
+    def refresh_live_results(self):
+        """重算受影响的公式节点，只刷新结果有变化的页面"""
+        self._live_pending = None
+        changed = self.formula_graph.recompute()
+        if self.live_update.get():
+            self.show_live_results(changed)
+
+    def show_live_results(self, changed=None):
+        """把依赖图中的报告文字写到各结果页面（changed 为 None 时全部刷新）"""
+        if not self.live_update.get():
+            return
+        if changed is None:
+            # 先应用尚未重算的修改（之后排队的刷新不会再有变化）
+            self.formula_graph.recompute()
+        for node, text in (("salary_text", self.result_text), ("comparison_text", self.comparison_text),
+                           ("store_text", self.store_text)):
+            if changed is not None and node not in changed:
+                continue
+            value = self.formula_graph.values[node]
+            text.delete(1.0, tk.END)
+            text.insert(tk.END, f"计算错误: {value.error}" if isinstance(value, NodeError) else value)
+
+    @traced("v6.calculate_salary")
     def calculate_salary(self):
         """计算并显示薪资结果"""
         try:
             self.result_text.delete(1.0, tk.END)
 
-            # 获取基本参数
-            delivery = self.delivery_amount.get()
-            purchase = self.purchase_amount.get()
-            conversion_rate = self.calculate_conversion_rate()
-            employee_type = self.employee_type.get()
-            salary_mode = self.salary_mode.get()
-
-            result = f"=== 薪资计算详细步骤 ===\n\n"
-            result += f"员工类型: {employee_type}\n"
-            result += f"交付量: {delivery}\n"
-            result += f"购买服务包数量: {purchase}\n"
-            result += f"转化率: {conversion_rate:.2f}%\n"
-            result += f"选择模式: {salary_mode}\n\n"
-
-            # 计算旧薪资
-            old_salary = self.calculate_old_salary()
-            result += f"旧薪资体系计算结果: {old_salary:.2f}元\n\n"
-
-            # 根据选择的模式计算新薪资
-            if salary_mode == "新保底":
-                new_salary = self.calculate_new_salary_mode1()
-                result += f"新保底模式薪资: {new_salary:.2f}元\n"
-            elif salary_mode == "新底薪（中）":
-                new_salary = self.calculate_new_salary_mode2()
-                result += f"新底薪（中）模式薪资: {new_salary:.2f}元\n"
-            else:  # 新底薪（低）
-                new_salary = self.calculate_new_salary_mode3()
-                result += f"新底薪（低）模式薪资: {new_salary:.2f}元\n"
-
-            # 薪资差异分析
-            difference = new_salary - old_salary
-            result += f"\n薪资差异: {difference:.2f}元\n"
-
-            if difference > 0:
-                result += f"新模式比旧模式多 {difference:.2f}元 ({(difference / old_salary) * 100:.2f}%)\n"
-            elif difference < 0:
-                result += f"新模式比旧模式少 {abs(difference):.2f}元 ({(abs(difference) / old_salary) * 100:.2f}%)\n"
-            else:
-                result += "新旧模式薪资相同\n"
-
-            # 客单利润计算
-            service_price = self.service_price.get()
-            service_cost = self.service_cost.get()
-            unit_profit = service_price - service_cost
-            total_profit = purchase * unit_profit
-
-            result += f"\n=== 业务数据 ===\n"
-            result += f"服务包单价: {service_price:.2f}元\n"
-            result += f"服务包成本: {service_cost:.2f}元\n"
-            result += f"客单利润: {unit_profit:.2f}元\n"
-            result += f"总利润: {total_profit:.2f}元\n"
-
-            self.result_text.insert(tk.END, result)
+            with span("读取参数"):
+                params = self.current_params()
+            # 计算过程只记录步骤，显示时才生成文字
+            with span("计算薪资"):
+                steps = salary_steps(params)
+            with span("生成文字"):
+                self.result_text.insert(tk.END, steps.render())
 
         except Exception as e:
             messagebox.showerror("计算错误", f"计算过程中出现错误: {str(e)}")
 
+    @traced("v6.generate_comparison")
     def generate_comparison(self):
-        """生成薪资对比报告"""
+        """生成薪资对比报告（所有模式的薪资取自场景缓存，没有缓存时在后台计算）"""
+        self.comparison_text.delete(1.0, tk.END)
+        self.comparison_scheduler.run_now()
+
+    def read_comparison_params(self):
+        """主线程读取参数；内存缓存中已有该场景时直接显示，不再进入后台"""
+        with span("读取参数"):
+            params = self.current_params()
+        return self.cached_or_pending(params, self.show_comparison)
+
+    def show_comparison(self, loaded):
         try:
-            self.comparison_text.delete(1.0, tk.END)
-
-            # 计算所有模式的薪资
-            old_salary = self.calculate_old_salary()
-            mode1_salary = self.calculate_new_salary_mode1()
-            mode2_salary = self.calculate_new_salary_mode2()
-            mode3_salary = self.calculate_new_salary_mode3()
-
-            conversion_rate = self.calculate_conversion_rate()
-            employee_type = self.employee_type.get()
-
-            result = f"=== 薪资模式对比报告 ===\n\n"
-            result += f"员工类型: {employee_type}\n"
-            result += f"交付量: {self.delivery_amount.get()}\n"
-            result += f"购买服务包数量: {self.purchase_amount.get()}\n"
-            result += f"转化率: {conversion_rate:.2f}%\n\n"
-
-            # 各模式薪资对比
-            result += f"{'模式':<15} {'薪资(元)':<12} {'与旧模式差异(元)':<15} {'差异百分比':<12}\n"
-            result += f"{'-' * 60}\n"
-
-            modes = [
-                ("旧薪资体系", old_salary),
-                ("新保底", mode1_salary),
-                ("新底薪（中）", mode2_salary),
-                ("新底薪（低）", mode3_salary)
-            ]
-
-            for mode_name, salary in modes:
-                if mode_name == "旧薪资体系":
-                    diff = 0
-                    diff_pct = 0
-                else:
-                    diff = salary - old_salary
-                    diff_pct = (diff / old_salary) * 100 if old_salary != 0 else 0
-
-                result += f"{mode_name:<15} {salary:<12.2f} {diff:<15.2f} {diff_pct:<12.2f}%\n"
-
-            # 推荐最优模式
-            best_salary = max(mode1_salary, mode2_salary, mode3_salary)
-            best_modes = []
-            if mode1_salary == best_salary:
-                best_modes.append("新保底")
-            if mode2_salary == best_salary:
-                best_modes.append("新底薪（中）")
-            if mode3_salary == best_salary:
-                best_modes.append("新底薪（低）")
-
-            result += f"\n=== 推荐方案 ===\n"
-            result += f"推荐选择: {', '.join(best_modes)}\n"
-            result += f"最高薪资: {best_salary:.2f}元\n"
-            result += f"比旧模式多: {best_salary - old_salary:.2f}元\n"
-
-            # 转化率影响分析
-            min_rate = self.min_conversion_rate.get()
-            if conversion_rate < min_rate:
-                result += f"\n⚠️ 警告: 当前转化率({conversion_rate:.2f}%)低于要求({min_rate}%)，提成已应用折扣\n"
-                result += f"如果转化率达到{min_rate}%，提成将有所提升\n"
-
-            self.comparison_text.insert(tk.END, result)
+            params, result = loaded
+            self.remember_scenario(params, result)
+            if result.salaries is None:
+                raise ValueError("门店总人数为0，无法计算人均薪资")
+            with span("生成文字"):
+                salaries = {mode: result.salaries[mode][params.employee_type] for mode in result.salaries}
+                self.comparison_text.delete(1.0, tk.END)
+                self.comparison_text.insert(tk.END, comparison_steps(params, salaries).render())
 
         except Exception as e:
             messagebox.showerror("对比错误", f"生成对比报告时出现错误: {str(e)}")
@@ -855,39 +520,94 @@ class SalaryCalculator:
         try:
             self.social_result_text.delete(1.0, tk.END)
 
-            base = self.social_insurance_base.get()
-            pension = base * (self.pension_rate.get() / 100)
-            medical = base * (self.medical_rate.get() / 100)
-            unemployment = base * (self.unemployment_rate.get() / 100)
-            injury = base * (self.injury_rate.get() / 100)
-            maternity = base * (self.maternity_rate.get() / 100)
-            housing_fund = base * (self.housing_fund_rate.get() / 100)
-
-            total_per_employee = pension + medical + unemployment + injury + maternity + housing_fund
-
-            total_staff = (self.employee_count.get() + self.supervisor_count.get() +
-                           self.consultant_count.get() + self.regional_manager_count.get() +
-                           self.city_manager_count.get())
-
-            total_cost = total_per_employee * total_staff
+            # 参数只读取一次
+            params = self.current_params()
+            social = engine.calculate_social_insurance(params)
 
             result = "=== 社保计算结果 ===\n\n"
-            result += f"社保基数: {base:.2f}元\n"
-            result += f"养老保险: {pension:.2f}元 (费率: {self.pension_rate.get()}%)\n"
-            result += f"医疗保险: {medical:.2f}元 (费率: {self.medical_rate.get()}%)\n"
-            result += f"失业保险: {unemployment:.2f}元 (费率: {self.unemployment_rate.get()}%)\n"
-            result += f"工伤保险: {injury:.2f}元 (费率: {self.injury_rate.get()}%)\n"
-            result += f"生育保险: {maternity:.2f}元 (费率: {self.maternity_rate.get()}%)\n"
-            result += f"住房公积金: {housing_fund:.2f}元 (费率: {self.housing_fund_rate.get()}%)\n"
-            result += f"每位员工社保成本: {total_per_employee:.2f}元\n"
-            result += f"总员工数: {total_staff}人\n"
-            result += f"社保总成本: {total_cost:.2f}元\n"
+            result += f"社保基数: {social.base:.2f}元\n"
+            result += f"养老保险: {social.pension:.2f}元 (费率: {params.pension_rate}%)\n"
+            result += f"医疗保险: {social.medical:.2f}元 (费率: {params.medical_rate}%)\n"
+            result += f"失业保险: {social.unemployment:.2f}元 (费率: {params.unemployment_rate}%)\n"
+            result += f"工伤保险: {social.injury:.2f}元 (费率: {params.injury_rate}%)\n"
+            result += f"生育保险: {social.maternity:.2f}元 (费率: {params.maternity_rate}%)\n"
+            result += f"住房公积金: {social.housing_fund:.2f}元 (费率: {params.housing_fund_rate}%)\n"
+            result += f"每位员工社保成本: {social.per_employee:.2f}元\n"
+            result += f"总员工数: {social.total_staff}人\n"
+            result += f"社保总成本: {social.total_cost:.2f}元\n"
 
             self.social_result_text.insert(tk.END, result)
 
         except Exception as e:
             messagebox.showerror("社保计算错误", f"计算社保时出现错误: {str(e)}")
 
+    def cached_or_pending(self, params, show):
+        """
+        内存缓存中有该场景时直接 show((参数, 结果)) 并返回 None，否则返回参数交给后台读取
+
+        界面线程中不读写磁盘，磁盘缓存由 load_scenario 在工作线程中读写
+        """
+        from salary_calculator.scenarios import ScenarioCache, scenario_key
+
+        if self.scenario_cache is None:
+            self.scenario_cache = ScenarioCache()
+        with span("场景结果"):
+            result = self.scenario_cache.lookup(scenario_key(params))
+        if result is None:
+            return params
+        show((params, result))
+        return None
+
+    def remember_scenario(self, params, result):
+        from salary_calculator.scenarios import scenario_key
+
+        self.scenario_cache.remember(scenario_key(params), result)
+
+    def import_roster(self):
+        """导入员工名单（列: 社保基数、城市、员工类型），门店分析改用名单汇总的社保成本"""
+        path = filedialog.askopenfilename(
+            title="导入员工名单",
+            filetypes=[("表格文件", "*.xlsx *.xls *.csv *.parquet"), ("所有文件", "*.*")],
+        )
+        if not path:
+            return
+        try:
+            # pandas 只在导入名单时才加载
+            from salary_calculator.social import calculate_roster, load_city_limits, roster_summary
+            from salary_calculator.tables import read_table
+
+            params = self.current_params(self.safe_get)
+            contributions = calculate_roster(read_table(path, normalize=False), params, load_city_limits())
+        except Exception as e:
+            messagebox.showerror("名单错误", f"读取员工名单时出现错误: {str(e)}")
+            return
+        if contributions.empty:
+            messagebox.showerror("名单错误", "员工名单为空")
+            return
+
+        self.roster_social = roster_summary(contributions)
+        self.roster_label.config(text=f"已导入 {len(contributions)} 名员工: {os.path.basename(path)}")
+        self.formula_graph.set("roster_social", self.roster_social)
+        self.refresh_live_results()
+
+        totals = contributions.sum()
+        result = "=== 员工名单社保计算结果 ===\n\n"
+        result += f"名单人数: {len(contributions)}人\n"
+        result += f"人均缴费基数: {self.roster_social.base:.2f}元\n"
+        for name in ("养老保险", "医疗保险", "失业保险", "工伤保险", "生育保险", "住房公积金"):
+            result += f"{name}合计: {totals[name]:.2f}元\n"
+        result += f"每位员工社保成本(平均): {self.roster_social.per_employee:.2f}元\n"
+        result += f"社保总成本: {totals['社保合计']:.2f}元\n"
+        self.social_result_text.delete(1.0, tk.END)
+        self.social_result_text.insert(tk.END, result)
+
+    def clear_roster(self):
+        """恢复按统一社保基数和门店人数计算"""
+        self.roster_social = None
+        self.roster_label.config(text="未导入名单，按统一社保基数计算")
+        self.formula_graph.set("roster_social", None)
+        self.refresh_live_results()
+
     def safe_get(self, var, default=0):
         """兼容tk变量.get()空字符串或异常，保证返回数字"""
         try:
@@ -897,132 +617,43 @@ class SalaryCalculator:
             return v
         except Exception:
             return default
+    @traced("v6.analyze_store")
     def analyze_store(self):
         """门店财务分析报告-多模式对比+分项明细+完整指标"""
+        self.store_text.delete(1.0, tk.END)
+        self.store_scheduler.run_now()
+
+    def read_store_params(self):
+        """主线程读取参数；导入了名单或内存缓存中已有该场景时直接显示"""
+        # 各模式、各类员工的薪资由引擎按参数快照计算，不再逐个切换 employee_type
+        with span("读取参数"):
+            params = self.current_params(self.safe_get)
+        if self.roster_social is not None:
+            # 场景缓存按参数取结果，不包含名单，导入名单时直接计算
+            with span("门店报告"):
+                report = store_report(params, self.roster_social)
+            self.render_store_report(params, report)
+            return None
+        return self.cached_or_pending(params, self.show_store_report)
+
+    def show_store_report(self, loaded):
+        params, result = loaded
+        self.remember_scenario(params, result)
+        self.render_store_report(params, result.report)
+
+    def render_store_report(self, params, report):
         try:
-            self.store_text.delete(1.0, tk.END)
-
-            # === 基础参数 ===
-            purchase = self.safe_get(self.purchase_amount)
-            service_price = self.safe_get(self.service_price)
-            service_cost = self.safe_get(self.service_cost)
-            city_cost = self.safe_get(self.city_cost)
-
-            employees = int(self.safe_get(self.employee_count))
-            supervisors = int(self.safe_get(self.supervisor_count))
-            consultants = int(self.safe_get(self.consultant_count))
-            regional_managers = int(self.safe_get(self.regional_manager_count))
-            city_managers = int(self.safe_get(self.city_manager_count))
-            total_staff = employees + supervisors + consultants + regional_managers + city_managers
-
-            base = self.safe_get(self.social_insurance_base)
-            pension = base * self.safe_get(self.pension_rate) / 100
-            medical = base * self.safe_get(self.medical_rate) / 100
-            unemployment = base * self.safe_get(self.unemployment_rate) / 100
-            injury = base * self.safe_get(self.injury_rate) / 100
-            maternity = base * self.safe_get(self.maternity_rate) / 100
-            housing_fund = base * self.safe_get(self.housing_fund_rate) / 100
-            social_per_employee = pension + medical + unemployment + injury + maternity + housing_fund
-            social_total_cost = social_per_employee * total_staff
-
-            total_revenue = purchase * service_price
-            unit_profit = service_price - service_cost
-            total_profit = purchase * unit_profit
-
-            # ====== 开头基础信息 ======
-            result = "=== 门店财务分析报告 ===\n\n"
-
-            result += "=== 基础数据 ===\n"
-            result += f"购买服务包数量: {purchase}\n"
-            result += f"服务包单价: {service_price:.2f}元\n"
-            result += f"服务包成本: {service_cost:.2f}元\n"
-            result += f"城市平均成本: {city_cost:.2f}元\n\n"
-
-            result += "=== 人员配置 ===\n"
-            result += f"员工数量: {employees}\n"
-            result += f"主管数量: {supervisors}\n"
-            result += f"顾问数量: {consultants}\n"
-            result += f"区总数量: {regional_managers}\n"
-            result += f"市总数量: {city_managers}\n"
-            result += f"总人数: {total_staff}\n\n"
-
-            result += "=== 社保成本 ===\n"
-            result += f"社保基数: {base:.2f}元\n"
-            result += f"每人社保成本: {social_per_employee:.2f}元\n"
-            result += f"社保总成本: {social_total_cost:.2f}元\n\n"
-
-            result += "=== 门店财务指标 ===\n"
-            result += f"门店总流水: {total_revenue:.2f}元\n"
-            result += f"客单利润: {unit_profit:.2f}元\n"
-            result += f"门店总利润: {total_profit:.2f}元\n\n"
-
-            result += "=== 不同薪资模式下的成本分析 ===\n\n"
-
-            # ==== 定义薪资模式列表 ====
-            modes = [
-                ("旧薪资体系", lambda role: (self.employee_type.set(role) or (self.calculate_old_salary(), 0, 0)),
-                 "旧薪资体系"),
-                ("新保底", lambda role: self.calculate_new_salary_mode1(return_detail=True, role=role), "新保底"),
-                ("新底薪（中）", lambda role: self.calculate_new_salary_mode2(return_detail=True, role=role),
-                 "新底薪（中）"),
-                (
-                "新底薪（低）", lambda role: self.calculate_new_salary_mode3(return_detail=True, role=role), "新底薪（低）")
-            ]
-            employee_roles = [
-                ("员工", employees),
-                ("主管", supervisors),
-                ("顾问", consultants),
-                ("区总", regional_managers),
-                ("市总", city_managers)
-            ]
-
-            for mode_name, calc_func, _ in modes:
-                result += f"{mode_name}:\n"
-                # 统计总薪资
-                total_salary = 0
-                detail_lines = []
-                for role, count in employee_roles:
-                    if count == 0:
-                        salary, bonus, subsidy = 0, 0, 0
-                    else:
-                        salary, bonus, subsidy = calc_func(role)
-                    per_total = (salary + bonus + subsidy) * count
-
-                    # 分项明细（仅新体系分底薪/提成/补贴）
-                    if mode_name == "旧薪资体系":
-                        detail_lines.append(
-                            f"  {role}薪资: {salary:.2f}元 × {count}人 = {salary * count:.2f}元"
-                        )
-                        total_salary += salary * count
-                    else:
-                        detail_lines.append(
-                            f"  {role}底薪: {salary:.2f}元 × {count}人 = {salary * count:.2f}元"
-                        )
-                        detail_lines.append(
-                            f"  {role}提成: {bonus:.2f}元 × {count}人 = {bonus * count:.2f}元"
-                        )
-                        detail_lines.append(
-                            f"  {role}补贴: {subsidy:.2f}元 × {count}人 = {subsidy * count:.2f}元"
-                        )
-                        total_salary += (salary + bonus + subsidy) * count
-
-                # 汇总
-                result += "\n".join(detail_lines) + "\n"
-                result += f"  总薪资成本: {total_salary:.2f}元\n"
-                result += f"  社保成本: {social_total_cost:.2f}元\n"
-                total_cost = total_salary + social_total_cost + city_cost
-                result += f"  总成本: {total_cost:.2f}元 (薪资+社保+城市成本)\n"
-                net_profit = total_profit - total_cost
-                result += f"  净利润: {net_profit:.2f}元\n"
-                if net_profit > 0:
-                    result += "  ✓ 盈利状况良好\n\n"
-                else:
-                    result += "  ✗ 盈利需优化\n\n"
-
-            self.store_text.insert(tk.END, result)
+            with span("生成文字"):
+                steps = store_report_steps(params, report)
+                self.store_text.delete(1.0, tk.END)
+                self.store_text.insert(tk.END, steps.render())
         except Exception as e:
-            import traceback
-            self.store_text.insert(tk.END, f"分析时发生错误:\n{e}\n{traceback.format_exc()}")
+            self.show_store_error(e)
+
+    def show_store_error(self, e):
+        import traceback
+        details = "".join(traceback.format_exception(type(e), e, e.__traceback__))
+        self.store_text.insert(tk.END, f"分析时发生错误:\n{e}\n{details}")
 
     def export_excel(self):
         """导出Excel报告"""
@@ -1041,129 +672,32 @@ class SalaryCalculator:
             if not file_path:
                 return  # 用户取消了保存
 
-            # 创建Excel写入器
-            writer = pd.ExcelWriter(file_path, engine='xlsxwriter')
-
-            # 收集所有数据
-            data = {
-                "基础参数": {
-                    "交付量": self.delivery_amount.get(),
-                    "购买服务包数量": self.purchase_amount.get(),
-                    "服务包单价": self.service_price.get(),
-                    "服务包必要支出": self.service_cost.get(),
-                },
-                "人员配置": {
-                    "员工数量": self.employee_count.get(),
-                    "主管数量": self.supervisor_count.get(),
-                    "顾问数量": self.consultant_count.get(),
-                    "区总数量": self.regional_manager_count.get(),
-                    "市总数量": self.city_manager_count.get(),
-                },
-                "职位补贴": {
-                    "主管补贴": self.supervisor_bonus.get(),
-                    "顾问补贴": self.consultant_bonus.get(),
-                    "区总补贴": self.regional_manager_bonus.get(),
-                    "市总补贴": self.city_manager_bonus.get(),
-                },
-                "旧薪资体系": {
-                    "底薪": self.old_base_salary.get(),
-                    "基本绩效": self.old_basic_bonus.get(),
-                    "岗位绩效": self.old_position_bonus.get(),
-                    "奖金": self.old_extra_bonus.get(),
-                },
-                "新薪资体系": {
-                    "新底薪（中）": self.new_base_salary_mid.get(),
-                    "新底薪（低）": self.new_base_salary_low.get(),
-                    "旧购买服务包基准": self.old_purchase_baseline.get(),
-                    "档1占比阈值": self.bonus_tier1_threshold.get(),
-                    "档2占比阈值": self.bonus_tier2_threshold.get(),
-                    "档1每包提成": self.bonus_tier1_amount.get(),
-                    "档2每包提成": self.bonus_tier2_amount.get(),
-                    "档3每包提成": self.bonus_tier3_amount.get(),
-                    "新服务包购买数量": self.new_purchase_amount.get(),
-                    "下线转化率": self.min_conversion_rate.get(),
-                    "未达标折扣率": self.penalty_rate.get(),
-                },
-                "社保参数": {
-                    "社保基数": self.social_insurance_base.get(),
-                    "养老保险比例": self.pension_rate.get(),
-                    "医疗保险比例": self.medical_rate.get(),
-                    "失业保险比例": self.unemployment_rate.get(),
-                    "工伤保险比例": self.injury_rate.get(),
-                    "生育保险比例": self.maternity_rate.get(),
-                    "住房公积金比例": self.housing_fund_rate.get(),
-                },
-                "展示模块": {
-                    "当前月份": self.current_month.get(),
-                    "平均总薪资": self.avg_total_salary.get(),
-                    "平均交付量": self.avg_delivery.get(),
-                    "平均购买服务包数": self.avg_purchase.get(),
-                    "平均转化率": self.avg_conversion_rate.get(),
-                    "城市平均成本": self.city_cost.get(),
-                }
-            }
-
-            # 将数据写入Excel的不同工作表
-            for sheet_name, sheet_data in data.items():
-                df = pd.DataFrame(list(sheet_data.items()), columns=["参数", "值"])
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
-
-            # 保存Excel文件
-            writer.close()
+            # 参数表 + 当前门店的门店薪资、员工薪资，逐行写出
+            from salary_calculator.export import export_report
+            export_report(file_path, self.current_params())
+
             messagebox.showinfo("导出成功", f"报告已成功导出到: {file_path}")
 
         except Exception as e:
             messagebox.showerror("导出错误", f"导出Excel时出现错误: {str(e)}")
 
+    def set_params(self, params):
+        """把参数快照写回界面变量，值没有变化的变量不重新设置（不触发 trace）"""
+        for param in PARAMETERS:
+            var = getattr(self, param.name)
+            value = getattr(params, param.name)
+            try:
+                if var.get() == value:
+                    continue
+            except tk.TclError:
+                pass  # 输入框中是无效内容，直接覆盖
+            var.set(value)
+
     def save_config(self):
         """保存参数配置"""
         try:
             # 获取所有变量值
-            config = {
-                "delivery_amount": self.delivery_amount.get(),
-                "purchase_amount": self.purchase_amount.get(),
-                "service_price": self.service_price.get(),
-                "service_cost": self.service_cost.get(),
-                "employee_count": self.employee_count.get(),
-                "supervisor_count": self.supervisor_count.get(),
-                "consultant_count": self.consultant_count.get(),
-                "regional_manager_count": self.regional_manager_count.get(),
-                "city_manager_count": self.city_manager_count.get(),
-                "supervisor_bonus": self.supervisor_bonus.get(),
-                "consultant_bonus": self.consultant_bonus.get(),
-                "regional_manager_bonus": self.regional_manager_bonus.get(),
-                "city_manager_bonus": self.city_manager_bonus.get(),
-                "employee_type": self.employee_type.get(),
-                "old_base_salary": self.old_base_salary.get(),
-                "old_basic_bonus": self.old_basic_bonus.get(),
-                "old_position_bonus": self.old_position_bonus.get(),
-                "old_extra_bonus": self.old_extra_bonus.get(),
-                "new_base_salary_mid": self.new_base_salary_mid.get(),
-                "new_base_salary_low": self.new_base_salary_low.get(),
-                "old_purchase_baseline": self.old_purchase_baseline.get(),
-                "bonus_tier1_threshold": self.bonus_tier1_threshold.get(),
-                "bonus_tier1_amount": self.bonus_tier1_amount.get(),
-                "bonus_tier2_threshold": self.bonus_tier2_threshold.get(),
-                "bonus_tier2_amount": self.bonus_tier2_amount.get(),
-                "bonus_tier3_amount": self.bonus_tier3_amount.get(),
-                "new_purchase_amount": self.new_purchase_amount.get(),
-                "min_conversion_rate": self.min_conversion_rate.get(),
-                "penalty_rate": self.penalty_rate.get(),
-                "salary_mode": self.salary_mode.get(),
-                "social_insurance_base": self.social_insurance_base.get(),
-                "pension_rate": self.pension_rate.get(),
-                "medical_rate": self.medical_rate.get(),
-                "unemployment_rate": self.unemployment_rate.get(),
-                "injury_rate": self.injury_rate.get(),
-                "maternity_rate": self.maternity_rate.get(),
-                "housing_fund_rate": self.housing_fund_rate.get(),
-                "current_month": self.current_month.get(),
-                "avg_total_salary": self.avg_total_salary.get(),
-                "avg_delivery": self.avg_delivery.get(),
-                "avg_purchase": self.avg_purchase.get(),
-                "avg_conversion_rate": self.avg_conversion_rate.get(),
-                "city_cost": self.city_cost.get(),
-            }
+            params = self.current_params()
 
             # 询问保存位置
             file_path = filedialog.asksaveasfilename(
@@ -1176,8 +710,7 @@ class SalaryCalculator:
                 return  # 用户取消了保存
 
             # 保存到文件
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=4)
+            schema.save_config(params, file_path)
 
             messagebox.showinfo("保存成功", f"配置已成功保存到: {file_path}")
 
@@ -1196,56 +729,12 @@ class SalaryCalculator:
             if not file_path:
                 return  # 用户取消了加载
 
-            # 从文件加载配置
-            with open(file_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-
-            # 设置所有变量值
-            self.delivery_amount.set(config.get("delivery_amount", 100.0))
-            self.purchase_amount.set(config.get("purchase_amount", 50.0))
-            self.service_price.set(config.get("service_price", 1000.0))
-            self.service_cost.set(config.get("service_cost", 300.0))
-            self.employee_count.set(config.get("employee_count", 2))
-            self.supervisor_count.set(config.get("supervisor_count", 1))
-            self.consultant_count.set(config.get("consultant_count", 0))
-            self.regional_manager_count.set(config.get("regional_manager_count", 0))
-            self.city_manager_count.set(config.get("city_manager_count", 0))
-            self.supervisor_bonus.set(config.get("supervisor_bonus", 500.0))
-            self.consultant_bonus.set(config.get("consultant_bonus", 800.0))
-            self.regional_manager_bonus.set(config.get("regional_manager_bonus", 1200.0))
-            self.city_manager_bonus.set(config.get("city_manager_bonus", 1500.0))
-            self.employee_type.set(config.get("employee_type", "员工"))
-            self.old_base_salary.set(config.get("old_base_salary", 3000.0))
-            self.old_basic_bonus.set(config.get("old_basic_bonus", 500.0))
-            self.old_position_bonus.set(config.get("old_position_bonus", 300.0))
-            self.old_extra_bonus.set(config.get("old_extra_bonus", 200.0))
-            self.new_base_salary_mid.set(config.get("new_base_salary_mid", 3500.0))
-            self.new_base_salary_low.set(config.get("new_base_salary_low", 2800.0))
-            self.old_purchase_baseline.set(config.get("old_purchase_baseline", 40.0))
-            self.bonus_tier1_threshold.set(config.get("bonus_tier1_threshold", 0.9))
-            self.bonus_tier1_amount.set(config.get("bonus_tier1_amount", 7.5))
-            self.bonus_tier2_threshold.set(config.get("bonus_tier2_threshold", 1.0))
-            self.bonus_tier2_amount.set(config.get("bonus_tier2_amount", 50.0))
-            self.bonus_tier3_amount.set(config.get("bonus_tier3_amount", 60.0))
-            self.new_purchase_amount.set(config.get("new_purchase_amount", 0.0))
-            self.min_conversion_rate.set(config.get("min_conversion_rate", 45.0))
-            self.penalty_rate.set(config.get("penalty_rate", 0.8))
-            self.salary_mode.set(config.get("salary_mode", "新保底"))
-            self.social_insurance_base.set(config.get("social_insurance_base", 10000.0))
-            self.pension_rate.set(config.get("pension_rate", 8.0))
-            self.medical_rate.set(config.get("medical_rate", 2.0))
-            self.unemployment_rate.set(config.get("unemployment_rate", 0.2))
-            self.injury_rate.set(config.get("injury_rate", 0.0))
-            self.maternity_rate.set(config.get("maternity_rate", 0.0))
-            self.housing_fund_rate.set(config.get("housing_fund_rate", 12.0))
-            self.current_month.set(config.get("current_month", datetime.now().strftime("%Y-%m")))
-            self.avg_total_salary.set(config.get("avg_total_salary", 5000.0))
-            self.avg_delivery.set(config.get("avg_delivery", 80.0))
-            self.avg_purchase.set(config.get("avg_purchase", 40.0))
-            self.avg_conversion_rate.set(config.get("avg_conversion_rate", 50.0))
-            self.city_cost.set(config.get("city_cost", 10000.0))
-
-            # 更新显示
+            # 从文件加载并校验配置，缺失的参数使用默认值
+            params = schema.load_config(file_path)
+            self.set_params(params)
+
+            # 档1每包提成由底薪推算；更新显示
+            self.update_tier1_bonus()
             self.update_salary_displays()
 
             messagebox.showinfo("加载成功", f"配置已成功从 {file_path} 加载")
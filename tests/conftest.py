@@ -0,0 +1,59 @@
+"""测试共用的随机参数（固定种子，每次运行相同）"""
+import random
+
+import pytest
+
+from salary_calculator.engine import ROLES, SalaryParams
+
+
+# 各参数的候选值：包含 0、整数和小数，覆盖转化率为0、人数为0、三档的各个分支和折扣
+CHOICES = {
+    "delivery_amount": [0, 100, 80.5, 37, 120],
+    "purchase_amount": [0, 50, 30.25, 70, 41],
+    "new_purchase_amount": [0, 60, 33.3],
+    "employee_count": [0, 1, 2, 3],
+    "supervisor_count": [0, 1, 2],
+    "consultant_count": [0, 1],
+    "regional_manager_count": [0, 1],
+    "city_manager_count": [0, 1],
+    "supervisor_bonus": [500.0, 0, 321.5],
+    "consultant_bonus": [800.0, 640.25],
+    "employee_type": list(ROLES),
+    "old_base_salary": [3000.0, 2500.5],
+    "new_base_salary_mid": [3500.0, 2999.5],
+    "new_base_salary_low": [2800.0, 3100.0],
+    "old_purchase_baseline": [0, 40.0, 35.5],
+    "bonus_tier1_threshold": [0.9, 0.5],
+    "bonus_tier2_threshold": [1.0, 1.3],
+    "bonus_tier2_amount": [50.0, 42.5],
+    "bonus_tier3_amount": [60.0, 75.0],
+    "min_conversion_rate": [45.0, 60.0, 30.0],
+    "penalty_rate": [0.8, 0.5],
+    "social_insurance_base": [10000.0, 6543.2],
+    "pension_rate": [8.0, 8.5],
+    "housing_fund_rate": [12.0, 7.0],
+    "service_price": [500.0, 399.9],
+    "service_cost": [300.0, 450.0],
+    "city_cost": [10000.0, 0],
+}
+
+
+def random_config(rng):
+    """随机取一组参数覆盖值"""
+    return {name: rng.choice(values) for name, values in CHOICES.items()}
+
+
+@pytest.fixture
+def choices():
+    return CHOICES
+
+
+@pytest.fixture
+def rng():
+    return random.Random(20240501)
+
+
+@pytest.fixture
+def params_list(rng):
+    """300 组随机参数（月份固定，结果与运行日期无关）"""
+    return [SalaryParams(current_month="2024-05", **random_config(rng)) for _ in range(300)]
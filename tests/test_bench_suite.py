@@ -0,0 +1,42 @@
+"""基准测试套件的计时与基线对比"""
+import argparse
+import importlib.util
+import os
+
+import pytest
+
+_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "bench_suite.py")
+_spec = importlib.util.spec_from_file_location("bench_suite", _path)
+bench_suite = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bench_suite)
+
+
+def results(**medians):
+    return {"results": {name: {"best": value * 0.9, "median": value} for name, value in medians.items()}}
+
+
+def test_compare_uses_median_and_noise_floor():
+    baseline = results(fast=1e-6, slow=1e-3, fixed=2e-3)
+    current = results(fast=1.6e-6, slow=1.3e-3, fixed=1.5e-3, added=1e-3)
+    comparison = bench_suite.compare(current, baseline, tolerance=0.2, noise_floor=5e-7)
+    # 亚微秒级的 0.6 微秒差距在噪声下限内
+    assert {name: c["status"] for name, c in comparison.items()} == {
+        "fast": "ok", "slow": "regression", "fixed": "improved", "added": "new"}
+    assert comparison["slow"]["ratio"] == pytest.approx(1.3)
+    assert bench_suite.compare(current, baseline, 0.2, noise_floor=0)["fast"]["status"] == "regression"
+
+
+def test_measure_runs_enough_calls():
+    calls = []
+    result = bench_suite.measure(lambda: calls.append(None), repeat=3, min_time=0.05)
+    # 每轮至少 min_time 秒，极快的函数一轮也调用很多次
+    assert result["number"] > 10000
+    assert len(calls) >= result["number"] * 3
+    assert result["best"] <= result["median"]
+
+
+def test_registered_benchmarks_run():
+    """每个项目都能在小的模拟月份上运行"""
+    options = argparse.Namespace(stores=50, seed=0)
+    for bench in bench_suite.BENCHMARKS:
+        bench.setup(options)()
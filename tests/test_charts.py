@@ -0,0 +1,57 @@
+"""薪资分析图表：后台线程渲染，参数相同时复用已生成的图片"""
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from salary_calculator.charts import ChartCache, build_figure, params_hash, render_charts  # noqa: E402
+from salary_calculator.sweep import SweepParams, evaluate  # noqa: E402
+
+# 测试环境可能没有中文字体
+pytestmark = pytest.mark.filterwarnings("ignore:Glyph")
+
+
+def test_hash():
+    params = SweepParams()
+    assert params_hash(params) == params_hash(SweepParams())
+    assert params_hash(params) != params_hash(SweepParams(purchase_amount=51.0))
+
+
+def test_figure():
+    params = SweepParams()
+    fig = build_figure(params, points=20)
+    ax1, _, ax3, _ = fig.axes
+    _, *salaries = evaluate(params, params.delivery_amount, params.purchase_amount)
+    assert [bar.get_height() for bar in ax1.patches] == pytest.approx(salaries)
+    assert len(ax3.lines[0].get_xdata()) == 20
+
+
+def test_render_cached(tmp_path):
+    cache = ChartCache()
+    result = []
+    # 在后台线程中渲染（不依赖 Tk 和 pyplot）
+    worker = threading.Thread(target=lambda: result.append(render_charts(SweepParams(), str(tmp_path), cache)))
+    worker.start()
+    worker.join()
+    path, hit = result[0]
+    assert not hit and os.path.dirname(path) == str(tmp_path)
+    with open(path, "rb") as f:
+        assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+
+    assert render_charts(SweepParams(), str(tmp_path), cache) == (path, True)
+    assert render_charts(SweepParams(), str(tmp_path / "other"), cache)[1] is False
+    # 图片被删除后重新生成
+    os.remove(path)
+    assert render_charts(SweepParams(), str(tmp_path), cache)[1] is False
+
+
+def test_cache_lru(tmp_path):
+    cache = ChartCache(maxsize=2)
+    for name in "abc":
+        path = tmp_path / f"{name}.png"
+        path.touch()
+        cache.put(name, str(path))
+    assert cache.get("a") is None
+    assert cache.get("b") == str(tmp_path / "b.png")
@@ -0,0 +1,70 @@
+"""命令行：参数列的空单元格使用配置中的值；输入有误时返回 1 且不写出结果"""
+import os
+
+import pandas as pd
+import pytest
+
+from salary_calculator.cli import main
+from salary_calculator.engine import SalaryParams
+
+
+def write_stores(path, delivery, employees):
+    pd.DataFrame({"门店编号": ["S1", "S2", "S3"], "region": ["华东", "华北", "华东"],
+                  "交付量": delivery, "购买服务包数量": [50, 30, 40], "员工数量": employees}).to_csv(path, index=False)
+
+
+def read_output(command, path):
+    if command == "export":
+        return pd.read_excel(path, sheet_name=None)
+    if command == "dataset":
+        return pd.read_parquet(os.path.join(path, "stores")).sort_values("门店编号", ignore_index=True)
+    return pd.read_csv(path)
+
+
+@pytest.mark.parametrize("command, ext", [("batch", ".csv"), ("report", ".csv"), ("export", ".xlsx"),
+                                          ("dataset", "")])
+def test_blank_cells_use_config(tmp_path, command, ext):
+    """空单元格与填入配置值的结果相同（Int64 列的空值不会变成 None 传入计算）"""
+    defaults = SalaryParams()
+    blank, filled = str(tmp_path / "blank.csv"), str(tmp_path / "filled.csv")
+    write_stores(blank, [100, None, 80], pd.array([None, 2, 1], dtype="Int64"))
+    write_stores(filled, [100, defaults.delivery_amount, 80], [defaults.employee_count, 2, 1])
+
+    outputs = []
+    for source in (blank, filled):
+        output = str(tmp_path / f"{os.path.basename(source)[:-4]}_out{ext}")
+        extra = ["--workers", "1"] if command == "report" else []
+        assert main([command, "--input", source, "--output", output] + extra) == 0
+        outputs.append(read_output(command, output))
+
+    if command == "batch":
+        # batch 原样保留输入列，只比较计算结果
+        outputs = [df.drop(columns=["delivery_amount", "employee_count"]) for df in outputs]
+    if command == "export":
+        assert outputs[0].keys() == outputs[1].keys()
+        for name in outputs[0]:
+            pd.testing.assert_frame_equal(outputs[0][name], outputs[1][name])
+    else:
+        pd.testing.assert_frame_equal(outputs[0], outputs[1])
+
+
+@pytest.mark.parametrize("command", ["batch", "report", "export", "dataset"])
+def test_bad_input_exit_code(tmp_path, capsys, command):
+    output = str(tmp_path / ("out.xlsx" if command == "export" else "out.csv"))
+    assert main([command, "--input", str(tmp_path / "missing.csv"), "--output", output]) == 1
+
+    source = str(tmp_path / "bad.csv")
+    write_stores(source, [100, "abc", 80], [1, 2, 1])
+    assert main([command, "--input", source, "--output", output]) == 1
+    assert "计算错误" in capsys.readouterr().err
+    assert not os.path.exists(output)
+
+
+def test_bad_config_exit_code(tmp_path):
+    config = str(tmp_path / "config.json")
+    with open(config, "w", encoding="utf-8") as f:
+        f.write('{"employee_count": "两个"}')
+    assert main(["validate", config]) == 1
+    source = str(tmp_path / "stores.csv")
+    write_stores(source, [100, 90, 80], [1, 2, 1])
+    assert main(["batch", "--input", source, "--output", str(tmp_path / "out.csv"), "--config", config]) == 1
@@ -0,0 +1,88 @@
+"""列式结果数据集：列类型固定、按月份/区域分区，写出的值与 store_report 相同"""
+import os
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pytest
+
+from salary_calculator.columnar import (NULL_PARTITION, STAFF_DATASET, STORE_DATASET, partition_path,
+                                        staff_schema, store_schema, write_results)
+from salary_calculator.engine import SalaryParams, store_report
+
+
+def stores():
+    return [
+        {"门店编号": 101, "name": "一店", "region": "华东", "delivery_amount": 100, "employee_count": 2},
+        {"门店编号": 102, "name": "二店", "region": "华北", "current_month": "2024-06", "supervisor_count": 0},
+        {"门店编号": 103, "name": None, "region": None, "purchase_amount": 20},
+    ]
+
+
+KEYS = {"门店编号": np.dtype("int64"), "name": np.dtype(object), "region": np.dtype(object)}
+
+
+def read(root, name, format="parquet"):
+    return ds.dataset(os.path.join(root, name), format="ipc" if format == "arrow" else format,
+                      partitioning="hive").to_table().to_pylist()
+
+
+def test_schema():
+    schema = store_schema(KEYS)
+    assert schema.field("门店编号").type == pa.int64()
+    assert schema.field("name").type == pa.string()
+    assert all(pa.types.is_float64(f.type) for f in schema if f.name not in KEYS)
+    staff = staff_schema(["门店编号"])
+    assert staff.field("门店编号").type == pa.string()
+    assert pa.types.is_dictionary(staff.field("薪资模式").type)
+    assert staff.field("人数").type == pa.int32()
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_partitions(tmp_path, format):
+    params = SalaryParams(current_month="2024-05")
+    root = str(tmp_path / "out")
+    assert write_results(root, params, stores(), KEYS, format=format, batch_size=5) == 3
+
+    ext = "arrow" if format == "arrow" else "parquet"
+    for name in (STORE_DATASET, STAFF_DATASET):
+        for month, region in (("2024-05", "华东"), ("2024-06", "华北"), ("2024-05", None)):
+            assert os.path.exists(os.path.join(root, name, partition_path(month, region), f"part-0.{ext}"))
+    assert NULL_PARTITION in partition_path("2024-05", None)
+
+    rows = {row["门店编号"]: row for row in read(root, STORE_DATASET, format)}
+    staff = read(root, STAFF_DATASET, format)
+    for record in stores():
+        overrides = {k: v for k, v in record.items() if k not in ("门店编号", "name", "region")}
+        store = params.replace(**overrides)
+        report = store_report(store)
+        row = rows[record["门店编号"]]
+        assert (row["name"], row["region"], row["month"]) == (record["name"], record["region"], store.current_month)
+        assert {k: row[k] for k in report.to_row()} == report.to_row()
+        expected = [tuple(r) for r in report.staff_rows()]
+        assert [tuple(r[k] for k in staff_schema().names) for r in staff
+                if r["门店编号"] == record["门店编号"]] == expected
+
+
+def test_refuses_non_empty_directory(tmp_path):
+    root = str(tmp_path / "out")
+    write_results(root, SalaryParams(current_month="2024-05"), stores(), KEYS)
+    before = sorted(os.walk(root))
+    with pytest.raises(ValueError):
+        write_results(root, SalaryParams(current_month="2024-07"), stores(), KEYS)
+    assert sorted(os.walk(root)) == before
+    # 空目录可以直接使用
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    assert write_results(str(empty), SalaryParams(), stores(), KEYS) == 3
+
+
+def test_failure_leaves_nothing(tmp_path):
+    def failing():
+        yield from stores()
+        raise RuntimeError("读表出错")
+
+    root = str(tmp_path / "out")
+    with pytest.raises(RuntimeError):
+        write_results(root, SalaryParams(current_month="2024-05"), failing(), KEYS, batch_size=1)
+    assert os.listdir(tmp_path) == []
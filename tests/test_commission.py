@@ -0,0 +1,45 @@
+"""v28 门店计算：先算门店上下文的结果与原界面逐个员工重算的写法相同"""
+import importlib.util
+import os
+
+import pytest
+
+from salary_calculator.commission import StoreParams, calculate_store
+from salary_calculator.roster import DEFAULT_STAFF
+
+_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks",
+                     "bench_store_context.py")
+_spec = importlib.util.spec_from_file_location("bench_store_context", _path)
+bench_store_context = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bench_store_context)
+
+# 覆盖转化率折扣的三个分支、阈值的三档、包数不足和无区域的情况
+CHOICES = {
+    "delivery_volume": [0, 175, 120],
+    "service_packs": [0, 60, 102, 150],
+    "store_staff": [0, 1, 2, 5],
+    "pack_price": [300, 450, 510],
+    "has_station_license": [True, False],
+    "new_service_packs": [0, 80, 95, 130],
+    "use_threshold": [True, False],
+    "has_region": [True, False],
+    "new_base_mid": [3100.0, 2999.5],
+    "threshold_percentage": [0.9, 0.5],
+}
+
+
+@pytest.fixture
+def stores(rng):
+    return [StoreParams(**{name: rng.choice(values) for name, values in CHOICES.items()}) for _ in range(300)]
+
+
+def test_matches_per_staff_loop(stores, rng):
+    for params in stores:
+        staff_list = [dict(rng.choice(DEFAULT_STAFF), subsidy=rng.choice([0.0, 1100.0])) for _ in range(3)]
+        result = calculate_store(params, staff_list)
+        assert (result.old, result.mid, result.low) == bench_store_context.per_staff_reference(params, staff_list)
+
+
+def test_zero_avg_packs():
+    with pytest.raises(ZeroDivisionError):
+        calculate_store(StoreParams(avg_monthly_packs=0), DEFAULT_STAFF)
@@ -0,0 +1,153 @@
+"""
+engine 与原 v6 界面的公式一致
+
+v6_* 照抄 salary_calculator_v6_final_release.py 原来的计算方法（Tk 变量的 .get() 换成参数属性），
+作为参考实现，engine 的每种模式、每类员工和门店报告都要与之完全相同。
+"""
+import pytest
+
+from salary_calculator.engine import (MODES, ROLES, calculate_conversion_rate, calculate_mode_salary,
+                                      calculate_social_insurance, store_report)
+
+
+def v6_conversion_rate(p):
+    delivery = p.delivery_amount
+    purchase = p.purchase_amount
+    if delivery == 0:
+        return 0
+    return (purchase / delivery) * 100
+
+
+def v6_subsidy(p, role):
+    subsidy = 0
+    if role == "主管":
+        subsidy = p.supervisor_bonus
+    elif role == "顾问":
+        subsidy = p.consultant_bonus
+    elif role == "区总":
+        subsidy = p.regional_manager_bonus
+    elif role == "市总":
+        subsidy = p.city_manager_bonus
+    return subsidy
+
+
+def v6_old_salary(p, role):
+    delivery = p.delivery_amount
+    conversion_rate = v6_conversion_rate(p)
+    staff_count = (p.employee_count + p.supervisor_count + p.consultant_count + p.regional_manager_count +
+                   p.city_manager_count)
+
+    base_calculation = (delivery * conversion_rate / 100 - delivery / 2) * 10 / staff_count
+    if conversion_rate >= 50:
+        salary = p.old_base_salary + base_calculation + p.old_basic_bonus + p.old_position_bonus + p.old_extra_bonus
+    else:
+        salary = (p.old_base_salary + base_calculation + (p.old_basic_bonus + p.old_position_bonus) / 2 +
+                  p.old_extra_bonus)
+    if role == "主管":
+        salary += p.supervisor_bonus
+    elif role == "顾问":
+        salary += p.consultant_bonus
+    elif role == "区总":
+        salary += p.regional_manager_bonus
+    elif role == "市总":
+        salary += p.city_manager_bonus
+    return salary
+
+
+def v6_tiered_salary(p, new_base, role):
+    purchase_amount = p.new_purchase_amount or p.purchase_amount
+    old_purchase_baseline = p.old_purchase_baseline
+    old_base = p.old_base_salary
+
+    tier1_threshold = old_purchase_baseline * p.bonus_tier1_threshold
+    tier2_threshold = old_purchase_baseline * p.bonus_tier2_threshold
+    tier1_amount = (old_base - new_base) / old_purchase_baseline if old_purchase_baseline else 0
+    tier2_amount = p.bonus_tier2_amount
+    tier3_amount = p.bonus_tier3_amount
+
+    if purchase_amount <= tier1_threshold:
+        bonus = purchase_amount * tier1_amount
+    elif purchase_amount <= tier2_threshold:
+        bonus = (tier1_threshold * tier1_amount) + ((purchase_amount - tier1_threshold) * tier2_amount)
+    else:
+        bonus = (tier1_threshold * tier1_amount) + ((tier2_threshold - tier1_threshold) * tier2_amount) + (
+                (purchase_amount - tier2_threshold) * tier3_amount)
+
+    if v6_conversion_rate(p) < p.min_conversion_rate:
+        bonus = bonus * p.penalty_rate
+    return new_base, bonus, v6_subsidy(p, role)
+
+
+def v6_mode_detail(p, mode, role):
+    """analyze_store 中各模式的 (底薪, 提成, 补贴)"""
+    if mode in ("旧薪资体系", "新保底"):
+        return v6_old_salary(p, role), 0, 0
+    new_base = p.new_base_salary_mid if mode == "新底薪（中）" else p.new_base_salary_low
+    return v6_tiered_salary(p, new_base, role)
+
+
+def v6_social(p):
+    base = p.social_insurance_base
+    total_per_employee = (base * (p.pension_rate / 100) + base * (p.medical_rate / 100) +
+                          base * (p.unemployment_rate / 100) + base * (p.injury_rate / 100) +
+                          base * (p.maternity_rate / 100) + base * (p.housing_fund_rate / 100))
+    return total_per_employee, total_per_employee * p.total_staff
+
+
+def outcome(func, *args):
+    """函数结果，出错时为异常类型（人数为0时两边都应除零出错）"""
+    try:
+        return func(*args)
+    except ZeroDivisionError:
+        return ZeroDivisionError
+
+
+def test_conversion_rate(params_list):
+    for p in params_list:
+        assert calculate_conversion_rate(p) == v6_conversion_rate(p)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_mode_salary(params_list, mode):
+    for p in params_list:
+        for role in ROLES:
+            expected = outcome(v6_mode_detail, p, mode, role)
+            assert outcome(calculate_mode_salary, p, mode, True, role) == expected, (mode, role, p)
+            if expected is not ZeroDivisionError:
+                assert calculate_mode_salary(p, mode, role=role) == sum(expected)
+
+
+def test_mode_salary_default_role(params_list):
+    """不指定员工类型时按 params.employee_type 计算"""
+    for p in params_list:
+        for mode in MODES:
+            assert (outcome(calculate_mode_salary, p, mode, True) ==
+                    outcome(v6_mode_detail, p, mode, p.employee_type))
+
+
+def test_social_insurance(params_list):
+    for p in params_list:
+        social = calculate_social_insurance(p)
+        per_employee, total_cost = v6_social(p)
+        assert social.per_employee == pytest.approx(per_employee, rel=1e-12)
+        assert social.total_cost == pytest.approx(total_cost, rel=1e-12)
+
+
+def test_store_report(params_list):
+    """analyze_store：人数为0的员工类型不计算，各项为0"""
+    for p in params_list:
+        report = store_report(p)
+        assert report.total_revenue == p.purchase_amount * p.service_price
+        assert report.unit_profit == p.service_price - p.service_cost
+        assert report.total_profit == p.purchase_amount * (p.service_price - p.service_cost)
+        _, social_total_cost = v6_social(p)
+        for mode in MODES:
+            cost = report.mode(mode)
+            total_salary = 0
+            for (role, count), r in zip(p.role_counts(), cost.roles):
+                detail = (0, 0, 0) if count == 0 else v6_mode_detail(p, mode, role)
+                assert (r.role, r.count, r.base, r.bonus, r.subsidy) == (role, count) + tuple(detail)
+                total_salary += sum(detail) * count
+            total_cost = total_salary + social_total_cost + p.city_cost
+            assert cost.total_salary == pytest.approx(total_salary, rel=1e-12, abs=1e-9)
+            assert cost.net_profit == pytest.approx(report.total_profit - total_cost, rel=1e-12, abs=1e-6)
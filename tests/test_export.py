@@ -0,0 +1,73 @@
+"""Excel 报表导出：参数表 + 门店/员工薪资行与 store_report 相同，出错时不留下未完成的报表"""
+import os
+
+import openpyxl
+import pytest
+
+from salary_calculator.engine import STAFF_COLUMNS, SalaryParams, store_report
+from salary_calculator.export import PARAMETER_SHEETS, STAFF_SHEET, STORE_SHEET, ReportWorkbook, SheetStream, export_report
+
+
+STORES = [{"门店编号": "S1", "delivery_amount": 100, "employee_count": 2},
+          {"门店编号": "S2", "purchase_amount": 20, "supervisor_count": 0},
+          {"门店编号": "S3"}]
+
+
+def sheet_rows(workbook, name):
+    return [list(row) for row in workbook[name].iter_rows(values_only=True)]
+
+
+def test_export_report(tmp_path):
+    path = str(tmp_path / "report.xlsx")
+    params = SalaryParams(current_month="2024-05", city_cost=8000.0)
+    assert export_report(path, params, iter(STORES), ["门店编号"]) == len(STORES)
+
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    assert workbook.sheetnames == [name for name, _ in PARAMETER_SHEETS] + [STORE_SHEET, STAFF_SHEET]
+    for sheet_name, items in PARAMETER_SHEETS:
+        assert sheet_rows(workbook, sheet_name) == [["参数", "值"]] + [[label, getattr(params, name)]
+                                                                     for label, name in items]
+
+    stores, staff = sheet_rows(workbook, STORE_SHEET), sheet_rows(workbook, STAFF_SHEET)
+    reports = [store_report(params.replace(**{k: v for k, v in s.items() if k != "门店编号"})) for s in STORES]
+    assert stores[0] == ["门店编号"] + list(reports[0].to_row())
+    assert staff[0] == ["门店编号"] + list(STAFF_COLUMNS)
+    assert stores[1:] == [[s["门店编号"]] + list(r.to_row().values()) for s, r in zip(STORES, reports)]
+    assert staff[1:] == [[s["门店编号"]] + list(row) for s, r in zip(STORES, reports) for row in r.staff_rows()]
+    workbook.close()
+
+
+def test_sheet_rollover(tmp_path):
+    """超过单个工作表的行数时续写到新工作表，每个工作表都有表头"""
+    path = str(tmp_path / "rows.xlsx")
+    with ReportWorkbook(path) as workbook:
+        stream = SheetStream(workbook.workbook, "明细", max_rows=3)
+        stream.header = ["序号"]
+        for i in range(5):
+            stream.write([i])
+    result = openpyxl.load_workbook(path, read_only=True)
+    assert [sheet_rows(result, name) for name in ("明细", "明细2", "明细3")] == [
+        [["序号"], [0], [1]], [["序号"], [2], [3]], [["序号"], [4]]]
+    result.close()
+
+
+def test_failed_export_keeps_previous_report(tmp_path):
+    path = str(tmp_path / "report.xlsx")
+    export_report(path, SalaryParams(current_month="2024-05"), iter(STORES), ["门店编号"])
+    with open(path, "rb") as f:
+        previous = f.read()
+
+    def failing():
+        yield from STORES
+        raise ValueError("门店表有误")
+
+    with pytest.raises(ValueError):
+        export_report(path, SalaryParams(current_month="2024-06"), failing(), ["门店编号"])
+    with open(path, "rb") as f:
+        assert f.read() == previous
+    assert os.listdir(tmp_path) == ["report.xlsx"]
+
+    # 没有同名报表时也不留下文件
+    with pytest.raises(ValueError):
+        export_report(str(tmp_path / "new.xlsx"), SalaryParams(), failing(), ["门店编号"])
+    assert os.listdir(tmp_path) == ["report.xlsx"]
@@ -0,0 +1,78 @@
+"""FormulaGraph 增量重算的结果与按同样输入重新建图（全部重算）相同"""
+import pytest
+
+from salary_calculator.engine import SalaryParams, comparison_steps, salary_steps, store_report, store_report_steps
+from salary_calculator.graph import FormulaGraph, Node, NodeError, salary_graph
+
+
+def same_value(a, b):
+    """节点值相同；出错的节点比较异常类型和信息"""
+    if isinstance(a, NodeError) or isinstance(b, NodeError):
+        return (isinstance(a, NodeError) and isinstance(b, NodeError) and
+                type(a.error) is type(b.error) and str(a.error) == str(b.error))
+    return repr(a) == repr(b)
+
+
+def test_incremental_matches_full(rng, choices):
+    params = SalaryParams(current_month="2024-05")
+    graph = salary_graph(params)
+    config = params.to_config()
+    for _ in range(1500):
+        name = rng.choice(list(choices))
+        value = rng.choice(choices[name])
+        config[name] = value
+        graph.set(name, value)
+        graph.recompute()
+
+        full = salary_graph(SalaryParams(**config))
+        for node in graph.nodes:
+            assert same_value(graph.values[node], full.values[node]), (node, name, value)
+
+
+def test_texts_match_engine(rng, choices):
+    """报告文字节点与 engine 直接生成的报告相同"""
+    params = SalaryParams(current_month="2024-05")
+    graph = salary_graph(params)
+    config = params.to_config()
+    for _ in range(300):
+        name = rng.choice(list(choices))
+        config[name] = rng.choice(choices[name])
+        graph.update({name: config[name]})
+        graph.recompute()
+        p = SalaryParams(**config)
+        for node, build in (("salary_text", lambda: salary_steps(p).render()),
+                            ("comparison_text", lambda: comparison_steps(p).render()),
+                            ("store_text", lambda: store_report_steps(p).render()),
+                            ("report", lambda: store_report(p))):
+            try:
+                expected = build()
+            except ZeroDivisionError:
+                with pytest.raises(ZeroDivisionError):
+                    graph[node]
+                continue
+            assert graph[node] == expected, (node, name)
+
+
+def test_only_downstream_recomputed():
+    graph = salary_graph(SalaryParams(current_month="2024-05"))
+    before = graph.evaluations
+    assert graph.set("city_cost", 12345.0)
+    updated = graph.recompute()
+    assert "store_text" in updated and "salary_text" not in updated
+    assert graph.evaluations - before < len(graph.nodes) // 4
+    # 值没有变化时不重算
+    assert not graph.set("city_cost", 12345.0)
+    assert graph.recompute() == set()
+
+
+def test_unchanged_value_stops_propagation():
+    nodes = [Node("sign", ("x",), lambda x: x > 0), Node("label", ("sign",), lambda s: "正" if s else "非正")]
+    graph = FormulaGraph(nodes, {"x": 1})
+    graph.set("x", 2)
+    assert graph.recompute() == set()
+    assert graph.evaluations == 3
+
+
+def test_cycle_rejected():
+    with pytest.raises(ValueError):
+        FormulaGraph([Node("a", ("b",), lambda b: b), Node("b", ("a",), lambda a: a)], {})
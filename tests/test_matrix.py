@@ -0,0 +1,38 @@
+"""薪资矩阵：所有模式 × 员工类型一次算出，与逐格计算和原 v6 公式相同"""
+import numpy as np
+import pandas as pd
+
+from salary_calculator.engine import MODES, ROLES, SalaryParams, salary_matrix
+from salary_calculator.vectorized import STORE_COLUMNS, calculate_matrix
+from test_engine import v6_mode_detail
+
+
+def test_salary_matrix(params_list):
+    for p in params_list:
+        if not p.total_staff:
+            continue
+        matrix = salary_matrix(p)
+        for mode in MODES:
+            for role in ROLES:
+                assert matrix.cell(mode, role) == v6_mode_detail(p, mode, role)
+        assert matrix.salaries() == {mode: {role: matrix.salary(mode, role) for role in ROLES} for mode in MODES}
+
+
+def test_skip_empty(params_list):
+    """人数为0的员工类型不计算，各项为整数0"""
+    for p in params_list[:50]:
+        if not p.total_staff:
+            continue
+        matrix, full = salary_matrix(p, skip_empty=True), salary_matrix(p)
+        for role, count in p.role_counts():
+            for mode in MODES:
+                assert matrix.cell(mode, role) == (full.cell(mode, role) if count else (0, 0, 0))
+
+
+def test_calculate_matrix(params_list):
+    rows = [p for p in params_list if p.total_staff]
+    df = pd.DataFrame([{name: getattr(p, name) for name in STORE_COLUMNS} for p in rows])
+    matrix = calculate_matrix(df, SalaryParams())
+    assert matrix.shape == (len(rows), len(MODES), len(ROLES), 3)
+    for cells, p in zip(matrix, rows):
+        np.testing.assert_array_equal(cells, salary_matrix(p).to_numpy())
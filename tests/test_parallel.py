@@ -0,0 +1,55 @@
+"""多进程门店分析：结果与逐个调用 store_report 相同，按输入顺序排列"""
+import pytest
+
+from conftest import random_config
+from salary_calculator.engine import SalaryParams, store_report
+from salary_calculator.parallel import partition_stores, run_store_reports
+from salary_calculator.scenarios import ScenarioStore
+
+
+@pytest.fixture
+def records(rng):
+    # 门店表中有一列用户自己的“序号”（倒序），区域交错出现
+    return [dict(random_config(rng), 序号=100 - i, region=rng.choice(["华东", "华北", None]))
+            for i in range(60)]
+
+
+def expected_rows(records, params, key_columns):
+    names = set(params.to_config())
+    rows = []
+    for record in records:
+        report = store_report(params.replace(**{k: v for k, v in record.items() if k in names}))
+        row = {c: record[c] for c in key_columns}
+        row["region"] = record["region"]
+        row.update(report.to_row())
+        rows.append(row)
+    return rows
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_matches_store_report(records, workers):
+    params = SalaryParams(current_month="2024-05")
+    rows = run_store_reports(records, params, workers=workers, partition_size=7, key_columns=["序号"])
+    assert rows == expected_rows(records, params, ["序号"])
+
+
+def test_no_index_column(records):
+    """没有指定为标识列时结果中没有“序号”列"""
+    rows = run_store_reports(records, SalaryParams(current_month="2024-05"), workers=2, partition_size=7)
+    assert all(list(row)[0] == "region" for row in rows)
+
+
+def test_cached(tmp_path, records):
+    params = SalaryParams(current_month="2024-05")
+    with ScenarioStore(str(tmp_path / "cache.db")) as cache:
+        first = run_store_reports(records, params, workers=2, key_columns=["序号"], cache=cache)
+        assert run_store_reports(records, params, workers=2, key_columns=["序号"], cache=cache) == first
+        assert cache.hits >= len(records)
+    assert first == expected_rows(records, params, ["序号"])
+
+
+def test_partitions_keep_regions_together():
+    records = [{"region": r} for r in "ABAACBA"]
+    partitions = partition_stores(records, partition_size=2)
+    assert [(region, [i for i, _ in items]) for region, items in partitions] == [
+        ("A", [0, 2]), ("A", [3, 6]), ("B", [1, 5]), ("C", [4])]
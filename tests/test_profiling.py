@@ -0,0 +1,65 @@
+"""分段计时：未启用时不记录；启用后写出 trace / pstats，多进程计算时包含工作进程的计时段"""
+import json
+import os
+import pstats
+
+import pytest
+
+from salary_calculator import profiling
+from salary_calculator.engine import SalaryParams
+from salary_calculator.parallel import run_store_reports
+
+
+@pytest.fixture(autouse=True)
+def restore():
+    yield
+    profiling.disable()
+
+
+def test_disabled_records_nothing():
+    assert not profiling.enabled()
+    assert profiling.span("读取参数") is profiling.span("社保")
+    profiling.note("标记", value=1)
+    assert profiling.tracer() is None
+
+
+def test_trace_file(tmp_path):
+    path = str(tmp_path / "trace.json")
+    profiling.enable(trace=path)
+
+    @profiling.traced("计算")
+    def compute():
+        with profiling.span("内层", step=1):
+            profiling.note("标记", value=2)
+        return 3
+
+    assert compute() == 3
+    tracer = profiling.disable()
+    assert [e[0] for e in tracer.events] == ["标记", "内层", "计算"]
+    with open(path, encoding="utf-8") as f:
+        trace = json.load(f)
+    events = {e["name"]: e for e in trace["traceEvents"]}
+    assert events["标记"]["ph"] == "i" and events["标记"]["args"] == {"value": 2}
+    assert events["内层"]["dur"] <= events["计算"]["dur"]
+    assert trace["summary"]["计算"]["count"] == 1
+
+
+def test_worker_spans_merged(tmp_path):
+    """--workers 2 时工作进程的计时段和剖析数据合并到主进程写出的文件中"""
+    trace_path, profile_path = str(tmp_path / "trace.json"), str(tmp_path / "profile.pstats")
+    records = [{"region": f"区域{i % 4}", "delivery_amount": 50 + i} for i in range(40)]
+    profiling.enable(trace=trace_path, profile=profile_path)
+    with profiling.span("report"):
+        rows = run_store_reports(records, SalaryParams(current_month="2024-05"), workers=2, partition_size=5)
+    profiling.disable()
+    assert len(rows) == len(records)
+
+    with open(trace_path, encoding="utf-8") as f:
+        trace = json.load(f)
+    worker_pids = {e["pid"] for e in trace["traceEvents"] if e["name"] == "薪资矩阵"}
+    assert worker_pids and os.getpid() not in worker_pids
+    assert trace["summary"]["薪资矩阵"]["count"] == len(records)
+
+    stats = pstats.Stats(profile_path).stats
+    calls = {func[2]: value[1] for func, value in stats.items() if func[0].endswith("engine.py")}
+    assert calls["store_report"] == len(records)
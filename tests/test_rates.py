@@ -0,0 +1,84 @@
+"""旧提成单价表：查找结果与原界面的 if/elif 分支相同"""
+import json
+
+import numpy as np
+import pytest
+
+from salary_calculator.rates import (
+    DEFAULT_RATE_TABLE, DEFAULT_RATES, V13_RATES, CommissionRateTable, load_rate_table)
+
+
+def v26_ladder(pack_price, has_station_license, conversion_rate):
+    """v26 / v28 原来的分支写法"""
+    if pack_price > 450 and not has_station_license:
+        rates = (10, 15, 20)
+    elif pack_price > 450:
+        rates = (15, 20, 25)
+    elif not has_station_license:
+        rates = (5, 10, 15)
+    else:
+        rates = (10, 15, 20)
+    if conversion_rate < 50:
+        return rates[0]
+    elif conversion_rate < 60:
+        return rates[1]
+    return rates[2]
+
+
+def v13_ladder(pack_price, has_station_license, conversion_rate):
+    """v13 原来的分支写法（各组分界不同）"""
+    if pack_price > 450:
+        bands = (60, 70, 80) if has_station_license else (50, 60, 70)
+        rates = (10, 15, 20, 25)
+    else:
+        bands = (60, 70, 80) if has_station_license else (50, 60, 75)
+        rates = (10, 12, 15, 20)
+    for band, rate in zip(bands, rates):
+        if conversion_rate < band:
+            return rate
+    return rates[-1]
+
+
+# 各分界本身、分界两侧和区间中间的转化率
+RATES = [0, 49.99, 50, 55, 59.99, 60, 65, 69.99, 70, 74.99, 75, 79.99, 80, 100, 250]
+PRICES = [300, 450, 450.5, 510]
+
+
+@pytest.mark.parametrize("table, ladder", [(DEFAULT_RATES, v26_ladder), (V13_RATES, v13_ladder)])
+def test_lookup_matches_ladder(table, ladder):
+    cases = [(p, lic, r) for p in PRICES for lic in (True, False) for r in RATES]
+    for case in cases:
+        assert table.lookup(*case) == ladder(*case), case
+    prices, licenses, rates = map(np.array, zip(*cases))
+    assert table.lookup_array(prices, licenses, rates).tolist() == [ladder(*case) for case in cases]
+
+
+def test_lookup_array_broadcasts():
+    result = DEFAULT_RATES.lookup_array(510, False, [10, 55, 90])
+    assert result.tolist() == [10, 15, 20]
+
+
+def test_load(tmp_path):
+    config = json.loads(json.dumps(DEFAULT_RATE_TABLE))
+    config["groups"]["low_license"] = {"bands": [40], "rates": [7, 9]}
+    path = tmp_path / "rates.json"
+    path.write_text(json.dumps(config), encoding="utf-8")
+    table = load_rate_table(str(path))
+    assert table.lookup(300, True, 39.9) == 7 and table.lookup(300, True, 40) == 9
+    assert CommissionRateTable.from_config(table.to_config()).groups == table.groups
+    # 未指定路径且当前目录没有单价表文件时使用内置表
+    assert load_rate_table(filename=str(tmp_path / "missing.json")) is DEFAULT_RATES
+
+
+@pytest.mark.parametrize("group, message", [
+    ({"bands": [50, 60], "rates": [1, 2]}, "多一个"),
+    ({"bands": [60, 50], "rates": [1, 2, 3]}, "从小到大"),
+])
+def test_invalid_table(group, message):
+    config = json.loads(json.dumps(DEFAULT_RATE_TABLE))
+    config["groups"]["high_license"] = group
+    with pytest.raises(ValueError, match=message):
+        CommissionRateTable.from_config(config)
+    del config["groups"]["high_license"]
+    with pytest.raises(ValueError, match="缺少分组"):
+        CommissionRateTable.from_config(config)
@@ -0,0 +1,43 @@
+"""员工名单：按列存储，迭代得到的员工字典与原 staff_list 相同，门店计算结果不变"""
+import pandas as pd
+import pytest
+
+from salary_calculator.commission import StoreParams, calculate_store
+from salary_calculator.roster import DEFAULT_STAFF, STAFF_FIELDS, StaffRoster
+
+
+@pytest.fixture
+def staff_list(rng):
+    return [{name: float(rng.choice([0, 200, 550.5, 2000, 2200])) for name in STAFF_FIELDS} for _ in range(50)]
+
+
+def test_same_staff(staff_list):
+    roster = StaffRoster(staff_list)
+    assert len(roster) == len(staff_list)
+    assert list(roster) == staff_list
+    assert roster[3] == staff_list[3]
+    assert list(roster.basic_salaries()) == [s["old_base"] + s["basic_perf"] + s["post_perf"] + s["subsidy"]
+                                            for s in staff_list]
+
+
+@pytest.mark.parametrize("use_threshold", [False, True])
+def test_calculate_store_same_as_list(staff_list, use_threshold):
+    params = StoreParams(store_staff=len(staff_list), service_packs=2600, new_service_packs=2600,
+                         use_threshold=use_threshold, threshold1=2000, threshold2=2500)
+    assert calculate_store(params, StaffRoster(staff_list)) == calculate_store(params, staff_list)
+    assert calculate_store(StoreParams(), StaffRoster(DEFAULT_STAFF)) == calculate_store(StoreParams(), DEFAULT_STAFF)
+
+
+def test_read(tmp_path):
+    path = tmp_path / "staff.csv"
+    pd.DataFrame({"旧底薪": [2000, 2200], "基本绩效": [550, None], "post_perf": [200, 400], " 补贴": [1100, 1100]}
+                 ).to_csv(path, index=False)
+    roster = StaffRoster.read(str(path))
+    # 中文列名和字段名都可以，空值按 0 计
+    assert list(roster) == [dict(DEFAULT_STAFF[0]), dict(DEFAULT_STAFF[1], basic_perf=0.0)]
+
+    pd.DataFrame({"旧底薪": [2000], "补贴": [1100]}).to_csv(path, index=False)
+    with pytest.raises(ValueError, match="基本绩效, 岗位绩效"):
+        StaffRoster.read(str(path))
+    with pytest.raises(ValueError, match="长度不一致"):
+        StaffRoster.from_columns(old_base=[1, 2], basic_perf=[1], post_perf=[1, 2], subsidy=[1, 2])
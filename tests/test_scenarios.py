@@ -0,0 +1,96 @@
+"""场景缓存：读回的结果与直接计算相同（重新打开缓存文件后也相同），按最近使用淘汰"""
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+from salary_calculator import scenarios
+from salary_calculator.engine import SalaryParams
+from salary_calculator.scenarios import ScenarioCache, ScenarioStore, compute_scenario, scenario_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """每次取时间都递增，最近使用的先后顺序确定"""
+    ticks = itertools.count(1)
+    monkeypatch.setattr(scenarios, "time", SimpleNamespace(time=lambda: float(next(ticks))))
+
+
+def test_results_match_compute(tmp_path, params_list):
+    path = str(tmp_path / "cache.db")
+    with ScenarioStore(path) as store:
+        first = store.results(params_list)
+        assert store.misses == len(params_list)
+    # 重新打开（相当于重启程序）后从磁盘读取
+    with ScenarioStore(path) as store:
+        loaded = store.results(params_list)
+        assert store.hits == len(params_list) and store.misses == 0
+    for params, a, b in zip(params_list, first, loaded):
+        # 金额按 float64 存储，与直接计算的值相等（整数0读回为0.0）
+        assert a == b == compute_scenario(params)
+
+
+def test_count_types_kept(tmp_path):
+    """人数为整数和浮点数时分开缓存，读回的人数类型与参数相同"""
+    as_int = SalaryParams(current_month="2024-05", employee_count=2, supervisor_count=1)
+    as_float = as_int.replace(employee_count=2.0)
+    assert scenario_key(as_int) != scenario_key(as_float)
+    path = str(tmp_path / "cache.db")
+    with ScenarioStore(path) as store:
+        store.results([as_int, as_float])
+    with ScenarioStore(path) as store:
+        for params in (as_int, as_float):
+            result, hit = store.result(params)
+            assert hit and result == compute_scenario(params)
+            assert [type(r.count) for r in result.report.modes[0].roles] == [type(c) for _, c in params.role_counts()]
+            assert type(result.report.social.total_staff) is type(params.total_staff)
+
+
+def test_key_ignores_display_fields():
+    params = SalaryParams(current_month="2024-05", delivery_amount=100)
+    assert scenario_key(params) == scenario_key(params.replace(delivery_amount=100.0, employee_type="主管",
+                                                              salary_mode="新保底"))
+    assert scenario_key(params) != scenario_key(params.replace(current_month="2024-06"))
+    assert scenario_key(params) != scenario_key(params.replace(delivery_amount=101))
+
+
+def test_hit_path(tmp_path):
+    params = [SalaryParams(current_month="2024-05", delivery_amount=d) for d in (80, 90, 100)]
+    computed = []
+
+    def compute(todo):
+        computed.append(list(todo))
+        return [compute_scenario(p) for p in todo]
+
+    with ScenarioStore(str(tmp_path / "cache.db")) as store:
+        store.results(params[:2], compute=compute)
+        # 已缓存的不再计算，重复的参数只算一次
+        results = store.results(params + [params[2]], compute=compute)
+        assert computed == [params[:2], [params[2]]]
+        assert results[2] is results[3]
+        assert store.get(params[0]) is results[0]
+
+
+def test_store_lru_eviction(tmp_path, clock):
+    params = [SalaryParams(current_month="2024-05", delivery_amount=d) for d in range(80, 84)]
+    with ScenarioStore(str(tmp_path / "cache.db"), max_entries=3, memory_entries=1) as store:
+        for p in params[:3]:
+            store.put(p, compute_scenario(p))
+        assert store.get(params[0]) is not None
+        store.put(params[3], compute_scenario(params[3]))
+        # 第二个最久未使用，被淘汰
+        assert len(store) == 3
+        assert [store.get(p) is None for p in params] == [False, True, False, False]
+
+
+def test_memory_lru():
+    cache = ScenarioCache(max_entries=2)
+    params = [SalaryParams(current_month="2024-05", delivery_amount=d) for d in (80, 90, 100)]
+    a, hit = cache.result(params[0])
+    assert not hit
+    cache.result(params[1])
+    assert cache.result(params[0]) == (a, True)
+    cache.result(params[2])
+    assert len(cache) == 2
+    assert cache.lookup(scenario_key(params[1])) is None
+    assert (cache.hits, cache.misses) == (1, 3)
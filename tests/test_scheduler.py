@@ -0,0 +1,98 @@
+"""后台重算调度：防抖、只应用最新一次输入的结果、错误回调"""
+import itertools
+import threading
+
+from salary_calculator.scheduler import RecomputeScheduler
+
+
+class FakeRoot:
+    """代替 Tk 根窗口：after 只记录回调，由测试按顺序执行"""
+
+    def __init__(self):
+        self.callbacks = {}
+        self._ids = itertools.count()
+
+    def after(self, delay, callback):
+        after_id = f"after#{next(self._ids)}"
+        self.callbacks[after_id] = callback
+        return after_id
+
+    def after_cancel(self, after_id):
+        del self.callbacks[after_id]
+
+    def run_pending(self):
+        callbacks, self.callbacks = self.callbacks, {}
+        for callback in callbacks.values():
+            callback()
+
+    def drain(self, scheduler):
+        while scheduler.busy:
+            self.run_pending()
+
+
+def make(root, inputs, compute=None):
+    applied, errors = [], []
+    scheduler = RecomputeScheduler(root, lambda: inputs[-1], compute or (lambda x: x * 10),
+                                   applied.append, errors.append, delay=0, poll_interval=0)
+    return scheduler, applied, errors
+
+
+def test_debounce():
+    root, inputs = FakeRoot(), [1]
+    scheduler, applied, _ = make(root, inputs)
+    for value in (2, 3, 4):
+        inputs.append(value)
+        scheduler.schedule()
+    # 连续输入只保留最后一次的防抖计时
+    assert len(root.callbacks) == 1
+    root.drain(scheduler)
+    assert applied == [40]
+
+
+def test_stale_generation_dropped():
+    """计算期间又有新的输入时，旧任务的结果不应用"""
+    root, inputs = FakeRoot(), [1]
+    started, release = threading.Event(), threading.Event()
+
+    def compute(value):
+        if value == 1:
+            started.set()
+            release.wait(5)
+        return value * 10
+
+    scheduler, applied, _ = make(root, inputs, compute)
+    scheduler.run_now()
+    assert started.wait(5)
+    inputs.append(2)
+    scheduler.run_now()
+    release.set()
+    root.drain(scheduler)
+    assert applied == [20]
+
+    # 取消后正在进行的计算也作废
+    started.clear()
+    release.clear()
+    inputs.append(1)
+    scheduler.run_now()
+    assert started.wait(5)
+    scheduler.cancel()
+    release.set()
+    root.drain(scheduler)
+    assert applied == [20]
+    assert not root.callbacks
+
+
+def test_errors_reported():
+    root = FakeRoot()
+    scheduler, applied, errors = make(root, [0], lambda value: 1 / value)
+    scheduler.run_now()
+    root.drain(scheduler)
+    assert applied == [] and isinstance(errors[0], ZeroDivisionError)
+
+    # prepare 出错时不启动计算，返回 None 时什么也不做
+    scheduler.prepare = lambda: int("x")
+    scheduler.run_now()
+    assert isinstance(errors[1], ValueError) and not scheduler.busy
+    scheduler.prepare = lambda: None
+    scheduler.run_now()
+    assert len(errors) == 2 and not scheduler.busy
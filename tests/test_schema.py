@@ -0,0 +1,42 @@
+"""参数表：配置读写往返不变，出错的参数一起报告"""
+from dataclasses import fields
+
+import pytest
+
+from salary_calculator.engine import SalaryParams
+from salary_calculator.schema import (
+    GROUPS_BY_NAME, PARAMETERS, export_sheets, load_config, parse_config, save_config)
+
+
+def test_covers_params():
+    assert {p.name for p in PARAMETERS} == {f.name for f in fields(SalaryParams)}
+    assert all(GROUPS_BY_NAME[name].export for name, _ in export_sheets())
+
+
+def test_round_trip(tmp_path, params_list):
+    path = str(tmp_path / "config.json")
+    for params in params_list[:50]:
+        save_config(params, path)
+        loaded = load_config(path)
+        assert loaded == params
+        assert [type(getattr(loaded, p.name)) for p in PARAMETERS] == [p.type for p in PARAMETERS]
+
+
+def test_parse_coerces():
+    params = parse_config({"employee_count": "3", "supervisor_count": 2.0, "delivery_amount": "80.5",
+                           "current_month": 202405, "unknown": 1})
+    assert (params.employee_count, params.supervisor_count, params.delivery_amount) == (3, 2, 80.5)
+    assert type(params.supervisor_count) is int
+    assert params.current_month == "202405"
+    # 缺失的键使用默认值
+    assert parse_config({}) == SalaryParams()
+
+
+def test_parse_reports_all_errors():
+    with pytest.raises(ValueError) as excinfo:
+        parse_config({"employee_count": 1.5, "delivery_amount": "abc", "salary_mode": "旧薪资",
+                      "pension_rate": True})
+    message = str(excinfo.value)
+    for text in ("员工数量(employee_count)=1.5 必须是整数", "交付量(delivery_amount)='abc' 必须是数字",
+                 "薪资模式(salary_mode)='旧薪资' 只能是", "养老保险比例(pension_rate)=True 不能是布尔值"):
+        assert text in message
@@ -0,0 +1,86 @@
+"""员工名单社保：缴费基数按城市上下限截断，结果与逐人计算相同"""
+import math
+
+import pandas as pd
+import pytest
+
+from salary_calculator.engine import SalaryParams, calculate_social_insurance
+from salary_calculator.social import (
+    CONTRIBUTIONS, CityLimit, CityLimitTable, calculate_roster, roster_social_insurance, roster_summary)
+
+LIMITS = CityLimitTable.from_config({
+    "default": {"floor": 3000, "cap": None},
+    "cities": {
+        "上海": {"floor": 7310, "cap": 36549, "housing_floor": 2690, "housing_cap": 30000},
+        "杭州": {"floor": 4462, "cap": 24930, "rates": {"housing_fund_rate": 5, "pension_rate": 16}},
+    },
+})
+
+
+@pytest.fixture
+def roster(rng):
+    return pd.DataFrame({
+        "社保基数": [rng.choice([None, 1000, 2800, 5000, 8000.5, 30000, 50000]) for _ in range(200)],
+        "城市": [rng.choice(["上海", "杭州", "北京", None]) for _ in range(200)],
+        "门店": [rng.choice(["A", "B", "C"]) for _ in range(200)],
+    })
+
+
+def per_row(row, params, limits):
+    """逐人计算：先按城市上下限截断基数，再乘以各项比例"""
+    limit = limits.limit(row["城市"]) if isinstance(row["城市"], str) else limits.default
+    base = params.social_insurance_base if pd.isna(row["社保基数"]) else row["社保基数"]
+    social_base = min(max(base, limit.floor), limit.cap)
+    housing_base = min(max(base, limit.housing_floor), limit.housing_cap)
+    result = {"缴费基数": social_base, "公积金基数": housing_base}
+    for name, field, housing in CONTRIBUTIONS:
+        rate = limit.rates.get(field, getattr(params, field))
+        result[name] = (housing_base if housing else social_base) * (rate / 100)
+    result["社保合计"] = sum(result[name] for name, _, _ in CONTRIBUTIONS)
+    return result
+
+
+def test_matches_per_row(roster):
+    params = SalaryParams(social_insurance_base=6000.0)
+    result = calculate_roster(roster, params, LIMITS)
+    assert list(result.index) == list(roster.index)
+    for (_, row), (_, got) in zip(roster.iterrows(), result.iterrows()):
+        expected = per_row(row, params, LIMITS)
+        assert got.to_dict() == pytest.approx(expected)
+
+
+def test_clamped(roster):
+    result = calculate_roster(roster, SalaryParams(), LIMITS)
+    shanghai = (roster["城市"] == "上海").to_numpy()
+    assert result["缴费基数"][shanghai].between(7310, 36549).all()
+    assert result["公积金基数"][shanghai].between(2690, 30000).all()
+    # 北京不在表中，与没有城市的行一样只有默认下限
+    others = roster["城市"].isin(["北京"]).to_numpy() | roster["城市"].isna().to_numpy()
+    assert (result["缴费基数"][others] >= 3000).all()
+    assert result["缴费基数"].max() == 50000
+
+
+def test_no_limits_same_as_params():
+    """不限上下限、所有人基数相同时与 calculate_social_insurance 相同"""
+    params = SalaryParams(employee_count=3, supervisor_count=1)
+    summary = roster_summary(calculate_roster(pd.DataFrame({"城市": [None] * params.total_staff}), params))
+    assert summary == calculate_social_insurance(params)
+
+
+def test_grouped_by_store(roster):
+    params = SalaryParams()
+    grouped = roster_social_insurance(roster, params, LIMITS, store_column="store")
+    assert list(grouped) == list(dict.fromkeys(roster["门店"]))
+    for store, social in grouped.items():
+        expected = roster_social_insurance(roster[roster["门店"] == store], params, LIMITS)
+        assert social.total_staff == expected.total_staff
+        assert social.total_cost == pytest.approx(expected.total_cost)
+
+
+def test_invalid_limits():
+    with pytest.raises(ValueError, match="下限不能高于上限"):
+        CityLimit(floor=5000, cap=4000)
+    with pytest.raises(ValueError, match="未知的缴费比例"):
+        CityLimit(rates={"bonus_rate": 1})
+    assert CityLimitTable.from_config(LIMITS.to_config()).limit("杭州").rates["housing_fund_rate"] == 5
+    assert math.isinf(LIMITS.limit("北京").cap)
@@ -0,0 +1,39 @@
+"""计算过程记录：显示时才格式化，各步骤的结果可以直接取出"""
+import pytest
+
+from salary_calculator.steps import StepLog
+
+
+def test_render_and_results():
+    log = StepLog()
+    log.text("=== 标题 ===\n")
+    log.add("转化率 = {purchase} / {delivery} × 100% = {result:.2f}%\n", name="转化率", result=12.5,
+            purchase=10, delivery=80)
+    other = StepLog()
+    other.add("人均 = {result}\n", name="人均", result=3)
+    other.add("人均 = {result}\n", name="人均", result=4)
+    log.extend(other)
+    assert len(log) == 4
+    assert log.render() == "=== 标题 ===\n转化率 = 10 / 80 × 100% = 12.50%\n人均 = 3\n人均 = 4\n"
+    # 同名步骤取最后一次
+    assert log.results() == {"转化率": 12.5, "人均": 4}
+
+
+@pytest.mark.parametrize("conversion_rate, use_threshold, new_service_packs",
+                         [(5.0, False, 30), (50.0, True, 30), (20.0, True, 100)])
+def test_v13_detail(conversion_rate, use_threshold, new_service_packs):
+    """v13 界面新底薪模式的计算过程：记录的结果与返回的最终薪资一致"""
+    pytest.importorskip("tkinter")
+    from salary_calculator_v13 import SalaryCalculatorApp
+
+    staff = {"old_base": 2000, "basic_perf": 500, "post_perf": 300, "subsidy": 200}
+    final, log = SalaryCalculatorApp.calculate_new_salary_detail(
+        None, staff, conversion_rate, new_service_packs, 20, 2,
+        2000, 500, 300, 200, 800, 2500,
+        0.1, 0.3, 0.8, 0.9, use_threshold,
+        60, 90, 60, 80, 100, 0.9, 0.8,
+        "中")
+    results = log.results()
+    assert results["新底薪中最终薪资"] == final
+    assert results["新底薪中单位提成"] == pytest.approx((2000 + 500 + 300 + 200 + 800 - 2500) / 20)
+    assert log.render().endswith(f"最终中模式薪资: {final:.2f}元\n")
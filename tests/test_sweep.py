@@ -0,0 +1,87 @@
+"""薪资敏感性分析：向量化曲线与 v5 界面逐点计算的结果相同"""
+import numpy as np
+import pytest
+
+from salary_calculator.sweep import SweepParams, evaluate, sweep_conversion, sweep_purchase, sweep_surface
+
+
+def v5_point(p, delivery, purchase):
+    """v5 界面 calculate_old_salary / calculate_new_salary_mode2/3 / apply_conversion_rate_penalty 的写法"""
+    rate = 0 if delivery == 0 else (purchase / delivery) * 100
+    base_calculation = (delivery * rate / 100 - delivery / 2) * 10 / p.store_staff_count
+    if rate >= 50:
+        old = p.old_base_salary + base_calculation + p.old_basic_bonus + p.old_position_bonus + p.old_extra_bonus
+    else:
+        old = (p.old_base_salary + base_calculation + (p.old_basic_bonus + p.old_position_bonus) / 2 +
+               p.old_extra_bonus)
+    supervisor = 500 if p.employee_type == "主管" else 0
+
+    def tiered(new_base):
+        amount = p.new_purchase_amount or purchase
+        baseline = p.old_purchase_baseline
+        per_package = (p.old_base_salary - new_base) / baseline if baseline > 0 else 0
+        tier1, tier2 = baseline * p.bonus_tier1_threshold, baseline * p.bonus_tier2_threshold
+        if amount <= tier1:
+            bonus = per_package * amount
+        elif amount <= tier2:
+            bonus = per_package * tier1 + (per_package + p.bonus_extra1) * (amount - tier1)
+        else:
+            bonus = (per_package * tier1 + (per_package + p.bonus_extra1) * (tier2 - tier1) +
+                     (per_package + p.bonus_extra2) * (amount - tier2))
+        return new_base + bonus + supervisor
+
+    def penalty(salary):
+        return salary * p.penalty_rate if rate < p.min_conversion_rate else salary
+
+    old += supervisor
+    return rate, old, penalty(old), penalty(tiered(p.new_base_salary_mid)), penalty(tiered(p.new_base_salary_low))
+
+
+@pytest.fixture
+def sweep_params(rng):
+    return [SweepParams(employee_type=rng.choice(["员工", "主管"]),
+                        old_purchase_baseline=rng.choice([0, 40.0, 35.5]),
+                        new_purchase_amount=rng.choice([0, 0, 60.0]),
+                        min_conversion_rate=rng.choice([30.0, 45.0, 60.0]),
+                        store_staff_count=rng.choice([1, 5]))
+            for _ in range(20)]
+
+
+def test_evaluate_matches_v5(sweep_params):
+    delivery = np.array([0, 37, 80.5, 100, 120])[:, None]
+    purchase = np.array([0, 30.25, 40, 41, 50, 60, 70, 95])[None, :]
+    for p in sweep_params:
+        result = evaluate(p, delivery, purchase)
+        assert all(r.shape == (5, 8) for r in result)
+        for i, d in enumerate(delivery[:, 0]):
+            for j, a in enumerate(purchase[0]):
+                assert [r[i, j] for r in result] == pytest.approx(v5_point(p, d, a))
+
+
+def test_sweeps(sweep_params):
+    p = sweep_params[0]
+    rates = np.linspace(0, 100, 11)
+    sweep = sweep_conversion(p, rates)
+    assert list(sweep.x) == list(rates)
+    assert sweep.conversion_rate == pytest.approx(rates)
+    for rate, old in zip(rates, sweep.old):
+        assert old == pytest.approx(v5_point(p, p.delivery_amount, p.delivery_amount * rate / 100)[1])
+
+    amounts = [0, 25, 50, 150]
+    assert sweep_purchase(p, amounts).mode2 == pytest.approx(
+        [v5_point(p, p.delivery_amount, a)[3] for a in amounts])
+
+
+def test_surface(sweep_params):
+    p = sweep_params[1]
+    rates, amounts = [0, 25, 50, 80], [10, 40, 70]
+    surface = sweep_surface(p, rates, amounts)
+    assert surface.mode3.shape == (4, 3)
+    # 转化率为0的行交付量按0处理，其余行的交付量由 购买量 / 转化率 反推
+    assert list(surface.delivery[0]) == [0, 0, 0]
+    for i, rate in enumerate(rates[1:], 1):
+        for j, amount in enumerate(amounts):
+            expected = v5_point(p, amount * 100 / rate, amount)
+            assert expected[0] == pytest.approx(rate)
+            assert [surface.old[i, j], surface.mode1[i, j], surface.mode2[i, j], surface.mode3[i, j]] == \
+                pytest.approx(expected[1:])
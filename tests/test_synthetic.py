@@ -0,0 +1,55 @@
+"""模拟门店数据：同一种子结果相同（流式写出也相同），门店表与员工表一致"""
+import pandas as pd
+import pytest
+
+from salary_calculator import synthetic
+from salary_calculator.synthetic import COUNT_COLUMNS, generate, v28_stores, write_synthetic
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    """每块 7 个门店，少量门店也能覆盖多块"""
+    monkeypatch.setattr(synthetic, "BLOCK_SIZE", 7)
+
+
+def test_same_seed(small_blocks):
+    stores, staff = generate(30, seed=5)
+    again_stores, again_staff = generate(30, seed=5)
+    pd.testing.assert_frame_equal(stores, again_stores)
+    pd.testing.assert_frame_equal(staff, again_staff)
+    assert not generate(30, seed=6)[0].equals(stores)
+    # 完整的块与总门店数无关
+    pd.testing.assert_frame_equal(generate(14, seed=5)[0], stores.head(14))
+
+
+def test_staff_matches_stores(small_blocks):
+    stores, staff = generate(30)
+    assert stores["门店编号"].is_unique and staff["员工编号"].is_unique
+    assert list(staff["员工编号"]) == [f"E{i:08d}" for i in range(len(staff))]
+    counts = staff.groupby("门店编号", sort=False).size()
+    assert list(counts.index) == list(stores["门店编号"])
+    assert list(counts) == list(stores[list(COUNT_COLUMNS)].sum(axis=1))
+    assert (staff["城市"].to_numpy() == stores.set_index("门店编号").loc[staff["门店编号"], "城市"].to_numpy()).all()
+    assert (stores["purchase_amount"] <= stores["delivery_amount"]).all()
+
+
+def test_v28_stores(small_blocks):
+    stores, staff = generate(20)
+    rows = list(v28_stores(stores, staff))
+    assert len(rows) == len(stores)
+    start = 0
+    for (params, roster), (_, store) in zip(rows, stores.iterrows()):
+        assert params.delivery_volume == store["delivery_amount"]
+        assert params.pack_price == store["service_price"]
+        assert params.store_staff == len(roster)
+        assert list(roster.old_base) == list(staff["旧底薪"][start:start + len(roster)])
+        start += len(roster)
+    assert start == len(staff)
+
+
+def test_write_streams_same_data(tmp_path, small_blocks):
+    store_path, staff_path = str(tmp_path / "stores.parquet"), str(tmp_path / "staff.csv")
+    assert write_synthetic(store_path, staff_path, stores=30, seed=3) == (30, len(generate(30, seed=3)[1]))
+    stores, staff = generate(30, seed=3)
+    pd.testing.assert_frame_equal(pd.read_parquet(store_path), stores, check_dtype=False)
+    assert list(pd.read_csv(staff_path)["员工编号"]) == list(staff["员工编号"])
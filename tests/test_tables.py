@@ -0,0 +1,127 @@
+"""按块读写门店表：TableWriter 写出的文件用 iter_table_chunks 读回内容不变，各块列类型一致"""
+import os
+
+import pandas as pd
+import pytest
+
+from salary_calculator.streaming import run_stream
+from salary_calculator.tables import TableWriter, iter_table_chunks
+
+
+def stores_frame():
+    return pd.DataFrame({
+        # 前几行全是数字、后面出现字母和前导0，按块推断类型会不一致
+        "门店编号": ["101", "102", "103", "104", "A05", "007", None],
+        "region": ["华东", "华北", None, "华东", "华南", "华北", "华东"],
+        "交付量": [100.0, 80.5, 0.0, 37.0, 120.0, 90.0, 60.0],
+        "购买服务包数量": [50.0, 30.25, 0.0, 41.0, 70.0, 45.0, 20.0],
+        "employee_count": pd.array([2, 1, 3, None, 2, 1, 0], dtype="Int64"),
+    })
+
+
+def write_chunks(path, df, size=3):
+    with TableWriter(path) as writer:
+        for start in range(0, len(df), size):
+            writer.write(df.iloc[start:start + size])
+    return writer.rows
+
+
+def read_chunks(path, size=2, **kwargs):
+    chunks = list(iter_table_chunks(path, size, **kwargs))
+    return chunks, pd.concat(chunks)
+
+
+@pytest.mark.parametrize("ext", [".csv", ".xlsx", ".parquet"])
+def test_round_trip(tmp_path, ext):
+    df = stores_frame()
+    path = str(tmp_path / f"stores{ext}")
+    assert write_chunks(path, df) == len(df)
+
+    chunks, result = read_chunks(path)
+    # 中文列名转换为参数字段名，行号在整个文件内连续
+    assert list(result.columns) == ["门店编号", "region", "delivery_amount", "purchase_amount", "employee_count"]
+    assert list(result.index) == list(range(len(df)))
+    assert result["delivery_amount"].tolist() == df["交付量"].tolist()
+    for name in ("门店编号", "region", "employee_count"):
+        # 空值读回后仍为空（文本列的空值在 pandas 3 中为 NaN）
+        assert result[name].isna().tolist() == df[name].isna().tolist()
+        assert result[name].dropna().tolist() == df[name].dropna().tolist()
+    # 每块的列类型相同
+    assert len({tuple(map(str, chunk.dtypes)) for chunk in chunks}) == 1
+
+
+def test_csv_identifiers_stay_text(tmp_path):
+    path = str(tmp_path / "stores.csv")
+    pd.DataFrame({"门店编号": ["1", "2", "007", "B1"], "交付量": [1, 2, 3, 4]}).to_csv(path, index=False)
+    chunks, result = read_chunks(path)
+    assert result["门店编号"].tolist() == ["1", "2", "007", "B1"]
+    assert all(chunk["delivery_amount"].dtype == "float64" for chunk in chunks)
+
+
+def test_parquet_dtype_drift(tmp_path):
+    """后续块的列类型与第一块不同时按第一块转换（全空列按字符串、整数写入浮点列）"""
+    path = str(tmp_path / "out.parquet")
+    with TableWriter(path) as writer:
+        writer.write(pd.DataFrame({"门店编号": [None, None], "交付量": [1.5, 2.5]}))
+        writer.write(pd.DataFrame({"门店编号": ["A1", "A2"], "交付量": [3, 4]}))
+    result = pd.read_parquet(path)
+    assert result["门店编号"].tolist()[2:] == ["A1", "A2"]
+    assert result["交付量"].tolist() == [1.5, 2.5, 3.0, 4.0]
+
+
+def test_parquet_incompatible_chunk(tmp_path):
+    """无法无损转换时报错，不留下写了一半的文件"""
+    path = str(tmp_path / "out.parquet")
+    with pytest.raises(ValueError):
+        with TableWriter(path) as writer:
+            writer.write(pd.DataFrame({"门店编号": ["A1"], "交付量": [1.5]}))
+            writer.write(pd.DataFrame({"门店编号": ["A2"], "交付量": ["x"]}))
+    assert not os.path.exists(path)
+
+
+@pytest.mark.parametrize("ext", [".csv", ".parquet"])
+def test_rerun_on_output(tmp_path, ext):
+    """对上一次的结果文件再算一遍：结果列被替换而不是重复，也不会被当成参数读入"""
+    source = str(tmp_path / f"stores{ext}")
+    write_chunks(source, stores_frame().fillna({"employee_count": 1}))
+    first = str(tmp_path / f"first{ext}")
+    second = str(tmp_path / f"second{ext}")
+    rows = run_stream(source, first, chunksize=3, detail=True)
+    assert run_stream(first, second, chunksize=2, detail=True) == rows
+
+    _, expected = read_chunks(first, keep=("新底薪（中）", "新底薪（低）"))
+    _, result = read_chunks(second, keep=("新底薪（中）", "新底薪（低）"))
+    assert list(result.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize("ext", [".csv", ".xlsx", ".parquet"])
+def test_failed_write_keeps_previous_output(tmp_path, ext):
+    """出错时原有的结果文件保持不变，也不留下临时文件"""
+    path = str(tmp_path / f"out{ext}")
+    write_chunks(path, stores_frame())
+    with open(path, "rb") as f:
+        previous = f.read()
+
+    with pytest.raises(RuntimeError):
+        with TableWriter(path) as writer:
+            writer.write(stores_frame().iloc[:2])
+            raise RuntimeError("计算出错")
+    with pytest.raises(FileNotFoundError):
+        run_stream(str(tmp_path / "missing.csv"), path)
+
+    with open(path, "rb") as f:
+        assert f.read() == previous
+    assert os.listdir(tmp_path) == [f"out{ext}"]
+
+
+def test_bad_input_keeps_previous_output(tmp_path):
+    source = str(tmp_path / "stores.csv")
+    pd.DataFrame({"门店编号": ["S1"], "交付量": ["abc"]}).to_csv(source, index=False)
+    path = str(tmp_path / "out.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("上次的结果\n")
+    with pytest.raises(ValueError):
+        run_stream(source, path)
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == "上次的结果\n"
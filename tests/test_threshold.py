@@ -0,0 +1,74 @@
+"""suggest_thresholds 与原界面的双重循环穷举结果相同"""
+import random
+
+import pytest
+
+from salary_calculator.threshold import suggest_thresholds, suggest_thresholds_batch, tier_commission
+
+
+def brute_force(packs, tier1, tier2, tier3, target=None, step=5, start=10):
+    """v26 calculate_threshold_suggestion 的穷举（差异更小时才替换，相同时保留先找到的较小阈值）"""
+    if target is None:
+        target = packs * tier1
+    best, min_diff = None, float("inf")
+    for t1 in range(start, packs, step):
+        for t2 in range(t1 + step, packs + step, step):
+            diff = abs(tier_commission(packs, t1, t2, tier1, tier2, tier3) - target)
+            if diff < min_diff:
+                min_diff = diff
+                best = (t1, t2, diff)
+    return best
+
+
+def check(packs, tier1, tier2, tier3, target=None, step=5, start=10):
+    expected = brute_force(packs, tier1, tier2, tier3, target, step, start)
+    result = suggest_thresholds(packs, tier1, tier2, tier3, target, step=step, start=start)
+    if expected is None:
+        assert result is None
+        return
+    assert result.diff == pytest.approx(expected[2], abs=1e-9)
+    assert (result.threshold1, result.threshold2) == expected[:2]
+
+
+def test_integer_rates():
+    """整数单价时差异没有浮点误差，阈值也要与穷举相同"""
+    rng = random.Random(1)
+    for _ in range(2000):
+        check(rng.randint(0, 200), rng.randint(0, 30), rng.randint(0, 30), rng.randint(0, 30),
+              step=rng.choice((1, 5, 7)), start=rng.choice((1, 10)))
+
+
+def test_with_target():
+    rng = random.Random(2)
+    for _ in range(1000):
+        check(rng.randint(0, 150), rng.randint(0, 20), rng.randint(0, 20), rng.randint(0, 20),
+              target=rng.randint(0, 3000))
+
+
+def test_fractional_rates():
+    """小数单价时最小差异相同（差异相同的组合可能因浮点误差取到另一组）"""
+    rng = random.Random(3)
+    for _ in range(1000):
+        packs = rng.randint(11, 150)
+        tiers = [round(rng.uniform(0, 30), 2) for _ in range(3)]
+        target = round(rng.uniform(0, 3000), 2)
+        expected = brute_force(packs, *tiers, target=target)
+        result = suggest_thresholds(packs, *tiers, target=target)
+        assert result.diff == pytest.approx(expected[2], abs=1e-6)
+        assert result.diff == pytest.approx(
+            abs(tier_commission(packs, result.threshold1, result.threshold2, *tiers) - target), abs=1e-9)
+
+
+def test_no_candidates():
+    assert suggest_thresholds(10, 5, 6, 7) is None
+    assert suggest_thresholds(3, 5, 6, 7) is None
+
+
+def test_invalid_step():
+    with pytest.raises(ValueError):
+        suggest_thresholds(100, 5, 6, 7, step=0)
+
+
+def test_batch():
+    stores = [(80, 7.5, 50, 60), (120, 10, 12, 15, 900), (5, 1, 2, 3)]
+    assert suggest_thresholds_batch(stores) == [suggest_thresholds(*s) for s in stores]
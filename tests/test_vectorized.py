@@ -0,0 +1,59 @@
+"""vectorized 批量计算与 engine 逐个计算完全一致"""
+import pandas as pd
+import pytest
+
+from salary_calculator.engine import MODES, ROLES, SalaryParams, calculate_conversion_rate, calculate_mode_salary
+from salary_calculator.vectorized import STORE_COLUMNS, calculate_batch
+
+
+@pytest.fixture
+def stores(params_list):
+    """随机参数组成的门店表（门店人数都不为0，旧薪资有定义）"""
+    rows = [p for p in params_list if p.total_staff]
+    df = pd.DataFrame([{name: getattr(p, name) for name in STORE_COLUMNS + ("employee_type",)} for p in rows])
+    return df, rows
+
+
+def expected_frame(rows, roles, index):
+    records = []
+    for p, role in zip(rows, roles):
+        record = {"转化率": calculate_conversion_rate(p)}
+        for mode in MODES:
+            record[mode] = calculate_mode_salary(p, mode, role=role)
+        for mode in MODES[2:]:
+            base, bonus, subsidy = calculate_mode_salary(p, mode, return_detail=True, role=role)
+            record.update({f"{mode}_底薪": base, f"{mode}_提成": bonus, f"{mode}_补贴": subsidy})
+        records.append(record)
+    return pd.DataFrame(records, index=index).astype(float)
+
+
+@pytest.mark.parametrize("role", ROLES)
+def test_single_role(stores, role):
+    df, rows = stores
+    result = calculate_batch(df.drop(columns="employee_type"), SalaryParams(), role=role, detail=True)
+    pd.testing.assert_frame_equal(result, expected_frame(rows, [role] * len(rows), df.index), check_exact=True)
+
+
+def test_role_per_row(stores):
+    df, rows = stores
+    result = calculate_batch(df, SalaryParams(), detail=True)
+    pd.testing.assert_frame_equal(result, expected_frame(rows, df["employee_type"], df.index), check_exact=True)
+
+
+def test_without_detail(stores):
+    df, rows = stores
+    result = calculate_batch(df, SalaryParams())
+    assert list(result.columns) == ["转化率"] + list(MODES)
+
+
+def test_missing_columns_use_params(stores):
+    """门店表中没有的列取 params 中的值"""
+    df, rows = stores
+    params = SalaryParams(supervisor_bonus=777.0, new_base_salary_low=2600.0, employee_type="主管")
+    subset = df[["delivery_amount", "purchase_amount", "employee_count"]]
+    result = calculate_batch(subset, params)
+    for i, (_, row) in enumerate(subset.iterrows()):
+        p = params.replace(**row.to_dict())
+        for mode in MODES:
+            assert result[mode].iloc[i] == calculate_mode_salary(p, mode)
+